@@ -19,9 +19,10 @@ from __future__ import annotations
 
 from . import types
 from . import version
+from ._mcp_utils import invalidate_mcp_tools_cache
 from .client import Client
 
 
 __version__ = version.__version__
 
-__all__ = ['Client']
+__all__ = ['Client', 'invalidate_mcp_tools_cache']
@@ -16,6 +16,7 @@
 from __future__ import annotations
 
 import typing
+from typing import Optional
 
 from ._mcp_utils import mcp_to_gemini_tools
 from .types import FunctionCall, Tool
@@ -32,9 +33,11 @@ class McpToGenAiToolAdapter:
       self,
       session: "mcp.ClientSession",  # type: ignore # noqa: F821
       list_tools_result: "mcp_types.ListToolsResult",  # type: ignore
+      tools: Optional[list[Tool]] = None,
   ) -> None:
     self._mcp_session = session
     self._list_tools_result = list_tools_result
+    self._tools = tools
 
   async def call_tool(
       self, function_call: FunctionCall
@@ -54,4 +57,6 @@ class McpToGenAiToolAdapter:
   @property
   def tools(self) -> list[Tool]:
     """Returns a list of Google GenAI tools."""
-    return mcp_to_gemini_tools(self._list_tools_result.tools)
+    if self._tools is None:
+      self._tools = mcp_to_gemini_tools(self._list_tools_result.tools)
+    return self._tools
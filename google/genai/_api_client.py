@@ -23,6 +23,9 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import Generator
+import concurrent.futures
+import contextlib
+import contextvars
 import copy
 from dataclasses import dataclass
 import inspect
@@ -30,13 +33,27 @@ import io
 import json
 import logging
 import math
+import mmap
 import os
 import random
 import ssl
 import sys
 import threading
 import time
-from typing import Any, AsyncIterator, Iterator, Optional, Tuple, TYPE_CHECKING, Union
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    cast,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+    TypeVar,
+    Union,
+)
 from urllib.parse import urlparse
 from urllib.parse import urlunparse
 import warnings
@@ -54,6 +71,7 @@ import tenacity
 
 from . import _common
 from . import errors
+from . import response_cache
 from . import version
 from .types import HttpOptions
 from .types import HttpOptionsOrDict
@@ -79,10 +97,23 @@ except ImportError:
 if TYPE_CHECKING:
   from multidict import CIMultiDictProxy
 
+  from .local_tokenizer import LocalTokenCounter
+  from .semantic_cache import SemanticCache
+
 
 logger = logging.getLogger('google_genai._api_client')
 CHUNK_SIZE = 8 * 1024 * 1024  # 8 MB chunk size
+MAX_CHUNK_SIZE = 128 * 1024 * 1024  # 128 MB chunk size
+# Resumable upload chunks must be a multiple of this size, except the last.
+UPLOAD_CHUNK_GRANULARITY = 256 * 1024
+# The chunk size doubles after a chunk uploads faster than this, and halves
+# after a chunk uploads slower than the slow threshold.
+FAST_CHUNK_SECONDS = 2.0
+SLOW_CHUNK_SECONDS = 10.0
 READ_BUFFER_SIZE = 2**22
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB chunk size
+# Files of at least two ranges of this size are downloaded in parallel ranges.
+DOWNLOAD_RANGE_SIZE = 32 * 1024 * 1024  # 32 MB range size
 MAX_RETRY_COUNT = 3
 INITIAL_RETRY_DELAY = 1  # second
 DELAY_MULTIPLIER = 2
@@ -92,6 +123,10 @@ class EphemeralTokenAPIKeyError(ValueError):
   """Error raised when the API key is invalid."""
 
 
+class ResumableUploadExpiredError(ValueError):
+  """Error raised when an interrupted upload can no longer be resumed."""
+
+
 # This method checks for the API key in the environment variables. Google API
 # key is precedenced over Gemini API key.
 def get_env_api_key() -> Optional[str]:
@@ -216,6 +251,321 @@ def get_timeout_in_seconds(
   return timeout_in_seconds
 
 
+_T = TypeVar('_T')
+
+# Whether the requests of the current context can be served from the response
+# cache of the client. Set by the generate content methods.
+_response_cache_enabled: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    'google_genai_response_cache_enabled', default=False
+)
+
+
+@contextlib.contextmanager
+def use_response_cache(enabled: bool) -> Iterator[None]:
+  """Lets the requests sent in the context use the response cache."""
+  token = _response_cache_enabled.set(enabled)
+  try:
+    yield
+  finally:
+    _response_cache_enabled.reset(token)
+
+
+def iter_with_response_cache(
+    stream: Iterable[_T], enabled: bool
+) -> Iterator[_T]:
+  """Iterates a stream whose request can use the response cache.
+
+  The cache is only enabled while the next item is produced, so that it is not
+  enabled for the requests that the consumer sends between the items.
+  """
+  iterator = iter(stream)
+  while True:
+    with use_response_cache(enabled):
+      try:
+        item = next(iterator)
+      except StopIteration:
+        return
+    yield item
+
+
+class _UploadChunkSizer:
+  """Adapts the size of resumable upload chunks to the measured throughput."""
+
+  def __init__(self, max_chunk_size: Optional[int] = None):
+    max_chunk_size = max_chunk_size or MAX_CHUNK_SIZE
+    self.max_chunk_size = max(
+        UPLOAD_CHUNK_GRANULARITY,
+        max_chunk_size - max_chunk_size % UPLOAD_CHUNK_GRANULARITY,
+    )
+    self.min_chunk_size = min(CHUNK_SIZE, self.max_chunk_size)
+    self.chunk_size = self.min_chunk_size
+
+  def record(self, size: int, seconds: float) -> None:
+    """Records the time it took to upload a chunk of the given size."""
+    if size < self.chunk_size:
+      # The last chunk of the file says nothing about the throughput.
+      return
+    if seconds < FAST_CHUNK_SECONDS:
+      self.chunk_size = min(self.chunk_size * 2, self.max_chunk_size)
+    elif seconds > SLOW_CHUNK_SECONDS:
+      self.chunk_size = max(self.chunk_size // 2, self.min_chunk_size)
+
+
+class _UploadReader:
+  """Reads upload chunks at the given offsets.
+
+  Chunks of a memory mapped file are `memoryview` slices, so they are not
+  copied. File objects are only seeked when an upload resumes from an offset
+  other than the current one. Async reads of blocking file objects run in a
+  worker thread, so that they do not block the event loop.
+  """
+
+  def __init__(self, source: Union[memoryview, io.IOBase, Any]):
+    self._source = source
+    # The offset that the next read of a file object starts at.
+    self._position = 0
+    # The size of the source is given by the caller.
+    self.size: Optional[int] = None
+
+  def read(self, offset: int, size: int) -> Union[bytes, memoryview]:
+    if isinstance(self._source, memoryview):
+      return self._source[offset : offset + size]
+    if offset != self._position:
+      start = self._source.tell() - self._position
+      self._source.seek(start + offset, os.SEEK_SET)
+    chunk: bytes = self._source.read(size)
+    self._position = offset + len(chunk)
+    return chunk
+
+  async def async_read(
+      self, offset: int, size: int
+  ) -> Union[bytes, memoryview]:
+    if isinstance(self._source, memoryview):
+      return self.read(offset, size)
+    if isinstance(self._source, io.IOBase):
+      return await asyncio.to_thread(self.read, offset, size)
+    if offset != self._position:
+      start = await self._source.tell() - self._position
+      await self._source.seek(start + offset, os.SEEK_SET)
+    chunk: bytes = await self._source.read(size)
+    self._position = offset + len(chunk)
+    return chunk
+
+
+class _IteratorUploadReader:
+  """Reads upload chunks from a sync or async iterator of bytes.
+
+  The length of the data is unknown until the iterator is exhausted. Data is
+  read one byte beyond each chunk, to tell whether the chunk is the last one.
+  Only the data from the last two read chunks on is kept, so that a failed
+  chunk can be resent after the next chunk was read ahead.
+  """
+
+  def __init__(
+      self, chunks: Union[Iterable[bytes], AsyncIterable[bytes]]
+  ):
+    self._chunks = chunks
+    self._iterator: Any = None
+    self._buffer = bytearray()
+    # The offset of the first byte of the buffer.
+    self._start = 0
+    # The offset of the last read chunk.
+    self._last_offset = 0
+    # The size of the data, once the iterator is exhausted.
+    self.size: Optional[int] = None
+
+  def _drop_before(self, offset: int) -> None:
+    if offset < self._start:
+      raise ValueError(
+          'Cannot resume the upload of an iterator before its last chunk.'
+      )
+    start = min(offset, self._last_offset)
+    del self._buffer[: start - self._start]
+    self._start = start
+    self._last_offset = offset
+
+  def _needs_data(self, offset: int, size: int) -> bool:
+    end = offset - self._start + size
+    return self.size is None and len(self._buffer) <= end
+
+  def _chunk(self, offset: int, size: int) -> bytes:
+    start = offset - self._start
+    return bytes(memoryview(self._buffer)[start : start + size])
+
+  def _append(self, data: Optional[bytes]) -> None:
+    if data is None:
+      self.size = self._start + len(self._buffer)
+    else:
+      self._buffer += data
+
+  def read(self, offset: int, size: int) -> bytes:
+    self._drop_before(offset)
+    if self._iterator is None:
+      self._iterator = iter(self._chunks)  # type: ignore[arg-type]
+    while self._needs_data(offset, size):
+      self._append(next(self._iterator, None))
+    return self._chunk(offset, size)
+
+  async def async_read(self, offset: int, size: int) -> bytes:
+    if not isinstance(self._chunks, AsyncIterable):
+      # Sync iterators may block to produce their chunks.
+      return await asyncio.to_thread(self.read, offset, size)
+    self._drop_before(offset)
+    if self._iterator is None:
+      self._iterator = self._chunks.__aiter__()
+    while self._needs_data(offset, size):
+      try:
+        self._append(await self._iterator.__anext__())
+      except StopAsyncIteration:
+        self._append(None)
+    return self._chunk(offset, size)
+
+
+def _upload_reader(
+    source: Any,
+) -> Union[_UploadReader, _IteratorUploadReader]:
+  """Returns the reader of a file, memory view or iterator of bytes."""
+  if isinstance(source, (memoryview, io.IOBase, anyio.AsyncFile)):
+    return _UploadReader(source)
+  return _IteratorUploadReader(source)
+
+
+class _UploadReadAhead:
+  """Reads the next chunk of an async upload while the current one is sent.
+
+  At most one chunk is read ahead. The chunk is used if the next read asks for
+  the same offset, otherwise it is read again. If the chunk size changed after
+  the chunk was read ahead, it is cut to the new size, or only the rest of the
+  larger chunk is read.
+  """
+
+  def __init__(self, reader: Union[_UploadReader, _IteratorUploadReader]):
+    self._reader = reader
+    self._next: Optional[
+        tuple[int, int, asyncio.Future[Union[bytes, memoryview]]]
+    ] = None
+
+  def prefetch(self, offset: int, size: int) -> None:
+    """Starts reading the chunk at offset in the background."""
+    assert self._next is None
+    self._next = (
+        offset,
+        size,
+        asyncio.ensure_future(self._reader.async_read(offset, size)),
+    )
+
+  async def read(self, offset: int, size: int) -> Union[bytes, memoryview]:
+    """Returns the chunk at offset, once the read ahead chunk is done."""
+    if self._next is not None:
+      next_offset, next_size, future = self._next
+      self._next = None
+      if next_offset == offset:
+        chunk = await future
+        if size <= next_size or len(chunk) < next_size:
+          # A short chunk is the last one of the file.
+          return chunk[:size]
+        if isinstance(self._reader, _UploadReader):
+          # The chunk size grew while the chunk was read ahead. Iterators keep
+          # the chunk buffered, so they are read again from its offset
+          # instead.
+          rest = await self._reader.async_read(
+              offset + next_size, size - next_size
+          )
+          return b''.join((chunk, rest))
+        return await self._reader.async_read(offset, size)
+      # The reader does not support concurrent reads.
+      with contextlib.suppress(Exception):
+        await future
+    return await self._reader.async_read(offset, size)
+
+  async def aclose(self) -> None:
+    """Waits for the read ahead chunk, so the file is not read once closed."""
+    if self._next is not None:
+      _, _, future = self._next
+      self._next = None
+      with contextlib.suppress(Exception):
+        await future
+
+
+@contextlib.contextmanager
+def _map_file(file: io.BufferedReader) -> Iterator[Optional[memoryview]]:
+  """Memory maps a file for reading, or yields None if it cannot be mapped."""
+  try:
+    mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+  except (OSError, ValueError):
+    # Empty files and special files cannot be mapped.
+    yield None
+    return
+  view = memoryview(mapped)
+  try:
+    yield view
+  finally:
+    view.release()
+    try:
+      mapped.close()
+    except BufferError:
+      # A chunk is still referenced, the map is closed once it is collected.
+      pass
+
+
+# The errors of a dropped connection, after which a transfer is resumed.
+_CONNECTION_ERRORS: tuple[type[Exception], ...] = (
+    (httpx.TransportError, aiohttp.ClientConnectionError)
+    if has_aiohttp
+    else (httpx.TransportError,)
+)
+
+
+def _upload_size_received(headers: Any) -> Optional[int]:
+  """Returns the upload offset that the server reported, if any."""
+  size_received = headers.get('x-goog-upload-size-received')
+  if size_received is None:
+    return None
+  try:
+    return int(size_received)
+  except ValueError:
+    return None
+
+
+def _range_header(start: int, end: Optional[int]) -> str:
+  """Returns the Range header value of the bytes from start to end."""
+  return f'bytes={start}-{"" if end is None else end - 1}'
+
+
+def _content_range_size(headers: Any) -> Optional[int]:
+  """Returns the full size of the file from a Content-Range header."""
+  content_range = headers.get('content-range', '')
+  _, _, size = content_range.rpartition('/')
+  try:
+    return int(size)
+  except ValueError:
+    return None
+
+
+def _download_ranges(size: int) -> list[tuple[int, int]]:
+  return [
+      (start, min(start + DOWNLOAD_RANGE_SIZE, size))
+      for start in range(0, size, DOWNLOAD_RANGE_SIZE)
+  ]
+
+
+def _trim_chunk(
+    chunk: bytes, skip: int, offset: int, end: Optional[int]
+) -> tuple[bytes, int]:
+  """Drops the bytes before the requested offset and after the end.
+
+  Returns:
+    The trimmed chunk and the number of bytes that are still to be skipped.
+  """
+  if skip:
+    if len(chunk) <= skip:
+      return b'', skip - len(chunk)
+    chunk = chunk[skip:]
+  if end is not None and offset + len(chunk) > end:
+    chunk = chunk[: end - offset]
+  return chunk, 0
+
+
 @dataclass
 class HttpRequest:
   headers: dict[str, str]
@@ -597,6 +947,14 @@ class BaseApiClient:
     self._sync_auth_lock = threading.Lock()
     self._async_auth_lock: Optional[asyncio.Lock] = None
     self._async_auth_lock_creation_lock: Optional[asyncio.Lock] = None
+    # The cache of deterministic responses, set by the client.
+    self._response_cache: Optional[response_cache.ResponseCache] = None
+    # The semantic cache of generate_content responses, set by the client.
+    self._semantic_cache: Optional['SemanticCache'] = None
+    # Answers count_tokens requests locally when possible, set by the client.
+    self._local_token_counter: Optional['LocalTokenCounter'] = None
+    # The largest chunk of resumable uploads, set by the client.
+    self._upload_max_chunk_size: Optional[int] = None
 
     # Handle when to use Vertex AI in express mode (api key).
     # Explicit initializer arguments are already validated above.
@@ -926,6 +1284,12 @@ class BaseApiClient:
 
   def _access_token(self) -> str:
     """Retrieves the access token for the credentials."""
+    # Return a valid token without taking the lock, so that concurrent requests
+    # from multiple threads are not serialized on it. The lock is only needed
+    # to load or refresh the credentials.
+    credentials = self._credentials
+    if credentials and credentials.token and not credentials.expired:
+      return credentials.token  # type: ignore[no-any-return]
     with self._sync_auth_lock:
       if not self._credentials:
         self._credentials, project = load_auth(project=self.project)
@@ -1303,6 +1667,18 @@ class BaseApiClient:
       copied = self._http_options
     return copied
 
+  def _get_response_cache_key(
+      self, http_request: HttpRequest
+  ) -> Optional[str]:
+    if not _response_cache_enabled.get() or self._response_cache is None:
+      return None
+    # Responses are only served to clients of the same API key, or the same
+    # project and location.
+    account = json.dumps([self.api_key, self.project, self.location])
+    return response_cache.request_key(
+        http_request.method, http_request.url, http_request.data, account
+    )
+
   def request(
       self,
       http_method: str,
@@ -1313,10 +1689,24 @@ class BaseApiClient:
     http_request = self._build_request(
         http_method, path, request_dict, http_options
     )
+    cache_key = self._get_response_cache_key(http_request)
+    if cache_key is not None:
+      cached_response = self._response_cache.get(cache_key)  # type: ignore[union-attr]
+      if cached_response is not None and len(cached_response.bodies) == 1:
+        return SdkHttpResponse(
+            headers=cached_response.headers, body=cached_response.bodies[0]
+        )
     response = self._request(http_request, http_options, stream=False)
     response_body = (
         response.response_stream[0] if response.response_stream else ''
     )
+    if cache_key is not None:
+      self._response_cache.put(  # type: ignore[union-attr]
+          cache_key,
+          response_cache.CachedResponse(
+              headers=dict(response.headers), bodies=[response_body]
+          ),
+      )
     return SdkHttpResponse(headers=response.headers, body=response_body)
 
   def request_streamed(
@@ -1329,11 +1719,28 @@ class BaseApiClient:
     http_request = self._build_request(
         http_method, path, request_dict, http_options
     )
+    cache_key = self._get_response_cache_key(http_request)
+    if cache_key is not None:
+      cached_response = self._response_cache.get(cache_key)  # type: ignore[union-attr]
+      if cached_response is not None:
+        for body in cached_response.bodies:
+          yield SdkHttpResponse(headers=cached_response.headers, body=body)
+        return
 
     session_response = self._request(http_request, http_options, stream=True)
+    bodies = []
     for chunk in session_response.segments():
-      yield SdkHttpResponse(
-          headers=session_response.headers, body=json.dumps(chunk)
+      body = json.dumps(chunk)
+      if cache_key is not None:
+        bodies.append(body)
+      yield SdkHttpResponse(headers=session_response.headers, body=body)
+    # Only streams that were consumed completely are cached.
+    if cache_key is not None:
+      self._response_cache.put(  # type: ignore[union-attr]
+          cache_key,
+          response_cache.CachedResponse(
+              headers=dict(session_response.headers), bodies=bodies
+          ),
       )
 
   async def async_request(
@@ -1346,11 +1753,28 @@ class BaseApiClient:
     http_request = self._build_request(
         http_method, path, request_dict, http_options
     )
+    cache_key = self._get_response_cache_key(http_request)
+    if cache_key is not None:
+      cached_response = await asyncio.to_thread(
+          self._response_cache.get, cache_key  # type: ignore[union-attr]
+      )
+      if cached_response is not None and len(cached_response.bodies) == 1:
+        return SdkHttpResponse(
+            headers=cached_response.headers, body=cached_response.bodies[0]
+        )
 
     result = await self._async_request(
         http_request=http_request, http_options=http_options, stream=False
     )
     response_body = result.response_stream[0] if result.response_stream else ''
+    if cache_key is not None:
+      await asyncio.to_thread(
+          self._response_cache.put,  # type: ignore[union-attr]
+          cache_key,
+          response_cache.CachedResponse(
+              headers=dict(result.headers), bodies=[response_body]
+          ),
+      )
     return SdkHttpResponse(headers=result.headers, body=response_body)
 
   async def async_request_streamed(
@@ -1363,123 +1787,250 @@ class BaseApiClient:
     http_request = self._build_request(
         http_method, path, request_dict, http_options
     )
+    cache_key = self._get_response_cache_key(http_request)
+    if cache_key is not None:
+      cached_response = await asyncio.to_thread(
+          self._response_cache.get, cache_key  # type: ignore[union-attr]
+      )
+      if cached_response is not None:
+
+        async def cached_async_generator():  # type: ignore[no-untyped-def]
+          for body in cached_response.bodies:
+            yield SdkHttpResponse(headers=cached_response.headers, body=body)
+
+        return cached_async_generator()  # type: ignore[no-untyped-call]
 
     response = await self._async_request(http_request=http_request, stream=True)
 
     async def async_generator():  # type: ignore[no-untyped-def]
+      bodies = []
       async for chunk in response:
-        yield SdkHttpResponse(headers=response.headers, body=json.dumps(chunk))
+        body = json.dumps(chunk)
+        if cache_key is not None:
+          bodies.append(body)
+        yield SdkHttpResponse(headers=response.headers, body=body)
+      # Only streams that were consumed completely are cached.
+      if cache_key is not None:
+        await asyncio.to_thread(
+            self._response_cache.put,  # type: ignore[union-attr]
+            cache_key,
+            response_cache.CachedResponse(
+                headers=dict(response.headers), bodies=bodies
+            ),
+        )
 
     return async_generator()  # type: ignore[no-untyped-call]
 
   def upload_file(
       self,
-      file_path: Union[str, io.IOBase],
+      file_path: Union[str, io.IOBase, Iterable[bytes]],
       upload_url: str,
-      upload_size: int,
+      upload_size: Optional[int],
       *,
       http_options: Optional[HttpOptionsOrDict] = None,
+      resume: bool = False,
+      progress_callback: Optional[Callable[[int], None]] = None,
   ) -> HttpResponse:
     """Transfers a file to the given URL.
 
+    Files given by path are memory mapped, so that their chunks are sent
+    without being copied.
+
     Args:
-      file_path: The full path to the file or a file like object inherited from
-        io.BytesIO. If the local file path is not found, an error will be
-        raised.
+      file_path: The full path to the file, a file like object inherited from
+        io.BytesIO, or an iterator of bytes. If the local file path is not
+        found, an error will be raised.
       upload_url: The URL to upload the file to.
       upload_size: The size of file content to be uploaded, this will have to
-        match the size requested in the resumable upload request.
+        match the size requested in the resumable upload request. None if the
+        size of an iterator is declared when the upload is finalized.
       http_options: The http options to use for the request.
+      resume: Whether to continue an interrupted upload from the offset that
+        the server received, instead of uploading from the start.
+      progress_callback: Called with the number of bytes that the server
+        acknowledged, after each uploaded chunk.
 
     returns:
           The HttpResponse object from the finalize request.
     """
-    if isinstance(file_path, io.IOBase):
+    if not isinstance(file_path, (str, os.PathLike)):
       return self._upload_fd(
-          file_path, upload_url, upload_size, http_options=http_options
+          file_path,
+          upload_url,
+          upload_size,
+          http_options=http_options,
+          resume=resume,
+          progress_callback=progress_callback,
       )
     else:
-      with open(file_path, 'rb') as file:
+      with open(file_path, 'rb') as file, _map_file(file) as view:
         return self._upload_fd(
-            file, upload_url, upload_size, http_options=http_options
+            view if view is not None else file,
+            upload_url,
+            upload_size,
+            http_options=http_options,
+            resume=resume,
+            progress_callback=progress_callback,
         )
 
+  def _upload_timeout_in_seconds(
+      self, http_options: Optional[HttpOptionsOrDict]
+  ) -> Optional[float]:
+    """Returns the timeout of upload requests in seconds."""
+    http_options = http_options if http_options else self._http_options
+    timeout = (
+        http_options.get('timeout')
+        if isinstance(http_options, dict)
+        else http_options.timeout
+    )
+    if timeout is None:
+      # Per request timeout is not configured. Check the global timeout.
+      timeout = (
+          self._http_options.timeout
+          if isinstance(self._http_options, dict)
+          else self._http_options.timeout
+      )
+    return get_timeout_in_seconds(timeout)
+
+  def _query_upload(
+      self, upload_url: str, timeout_in_seconds: Optional[float]
+  ) -> Optional[httpx.Response]:
+    """Asks the server for the status of an interrupted upload."""
+    query_headers = {'X-Goog-Upload-Command': 'query'}
+    populate_server_timeout_header(query_headers, timeout_in_seconds)
+    try:
+      response = self._httpx_client.request(
+          method='POST',
+          url=upload_url,
+          headers=query_headers,
+          timeout=timeout_in_seconds,
+      )
+    except httpx.TransportError:
+      return None
+    if not response.headers.get('x-goog-upload-status'):
+      return None
+    return response
+
   def _upload_fd(
       self,
-      file: io.IOBase,
+      file: Union[io.IOBase, memoryview, Iterable[bytes]],
       upload_url: str,
-      upload_size: int,
+      upload_size: Optional[int],
       *,
       http_options: Optional[HttpOptionsOrDict] = None,
+      resume: bool = False,
+      progress_callback: Optional[Callable[[int], None]] = None,
   ) -> HttpResponse:
     """Transfers a file to the given URL.
 
+    The chunk size grows while chunks upload quickly, up to the maximum chunk
+    size of the client. A failed chunk is resumed from the offset that the
+    server received.
+
     Args:
-      file: A file like object inherited from io.BytesIO.
+      file: A file like object inherited from io.BytesIO, a memory view of
+        the file content, or an iterator of bytes.
       upload_url: The URL to upload the file to.
       upload_size: The size of file content to be uploaded, this will have to
-        match the size requested in the resumable upload request.
+        match the size requested in the resumable upload request. None if the
+        size of an iterator is declared when the upload is finalized.
       http_options: The http options to use for the request.
+      resume: Whether to continue an interrupted upload from the offset that
+        the server received, instead of uploading from the start.
+      progress_callback: Called with the number of bytes that the server
+        acknowledged, after each uploaded chunk.
 
     returns:
           The HttpResponse object from the finalize request.
     """
+    timeout_in_seconds = self._upload_timeout_in_seconds(http_options)
+    reader = _upload_reader(file)
+    sizer = _UploadChunkSizer(self._upload_max_chunk_size)
     offset = 0
+    if resume:
+      query_response = self._query_upload(upload_url, timeout_in_seconds)
+      if query_response is None:
+        raise ResumableUploadExpiredError(
+            'The upload session can no longer be resumed.'
+        )
+      if query_response.headers.get('x-goog-upload-status') == 'final':
+        return HttpResponse(
+            query_response.headers, response_stream=[query_response.text]
+        )
+      offset = _upload_size_received(query_response.headers) or 0
+    retry_count = 0
+    response: Optional[httpx.Response] = None
     # Upload the file in chunks
     while True:
-      file_chunk = file.read(CHUNK_SIZE)
-      chunk_size = 0
-      if file_chunk:
-        chunk_size = len(file_chunk)
+      file_chunk = reader.read(offset, sizer.chunk_size)
+      chunk_size = len(file_chunk)
       upload_command = 'upload'
+      # The size of iterators is known once they are read to the end.
+      total_size = upload_size if upload_size is not None else reader.size
       # If last chunk, finalize the upload.
-      if chunk_size + offset >= upload_size:
+      if total_size is not None and chunk_size + offset >= total_size:
         upload_command += ', finalize'
-      http_options = http_options if http_options else self._http_options
-      timeout = (
-          http_options.get('timeout')
-          if isinstance(http_options, dict)
-          else http_options.timeout
-      )
-      if timeout is None:
-        # Per request timeout is not configured. Check the global timeout.
-        timeout = (
-            self._http_options.timeout
-            if isinstance(self._http_options, dict)
-            else self._http_options.timeout
-        )
-      timeout_in_seconds = get_timeout_in_seconds(timeout)
       upload_headers = {
           'X-Goog-Upload-Command': upload_command,
           'X-Goog-Upload-Offset': str(offset),
           'Content-Length': str(chunk_size),
       }
       populate_server_timeout_header(upload_headers, timeout_in_seconds)
-      retry_count = 0
-      while retry_count < MAX_RETRY_COUNT:
+      start_time = time.monotonic()
+      try:
         response = self._httpx_client.request(
             method='POST',
             url=upload_url,
             headers=upload_headers,
-            content=file_chunk,
+            # A list of the chunk lets httpx send a memory view as is, without
+            # copying it, although the list is typed as holding bytes only.
+            content=cast(Iterable[bytes], [file_chunk]),
             timeout=timeout_in_seconds,
         )
-        if response.headers.get('x-goog-upload-status'):
-          break
-        delay_seconds = INITIAL_RETRY_DELAY * (DELAY_MULTIPLIER**retry_count)
+      except httpx.TransportError:
+        if retry_count + 1 >= MAX_RETRY_COUNT:
+          raise
+        response = None
+      del file_chunk
+
+      if response is None or not response.headers.get('x-goog-upload-status'):
         retry_count += 1
-        time.sleep(delay_seconds)
+        if retry_count >= MAX_RETRY_COUNT:
+          break
+        time.sleep(INITIAL_RETRY_DELAY * (DELAY_MULTIPLIER ** (retry_count - 1)))
+        # Resume from the data that the server received instead of resending
+        # the whole chunk.
+        query_response = self._query_upload(upload_url, timeout_in_seconds)
+        if query_response is not None:
+          if query_response.headers.get('x-goog-upload-status') == 'final':
+            response = query_response
+            break
+          size_received = _upload_size_received(query_response.headers)
+          if size_received is not None:
+            offset = size_received
+        continue
 
-      offset += chunk_size
+      retry_count = 0
+      sizer.record(chunk_size, time.monotonic() - start_time)
+      size_received = _upload_size_received(response.headers)
+      offset = (
+          size_received if size_received is not None else offset + chunk_size
+      )
+      if progress_callback is not None:
+        progress_callback(offset)
       if response.headers.get('x-goog-upload-status') != 'active':
         break  # upload is complete or it has been interrupted.
-      if upload_size <= offset:  # Status is not finalized.
+      if total_size is not None and total_size <= offset:
+        # Status is not finalized.
         raise ValueError(
             f'All content has been uploaded, but the upload status is not'
             f' finalized.'
         )
 
-    if response.headers.get('x-goog-upload-status') != 'final':
+    if (
+        response is None
+        or response.headers.get('x-goog-upload-status') != 'final'
+    ):
       raise ValueError('Failed to upload file: Upload status is not finalized.')
     return HttpResponse(response.headers, response_stream=[response.text])
 
@@ -1522,212 +2073,390 @@ class BaseApiClient:
         response.headers, byte_stream=[response.read()]
     ).byte_stream[0]
 
+  @contextlib.contextmanager
+  def _download_stream(
+      self, http_request: HttpRequest, headers: dict[str, str], chunk_size: int
+  ) -> Iterator[tuple[int, Any, Iterator[bytes]]]:
+    """Opens a download, yields its status, headers and chunks."""
+    with self._httpx_client.stream(
+        method=http_request.method,
+        url=http_request.url,
+        headers=headers,
+        timeout=http_request.timeout,
+    ) as response:
+      if response.status_code != 206:
+        errors.APIError.raise_for_response(response)
+      yield (
+          response.status_code,
+          response.headers,
+          response.iter_bytes(chunk_size),
+      )
+
+  def iter_download(
+      self,
+      path: str,
+      *,
+      http_options: Optional[HttpOptionsOrDict] = None,
+      start: int = 0,
+      end: Optional[int] = None,
+      chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+  ) -> Iterator[bytes]:
+    """Streams the file data in chunks.
+
+    A dropped connection is resumed with a Range request from the first byte
+    that was not received yet.
+
+    Args:
+      path: The request path with query params.
+      http_options: The http options to use for the request.
+      start: The offset of the first byte to download.
+      end: The offset after the last byte to download. Defaults to the end of
+        the file.
+      chunk_size: The size of the chunks, the last chunk may be smaller.
+
+    Yields:
+      The chunks of the file data.
+    """
+    http_request = self._build_request(
+        'get', path=path, request_dict={}, http_options=http_options
+    )
+    offset = start
+    retry_count = 0
+    while end is None or offset < end:
+      headers = dict(http_request.headers)
+      if offset or end is not None:
+        headers['Range'] = _range_header(offset, end)
+      try:
+        with self._download_stream(http_request, headers, chunk_size) as (
+            status_code,
+            _,
+            chunks,
+        ):
+          # The whole file is sent if the server ignores the range.
+          skip = offset if status_code == 200 else 0
+          for chunk in chunks:
+            chunk, skip = _trim_chunk(chunk, skip, offset, end)
+            if not chunk:
+              continue
+            offset += len(chunk)
+            retry_count = 0
+            yield chunk
+            if end is not None and offset >= end:
+              break
+        return
+      except httpx.TransportError:
+        if retry_count + 1 >= MAX_RETRY_COUNT:
+          raise
+        time.sleep(INITIAL_RETRY_DELAY * (DELAY_MULTIPLIER**retry_count))
+        retry_count += 1
+
+  def _download_size(
+      self, path: str, http_options: Optional[HttpOptionsOrDict]
+  ) -> Optional[int]:
+    """Returns the size of the file, or None if it has no range support."""
+    http_request = self._build_request(
+        'get', path=path, request_dict={}, http_options=http_options
+    )
+    headers = dict(http_request.headers)
+    headers['Range'] = _range_header(0, 1)
+    with self._download_stream(http_request, headers, 1) as (
+        status_code,
+        response_headers,
+        _,
+    ):
+      if status_code != 206:
+        return None
+      return _content_range_size(response_headers)
+
+  def download_file_to(
+      self,
+      path: str,
+      destination: Union[str, os.PathLike[str], io.IOBase],
+      *,
+      http_options: Optional[HttpOptionsOrDict] = None,
+      max_concurrency: int = 1,
+  ) -> None:
+    """Streams the file data to a local path or a writable file object.
+
+    Args:
+      path: The request path with query params.
+      destination: The path to write the file to, or a writable file object
+        opened in binary mode.
+      http_options: The http options to use for the request.
+      max_concurrency: The number of ranges of a large file to download in
+        parallel. Only used if the destination is a path.
+    """
+    if isinstance(destination, io.IOBase):
+      for chunk in self.iter_download(path, http_options=http_options):
+        destination.write(chunk)
+      return
+
+    try:
+      size = None
+      if max_concurrency > 1:
+        size = self._download_size(path, http_options)
+      with open(destination, 'wb') as file:
+        if size is None or size < 2 * DOWNLOAD_RANGE_SIZE:
+          for chunk in self.iter_download(path, http_options=http_options):
+            file.write(chunk)
+          return
+        file.truncate(size)
+
+      def download_range(download_range: tuple[int, int]) -> None:
+        start, end = download_range
+        with open(destination, 'r+b') as range_file:
+          range_file.seek(start)
+          for chunk in self.iter_download(
+              path, http_options=http_options, start=start, end=end
+          ):
+            range_file.write(chunk)
+
+      with concurrent.futures.ThreadPoolExecutor(max_concurrency) as executor:
+        for _ in executor.map(download_range, _download_ranges(size)):
+          pass
+    except BaseException:
+      # Do not leave a partial file behind.
+      with contextlib.suppress(OSError):
+        os.remove(destination)
+      raise
+
   async def async_upload_file(
       self,
-      file_path: Union[str, io.IOBase],
+      file_path: Union[
+          str, io.IOBase, Iterable[bytes], AsyncIterable[bytes]
+      ],
       upload_url: str,
-      upload_size: int,
+      upload_size: Optional[int],
       *,
       http_options: Optional[HttpOptionsOrDict] = None,
+      resume: bool = False,
+      progress_callback: Optional[Callable[[int], None]] = None,
   ) -> HttpResponse:
     """Transfers a file asynchronously to the given URL.
 
     Args:
-      file_path: The full path to the file. If the local file path is not found,
-        an error will be raised.
+      file_path: The full path to the file, a file like object, or a sync or
+        async iterator of bytes. If the local file path is not found, an error
+        will be raised.
       upload_url: The URL to upload the file to.
       upload_size: The size of file content to be uploaded, this will have to
-        match the size requested in the resumable upload request.
+        match the size requested in the resumable upload request. None if the
+        size of an iterator is declared when the upload is finalized.
       http_options: The http options to use for the request.
+      resume: Whether to continue an interrupted upload from the offset that
+        the server received, instead of uploading from the start.
+      progress_callback: Called with the number of bytes that the server
+        acknowledged, after each uploaded chunk.
 
     returns:
           The HttpResponse object from the finalize request.
     """
-    if isinstance(file_path, io.IOBase):
+    if not isinstance(file_path, (str, os.PathLike)):
       return await self._async_upload_fd(
-          file_path, upload_url, upload_size, http_options=http_options
+          file_path,
+          upload_url,
+          upload_size,
+          http_options=http_options,
+          resume=resume,
+          progress_callback=progress_callback,
       )
     else:
       file = anyio.Path(file_path)
       fd = await file.open('rb')
       async with fd:
         return await self._async_upload_fd(
-            fd, upload_url, upload_size, http_options=http_options
+            fd,
+            upload_url,
+            upload_size,
+            http_options=http_options,
+            resume=resume,
+            progress_callback=progress_callback,
         )
 
+  async def _async_upload_request(
+      self,
+      upload_url: str,
+      upload_headers: dict[str, str],
+      content: Optional[Union[bytes, memoryview]],
+      timeout_in_seconds: Optional[float],
+  ) -> Any:
+    """Sends an upload request with aiohttp, or httpx if it is unavailable."""
+    if self._use_aiohttp():
+      self._aiohttp_session = await self._get_aiohttp_session()
+      return await self._aiohttp_session.request(
+          method='POST',
+          url=upload_url,
+          data=content,
+          headers=upload_headers,
+          timeout=aiohttp.ClientTimeout(connect=timeout_in_seconds),
+      )
+    # aiohttp is not available. Fall back to httpx, which does not accept
+    # memory views as the content of async requests.
+    if isinstance(content, memoryview):
+      content = bytes(content)
+    return await self._async_httpx_client.request(
+        method='POST',
+        url=upload_url,
+        content=content,
+        headers=upload_headers,
+        timeout=timeout_in_seconds,
+    )
+
+  async def _async_query_upload(
+      self, upload_url: str, timeout_in_seconds: Optional[float]
+  ) -> Any:
+    """Asks the server for the status of an interrupted upload."""
+    query_headers = {'X-Goog-Upload-Command': 'query'}
+    populate_server_timeout_header(query_headers, timeout_in_seconds)
+    try:
+      response = await self._async_upload_request(
+          upload_url, query_headers, None, timeout_in_seconds
+      )
+    except _CONNECTION_ERRORS:
+      return None
+    if not response.headers.get('x-goog-upload-status'):
+      return None
+    return response
+
   async def _async_upload_fd(
       self,
-      file: Union[io.IOBase, anyio.AsyncFile[Any]],
+      file: Union[
+          io.IOBase, anyio.AsyncFile[Any], Iterable[bytes], AsyncIterable[bytes]
+      ],
       upload_url: str,
-      upload_size: int,
+      upload_size: Optional[int],
       *,
       http_options: Optional[HttpOptionsOrDict] = None,
+      resume: bool = False,
+      progress_callback: Optional[Callable[[int], None]] = None,
   ) -> HttpResponse:
     """Transfers a file asynchronously to the given URL.
 
+    The chunk size grows while chunks upload quickly, up to the maximum chunk
+    size of the client. A failed chunk is resumed from the offset that the
+    server received.
+
     Args:
-      file: A file like object inherited from io.BytesIO.
+      file: A file like object inherited from io.BytesIO, or a sync or async
+        iterator of bytes.
       upload_url: The URL to upload the file to.
       upload_size: The size of file content to be uploaded, this will have to
-        match the size requested in the resumable upload request.
+        match the size requested in the resumable upload request. None if the
+        size of an iterator is declared when the upload is finalized.
       http_options: The http options to use for the request.
+      resume: Whether to continue an interrupted upload from the offset that
+        the server received, instead of uploading from the start.
+      progress_callback: Called with the number of bytes that the server
+        acknowledged, after each uploaded chunk.
 
     returns:
           The HttpResponse object from the finalized request.
     """
+    timeout_in_seconds = self._upload_timeout_in_seconds(http_options)
+    reader = _upload_reader(file)
+    read_ahead = _UploadReadAhead(reader)
+    sizer = _UploadChunkSizer(self._upload_max_chunk_size)
     offset = 0
+    if resume:
+      query_response = await self._async_query_upload(
+          upload_url, timeout_in_seconds
+      )
+      if query_response is None:
+        raise ResumableUploadExpiredError(
+            'The upload session can no longer be resumed.'
+        )
+      if query_response.headers.get('x-goog-upload-status') == 'final':
+        return await self._async_upload_response(query_response)
+      offset = _upload_size_received(query_response.headers) or 0
+    retry_count = 0
+    response = None
     # Upload the file in chunks
-    if self._use_aiohttp():  # pylint: disable=g-import-not-at-top
-      self._aiohttp_session = await self._get_aiohttp_session()
+    try:
       while True:
-        if isinstance(file, io.IOBase):
-          file_chunk = file.read(CHUNK_SIZE)
-        else:
-          file_chunk = await file.read(CHUNK_SIZE)
-        chunk_size = 0
-        if file_chunk:
-          chunk_size = len(file_chunk)
+        file_chunk = await read_ahead.read(offset, sizer.chunk_size)
+        chunk_size = len(file_chunk)
         upload_command = 'upload'
+        # The size of iterators is known once they are read to the end.
+        total_size = upload_size if upload_size is not None else reader.size
         # If last chunk, finalize the upload.
-        if chunk_size + offset >= upload_size:
+        if total_size is not None and chunk_size + offset >= total_size:
           upload_command += ', finalize'
-        http_options = http_options if http_options else self._http_options
-        timeout = (
-            http_options.get('timeout')
-             if isinstance(http_options, dict)
-             else http_options.timeout
-        )
-        if timeout is None:
-          # Per request timeout is not configured. Check the global timeout.
-          timeout = (
-              self._http_options.timeout
-              if isinstance(self._http_options, dict)
-              else self._http_options.timeout
-          )
-        timeout_in_seconds = get_timeout_in_seconds(timeout)
         upload_headers = {
             'X-Goog-Upload-Command': upload_command,
-             'X-Goog-Upload-Offset': str(offset),
+            'X-Goog-Upload-Offset': str(offset),
             'Content-Length': str(chunk_size),
         }
         populate_server_timeout_header(upload_headers, timeout_in_seconds)
-
-        retry_count = 0
-        response = None
-        while retry_count < MAX_RETRY_COUNT:
-          response = await self._aiohttp_session.request(
-              method='POST',
-              url=upload_url,
-              data=file_chunk,
-              headers=upload_headers,
-              timeout=aiohttp.ClientTimeout(connect=timeout_in_seconds),
+        if 'finalize' not in upload_command:
+          # Read the next chunk from disk while this one is uploaded.
+          read_ahead.prefetch(offset + chunk_size, sizer.chunk_size)
+        start_time = time.monotonic()
+        try:
+          response = await self._async_upload_request(
+              upload_url, upload_headers, file_chunk, timeout_in_seconds
           )
-
-          if response.headers.get('X-Goog-Upload-Status'):
-            break
-          delay_seconds = INITIAL_RETRY_DELAY * (DELAY_MULTIPLIER**retry_count)
-          retry_count += 1
-          await asyncio.sleep(delay_seconds)
-
-        offset += chunk_size
-        if (
-            response is not None
-            and response.headers.get('X-Goog-Upload-Status') != 'active'
+        except _CONNECTION_ERRORS:
+          if retry_count + 1 >= MAX_RETRY_COUNT:
+            raise
+          response = None
+        del file_chunk
+
+        if response is None or not response.headers.get(
+            'x-goog-upload-status'
         ):
-          break  # upload is complete or it has been interrupted.
-
-        if upload_size <= offset:  # Status is not finalized.
-          raise ValueError(
-              f'All content has been uploaded, but the upload status is not'
-              f' finalized.'
+          retry_count += 1
+          if retry_count >= MAX_RETRY_COUNT:
+            break
+          await asyncio.sleep(
+              INITIAL_RETRY_DELAY * (DELAY_MULTIPLIER ** (retry_count - 1))
           )
-      if (
-          response is not None
-          and response.headers.get('X-Goog-Upload-Status') != 'final'
-      ):
-        raise ValueError(
-            'Failed to upload file: Upload status is not finalized.'
-        )
-      return HttpResponse(
-          response.headers, response_stream=[await response.text()]
-      )
-    else:
-      # aiohttp is not available. Fall back to httpx.
-      while True:
-        if isinstance(file, io.IOBase):
-          file_chunk = file.read(CHUNK_SIZE)
-        else:
-          file_chunk = await file.read(CHUNK_SIZE)
-        chunk_size = 0
-        if file_chunk:
-          chunk_size = len(file_chunk)
-        upload_command = 'upload'
-        # If last chunk, finalize the upload.
-        if chunk_size + offset >= upload_size:
-          upload_command += ', finalize'
-        http_options = http_options if http_options else self._http_options
-        timeout = (
-            http_options.get('timeout')
-            if isinstance(http_options, dict)
-            else http_options.timeout
-        )
-        if timeout is None:
-          # Per request timeout is not configured. Check the global timeout.
-          timeout = (
-              self._http_options.timeout
-              if isinstance(self._http_options, dict)
-              else self._http_options.timeout
+          # Resume from the data that the server received instead of resending
+          # the whole chunk.
+          query_response = await self._async_query_upload(
+              upload_url, timeout_in_seconds
           )
-        timeout_in_seconds = get_timeout_in_seconds(timeout)
-        upload_headers = {
-            'X-Goog-Upload-Command': upload_command,
-            'X-Goog-Upload-Offset': str(offset),
-            'Content-Length': str(chunk_size),
-        }
-        populate_server_timeout_header(upload_headers, timeout_in_seconds)
+          if query_response is not None:
+            if query_response.headers.get('x-goog-upload-status') == 'final':
+              response = query_response
+              break
+            size_received = _upload_size_received(query_response.headers)
+            if size_received is not None:
+              offset = size_received
+          continue
 
         retry_count = 0
-        client_response = None
-        while retry_count < MAX_RETRY_COUNT:
-          client_response = await self._async_httpx_client.request(
-              method='POST',
-              url=upload_url,
-              content=file_chunk,
-              headers=upload_headers,
-              timeout=timeout_in_seconds,
-          )
-          if (
-              client_response is not None
-              and client_response.headers
-              and client_response.headers.get('x-goog-upload-status')
-          ):
-            break
-          delay_seconds = INITIAL_RETRY_DELAY * (DELAY_MULTIPLIER**retry_count)
-          retry_count += 1
-          time.sleep(delay_seconds)
-
-        offset += chunk_size
-        if (
-            client_response is not None
-            and client_response.headers.get('x-goog-upload-status') != 'active'
-        ):
+        sizer.record(chunk_size, time.monotonic() - start_time)
+        size_received = _upload_size_received(response.headers)
+        offset = (
+            size_received if size_received is not None else offset + chunk_size
+        )
+        if progress_callback is not None:
+          progress_callback(offset)
+        if response.headers.get('x-goog-upload-status') != 'active':
           break  # upload is complete or it has been interrupted.
-
-        if upload_size <= offset:  # Status is not finalized.
+        if total_size is not None and total_size <= offset:
+          # Status is not finalized.
           raise ValueError(
               'All content has been uploaded, but the upload status is not'
               ' finalized.'
           )
-      if (
-          client_response is not None
-          and client_response.headers.get('x-goog-upload-status') != 'final'
-      ):
-        raise ValueError(
-            'Failed to upload file: Upload status is not finalized.'
-        )
-      return HttpResponse(
-          client_response.headers, response_stream=[client_response.text]
-      )
+    finally:
+      await read_ahead.aclose()
+
+    if (
+        response is None
+        or response.headers.get('x-goog-upload-status') != 'final'
+    ):
+      raise ValueError('Failed to upload file: Upload status is not finalized.')
+    return await self._async_upload_response(response)
+
+  async def _async_upload_response(self, response: Any) -> HttpResponse:
+    """Converts an aiohttp or httpx upload response to an HttpResponse."""
+    if isinstance(response, httpx.Response):
+      return HttpResponse(response.headers, response_stream=[response.text])
+    return HttpResponse(
+        response.headers, response_stream=[await response.text()]
+    )
 
   async def async_download_file(
       self,
@@ -1784,6 +2513,184 @@ class BaseApiClient:
           client_response.headers, byte_stream=[client_response.read()]
       ).byte_stream[0]
 
+  @contextlib.asynccontextmanager
+  async def _async_download_stream(
+      self, http_request: HttpRequest, headers: dict[str, str], chunk_size: int
+  ) -> AsyncIterator[tuple[int, Any, AsyncIterator[bytes]]]:
+    """Opens a download, yields its status, headers and chunks."""
+    if self._use_aiohttp():
+      self._aiohttp_session = await self._get_aiohttp_session()
+      async with self._aiohttp_session.request(
+          method=http_request.method,
+          url=http_request.url,
+          headers=headers,
+          timeout=aiohttp.ClientTimeout(connect=http_request.timeout),
+      ) as response:
+        if response.status != 206:
+          await errors.APIError.raise_for_async_response(response)
+        yield (
+            response.status,
+            response.headers,
+            response.content.iter_chunked(chunk_size),
+        )
+    else:
+      # aiohttp is not available. Fall back to httpx.
+      async with self._async_httpx_client.stream(
+          method=http_request.method,
+          url=http_request.url,
+          headers=headers,
+          timeout=http_request.timeout,
+      ) as client_response:
+        if client_response.status_code != 206:
+          await errors.APIError.raise_for_async_response(client_response)
+        yield (
+            client_response.status_code,
+            client_response.headers,
+            client_response.aiter_bytes(chunk_size),
+        )
+
+  async def async_iter_download(
+      self,
+      path: str,
+      *,
+      http_options: Optional[HttpOptionsOrDict] = None,
+      start: int = 0,
+      end: Optional[int] = None,
+      chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+  ) -> AsyncIterator[bytes]:
+    """Streams the file data in chunks asynchronously.
+
+    A dropped connection is resumed with a Range request from the first byte
+    that was not received yet.
+
+    Args:
+      path: The request path with query params.
+      http_options: The http options to use for the request.
+      start: The offset of the first byte to download.
+      end: The offset after the last byte to download. Defaults to the end of
+        the file.
+      chunk_size: The size of the chunks, the last chunk may be smaller.
+
+    Yields:
+      The chunks of the file data.
+    """
+    http_request = self._build_request(
+        'get', path=path, request_dict={}, http_options=http_options
+    )
+    offset = start
+    retry_count = 0
+    while end is None or offset < end:
+      headers = dict(http_request.headers)
+      if offset or end is not None:
+        headers['Range'] = _range_header(offset, end)
+      try:
+        async with self._async_download_stream(
+            http_request, headers, chunk_size
+        ) as (status_code, _, chunks):
+          # The whole file is sent if the server ignores the range.
+          skip = offset if status_code == 200 else 0
+          async for chunk in chunks:
+            chunk, skip = _trim_chunk(chunk, skip, offset, end)
+            if not chunk:
+              continue
+            offset += len(chunk)
+            retry_count = 0
+            yield chunk
+            if end is not None and offset >= end:
+              break
+        return
+      except _CONNECTION_ERRORS:
+        if retry_count + 1 >= MAX_RETRY_COUNT:
+          raise
+        await asyncio.sleep(
+            INITIAL_RETRY_DELAY * (DELAY_MULTIPLIER**retry_count)
+        )
+        retry_count += 1
+
+  async def _async_download_size(
+      self, path: str, http_options: Optional[HttpOptionsOrDict]
+  ) -> Optional[int]:
+    """Returns the size of the file, or None if it has no range support."""
+    http_request = self._build_request(
+        'get', path=path, request_dict={}, http_options=http_options
+    )
+    headers = dict(http_request.headers)
+    headers['Range'] = _range_header(0, 1)
+    async with self._async_download_stream(http_request, headers, 1) as (
+        status_code,
+        response_headers,
+        _,
+    ):
+      if status_code != 206:
+        return None
+      return _content_range_size(response_headers)
+
+  async def async_download_file_to(
+      self,
+      path: str,
+      destination: Union[str, os.PathLike[str], io.IOBase],
+      *,
+      http_options: Optional[HttpOptionsOrDict] = None,
+      max_concurrency: int = 1,
+  ) -> None:
+    """Streams the file data asynchronously to a path or a file object.
+
+    Args:
+      path: The request path with query params.
+      destination: The path to write the file to, or a writable file object
+        opened in binary mode.
+      http_options: The http options to use for the request.
+      max_concurrency: The number of ranges of a large file to download in
+        parallel. Only used if the destination is a path.
+    """
+    if isinstance(destination, io.IOBase):
+      async for chunk in self.async_iter_download(
+          path, http_options=http_options
+      ):
+        destination.write(chunk)
+      return
+
+    destination_path = anyio.Path(destination)
+    try:
+      size = None
+      if max_concurrency > 1:
+        size = await self._async_download_size(path, http_options)
+      async with await destination_path.open('wb') as file:
+        if size is None or size < 2 * DOWNLOAD_RANGE_SIZE:
+          async for chunk in self.async_iter_download(
+              path, http_options=http_options
+          ):
+            await file.write(chunk)
+          return
+        await file.truncate(size)
+
+      semaphore = asyncio.Semaphore(max_concurrency)
+
+      async def download_range(start: int, end: int) -> None:
+        async with semaphore, await destination_path.open('r+b') as range_file:
+          await range_file.seek(start)
+          async for chunk in self.async_iter_download(
+              path, http_options=http_options, start=start, end=end
+          ):
+            await range_file.write(chunk)
+
+      tasks = [
+          asyncio.ensure_future(download_range(start, end))
+          for start, end in _download_ranges(size)
+      ]
+      try:
+        await asyncio.gather(*tasks)
+      except BaseException:
+        for task in tasks:
+          task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    except BaseException:
+      # Do not leave a partial file behind.
+      with contextlib.suppress(OSError):
+        await destination_path.unlink()
+      raise
+
   # This method does nothing in the real api client. It is used in the
   # replay_api_client to verify the response from the SDK method matches the
   # recorded response.
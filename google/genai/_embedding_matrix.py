@@ -0,0 +1,170 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""A compact, contiguous float32 representation of embeddings."""
+
+from __future__ import annotations
+
+import array
+import typing
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+if typing.TYPE_CHECKING:
+  import numpy
+else:
+  try:
+    import numpy
+  except ImportError:
+    numpy = None
+
+_INT8_MAX = 127
+
+
+class EmbeddingMatrix:
+  """Embeddings stored as one contiguous, row-major float32 buffer.
+
+  Each row is one embedding. Rows are returned as zero-copy `memoryview`
+  objects, and `to_numpy` returns a zero-copy `(rows, dimensions)` NumPy array
+  when NumPy is installed. Compared to lists of Python floats, this uses about
+  8 times less memory.
+  """
+
+  def __init__(self, data: array.array[float], dimensions: int):
+    if data.typecode != 'f':
+      raise ValueError(
+          f'EmbeddingMatrix data must be a float32 array, got typecode'
+          f' {data.typecode!r}.'
+      )
+    if dimensions < 0 or (dimensions == 0 and len(data)) or (
+        dimensions and len(data) % dimensions
+    ):
+      raise ValueError(
+          f'Cannot split {len(data)} values into rows of {dimensions}'
+          ' dimensions.'
+      )
+    self._data = data
+    self._dimensions = dimensions
+
+  @classmethod
+  def from_rows(
+      cls, rows: Iterable[Sequence[float]], dimensions: Optional[int] = None
+  ) -> EmbeddingMatrix:
+    """Builds a matrix from rows of floats, or from rows of another matrix."""
+    data = array.array('f')
+    for row in rows:
+      if dimensions is None:
+        dimensions = len(row)
+      elif len(row) != dimensions:
+        raise ValueError(
+            f'All embeddings must have {dimensions} dimensions, got an'
+            f' embedding with {len(row)} dimensions.'
+        )
+      if isinstance(row, memoryview) and row.format == 'f':
+        data.frombytes(row.cast('B'))
+      else:
+        data.extend(row)
+    return cls(data, dimensions or 0)
+
+  @property
+  def shape(self) -> tuple[int, int]:
+    """The number of rows and the number of dimensions."""
+    return len(self), self._dimensions
+
+  @property
+  def data(self) -> array.array[float]:
+    """The underlying float32 buffer."""
+    return self._data
+
+  def __len__(self) -> int:
+    if not self._dimensions:
+      return 0
+    return len(self._data) // self._dimensions
+
+  def __getitem__(self, index: int) -> memoryview:
+    """Returns a zero-copy float32 view of one row."""
+    rows = len(self)
+    if index < 0:
+      index += rows
+    if not 0 <= index < rows:
+      raise IndexError('EmbeddingMatrix row index out of range.')
+    start = index * self._dimensions
+    return memoryview(self._data)[start : start + self._dimensions]
+
+  def __iter__(self) -> Iterator[memoryview]:
+    for index in range(len(self)):
+      yield self[index]
+
+  def __repr__(self) -> str:
+    return f'EmbeddingMatrix(shape={self.shape})'
+
+  def to_numpy(self) -> Any:
+    """Returns a zero-copy `(rows, dimensions)` float32 NumPy array."""
+    if numpy is None:
+      raise ImportError(
+          'NumPy is required to convert embeddings to a NumPy array. Install'
+          ' it with `pip install numpy`.'
+      )
+    return numpy.frombuffer(self._data, dtype=numpy.float32).reshape(
+        self.shape
+    )
+
+  def quantize_int8(self) -> tuple[array.array[int], array.array[float]]:
+    """Quantizes each row to int8 with a symmetric per-row scale.
+
+    Returns:
+      The row-major int8 values and the float32 scale of each row. A value is
+      approximately `int8_value * scale`.
+    """
+    if numpy is not None:
+      matrix = self.to_numpy()
+      scales = numpy.abs(matrix).max(axis=1, initial=0.0) / _INT8_MAX
+      scales[scales == 0] = 1.0
+      quantized = numpy.clip(
+          numpy.rint(matrix / scales[:, None]), -_INT8_MAX, _INT8_MAX
+      ).astype(numpy.int8)
+      values = array.array('b')
+      values.frombytes(quantized.tobytes())
+      return values, array.array('f', scales.astype(numpy.float32).tobytes())
+
+    values = array.array('b')
+    scales_array = array.array('f')
+    for row in self:
+      scale = max((abs(x) for x in row), default=0.0) / _INT8_MAX or 1.0
+      scales_array.append(scale)
+      values.extend(
+          max(-_INT8_MAX, min(_INT8_MAX, round(x / scale))) for x in row
+      )
+    return values, scales_array
+
+  def quantize_binary(self) -> bytes:
+    """Quantizes each row to one bit per dimension.
+
+    A bit is set when the value is positive. The bits of each row are packed
+    most significant bit first into `ceil(dimensions / 8)` bytes, the same
+    layout as `numpy.packbits(matrix > 0, axis=1)`.
+    """
+    if numpy is not None:
+      return bytes(numpy.packbits(self.to_numpy() > 0, axis=1).tobytes())
+
+    packed = bytearray()
+    for row in self:
+      for start in range(0, self._dimensions, 8):
+        byte = 0
+        for offset, value in enumerate(row[start : start + 8]):
+          if value > 0:
+            byte |= 0x80 >> offset
+        packed.append(byte)
+    return bytes(packed)
+
@@ -17,10 +17,16 @@
 
 from __future__ import annotations
 
+import asyncio
+import collections
+import hashlib
 import inspect
 import io
+import json
 import logging
 import sys
+import threading
+import time
 import typing
 from typing import Any, Callable, Dict, Optional, Union, get_args, get_origin
 import mimetypes
@@ -33,6 +39,8 @@ from . import _transformers as t
 from . import errors
 from . import types
 from ._adapters import McpToGenAiToolAdapter
+from ._embedding_matrix import EmbeddingMatrix
+from .embedding_cache import EmbeddingCache
 
 
 if sys.version_info >= (3, 10):
@@ -54,6 +62,11 @@ else:
     McpTool = None
 
 _DEFAULT_MAX_REMOTE_CALLS_AFC = 10
+_DEFAULT_FUNCTION_RESPONSE_CACHE_MAX_ENTRIES = 128
+_DEFAULT_FUNCTION_RESPONSE_CACHE_TTL_SECONDS = 300.0
+_DEFAULT_EMBED_MAX_ITEMS_PER_REQUEST = 100
+_DEFAULT_EMBED_MAX_TOKENS_PER_REQUEST = 20000
+_ESTIMATED_CHARACTERS_PER_TOKEN = 4
 
 logger = logging.getLogger('google_genai.models')
 
@@ -302,9 +315,139 @@ async def invoke_function_from_dict_args_async(
     )
 
 
+class FunctionResponseCache:
+  """A least recently used cache of function responses with a TTL.
+
+  Entries are keyed by the function name and the canonical JSON form of the
+  function call arguments, so identical function calls share an entry.
+  """
+
+  def __init__(
+      self,
+      function_names: Optional[list[str]] = None,
+      max_entries: Optional[int] = None,
+      ttl_seconds: Optional[float] = None,
+  ):
+    self._function_names = (
+        set(function_names) if function_names is not None else None
+    )
+    self._max_entries = (
+        max_entries
+        if max_entries is not None
+        else _DEFAULT_FUNCTION_RESPONSE_CACHE_MAX_ENTRIES
+    )
+    self._ttl_seconds = (
+        ttl_seconds
+        if ttl_seconds is not None
+        else _DEFAULT_FUNCTION_RESPONSE_CACHE_TTL_SECONDS
+    )
+    self._entries: collections.OrderedDict[
+        tuple[str, str], tuple[float, _common.StringDict]
+    ] = collections.OrderedDict()
+    self._lock = threading.Lock()
+
+  def _key(
+      self, func_name: str, args: _common.StringDict
+  ) -> Optional[tuple[str, str]]:
+    if (
+        self._function_names is not None
+        and func_name not in self._function_names
+    ):
+      return None
+    try:
+      canonical_args = json.dumps(args, sort_keys=True, separators=(',', ':'))
+    except (TypeError, ValueError):
+      # Arguments that are not JSON serializable are never cached.
+      return None
+    return func_name, canonical_args
+
+  def get(
+      self, func_name: str, args: _common.StringDict
+  ) -> Optional[_common.StringDict]:
+    """Returns the cached function response, if any."""
+    key = self._key(func_name, args)
+    if key is None:
+      return None
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is None:
+        return None
+      created_at, func_response = entry
+      if time.monotonic() - created_at > self._ttl_seconds:
+        del self._entries[key]
+        return None
+      self._entries.move_to_end(key)
+      return func_response
+
+  def put(
+      self,
+      func_name: str,
+      args: _common.StringDict,
+      func_response: _common.StringDict,
+  ) -> None:
+    """Caches the function response of a successful function call."""
+    key = self._key(func_name, args)
+    if key is None or self._max_entries <= 0:
+      return
+    with self._lock:
+      self._entries[key] = (time.monotonic(), func_response)
+      self._entries.move_to_end(key)
+      while len(self._entries) > self._max_entries:
+        self._entries.popitem(last=False)
+
+
+def get_function_response_cache(
+    config: Optional[types.GenerateContentConfigOrDict],
+    caches: Optional[dict[str, FunctionResponseCache]] = None,
+) -> Optional[FunctionResponseCache]:
+  """Returns the function response cache of the config, if caching is enabled.
+
+  Caching is enabled by the function response cache config, or by tools marked
+  with `types.cacheable_tool`. A new cache is returned for each automatic
+  function calling loop, unless `caches` is given. A chat keeps its `caches`,
+  keyed by the cache configuration, so that its turns share their cache.
+  """
+  if not config:
+    return None
+  config_model = _create_generate_content_config_model(config)
+  cacheable_tools = sorted(
+      tool.__name__
+      for tool in config_model.tools or []
+      if callable(tool) and types._is_cacheable_tool(tool)
+  )
+  afc_config = config_model.automatic_function_calling
+  cache_config = afc_config.function_response_cache if afc_config else None
+  if cache_config is None:
+    if not cacheable_tools:
+      return None
+    cache_config = types.FunctionResponseCacheConfig(
+        function_names=cacheable_tools
+    )
+  elif cache_config.function_names is not None:
+    cache_config = cache_config.model_copy(
+        update={
+            'function_names': sorted(
+                {*cache_config.function_names, *cacheable_tools}
+            )
+        }
+    )
+  key = cache_config.model_dump_json(exclude_none=True)
+  cache = caches.get(key) if caches is not None else None
+  if cache is None:
+    cache = FunctionResponseCache(
+        function_names=cache_config.function_names,
+        max_entries=cache_config.max_entries,
+        ttl_seconds=cache_config.ttl_seconds,
+    )
+    if caches is not None:
+      cache = caches.setdefault(key, cache)
+  return cache
+
+
 def get_function_response_parts(
     response: types.GenerateContentResponse,
     function_map: dict[str, Union[Callable[..., Any], McpToGenAiToolAdapter]],
+    function_response_cache: Optional[FunctionResponseCache] = None,
 ) -> list[types.Part]:
   """Returns the function response parts from the response."""
   func_response_parts = []
@@ -323,11 +466,20 @@ def get_function_response_parts(
             part.function_call.args
         )
         func_response: _common.StringDict
+        cached_func_response = (
+            function_response_cache.get(func_name, args)
+            if function_response_cache is not None
+            else None
+        )
         try:
-          if not isinstance(func, McpToGenAiToolAdapter):
+          if cached_func_response is not None:
+            func_response = cached_func_response
+          elif not isinstance(func, McpToGenAiToolAdapter):
             func_response = {
                 'result': invoke_function_from_dict_args(args, func)
             }
+            if function_response_cache is not None:
+              function_response_cache.put(func_name, args, func_response)
         except Exception as e:  # pylint: disable=broad-except
           func_response = {'error': str(e)}
         func_response_part = types.Part.from_function_response(
@@ -337,9 +489,60 @@ def get_function_response_parts(
   return func_response_parts
 
 
+async def _get_function_response_part_async(
+    func_name: str,
+    func_args: _common.StringDict,
+    function_map: dict[str, Union[Callable[..., Any], McpToGenAiToolAdapter]],
+    function_response_cache: Optional[FunctionResponseCache] = None,
+    run_sync_function_in_thread: bool = False,
+) -> types.Part:
+  """Invokes a single function call and returns its function response part."""
+  func = function_map[func_name]
+  args = convert_number_values_for_dict_function_call_args(func_args)
+  func_response: _common.StringDict
+  cached_func_response = (
+      function_response_cache.get(func_name, args)
+      if function_response_cache is not None
+      else None
+  )
+  if cached_func_response is not None:
+    return types.Part.from_function_response(
+        name=func_name, response=cached_func_response
+    )
+  try:
+    if isinstance(func, McpToGenAiToolAdapter):
+      mcp_tool_response = await func.call_tool(
+          types.FunctionCall(name=func_name, args=args)
+      )
+      if mcp_tool_response.isError:
+        func_response = {'error': mcp_tool_response}
+      else:
+        func_response = {'result': mcp_tool_response}
+    elif inspect.iscoroutinefunction(func):
+      func_response = {
+          'result': await invoke_function_from_dict_args_async(args, func)
+      }
+    elif run_sync_function_in_thread:
+      func_response = {
+          'result': await asyncio.to_thread(
+              invoke_function_from_dict_args, args, func
+          )
+      }
+    else:
+      func_response = {'result': invoke_function_from_dict_args(args, func)}
+    if function_response_cache is not None and 'result' in func_response:
+      function_response_cache.put(func_name, args, func_response)
+  except Exception as e:  # pylint: disable=broad-except
+    func_response = {'error': str(e)}
+  return types.Part.from_function_response(
+      name=func_name, response=func_response
+  )
+
+
 async def get_function_response_parts_async(
     response: types.GenerateContentResponse,
     function_map: dict[str, Union[Callable[..., Any], McpToGenAiToolAdapter]],
+    function_response_cache: Optional[FunctionResponseCache] = None,
 ) -> list[types.Part]:
   """Returns the function response parts from the response."""
   func_response_parts = []
@@ -353,37 +556,54 @@ async def get_function_response_parts_async(
         continue
       func_name = part.function_call.name
       if func_name is not None and part.function_call.args is not None:
-        func = function_map[func_name]
-        args = convert_number_values_for_dict_function_call_args(
-            part.function_call.args
-        )
-        func_response: _common.StringDict
-        try:
-          if isinstance(func, McpToGenAiToolAdapter):
-            mcp_tool_response = await func.call_tool(
-                types.FunctionCall(name=func_name, args=args)
+        func_response_parts.append(
+            await _get_function_response_part_async(
+                func_name,
+                part.function_call.args,
+                function_map,
+                function_response_cache=function_response_cache,
             )
-            if mcp_tool_response.isError:
-              func_response = {'error': mcp_tool_response}
-            else:
-              func_response = {'result': mcp_tool_response}
-          elif inspect.iscoroutinefunction(func):
-            func_response = {
-                'result': await invoke_function_from_dict_args_async(args, func)
-            }
-          else:
-            func_response = {
-                'result': invoke_function_from_dict_args(args, func)
-            }
-        except Exception as e:  # pylint: disable=broad-except
-          func_response = {'error': str(e)}
-        func_response_part = types.Part.from_function_response(
-            name=func_name, response=func_response
         )
-        func_response_parts.append(func_response_part)
   return func_response_parts
 
 
+def start_function_response_tasks(
+    chunk: types.GenerateContentResponse,
+    function_map: dict[str, Union[Callable[..., Any], McpToGenAiToolAdapter]],
+    function_response_cache: Optional[FunctionResponseCache] = None,
+) -> list[asyncio.Task[types.Part]]:
+  """Starts background tasks for the complete function calls in the chunk.
+
+  Used by eager execution in automatic function calling, so that function
+  calls run while the rest of the response stream is consumed. Synchronous
+  functions are run in a worker thread so they do not block the event loop.
+  """
+  tasks: list[asyncio.Task[types.Part]] = []
+  if (
+      chunk.candidates is not None
+      and isinstance(chunk.candidates[0].content, types.Content)
+      and chunk.candidates[0].content.parts is not None
+  ):
+    for part in chunk.candidates[0].content.parts:
+      if not part.function_call:
+        continue
+      func_name = part.function_call.name
+      if func_name is None or part.function_call.args is None:
+        continue
+      tasks.append(
+          asyncio.create_task(
+              _get_function_response_part_async(
+                  func_name,
+                  part.function_call.args,
+                  function_map,
+                  function_response_cache=function_response_cache,
+                  run_sync_function_in_thread=True,
+              )
+          )
+      )
+  return tasks
+
+
 def should_disable_afc(
     config: Optional[types.GenerateContentConfigOrDict] = None,
 ) -> bool:
@@ -439,6 +659,28 @@ def should_disable_afc(
   return config_model.automatic_function_calling.disable
 
 
+def should_eagerly_execute_afc(
+    config: Optional[types.GenerateContentConfigOrDict] = None,
+) -> bool:
+  """Returns whether function calls should start while the stream is read."""
+  if not config:
+    return False
+  config_model = _create_generate_content_config_model(config)
+  if not config_model.automatic_function_calling:
+    return False
+  return bool(config_model.automatic_function_calling.eager_execution)
+
+
+def should_use_response_cache(
+    config: Optional[types.GenerateContentConfigOrDict] = None,
+) -> bool:
+  """Returns whether the request can be served from the client response cache."""
+  if not config:
+    return True
+  config_model = _create_generate_content_config_model(config)
+  return not config_model.bypass_response_cache
+
+
 def get_max_remote_calls_afc(
     config: Optional[types.GenerateContentConfigOrDict] = None,
 ) -> int:
@@ -512,8 +754,11 @@ async def parse_config_for_mcp_sessions(
     parsed_config_copy.tools = []
     for tool in parsed_config.tools:
       if McpClientSession is not None and isinstance(tool, McpClientSession):
+        list_tools_result, genai_tools = (
+            await _mcp_utils.list_mcp_session_tools(tool)
+        )
         mcp_to_genai_tool_adapter = McpToGenAiToolAdapter(
-            tool, await tool.list_tools()
+            tool, list_tools_result, genai_tools
         )
         # Extend the config with the MCP session tools converted to GenAI tools.
         parsed_config_copy.tools.extend(mcp_to_genai_tool_adapter.tools)
@@ -535,25 +780,418 @@ async def parse_config_for_mcp_sessions(
   return parsed_config_copy, mcp_to_genai_tool_adapters
 
 
-def append_chunk_contents(
-    contents: Union[types.ContentListUnion, types.ContentListUnionDict],
-    chunk: types.GenerateContentResponse,
-) -> None:
-  """Appends the contents of the chunk to the contents list."""
-  if chunk is not None and chunk.candidates is not None:
-    chunk_content = chunk.candidates[0].content
-    contents = t.t_contents(contents)  # type: ignore[assignment]
-    if isinstance(contents, list) and chunk_content is not None:
-      contents.append(chunk_content)  # type: ignore[arg-type]
+class AfcConversationBuilder:
+  """Builds the request contents and history for automatic function calling.
+
+  The user contents are normalized with `t_contents` once, when the first
+  function call turn is appended. Later turns are appended as `types.Content`
+  objects without normalizing the whole conversation again. The same list
+  serves as the request contents and the automatic function calling history.
+  """
+
+  def __init__(
+      self,
+      contents: Union[types.ContentListUnion, types.ContentListUnionDict],
+  ):
+    self._user_contents = contents
+    self._contents: Optional[list[types.Content]] = None
+
+  @property
+  def contents(
+      self,
+  ) -> Union[types.ContentListUnion, types.ContentListUnionDict]:
+    """Returns the contents for the next request."""
+    if self._contents is None:
+      return self._user_contents
+    return self._contents  # type: ignore[return-value]
+
+  @property
+  def history(self) -> list[types.Content]:
+    """Returns the automatic function calling history.
+
+    The history is empty until a function call turn is appended.
+    """
+    if self._contents is None:
+      return []
+    return self._contents
+
+  def append_function_call_turn(
+      self,
+      func_call_content: Optional[types.Content],
+      func_response_content: types.Content,
+  ) -> None:
+    """Appends a function call and its function responses."""
+    if self._contents is None:
+      self._contents = t.t_contents(self._user_contents)
+    if func_call_content is not None:
+      self._contents.append(func_call_content)
+    self._contents.append(func_response_content)
+
+
+def get_embed_content_batching_config(
+    config: Optional[types.EmbedContentConfigOrDict] = None,
+) -> Optional[types.EmbedContentBatchingConfig]:
+  """Returns the auto batching config of an embed_content config, if any."""
+  if not config:
+    return None
+  if isinstance(config, dict):
+    config = types.EmbedContentConfig.model_validate(config)
+  return config.auto_batching
+
+
+def _count_embeddings(vertexai: bool, content: types.Content) -> int:
+  # The Vertex AI API returns one embedding per text part.
+  if vertexai:
+    return sum(1 for part in content.parts or [] if part.text)
+  return 1
+
+
+def _estimate_embed_tokens(content: types.Content) -> int:
+  characters = sum(len(part.text) for part in content.parts or [] if part.text)
+  return max(1, -(-characters // _ESTIMATED_CHARACTERS_PER_TOKEN))
+
+
+class EmbedContentBatchPlan:
+  """Splits the contents of an embed_content call into sub-requests.
+
+  Exact duplicate contents are embedded once. The unique contents are packed,
+  in input order, into sub-requests that respect the item and estimated token
+  limits of the batching config. `merge` maps the embeddings of the
+  sub-responses back to the input contents.
+  """
+
+  def __init__(
+      self,
+      vertexai: bool,
+      contents: list[Any],
+      batching_config: types.EmbedContentBatchingConfig,
+  ):
+    max_items = (
+        batching_config.max_items_per_request
+        or _DEFAULT_EMBED_MAX_ITEMS_PER_REQUEST
+    )
+    max_tokens = (
+        batching_config.max_tokens_per_request
+        or _DEFAULT_EMBED_MAX_TOKENS_PER_REQUEST
+    )
+    self.max_concurrency = batching_config.max_concurrency
+
+    unique_indexes: dict[Any, int] = {}
+    self._unique_contents: list[Any] = []
+    # The number of embeddings returned for each unique content.
+    self._embedding_counts: list[int] = []
+    self._input_to_unique: list[int] = []
+    self.batches: list[list[int]] = []
+    batch_tokens = 0
+    for item in contents:
+      if isinstance(item, str):
+        key: Any = item
+        content = None
+      else:
+        content = t.t_content(item)
+        key = ('content', content.model_dump_json(exclude_none=True))
+      unique_index = unique_indexes.get(key)
+      if unique_index is None:
+        if content is None:
+          content = types.Content(parts=[types.Part(text=item)])
+        unique_index = len(self._unique_contents)
+        unique_indexes[key] = unique_index
+        self._unique_contents.append(item)
+        self._embedding_counts.append(_count_embeddings(vertexai, content))
+        tokens = _estimate_embed_tokens(content)
+        if (
+            not self.batches
+            or len(self.batches[-1]) >= max_items
+            or batch_tokens + tokens > max_tokens
+        ):
+          self.batches.append([])
+          batch_tokens = 0
+        self.batches[-1].append(unique_index)
+        batch_tokens += tokens
+      self._input_to_unique.append(unique_index)
+
+  def requests(
+      self, model: str, config: types.EmbedContentConfigOrDict
+  ) -> list[_common.StringDict]:
+    """Returns the keyword arguments of the sub-requests."""
+    if isinstance(config, dict):
+      config = types.EmbedContentConfig.model_validate(config)
+    sub_request_config = config.model_copy(update={'auto_batching': None})
+    return [
+        {
+            'model': model,
+            'contents': [self._unique_contents[i] for i in batch],
+            'config': sub_request_config,
+        }
+        for batch in self.batches
+    ]
+
+  def merge(
+      self, responses: list[types.EmbedContentResponse]
+  ) -> types.EmbedContentResponse:
+    """Merges the sub-responses, in sub-request order, into one response."""
+    unique_embeddings: list[list[types.ContentEmbedding]] = [
+        [] for _ in self._unique_contents
+    ]
+    # The response index and first matrix row of each unique content.
+    unique_rows: list[tuple[int, int]] = [(0, 0) for _ in self._unique_contents]
+    billable_character_count: Optional[int] = None
+    for response_index, (batch, response) in enumerate(
+        zip(self.batches, responses)
+    ):
+      embeddings = response.embeddings or []
+      expected = sum(self._embedding_counts[i] for i in batch)
+      if len(embeddings) != expected:
+        raise ValueError(
+            f'Expected {expected} embeddings in the embed_content response,'
+            f' got {len(embeddings)}.'
+        )
+      offset = 0
+      for i in batch:
+        count = self._embedding_counts[i]
+        unique_embeddings[i] = embeddings[offset : offset + count]
+        unique_rows[i] = (response_index, offset)
+        offset += count
+      if response.metadata and response.metadata.billable_character_count:
+        billable_character_count = (
+            billable_character_count or 0
+        ) + response.metadata.billable_character_count
+
+    merged_embeddings: list[types.ContentEmbedding] = []
+    for unique_index in self._input_to_unique:
+      merged_embeddings.extend(unique_embeddings[unique_index])
+
+    embedding_matrix = None
+    matrices = [response._embedding_matrix for response in responses]
+    if matrices and all(matrix is not None for matrix in matrices):
+      rows = []
+      for unique_index in self._input_to_unique:
+        response_index, first_row = unique_rows[unique_index]
+        matrix = matrices[response_index]
+        for row in range(self._embedding_counts[unique_index]):
+          rows.append(matrix[first_row + row])  # type: ignore[index]
+      embedding_matrix = EmbeddingMatrix.from_rows(rows)
+
+    merged_response = types.EmbedContentResponse(
+        sdk_http_response=responses[0].sdk_http_response if responses else None,
+        embeddings=merged_embeddings,
+        metadata=(
+            types.EmbedContentMetadata(
+                billable_character_count=billable_character_count
+            )
+            if billable_character_count is not None
+            else None
+        ),
+    )
+    merged_response._embedding_matrix = embedding_matrix
+    return merged_response
+
+
+def compact_embed_content_response(
+    config: Optional[types.EmbedContentConfigOrDict],
+    response: types.EmbedContentResponse,
+) -> types.EmbedContentResponse:
+  """Moves the embedding values of a response into an EmbeddingMatrix.
+
+  Applies `EmbedContentConfig.compact_embeddings`. The float lists are still
+  built while the response is parsed, but they are released as soon as their
+  values are copied into the float32 buffer.
+  """
+  if not config:
+    return response
+  if isinstance(config, dict):
+    compact = config.get('compact_embeddings')
+  else:
+    compact = config.compact_embeddings
+  if not compact or response._embedding_matrix is not None:
+    return response
+  embeddings = response.embeddings or []
+  response._embedding_matrix = EmbeddingMatrix.from_rows(
+      embedding.values or [] for embedding in embeddings
+  )
+  for embedding in embeddings:
+    embedding.values = None
+  return response
+
+
+def get_embedding_cache(
+    config: Optional[types.EmbedContentConfigOrDict] = None,
+) -> Optional[EmbeddingCache]:
+  """Returns the embedding cache of an embed_content config, if any."""
+  if not config:
+    return None
+  if isinstance(config, dict):
+    return config.get('embedding_cache')
+  return config.embedding_cache
+
+
+class EmbeddingCacheLookup:
+  """Serves the contents of an embed_content call from an embedding cache.
+
+  Each content is keyed by a SHA-256 hash of the API backend, the model, the
+  config fields that change the embeddings and the content itself. `load`
+  reads the cache, `miss_contents` are the unique contents to send to the API,
+  and `merge` stores their embeddings and returns the response for all
+  contents in input order.
+  """
+
+  # Config fields that do not change the embeddings.
+  _CONFIG_FIELDS_EXCLUDED_FROM_KEY = {
+      'http_options',
+      'auto_batching',
+      'compact_embeddings',
+      'embedding_cache',
+  }
+
+  def __init__(
+      self,
+      vertexai: bool,
+      model: str,
+      contents: Union[types.ContentListUnion, types.ContentListUnionDict],
+      config: types.EmbedContentConfigOrDict,
+      embedding_cache: EmbeddingCache,
+  ):
+    if isinstance(config, dict):
+      config = types.EmbedContentConfig.model_validate(config)
+    self._vertexai = vertexai
+    self._config = config
+    self._embedding_cache = embedding_cache
+    key_prefix = json.dumps(
+        [
+            'vertexai' if vertexai else 'mldev',
+            model,
+            config.model_dump(
+                mode='json',
+                exclude_none=True,
+                exclude=self._CONFIG_FIELDS_EXCLUDED_FROM_KEY,
+            ),
+        ],
+        sort_keys=True,
+        separators=(',', ':'),
+    )
+
+    self._keys: list[str] = []
+    self._contents_by_key: dict[str, Any] = {}
+    self._embedding_counts: dict[str, int] = {}
+    for item in contents if isinstance(contents, list) else [contents]:
+      if isinstance(item, str):
+        content = types.Content(parts=[types.Part(text=item)])
+        canonical_content = json.dumps(item)
+      else:
+        content = t.t_content(item)
+        canonical_content = content.model_dump_json(exclude_none=True)
+      key = hashlib.sha256(
+          f'{key_prefix}\n{canonical_content}'.encode('utf-8')
+      ).hexdigest()
+      self._keys.append(key)
+      if key not in self._contents_by_key:
+        self._contents_by_key[key] = item
+        self._embedding_counts[key] = _count_embeddings(vertexai, content)
+    self._hits: dict[str, EmbeddingMatrix] = {}
+
+  def load(self) -> None:
+    """Reads the embeddings of all contents from the cache."""
+    self._hits = {
+        key: matrix
+        for key, matrix in self._embedding_cache.get_many(
+            list(self._contents_by_key)
+        ).items()
+        if len(matrix) == self._embedding_counts[key]
+    }
+
+  @property
+  def miss_contents(self) -> list[Any]:
+    """The unique contents that are not in the cache."""
+    return [
+        content
+        for key, content in self._contents_by_key.items()
+        if key not in self._hits
+    ]
+
+  def merge(
+      self, miss_response: Optional[types.EmbedContentResponse]
+  ) -> types.EmbedContentResponse:
+    """Caches the embeddings of the misses and returns the full response."""
+    matrices = dict(self._hits)
+    embeddings_by_key = {
+        key: [
+            types.ContentEmbedding(
+                values=None if self._config.compact_embeddings else row.tolist()
+            )
+            for row in matrix
+        ]
+        for key, matrix in self._hits.items()
+    }
+    if miss_response is not None:
+      miss_keys = [key for key in self._contents_by_key if key not in self._hits]
+      miss_embeddings = miss_response.embeddings or []
+      miss_matrix = miss_response.embedding_matrix
+      expected = sum(self._embedding_counts[key] for key in miss_keys)
+      if (
+          miss_matrix is None
+          or len(miss_matrix) != expected
+          or len(miss_embeddings) != expected
+      ):
+        raise ValueError(
+            f'Expected {expected} embeddings in the embed_content response,'
+            f' got {len(miss_embeddings)}.'
+        )
+      new_entries = {}
+      offset = 0
+      for key in miss_keys:
+        count = self._embedding_counts[key]
+        new_entries[key] = EmbeddingMatrix.from_rows(
+            miss_matrix[row] for row in range(offset, offset + count)
+        )
+        embeddings_by_key[key] = miss_embeddings[offset : offset + count]
+        offset += count
+      self._embedding_cache.put_many(new_entries)
+      matrices.update(new_entries)
+
+    response = types.EmbedContentResponse(
+        sdk_http_response=(
+            miss_response.sdk_http_response if miss_response else None
+        ),
+        embeddings=[
+            embedding for key in self._keys for embedding in embeddings_by_key[key]
+        ],
+        metadata=miss_response.metadata if miss_response else None,
+    )
+    if self._config.compact_embeddings:
+      response._embedding_matrix = EmbeddingMatrix.from_rows(
+          row for key in self._keys for row in matrices[key]
+      )
+    return response
+
+
+def _resumable_upload_headers(
+    size_bytes: Optional[int], mime_type: str
+) -> dict[str, str]:
+  """Returns the headers of the request that starts a resumable upload."""
+  headers = {
+      'Content-Type': 'application/json',
+      'X-Goog-Upload-Protocol': 'resumable',
+      'X-Goog-Upload-Command': 'start',
+  }
+  if size_bytes is not None:
+    headers['X-Goog-Upload-Header-Content-Length'] = f'{size_bytes}'
+  headers['X-Goog-Upload-Header-Content-Type'] = f'{mime_type}'
+  return headers
 
 
 def prepare_resumable_upload(
-    file: Union[str, os.PathLike[str], io.IOBase],
+    file: Union[
+        str,
+        os.PathLike[str],
+        io.IOBase,
+        typing.Iterable[bytes],
+        typing.AsyncIterable[bytes],
+    ],
     user_http_options: Optional[types.HttpOptionsOrDict] = None,
     user_mime_type: Optional[str] = None,
 ) -> tuple[
     types.HttpOptions,
-    int,
+    Optional[int],
     str,
 ]:
   """Prepares the HTTP options, file bytes size and mime type for a resumable upload.
@@ -561,6 +1199,9 @@ def prepare_resumable_upload(
   This function inspects a file (from a path or an in-memory object) to
   determine its size and MIME type. It then constructs the necessary HTTP
   headers and options required to initiate a resumable upload session.
+
+  The size of byte iterators is not known up front, it is declared by the
+  request that finalizes the upload, so the returned size is None.
   """
   size_bytes = None
   mime_type = user_mime_type
@@ -577,6 +1218,16 @@ def prepare_resumable_upload(
     file.seek(0, os.SEEK_END)
     size_bytes = file.tell() - offset
     file.seek(offset, os.SEEK_SET)
+  elif not isinstance(file, (str, os.PathLike)):
+    if isinstance(file, (bytes, bytearray, memoryview)):
+      raise ValueError(
+          'Byte strings are not supported, wrap them in `io.BytesIO`.'
+      )
+    if mime_type is None:
+      raise ValueError(
+          'Unknown mime type: Could not determine the mimetype for your'
+          ' file\n please set the `mime_type` argument'
+      )
   else:
     fs_path = os.fspath(file)
     if not fs_path or not os.path.isfile(fs_path):
@@ -595,22 +1246,10 @@ def prepare_resumable_upload(
       user_http_options = types.HttpOptions(**user_http_options)
     http_options = user_http_options
     http_options.api_version = ''
-    http_options.headers = {
-        'Content-Type': 'application/json',
-        'X-Goog-Upload-Protocol': 'resumable',
-        'X-Goog-Upload-Command': 'start',
-        'X-Goog-Upload-Header-Content-Length': f'{size_bytes}',
-        'X-Goog-Upload-Header-Content-Type': f'{mime_type}',
-    }
+    http_options.headers = _resumable_upload_headers(size_bytes, mime_type)
   else:
     http_options = types.HttpOptions(
         api_version='',
-        headers={
-            'Content-Type': 'application/json',
-            'X-Goog-Upload-Protocol': 'resumable',
-            'X-Goog-Upload-Command': 'start',
-            'X-Goog-Upload-Header-Content-Length': f'{size_bytes}',
-            'X-Goog-Upload-Header-Content-Type': f'{mime_type}',
-        },
+        headers=_resumable_upload_headers(size_bytes, mime_type),
     )
   return http_options, size_bytes, mime_type
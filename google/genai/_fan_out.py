@@ -0,0 +1,234 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Utilities to fan out many requests with bounded concurrency."""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import dataclasses
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+from . import _common
+
+T = TypeVar('T')
+
+_DEFAULT_MAX_CONCURRENCY = 10
+
+FanOutRequests = Union[
+    Iterable[_common.StringDict], AsyncIterable[_common.StringDict]
+]
+
+
+@dataclasses.dataclass
+class FanOutResult(Generic[T]):
+  """The result of one request of a fan-out call.
+
+  Exactly one of `response` and `error` is set.
+  """
+
+  index: int
+  """The position of the request in the input requests."""
+
+  request: _common.StringDict
+  """The keyword arguments of the request."""
+
+  response: Optional[T] = None
+  """The response of the request, if it succeeded."""
+
+  error: Optional[Exception] = None
+  """The error raised by the request, if it failed."""
+
+
+def validate_max_concurrency(
+    max_concurrency: Optional[int], argument_name: str = 'max_concurrency'
+) -> int:
+  """Returns the max concurrency, or the default if it is not set."""
+  if max_concurrency is None:
+    return _DEFAULT_MAX_CONCURRENCY
+  if max_concurrency <= 0:
+    raise ValueError(
+        f'{argument_name} must be a positive integer, got {max_concurrency}.'
+    )
+  return max_concurrency
+
+
+def _run_request(
+    request_func: Callable[..., T],
+    index: int,
+    request: _common.StringDict,
+) -> FanOutResult[T]:
+  try:
+    return FanOutResult(
+        index=index, request=request, response=request_func(**request)
+    )
+  except Exception as e:  # pylint: disable=broad-except
+    return FanOutResult(index=index, request=request, error=e)
+
+
+def fan_out(
+    request_func: Callable[..., T],
+    requests: Iterable[_common.StringDict],
+    max_workers: int,
+    ordered: bool,
+) -> Iterator[FanOutResult[T]]:
+  """Runs the requests on a thread pool and yields their results.
+
+  This is the synchronous counterpart of `fan_out_async`: requests are pulled
+  lazily, at most `max_workers` run at a time, and errors are captured in the
+  results. The thread pool is shut down when the iterator is exhausted or
+  closed, or when the caller is interrupted (for example by KeyboardInterrupt);
+  requests that have not started are then cancelled.
+  """
+  requests_iterator = iter(requests)
+  executor = concurrent.futures.ThreadPoolExecutor(
+      max_workers=max_workers, thread_name_prefix='google_genai_fan_out'
+  )
+  pending: set[concurrent.futures.Future[FanOutResult[T]]] = set()
+  completed: dict[int, FanOutResult[T]] = {}
+  next_index = 0
+  next_index_to_yield = 0
+  exhausted = False
+  try:
+    while True:
+      while (
+          not exhausted
+          and len(pending) < max_workers
+          and (not ordered or next_index - next_index_to_yield < 2 * max_workers)
+      ):
+        try:
+          request = next(requests_iterator)
+        except StopIteration:
+          exhausted = True
+          break
+        pending.add(
+            executor.submit(_run_request, request_func, next_index, request)
+        )
+        next_index += 1
+      if not pending:
+        break
+      done, pending = concurrent.futures.wait(
+          pending, return_when=concurrent.futures.FIRST_COMPLETED
+      )
+      for future in done:
+        result = future.result()
+        if ordered:
+          completed[result.index] = result
+        else:
+          yield result
+      while next_index_to_yield in completed:
+        yield completed.pop(next_index_to_yield)
+        next_index_to_yield += 1
+  finally:
+    for future in pending:
+      future.cancel()
+    executor.shutdown(wait=False)
+
+
+async def _run_request_async(
+    request_func: Callable[..., Awaitable[T]],
+    index: int,
+    request: _common.StringDict,
+) -> FanOutResult[T]:
+  try:
+    return FanOutResult(
+        index=index, request=request, response=await request_func(**request)
+    )
+  except Exception as e:  # pylint: disable=broad-except
+    return FanOutResult(index=index, request=request, error=e)
+
+
+async def fan_out_async(
+    request_func: Callable[..., Awaitable[T]],
+    requests: FanOutRequests,
+    max_concurrency: int,
+    ordered: bool,
+) -> AsyncIterator[FanOutResult[T]]:
+  """Runs the requests concurrently and yields their results.
+
+  Requests are pulled from `requests` only when a slot frees up, so large or
+  unbounded inputs are never materialized. At most `max_concurrency` requests
+  run at a time. When `ordered` is true, results are yielded in input order and
+  at most `2 * max_concurrency` requests are started ahead of the next result
+  to yield; otherwise results are yielded as they complete.
+
+  Errors raised by a request are captured in its result instead of being
+  raised. Pending requests are cancelled when the iterator is closed.
+  """
+  if isinstance(requests, AsyncIterable):
+    async_requests = requests.__aiter__()
+    requests_iterator = None
+  else:
+    async_requests = None
+    requests_iterator = iter(requests)
+
+  pending: set[asyncio.Task[FanOutResult[T]]] = set()
+  completed: dict[int, FanOutResult[T]] = {}
+  next_index = 0
+  next_index_to_yield = 0
+  exhausted = False
+  try:
+    while True:
+      while (
+          not exhausted
+          and len(pending) < max_concurrency
+          and (
+              not ordered
+              or next_index - next_index_to_yield < 2 * max_concurrency
+          )
+      ):
+        try:
+          if async_requests is not None:
+            request = await async_requests.__anext__()
+          else:
+            request = next(requests_iterator)  # type: ignore[arg-type]
+        except (StopIteration, StopAsyncIteration):
+          exhausted = True
+          break
+        pending.add(
+            asyncio.create_task(
+                _run_request_async(request_func, next_index, request)
+            )
+        )
+        next_index += 1
+      if not pending:
+        break
+      done, pending = await asyncio.wait(
+          pending, return_when=asyncio.FIRST_COMPLETED
+      )
+      for task in done:
+        result = task.result()
+        if ordered:
+          completed[result.index] = result
+        else:
+          yield result
+      while next_index_to_yield in completed:
+        yield completed.pop(next_index_to_yield)
+        next_index_to_yield += 1
+  finally:
+    for task in pending:
+      task.cancel()
@@ -18,9 +18,10 @@ from __future__ import annotations
 import dataclasses
 import functools
 import hashlib
+import json
 import os
 import tempfile
-from typing import Optional, cast
+from typing import Any, Optional, cast
 import uuid
 
 import requests  # type: ignore
@@ -58,6 +59,12 @@ _GEMINI_STABLE_MODELS_TO_TOKENIZER_NAMES = {
 }
 
 
+# Overrides the directory tokenizer models are cached in. Point it at a
+# persistent or pre-seeded directory to avoid downloads on ephemeral machines.
+_CACHE_DIR_ENV_VAR = "GOOGLE_GENAI_TOKENIZER_CACHE_DIR"
+_HASH_MARKER_SUFFIX = ".sha256"
+
+
 @dataclasses.dataclass(frozen=True)
 class _TokenizerConfig:
   model_url: str
@@ -106,15 +113,99 @@ def _maybe_remove_file(file_path: str) -> None:
     pass
 
 
+def _get_cache_dir(cache_dir: Optional[str] = None) -> str:
+  """Returns the directory tokenizer models are cached in."""
+  if cache_dir:
+    return os.path.expanduser(cache_dir)
+  env_cache_dir = os.environ.get(_CACHE_DIR_ENV_VAR)
+  if env_cache_dir:
+    return os.path.expanduser(env_cache_dir)
+  return os.path.join(tempfile.gettempdir(), "vertexai_tokenizer_model")
+
+
+def _can_trust_hash_markers(model_dir: str, cache_dir: Optional[str]) -> bool:
+  """Returns true if other users cannot replace the files in the cache.
+
+  Hash markers are trusted in a configured cache directory, and in the default
+  directory in the shared system temporary directory only when it is owned by
+  the current user and not writable by group or others. Platforms without
+  POSIX file ownership always verify files in the default directory.
+  """
+  if cache_dir or os.environ.get(_CACHE_DIR_ENV_VAR):
+    return True
+  getuid = getattr(os, "getuid", None)
+  if getuid is None:
+    return False
+  try:
+    stat = os.stat(model_dir)
+  except OSError:
+    return False
+  return stat.st_uid == getuid() and not stat.st_mode & 0o022
+
+
+def _file_signature(file_path: str) -> Optional[dict[str, int]]:
+  """Returns the size and modification time of the file, if it exists."""
+  try:
+    stat = os.stat(file_path)
+  except OSError:
+    return None
+  return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _has_valid_hash_marker(*, file_path: str, expected_hash: str) -> bool:
+  """Returns true if the file was verified and has not changed since."""
+  signature = _file_signature(file_path)
+  if signature is None:
+    return False
+  try:
+    with open(file_path + _HASH_MARKER_SUFFIX, "r") as f:
+      marker: Any = json.load(f)
+  except (OSError, ValueError, UnicodeDecodeError):
+    return False
+  return bool(marker == dict(signature, sha256=expected_hash))
+
+
+def _maybe_write_hash_marker(*, file_path: str, expected_hash: str) -> None:
+  """Records that the file matches the expected hash.
+
+  The marker stores the file size and modification time, so later loads can
+  skip hashing the file as long as it is unchanged.
+  """
+  signature = _file_signature(file_path)
+  if signature is None:
+    return
+  marker_path = file_path + _HASH_MARKER_SUFFIX
+  tmp_path = marker_path + "." + str(uuid.uuid4()) + ".tmp"
+  try:
+    with open(tmp_path, "w") as f:
+      json.dump(dict(signature, sha256=expected_hash), f)
+    os.replace(tmp_path, marker_path)
+  except OSError:
+    # Don't raise if we cannot write file, e.g. in a read-only cache.
+    _maybe_remove_file(tmp_path)
+
+
 def _maybe_load_from_cache(
-    *, file_path: str, expected_hash: str
+    *, file_path: str, expected_hash: str, use_hash_marker: bool = False
 ) -> Optional[bytes]:
-  """Loads the content from the cache path."""
+  """Loads the content from the cache path.
+
+  With `use_hash_marker`, the hash of an unchanged file that was already
+  verified is not computed again.
+  """
   if not os.path.exists(file_path):
     return None
   with open(file_path, "rb") as f:
     content = f.read()
+  if use_hash_marker and _has_valid_hash_marker(
+      file_path=file_path, expected_hash=expected_hash
+  ):
+    return content
   if _is_valid_model(model_data=content, expected_hash=expected_hash):
+    if use_hash_marker:
+      _maybe_write_hash_marker(
+          file_path=file_path, expected_hash=expected_hash
+      )
     return content
 
   # Cached file corrupted.
@@ -149,11 +240,15 @@ def _load_from_url(*, file_url: str, expected_hash: str) -> bytes:
   return content
 
 
-def _load(*, file_url: str, expected_hash: str) -> bytes:
+def _load(
+    *, file_url: str, expected_hash: str, cache_dir: Optional[str] = None
+) -> bytes:
   """Loads model bytes from the given file url.
 
   1. If the find local cached file for the given url and the cached file hash
-     matches the expected hash, the cached file is returned.
+     matches the expected hash, the cached file is returned. A hash marker
+     written next to the cached file skips hashing it again while the file is
+     unchanged, unless other users can write to the cache directory.
   2. If local cached file is not found or the hash does not match, the file is
      downloaded from the given url. And write to local cache and return the
      file bytes.
@@ -163,27 +258,38 @@ def _load(*, file_url: str, expected_hash: str) -> bytes:
   Args:
       file_url: The url of the file to load.
       expected_hash: The expected hash of the file.
+      cache_dir: The directory to cache the file in. Defaults to the
+        `GOOGLE_GENAI_TOKENIZER_CACHE_DIR` environment variable, or a directory
+        in the system temporary directory.
 
   Returns:
       The file bytes.
   """
-  model_dir = os.path.join(tempfile.gettempdir(), "vertexai_tokenizer_model")
+  model_dir = _get_cache_dir(cache_dir)
   filename = hashlib.sha1(file_url.encode()).hexdigest()
   model_path = os.path.join(model_dir, filename)
 
   model_data = _maybe_load_from_cache(
-      file_path=model_path, expected_hash=expected_hash
+      file_path=model_path,
+      expected_hash=expected_hash,
+      use_hash_marker=_can_trust_hash_markers(model_dir, cache_dir),
   )
-  if not model_data:
-    model_data = _load_from_url(file_url=file_url, expected_hash=expected_hash)
+  if model_data:
+    return model_data
 
+  model_data = _load_from_url(file_url=file_url, expected_hash=expected_hash)
   _maybe_save_to_cache(
       cache_dir=model_dir, cache_path=model_path, content=model_data
   )
+  # Checked after saving, since the cache directory may have just been made.
+  if _can_trust_hash_markers(model_dir, cache_dir):
+    _maybe_write_hash_marker(file_path=model_path, expected_hash=expected_hash)
   return model_data
 
 
-def _load_model_proto_bytes(tokenizer_name: str) -> bytes:
+def _load_model_proto_bytes(
+    tokenizer_name: str, cache_dir: Optional[str] = None
+) -> bytes:
   """Loads model proto bytes from the given tokenizer name."""
   if tokenizer_name not in _TOKENIZERS:
     raise ValueError(
@@ -193,16 +299,24 @@ def _load_model_proto_bytes(tokenizer_name: str) -> bytes:
   return _load(
       file_url=_TOKENIZERS[tokenizer_name].model_url,
       expected_hash=_TOKENIZERS[tokenizer_name].model_hash,
+      cache_dir=cache_dir,
   )
 
 
 @functools.lru_cache()
 def load_model_proto(
-    tokenizer_name: str,
+    tokenizer_name: str, cache_dir: Optional[str] = None
 ) -> sentencepiece_model_pb2.ModelProto:
-  """Loads model proto from the given tokenizer name."""
+  """Loads model proto from the given tokenizer name.
+
+  The model is loaded and verified once per process, and shared with
+  `get_sentencepiece`. The file is read rather than memory-mapped, since
+  parsing copies it into the proto either way.
+  """
   model_proto = sentencepiece_model_pb2.ModelProto()
-  model_proto.ParseFromString(_load_model_proto_bytes(tokenizer_name))
+  model_proto.ParseFromString(
+      _load_model_proto_bytes(tokenizer_name, cache_dir)
+  )
   return model_proto
 
 
@@ -218,8 +332,12 @@ def get_tokenizer_name(model_name: str) -> str:
 
 
 @functools.lru_cache()
-def get_sentencepiece(tokenizer_name: str) -> spm.SentencePieceProcessor:
+def get_sentencepiece(
+    tokenizer_name: str, cache_dir: Optional[str] = None
+) -> spm.SentencePieceProcessor:
   """Loads sentencepiece tokenizer from the given tokenizer name."""
   processor = spm.SentencePieceProcessor()
-  processor.LoadFromSerializedProto(_load_model_proto_bytes(tokenizer_name))
+  processor.LoadFromSerializedProto(
+      load_model_proto(tokenizer_name, cache_dir).SerializeToString()
+  )
   return processor
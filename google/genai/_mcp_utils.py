@@ -18,25 +18,47 @@
 from __future__ import annotations
 
 from importlib.metadata import PackageNotFoundError, version
+import time
 import typing
 from typing import Any
+import weakref
 
 from . import _common
 from . import types
 
 if typing.TYPE_CHECKING:
+  from mcp.types import ListToolsResult as McpListToolsResult
   from mcp.types import Tool as McpTool
   from mcp import ClientSession as McpClientSession
 else:
   McpClientSession: typing.Type = Any
+  McpListToolsResult: typing.Type = Any
   McpTool: typing.Type = Any
   try:
+    from mcp.types import ListToolsResult as McpListToolsResult
     from mcp.types import Tool as McpTool
     from mcp import ClientSession as McpClientSession
   except ImportError:
+    McpListToolsResult = None
     McpTool = None
     McpClientSession = None
 
+# How long the tools listed by an MCP session are reused before they are
+# listed again. Tools are also listed again after `invalidate_mcp_tools_cache`.
+_MCP_TOOLS_CACHE_TTL_SECONDS = 60.0
+
+# Maps an MCP session to the time its tools were listed, the listed tools and
+# their conversions to GenAI tools.
+_mcp_tools_cache: weakref.WeakKeyDictionary[
+    McpClientSession, tuple[float, McpListToolsResult, list[types.Tool]]
+] = weakref.WeakKeyDictionary()
+
+# Incremented whenever the cached tools of an MCP session are invalidated, so a
+# listing that races with an invalidation is not cached.
+_mcp_tools_cache_generations: weakref.WeakKeyDictionary[
+    McpClientSession, int
+] = weakref.WeakKeyDictionary()
+
 
 def mcp_to_gemini_tool(tool: McpTool) -> types.Tool:
   """Translates an MCP tool to a Google GenAI tool."""
@@ -58,6 +80,42 @@ def mcp_to_gemini_tools(tools: list[McpTool]) -> list[types.Tool]:
   return [mcp_to_gemini_tool(tool) for tool in tools]
 
 
+def invalidate_mcp_tools_cache(session: McpClientSession) -> None:
+  """Drops the cached tools of the MCP session.
+
+  Call it when the tools of the server change, for example from the message
+  handler of the session on a `notifications/tools/list_changed` notification,
+  to list them again before the cache TTL.
+  """
+  _mcp_tools_cache.pop(session, None)
+  _mcp_tools_cache_generations[session] = (
+      _mcp_tools_cache_generations.get(session, 0) + 1
+  )
+
+
+async def list_mcp_session_tools(
+    session: McpClientSession,
+) -> tuple[McpListToolsResult, list[types.Tool]]:
+  """Returns the tools of the MCP session and their GenAI tool conversions.
+
+  The result is cached per session, so `list_tools` and the schema conversion
+  only run again after the cache TTL or `invalidate_mcp_tools_cache`.
+  """
+  cached = _mcp_tools_cache.get(session)
+  if (
+      cached is not None
+      and time.monotonic() - cached[0] <= _MCP_TOOLS_CACHE_TTL_SECONDS
+  ):
+    return cached[1], list(cached[2])
+  generation = _mcp_tools_cache_generations.get(session, 0)
+  listed_at = time.monotonic()
+  list_tools_result = await session.list_tools()
+  tools = mcp_to_gemini_tools(list_tools_result.tools)
+  if _mcp_tools_cache_generations.get(session, 0) == generation:
+    _mcp_tools_cache[session] = (listed_at, list_tools_result, tools)
+  return list_tools_result, list(tools)
+
+
 def has_mcp_tool_usage(tools: types.ToolListUnion) -> bool:
   """Checks whether the list of tools contains any MCP tools or sessions."""
   if McpClientSession is None:
@@ -0,0 +1,405 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Offline token estimates for images, audio, video and PDF documents.
+
+Only the metadata of the media is read: image dimensions from the image
+header, durations from the container header and the page count of PDFs. The
+estimates apply the per-modality token rates documented at
+https://ai.google.dev/gemini-api/docs/tokens.
+"""
+
+from __future__ import annotations
+
+import io
+import math
+import os
+import re
+import struct
+from typing import BinaryIO, Optional
+from urllib import parse
+
+from . import types
+
+# Images with both dimensions at most this size are one tile.
+_SMALL_IMAGE_MAX_DIMENSION = 384
+# Larger images are split into tiles of this size.
+_IMAGE_TILE_SIZE = 768
+_IMAGE_TILE_TOKENS = 258
+_VIDEO_FRAME_TOKENS = 258
+_DEFAULT_VIDEO_FPS = 1.0
+_AUDIO_TOKENS_PER_SECOND = 32
+_PDF_PAGE_TOKENS = 258
+
+_JPEG_START_OF_FRAME_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Bitrates in kbps, by MPEG version 1 (index 0) or 2 and 2.5 (index 1), for
+# layer III.
+_MP3_BITRATES = (
+    (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+)
+# A page tree dictionary, which holds the number of pages below it.
+_PDF_PAGES_DICT = re.compile(
+    rb'<<(?:(?!>>).)*?/Type\s*/Pages\b(?:(?!>>).)*?>>', re.S
+)
+_PDF_COUNT = re.compile(rb'/Count\s+(\d+)')
+_PDF_PAGE = re.compile(rb'/Type\s*/Page\b(?!s)')
+_PDF_STARTXREF = re.compile(rb'startxref\s+(\d+)')
+_PDF_XREF_SUBSECTION = re.compile(rb'\s*(\d+)\s+(\d+)[ \t]*(?:\r\n|\r|\n)')
+_PDF_PREV = re.compile(rb'/Prev\s+(\d+)')
+_PDF_ROOT = re.compile(rb'/Root\s+(\d+)\s+\d+\s+R')
+_PDF_PAGES_REF = re.compile(rb'/Pages\s+(\d+)\s+\d+\s+R')
+# The number of bytes at the end of a PDF document that hold `startxref`.
+_PDF_TAIL_SIZE = 1024
+# Each entry of a cross-reference table is 20 bytes long.
+_PDF_XREF_ENTRY_SIZE = 20
+# The number of bytes read from the start of a trailer or an object.
+_PDF_OBJECT_WINDOW = 4096
+# The number of cross-reference sections of incremental updates that are read.
+_PDF_MAX_XREF_SECTIONS = 32
+
+
+def _read_exact(f: BinaryIO, size: int) -> bytes:
+  data = f.read(size)
+  if len(data) != size:
+    raise ValueError('Unexpected end of media data.')
+  return data
+
+
+def image_size(f: BinaryIO) -> tuple[int, int]:
+  """Returns the width and height of a PNG, JPEG, GIF or WebP image."""
+  header = f.read(30)
+  if header.startswith(b'\x89PNG\r\n\x1a\n'):
+    return struct.unpack('>II', header[16:24])  # type: ignore[return-value]
+  if header[:6] in (b'GIF87a', b'GIF89a'):
+    return struct.unpack('<HH', header[6:10])  # type: ignore[return-value]
+  if header.startswith(b'RIFF') and header[8:12] == b'WEBP':
+    chunk = header[12:16]
+    if chunk == b'VP8 ':
+      width, height = struct.unpack('<HH', header[26:30])
+      return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L':
+      bits = int.from_bytes(header[21:25], 'little')
+      return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X':
+      return (
+          int.from_bytes(header[24:27], 'little') + 1,
+          int.from_bytes(header[27:30], 'little') + 1,
+      )
+  if header.startswith(b'\xff\xd8'):
+    f.seek(2)
+    while True:
+      marker = _read_exact(f, 2)
+      while marker[1] == 0xFF:
+        # Fill bytes before the marker.
+        marker = marker[1:] + _read_exact(f, 1)
+      if marker[0] != 0xFF:
+        break
+      if 0xD0 <= marker[1] <= 0xD9 or marker[1] == 0x01:
+        continue
+      (length,) = struct.unpack('>H', _read_exact(f, 2))
+      if marker[1] in _JPEG_START_OF_FRAME_MARKERS:
+        height, width = struct.unpack('>xHH', _read_exact(f, 5))
+        return width, height
+      f.seek(length - 2, io.SEEK_CUR)
+  raise ValueError('Unsupported or corrupted image.')
+
+
+def _mp4_duration(f: BinaryIO, end: int) -> Optional[float]:
+  """Returns the duration in the movie header of an MP4 or QuickTime file."""
+  while f.tell() + 8 <= end:
+    start = f.tell()
+    size, box_type = struct.unpack('>I4s', _read_exact(f, 8))
+    if size == 1:
+      (size,) = struct.unpack('>Q', _read_exact(f, 8))
+    elif size == 0:
+      size = end - start
+    if size < f.tell() - start:
+      # The box would end inside its own header.
+      raise ValueError('Unsupported or corrupted media.')
+    if box_type == b'moov':
+      return _mp4_duration(f, start + size)
+    if box_type == b'mvhd':
+      version = _read_exact(f, 4)[0]
+      if version == 1:
+        timescale, duration = struct.unpack('>16xIQ', _read_exact(f, 28))
+      else:
+        timescale, duration = struct.unpack('>8xII', _read_exact(f, 16))
+      return duration / timescale if timescale else None
+    f.seek(start + size)
+  return None
+
+
+def _wav_duration(f: BinaryIO) -> Optional[float]:
+  f.seek(12)
+  byte_rate: Optional[int] = None
+  while True:
+    header = f.read(8)
+    if len(header) < 8:
+      return None
+    size: int
+    chunk_id, size = struct.unpack('<4sI', header)
+    if chunk_id == b'fmt ':
+      (byte_rate,) = struct.unpack('<8xI', _read_exact(f, 12))
+      f.seek(size - 12 + size % 2, io.SEEK_CUR)
+    elif chunk_id == b'data':
+      return size / byte_rate if byte_rate else None
+    else:
+      f.seek(size + size % 2, io.SEEK_CUR)
+
+
+def _flac_duration(f: BinaryIO) -> Optional[float]:
+  stream_info = _read_exact(f, 8 + 34)[8:]
+  bits = int.from_bytes(stream_info[10:18], 'big')
+  sample_rate = bits >> 44
+  total_samples = bits & ((1 << 36) - 1)
+  return total_samples / sample_rate if sample_rate else None
+
+
+def _mp3_duration(f: BinaryIO, size: int) -> Optional[float]:
+  """Estimates the duration of an MP3 file from its first frame bitrate."""
+  start = 0
+  header = f.read(10)
+  if header.startswith(b'ID3'):
+    # The ID3v2 tag size is a 28-bit syncsafe integer.
+    start = 10 + sum(
+        (b & 0x7F) << (7 * (3 - i)) for i, b in enumerate(header[6:10])
+    )
+  f.seek(start)
+  data = f.read(4096)
+  for i in range(len(data) - 3):
+    if data[i] != 0xFF or data[i + 1] & 0xE0 != 0xE0:
+      continue
+    version_bits = (data[i + 1] >> 3) & 0x3
+    layer_bits = (data[i + 1] >> 1) & 0x3
+    bitrate_index = data[i + 2] >> 4
+    if version_bits == 1 or layer_bits != 1 or not 0 < bitrate_index < 15:
+      continue
+    bitrate = _MP3_BITRATES[0 if version_bits == 3 else 1][bitrate_index]
+    return (size - start - i) * 8 / (bitrate * 1000)
+  return None
+
+
+def media_duration(f: BinaryIO, mime_type: str) -> float:
+  """Returns the duration in seconds of an audio or video file."""
+  f.seek(0, io.SEEK_END)
+  size = f.tell()
+  f.seek(0)
+  header = f.read(12)
+  f.seek(0)
+  duration: Optional[float] = None
+  if header[4:8] == b'ftyp':
+    duration = _mp4_duration(f, size)
+  elif header.startswith(b'RIFF') and header[8:12] == b'WAVE':
+    duration = _wav_duration(f)
+  elif header.startswith(b'fLaC'):
+    duration = _flac_duration(f)
+  elif mime_type in ('audio/mpeg', 'audio/mp3'):
+    duration = _mp3_duration(f, size)
+  if duration is None:
+    raise ValueError(f'Cannot read the duration of {mime_type} media.')
+  return duration
+
+
+def _pdf_xref_sections(
+    f: BinaryIO,
+) -> Optional[tuple[list[tuple[int, int, int]], bytes]]:
+  """Returns the subsections of the cross-reference tables and the trailer.
+
+  Each subsection is the number of its first object, its number of objects and
+  the offset of its entries, newest first. Returns None if the document has
+  cross-reference streams instead of tables.
+  """
+  f.seek(0, io.SEEK_END)
+  f.seek(max(0, f.tell() - _PDF_TAIL_SIZE))
+  starts = _PDF_STARTXREF.findall(f.read())
+  if not starts:
+    return None
+  offset: Optional[int] = int(starts[-1])
+  subsections: list[tuple[int, int, int]] = []
+  trailer: Optional[bytes] = None
+  for _ in range(_PDF_MAX_XREF_SECTIONS):
+    if offset is None:
+      break
+    f.seek(offset)
+    if f.read(4) != b'xref':
+      return None
+    position = offset + 4
+    while True:
+      f.seek(position)
+      match = _PDF_XREF_SUBSECTION.match(f.read(64))
+      if not match:
+        break
+      first, count = int(match.group(1)), int(match.group(2))
+      subsections.append((first, count, position + match.end()))
+      position += match.end() + count * _PDF_XREF_ENTRY_SIZE
+    f.seek(position)
+    section_trailer = f.read(_PDF_OBJECT_WINDOW).split(b'startxref')[0]
+    if not section_trailer.lstrip().startswith(b'trailer'):
+      return None
+    if trailer is None:
+      trailer = section_trailer
+    prev = _PDF_PREV.search(section_trailer)
+    offset = int(prev.group(1)) if prev else None
+  if trailer is None:
+    return None
+  return subsections, trailer
+
+
+def _pdf_object(
+    f: BinaryIO, subsections: list[tuple[int, int, int]], number: int
+) -> Optional[bytes]:
+  """Returns the start of an object that is not in an object stream."""
+  for first, count, position in subsections:
+    if first <= number < first + count:
+      f.seek(position + (number - first) * _PDF_XREF_ENTRY_SIZE)
+      entry = f.read(_PDF_XREF_ENTRY_SIZE)
+      if entry[17:18] != b'n':
+        # The object is free.
+        return None
+      f.seek(int(entry[:10]))
+      data = f.read(_PDF_OBJECT_WINDOW).split(b'endobj')[0]
+      if not re.match(rb'\s*%d\s+\d+\s+obj\b' % number, data):
+        return None
+      return data
+  return None
+
+
+def _pdf_xref_page_count(f: BinaryIO) -> Optional[int]:
+  """Returns the count of the page tree root, found through the trailer."""
+  try:
+    sections = _pdf_xref_sections(f)
+    if sections is None:
+      return None
+    subsections, trailer = sections
+    root_ref = _PDF_ROOT.search(trailer)
+    if not root_ref:
+      return None
+    root = _pdf_object(f, subsections, int(root_ref.group(1)))
+    pages_ref = _PDF_PAGES_REF.search(root) if root else None
+    if not pages_ref:
+      return None
+    pages = _pdf_object(f, subsections, int(pages_ref.group(1)))
+    count = _PDF_COUNT.search(pages) if pages else None
+  except ValueError:
+    return None
+  return int(count.group(1)) if count else None
+
+
+def pdf_page_count(f: BinaryIO) -> int:
+  """Returns the number of pages of a PDF document.
+
+  The count of the page tree root is read through the trailer and the
+  cross-reference table, so only the end of the document and a few objects are
+  read. Documents with cross-reference streams, whose page tree is hidden in
+  compressed object streams, are scanned in full instead.
+  """
+  count = _pdf_xref_page_count(f)
+  if count is not None:
+    return count
+  f.seek(0)
+  data = f.read()
+  counts = [
+      int(count.group(1))
+      for pages in _PDF_PAGES_DICT.finditer(data)
+      for count in _PDF_COUNT.finditer(pages.group())
+  ]
+  if counts:
+    return max(counts)
+  # The page tree is in a compressed object stream.
+  pages = len(_PDF_PAGE.findall(data))
+  if not pages:
+    raise ValueError('Cannot read the page count of the PDF document.')
+  return pages
+
+
+def _parse_offset(offset: Optional[str]) -> Optional[float]:
+  if offset is None:
+    return None
+  return float(offset.rstrip('s'))
+
+
+def image_tokens(width: int, height: int) -> int:
+  """Returns the estimated number of tokens of an image."""
+  if max(width, height) <= _SMALL_IMAGE_MAX_DIMENSION:
+    return _IMAGE_TILE_TOKENS
+  tiles = math.ceil(width / _IMAGE_TILE_SIZE) * math.ceil(
+      height / _IMAGE_TILE_SIZE
+  )
+  return tiles * _IMAGE_TILE_TOKENS
+
+
+def video_tokens(
+    duration: float, video_metadata: Optional[types.VideoMetadata] = None
+) -> int:
+  """Returns the estimated number of tokens of a video, with its audio."""
+  fps = _DEFAULT_VIDEO_FPS
+  if video_metadata is not None:
+    start = _parse_offset(video_metadata.start_offset) or 0.0
+    end = _parse_offset(video_metadata.end_offset)
+    if end is not None:
+      duration = min(duration, end)
+    duration = max(0.0, duration - start)
+    fps = video_metadata.fps or fps
+  frames = math.ceil(duration * fps)
+  return frames * _VIDEO_FRAME_TOKENS + math.ceil(
+      duration * _AUDIO_TOKENS_PER_SECOND
+  )
+
+
+def audio_tokens(duration: float) -> int:
+  """Returns the estimated number of tokens of an audio clip."""
+  return math.ceil(duration * _AUDIO_TOKENS_PER_SECOND)
+
+
+def estimate_tokens(
+    f: BinaryIO,
+    mime_type: str,
+    video_metadata: Optional[types.VideoMetadata] = None,
+) -> int:
+  """Returns the estimated number of tokens of an image, audio, video or PDF.
+
+  Raises:
+    ValueError: If the media type is not supported or its metadata cannot be
+      read.
+  """
+  mime_type = mime_type.split(';')[0].strip().lower()
+  if mime_type.startswith('image/'):
+    return image_tokens(*image_size(f))
+  if mime_type.startswith('video/'):
+    return video_tokens(media_duration(f, mime_type), video_metadata)
+  if mime_type.startswith('audio/'):
+    return audio_tokens(media_duration(f, mime_type))
+  if mime_type == 'application/pdf':
+    return pdf_page_count(f) * _PDF_PAGE_TOKENS
+  raise ValueError(f'Cannot estimate the tokens of {mime_type} media.')
+
+
+def open_local_file(file_uri: str) -> BinaryIO:
+  """Opens a `file_data` URI that refers to a local file.
+
+  Raises:
+    ValueError: If the URI refers to a remote file.
+  """
+  parsed = parse.urlparse(file_uri)
+  if parsed.scheme == 'file':
+    path = parse.unquote(parsed.path)
+  elif not parsed.scheme or os.path.exists(file_uri):
+    path = file_uri
+  else:
+    raise ValueError(
+        f'Cannot estimate the tokens of remote file {file_uri} offline.'
+    )
+  return open(path, 'rb')
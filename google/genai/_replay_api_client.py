@@ -26,7 +26,9 @@ import io
 import json
 import os
 import re
-from typing import Any, Literal, Optional, Union
+from typing import (
+    Any, AsyncIterable, Callable, Iterable, Literal, Optional, Union
+)
 
 import google.auth
 from requests.exceptions import HTTPError
@@ -567,31 +569,44 @@ class ReplayApiClient(BaseApiClient):
 
   def upload_file(
       self,
-      file_path: Union[str, io.IOBase],
+      file_path: Union[str, io.IOBase, Iterable[bytes]],
       upload_url: str,
-      upload_size: int,
+      upload_size: Optional[int],
       *,
       http_options: Optional[HttpOptionsOrDict] = None,
+      resume: bool = False,
+      progress_callback: Optional[Callable[[int], None]] = None,
   ) -> HttpResponse:
-    if isinstance(file_path, io.IOBase):
-      offset = file_path.tell()
-      content = file_path.read()
-      file_path.seek(offset, os.SEEK_SET)
+    if isinstance(file_path, str):
+      request = HttpRequest(
+          method='POST', url='', data={'file_path': file_path}, headers={}
+      )
+    else:
+      if isinstance(file_path, io.IOBase):
+        offset = file_path.tell()
+        content = file_path.read()
+        file_path.seek(offset, os.SEEK_SET)
+      else:
+        # Iterators can only be read once, so their content is recorded and
+        # then uploaded as a single piece.
+        content = b''.join(file_path)
+        file_path = [content]
       request = HttpRequest(
           method='POST',
           url='',
           data={'bytes': base64.b64encode(content).decode('utf-8')},
           headers={}
       )
-    else:
-      request = HttpRequest(
-          method='POST', url='', data={'file_path': file_path}, headers={}
-      )
     if self._should_call_api():
       result: Union[str, HttpResponse]
       try:
         result = super().upload_file(
-            file_path, upload_url, upload_size, http_options=http_options
+            file_path,
+            upload_url,
+            upload_size,
+            http_options=http_options,
+            resume=resume,
+            progress_callback=progress_callback,
         )
       except HTTPError as e:
         result = HttpResponse(
@@ -606,31 +621,49 @@ class ReplayApiClient(BaseApiClient):
 
   async def async_upload_file(
       self,
-      file_path: Union[str, io.IOBase],
+      file_path: Union[
+          str, io.IOBase, Iterable[bytes], AsyncIterable[bytes]
+      ],
       upload_url: str,
-      upload_size: int,
+      upload_size: Optional[int],
       *,
       http_options: Optional[HttpOptionsOrDict] = None,
+      resume: bool = False,
+      progress_callback: Optional[Callable[[int], None]] = None,
   ) -> HttpResponse:
-    if isinstance(file_path, io.IOBase):
-      offset = file_path.tell()
-      content = file_path.read()
-      file_path.seek(offset, os.SEEK_SET)
+    if isinstance(file_path, str):
+      request = HttpRequest(
+          method='POST', url='', data={'file_path': file_path}, headers={}
+      )
+    else:
+      if isinstance(file_path, io.IOBase):
+        offset = file_path.tell()
+        content = file_path.read()
+        file_path.seek(offset, os.SEEK_SET)
+      elif isinstance(file_path, AsyncIterable):
+        # Iterators can only be read once, so their content is recorded and
+        # then uploaded as a single piece.
+        content = b''.join([piece async for piece in file_path])
+        file_path = [content]
+      else:
+        content = b''.join(file_path)
+        file_path = [content]
       request = HttpRequest(
           method='POST',
           url='',
           data={'bytes': base64.b64encode(content).decode('utf-8')},
           headers={},
       )
-    else:
-      request = HttpRequest(
-          method='POST', url='', data={'file_path': file_path}, headers={}
-      )
     if self._should_call_api():
       result: HttpResponse
       try:
         result = await super().async_upload_file(
-            file_path, upload_url, upload_size, http_options=http_options
+            file_path,
+            upload_url,
+            upload_size,
+            http_options=http_options,
+            resume=resume,
+            progress_callback=progress_callback,
         )
       except HTTPError as e:
         result = HttpResponse(
@@ -0,0 +1,146 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""A local journal of resumable upload sessions.
+
+The journal lets `files.upload(..., resume=True)` continue the upload of a file
+after the uploading process died, instead of uploading it again from the
+start. Each entry is a small JSON file, keyed by the path, size and
+modification time of the uploaded file, that holds the upload URL and the last
+offset that the server acknowledged.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Callable, Optional
+import uuid
+
+logger = logging.getLogger('google_genai._upload_journal')
+
+_JOURNAL_DIR_ENV_VAR = 'GOOGLE_GENAI_UPLOAD_JOURNAL_DIR'
+
+
+def _get_journal_dir(journal_dir: Optional[str] = None) -> str:
+  """Returns the directory that the journal entries are stored in."""
+  if journal_dir:
+    return os.path.expanduser(journal_dir)
+  env_journal_dir = os.environ.get(_JOURNAL_DIR_ENV_VAR)
+  if env_journal_dir:
+    return os.path.expanduser(env_journal_dir)
+  return os.path.join(
+      os.path.expanduser('~'), '.cache', 'google-genai', 'uploads'
+  )
+
+
+@dataclasses.dataclass
+class UploadJournalEntry:
+  """An upload session of a local file."""
+
+  upload_url: str
+  # The number of bytes that the server acknowledged.
+  offset: int
+  # The metadata of the created file, the session is not reused for uploads
+  # with other metadata.
+  metadata: dict[str, Any]
+
+
+class UploadJournal:
+  """Stores the upload sessions of local files, to resume interrupted uploads.
+
+  Journal entries are written atomically, so the journal stays consistent when
+  the process dies at any point.
+  """
+
+  def __init__(self, journal_dir: Optional[str] = None):
+    self._journal_dir = _get_journal_dir(journal_dir)
+
+  def _entry_path(self, file_path: str) -> Optional[str]:
+    """Returns the entry path of the current version of the file."""
+    try:
+      stat = os.stat(file_path)
+    except OSError:
+      return None
+    key = json.dumps(
+        [os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns]
+    )
+    return os.path.join(
+        self._journal_dir, hashlib.sha256(key.encode()).hexdigest() + '.json'
+    )
+
+  def get(
+      self, file_path: str, metadata: dict[str, Any]
+  ) -> Optional[UploadJournalEntry]:
+    """Returns the upload session of the file, if there is one to resume."""
+    entry_path = self._entry_path(file_path)
+    if entry_path is None:
+      return None
+    try:
+      with open(entry_path, 'r') as f:
+        entry = UploadJournalEntry(**json.load(f))
+    except FileNotFoundError:
+      return None
+    except (OSError, TypeError, ValueError):
+      logger.warning(
+          'Ignoring the corrupted upload journal entry %s.', entry_path
+      )
+      return None
+    if entry.metadata != metadata:
+      return None
+    return entry
+
+  def record(self, file_path: str, entry: UploadJournalEntry) -> None:
+    """Stores the upload session of the file."""
+    entry_path = self._entry_path(file_path)
+    if entry_path is None:
+      return
+    # A temporary file per write, so that an entry is never replaced by one
+    # that another thread is still writing.
+    tmp_path = f'{entry_path}.{uuid.uuid4().hex}.tmp'
+    try:
+      os.makedirs(self._journal_dir, exist_ok=True)
+      with open(tmp_path, 'w') as f:
+        json.dump(dataclasses.asdict(entry), f)
+      os.replace(tmp_path, entry_path)
+    except OSError:
+      # The journal is best effort, the upload itself still succeeds.
+      logger.warning(
+          'Failed to write the upload journal entry %s.', entry_path
+      )
+
+  def progress_callback(
+      self, file_path: str, entry: UploadJournalEntry
+  ) -> Callable[[int], None]:
+    """Returns a callback that records the acknowledged offsets of an upload."""
+
+    def record_offset(offset: int) -> None:
+      entry.offset = offset
+      self.record(file_path, entry)
+
+    return record_offset
+
+  def remove(self, file_path: str) -> None:
+    """Removes the upload session of the file."""
+    entry_path = self._entry_path(file_path)
+    if entry_path is None:
+      return
+    try:
+      os.remove(entry_path)
+    except OSError:
+      pass
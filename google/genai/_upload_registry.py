@@ -0,0 +1,150 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""A local registry of uploaded files, keyed by their content.
+
+The registry lets `files.upload(..., deduplicate=True)` return a file that was
+already uploaded with the same content and metadata, instead of uploading it
+again. Each entry is a small JSON file, keyed by the SHA-256 hash of the
+content, the metadata of the file and the account it was uploaded with, that
+holds the uploaded file until it expires on the server.
+"""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import io
+import json
+import logging
+import os
+from typing import Any, Optional, Union
+import uuid
+
+from . import types
+
+logger = logging.getLogger('google_genai._upload_registry')
+
+_REGISTRY_DIR_ENV_VAR = 'GOOGLE_GENAI_UPLOAD_REGISTRY_DIR'
+
+# The size of the blocks that files are hashed in.
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+# Files that expire sooner than this are uploaded again, so that the returned
+# file can still be used for a while.
+_EXPIRATION_MARGIN = datetime.timedelta(hours=1)
+
+
+def _get_registry_dir(registry_dir: Optional[str] = None) -> str:
+  """Returns the directory that the registry entries are stored in."""
+  if registry_dir:
+    return os.path.expanduser(registry_dir)
+  env_registry_dir = os.environ.get(_REGISTRY_DIR_ENV_VAR)
+  if env_registry_dir:
+    return os.path.expanduser(env_registry_dir)
+  return os.path.join(
+      os.path.expanduser('~'), '.cache', 'google-genai', 'files'
+  )
+
+
+def content_hash(file: Union[str, os.PathLike[str], io.IOBase]) -> str:
+  """Returns the SHA-256 hash of a file, read in blocks.
+
+  File objects are hashed from their current position, and are seeked back to
+  it afterwards.
+  """
+  digest = hashlib.sha256()
+  if isinstance(file, io.IOBase):
+    offset = file.tell()
+    try:
+      while block := file.read(_HASH_BLOCK_SIZE):
+        digest.update(block)
+    finally:
+      file.seek(offset, os.SEEK_SET)
+  else:
+    with open(file, 'rb') as f:
+      while block := f.read(_HASH_BLOCK_SIZE):
+        digest.update(block)
+  return digest.hexdigest()
+
+
+class UploadRegistry:
+  """Stores the uploaded files by content, to avoid uploading them again.
+
+  Entries are written atomically, so the registry can be shared by several
+  processes.
+  """
+
+  def __init__(self, account: str, registry_dir: Optional[str] = None):
+    # Files are only visible to the account they were uploaded with.
+    self._account = account
+    self._registry_dir = _get_registry_dir(registry_dir)
+
+  def _entry_path(self, file_hash: str, metadata: dict[str, Any]) -> str:
+    key = json.dumps([self._account, file_hash, metadata], sort_keys=True)
+    return os.path.join(
+        self._registry_dir, hashlib.sha256(key.encode()).hexdigest() + '.json'
+    )
+
+  def get(
+      self, file_hash: str, metadata: dict[str, Any]
+  ) -> Optional[types.File]:
+    """Returns the uploaded file with the content, if it has not expired."""
+    entry_path = self._entry_path(file_hash, metadata)
+    try:
+      with open(entry_path, 'r') as f:
+        file = types.File.model_validate(json.load(f))
+    except FileNotFoundError:
+      return None
+    except (OSError, ValueError):
+      logger.warning(
+          'Ignoring the corrupted upload registry entry %s.', entry_path
+      )
+      return None
+    if file.expiration_time is not None:
+      expiration_time = file.expiration_time
+      if expiration_time.tzinfo is None:
+        expiration_time = expiration_time.replace(tzinfo=datetime.timezone.utc)
+      now = datetime.datetime.now(datetime.timezone.utc)
+      if expiration_time - _EXPIRATION_MARGIN <= now:
+        self.remove(file_hash, metadata)
+        return None
+    return file
+
+  def record(
+      self, file_hash: str, metadata: dict[str, Any], file: types.File
+  ) -> None:
+    """Stores the uploaded file with the content."""
+    entry_path = self._entry_path(file_hash, metadata)
+    # Uploads of the same content, from threads of `upload_many` or from other
+    # processes, each write their own temporary file.
+    tmp_path = f'{entry_path}.{uuid.uuid4().hex}.tmp'
+    try:
+      os.makedirs(self._registry_dir, exist_ok=True)
+      with open(tmp_path, 'w') as f:
+        f.write(file.model_dump_json(exclude_none=True))
+      os.replace(tmp_path, entry_path)
+    except OSError:
+      # The registry is best effort, the upload itself still succeeds.
+      logger.warning(
+          'Failed to write the upload registry entry %s.', entry_path
+      )
+
+  def remove(self, file_hash: str, metadata: dict[str, Any]) -> None:
+    """Removes the uploaded file with the content."""
+    try:
+      os.remove(self._entry_path(file_hash, metadata))
+    except OSError:
+      pass
@@ -217,7 +217,8 @@ class Chat(_BaseChat):
       config: Optional[GenerateContentConfigOrDict] = None,
       history: list[ContentOrDict],
   ):
-    self._modules = modules
+    # The chat reuses function responses across its turns only.
+    self._modules = modules._for_chat()
     super().__init__(
         model=model,
         config=config,
@@ -380,7 +381,8 @@ class AsyncChat(_BaseChat):
       config: Optional[GenerateContentConfigOrDict] = None,
       history: list[ContentOrDict],
   ):
-    self._modules = modules
+    # The chat reuses function responses across its turns only.
+    self._modules = modules._for_chat()
     super().__init__(
         model=model,
         config=config,
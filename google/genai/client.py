@@ -18,7 +18,7 @@ from __future__ import annotations
 import asyncio
 import os
 from types import TracebackType
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
 
 import google.auth
 import pydantic
@@ -33,10 +33,15 @@ from .files import AsyncFiles, Files
 from .live import AsyncLive
 from .models import AsyncModels, Models
 from .operations import AsyncOperations, Operations
+from .response_cache import ResponseCache
+from .semantic_cache import SemanticCache
 from .tokens import AsyncTokens, Tokens
 from .tunings import AsyncTunings, Tunings
 from .types import HttpOptions, HttpOptionsDict, HttpRetryOptions
 
+if TYPE_CHECKING:
+  from .local_tokenizer import LocalTokenCounter
+
 
 class AsyncClient:
   """Client for making asynchronous (non-blocking) requests."""
@@ -193,6 +198,15 @@ class Client:
     http_options: Http options to use for the client. These options will be
       applied to all requests made by the client. Example usage: `client =
       genai.Client(http_options=types.HttpOptions(api_version='v1'))`.
+    response_cache: A cache of deterministic `generate_content` responses.
+      Example usage: `client = genai.Client(
+      response_cache=response_cache.InMemoryResponseCache())`.
+    semantic_cache: A cache of `generate_content` responses keyed by the
+      meaning of the prompt.
+    local_token_counter: Counts the tokens of text only `count_tokens`
+      requests locally.
+    upload_max_chunk_size: The largest chunk of resumable file uploads, in
+      bytes.
 
   Usage for the Gemini Developer API:
 
@@ -223,6 +237,10 @@ class Client:
       location: Optional[str] = None,
       debug_config: Optional[DebugConfig] = None,
       http_options: Optional[Union[HttpOptions, HttpOptionsDict]] = None,
+      response_cache: Optional[ResponseCache] = None,
+      semantic_cache: Optional[SemanticCache] = None,
+      local_token_counter: Optional[LocalTokenCounter] = None,
+      upload_max_chunk_size: Optional[int] = None,
   ):
     """Initializes the client.
 
@@ -251,6 +269,24 @@ class Client:
          of the client. This is typically used when running test code.
        http_options (Union[HttpOptions, HttpOptionsDict]): Http options to use
          for the client.
+       response_cache (ResponseCache): A cache of `generate_content` and
+         `generate_content_stream` responses, keyed by the request URL and
+         body. Identical requests are served from the cache without a network
+         call. Only use it for deterministic requests, for example with a
+         temperature of 0 and a fixed seed. Set
+         `GenerateContentConfig.bypass_response_cache` to skip it per request.
+       semantic_cache (SemanticCache): A cache of `generate_content` responses
+         keyed by the meaning of the prompt. Requests with a prompt similar to
+         a previous prompt are served from the cache. Set
+         `GenerateContentConfig.bypass_response_cache` to skip it per request.
+       local_token_counter (LocalTokenCounter): Counts the tokens of
+         `count_tokens` requests with text only contents locally with a
+         `LocalTokenizer`, for models that have one. Other requests are sent
+         to the API. Requires the `local-tokenizer` extra.
+       upload_max_chunk_size (int): The largest chunk of resumable file
+         uploads, in bytes. Uploads start with 8 MB chunks and double the chunk
+         size while chunks upload quickly, up to this size. It is rounded down
+         to a multiple of 256 KB. Defaults to 128 MB.
     """
 
     self._debug_config = debug_config or DebugConfig()
@@ -273,6 +309,10 @@ class Client:
         debug_config=self._debug_config,
         http_options=http_options,
     )
+    self._api_client._response_cache = response_cache
+    self._api_client._semantic_cache = semantic_cache
+    self._api_client._local_token_counter = local_token_counter
+    self._api_client._upload_max_chunk_size = upload_max_chunk_size
 
     self._aio = AsyncClient(self._api_client)
     self._models = Models(self._api_client)
@@ -0,0 +1,215 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""[Experimental] Persistent caches for embed_content results."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import array
+import os
+import sqlite3
+import threading
+from typing import Mapping, Optional, Sequence, Union
+
+from ._embedding_matrix import EmbeddingMatrix
+
+__all__ = [
+    'EmbeddingCache',
+    'SqliteEmbeddingCache',
+]
+
+# SQLite limits the number of host parameters in one statement.
+_MAX_KEYS_PER_QUERY = 500
+
+
+class EmbeddingCache(ABC):
+  """The interface of an embed_content cache.
+
+  Keys are content-addressed hashes computed by the SDK from the model, the
+  embedding config and one content. The value of a key is the matrix of the
+  embeddings of that content, usually a single row. Implementations must be
+  safe to use from several threads.
+  """
+
+  @abstractmethod
+  def get_many(self, keys: Sequence[str]) -> dict[str, EmbeddingMatrix]:
+    """Returns the cached embeddings of the keys that are in the cache."""
+
+  @abstractmethod
+  def put_many(self, entries: Mapping[str, EmbeddingMatrix]) -> None:
+    """Adds embeddings to the cache, evicting entries if needed."""
+
+
+class SqliteEmbeddingCache(EmbeddingCache):
+  """An embedding cache stored in a local SQLite database.
+
+  Embeddings are stored as float32 blobs. When the cache exceeds
+  `max_entries` entries or `max_bytes` bytes of embeddings, the least recently
+  used entries are evicted.
+
+  Usage:
+
+  .. code-block:: python
+
+    from google.genai import embedding_cache
+
+    cache = embedding_cache.SqliteEmbeddingCache(
+        '~/.cache/embeddings.sqlite', max_bytes=1 << 30
+    )
+    response = client.models.embed_content(
+        model='text-embedding-004',
+        contents=chunks,
+        config={'embedding_cache': cache},
+    )
+  """
+
+  def __init__(
+      self,
+      path: Union[str, os.PathLike[str]],
+      *,
+      max_entries: Optional[int] = None,
+      max_bytes: Optional[int] = None,
+  ):
+    path = os.path.expanduser(os.fspath(path))
+    if path != ':memory:':
+      os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    self._max_entries = max_entries
+    self._max_bytes = max_bytes
+    self._lock = threading.Lock()
+    self._connection = sqlite3.connect(
+        path, check_same_thread=False, isolation_level=None
+    )
+    self._connection.execute('PRAGMA journal_mode=WAL')
+    self._connection.execute(
+        'CREATE TABLE IF NOT EXISTS embeddings ('
+        'key TEXT PRIMARY KEY, rows INTEGER NOT NULL,'
+        ' dimensions INTEGER NOT NULL, data BLOB NOT NULL,'
+        ' last_access INTEGER NOT NULL)'
+    )
+    self._connection.execute(
+        'CREATE INDEX IF NOT EXISTS embeddings_last_access'
+        ' ON embeddings (last_access)'
+    )
+    # A logical clock orders the entries by their last access.
+    (self._clock,) = self._connection.execute(
+        'SELECT COALESCE(MAX(last_access), 0) FROM embeddings'
+    ).fetchone()
+
+  def get_many(self, keys: Sequence[str]) -> dict[str, EmbeddingMatrix]:
+    """Returns the cached embeddings of the keys that are in the cache."""
+    hits: dict[str, EmbeddingMatrix] = {}
+    with self._lock:
+      for start in range(0, len(keys), _MAX_KEYS_PER_QUERY):
+        batch = list(keys[start : start + _MAX_KEYS_PER_QUERY])
+        placeholders = ','.join('?' * len(batch))
+        for key, rows, dimensions, data in self._connection.execute(
+            'SELECT key, rows, dimensions, data FROM embeddings'
+            f' WHERE key IN ({placeholders})',
+            batch,
+        ):
+          values = array.array('f')
+          values.frombytes(data)
+          if len(values) != rows * dimensions:
+            continue
+          hits[key] = EmbeddingMatrix(values, dimensions)
+      if hits:
+        self._clock += 1
+        hit_keys = list(hits)
+        for start in range(0, len(hit_keys), _MAX_KEYS_PER_QUERY):
+          batch = hit_keys[start : start + _MAX_KEYS_PER_QUERY]
+          placeholders = ','.join('?' * len(batch))
+          self._connection.execute(
+              'UPDATE embeddings SET last_access = ?'
+              f' WHERE key IN ({placeholders})',
+              [self._clock, *batch],
+          )
+    return hits
+
+  def put_many(self, entries: Mapping[str, EmbeddingMatrix]) -> None:
+    """Adds embeddings to the cache, evicting entries if needed."""
+    if not entries:
+      return
+    with self._lock:
+      self._clock += 1
+      self._connection.execute('BEGIN')
+      try:
+        self._connection.executemany(
+            'INSERT OR REPLACE INTO embeddings'
+            ' (key, rows, dimensions, data, last_access)'
+            ' VALUES (?, ?, ?, ?, ?)',
+            [
+                (
+                    key,
+                    len(matrix),
+                    matrix.shape[1],
+                    matrix.data.tobytes(),
+                    self._clock,
+                )
+                for key, matrix in entries.items()
+            ],
+        )
+        self._evict()
+        self._connection.execute('COMMIT')
+      except BaseException:
+        self._connection.execute('ROLLBACK')
+        raise
+
+  def _evict(self) -> None:
+    if self._max_entries is not None:
+      (count,) = self._connection.execute(
+          'SELECT COUNT(*) FROM embeddings'
+      ).fetchone()
+      if count > self._max_entries:
+        self._connection.execute(
+            'DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings'
+            ' ORDER BY last_access LIMIT ?)',
+            (count - self._max_entries,),
+        )
+    if self._max_bytes is not None:
+      (total_bytes,) = self._connection.execute(
+          'SELECT COALESCE(SUM(LENGTH(data)), 0) FROM embeddings'
+      ).fetchone()
+      if total_bytes <= self._max_bytes:
+        return
+      evicted_keys = []
+      for key, size in self._connection.execute(
+          'SELECT key, LENGTH(data) FROM embeddings ORDER BY last_access'
+      ).fetchall():
+        if total_bytes <= self._max_bytes:
+          break
+        evicted_keys.append((key,))
+        total_bytes -= size
+      self._connection.executemany(
+          'DELETE FROM embeddings WHERE key = ?', evicted_keys
+      )
+
+  def __len__(self) -> int:
+    with self._lock:
+      (count,) = self._connection.execute(
+          'SELECT COUNT(*) FROM embeddings'
+      ).fetchone()
+    return int(count)
+
+  def close(self) -> None:
+    """Closes the database connection."""
+    with self._lock:
+      self._connection.close()
+
+  def __enter__(self) -> SqliteEmbeddingCache:
+    return self
+
+  def __exit__(self, *args: object) -> None:
+    self.close()
@@ -17,17 +17,35 @@ from __future__ import annotations
 
 # Code generated by the Google Gen AI SDK generator DO NOT EDIT.
 
+import asyncio
+import concurrent.futures
+import dataclasses
+import functools
 import io
 import json
 import logging
 import os
-from typing import Any, Optional, Union
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Union,
+)
 from urllib.parse import urlencode
 
+from . import _api_client
 from . import _api_module
 from . import _common
 from . import _extra_utils
 from . import _transformers as t
+from . import _upload_journal
+from . import _upload_registry
+from . import errors
 from . import types
 from ._common import get_value_by_path as getv
 from ._common import set_value_by_path as setv
@@ -151,6 +169,79 @@ def _ListFilesResponse_from_mldev(
   return to_object
 
 
+@dataclasses.dataclass
+class FileUploadResult:
+  """The outcome of uploading one of the files of `upload_many`.
+
+  Attributes:
+    file: The uploaded file, if the upload succeeded.
+    error: The error that the upload failed with, if it failed.
+  """
+
+  file: Optional[types.File] = None
+  error: Optional[Exception] = None
+
+
+def _upload_many_configs(
+    count: int,
+    config: Optional[types.UploadFileConfigOrDict],
+    configs: Optional[Sequence[Optional[types.UploadFileConfigOrDict]]],
+) -> Sequence[Optional[types.UploadFileConfigOrDict]]:
+  """Returns the upload config of each file of `upload_many`."""
+  if configs is None:
+    return [config] * count
+  if config is not None:
+    raise ValueError('Only one of `config` and `configs` can be set.')
+  if len(configs) != count:
+    raise ValueError(
+        f'Got {len(configs)} configs for {count} files, `configs` must have'
+        ' one config per file.'
+    )
+  return configs
+
+
+def _combine_progress_callbacks(
+    *callbacks: Optional[Callable[[int], None]],
+) -> Optional[Callable[[int], None]]:
+  """Returns a callback that calls each of the given callbacks."""
+  active_callbacks = [callback for callback in callbacks if callback]
+  if not active_callbacks:
+    return None
+
+  def combined_callback(offset: int) -> None:
+    for callback in active_callbacks:
+      callback(offset)
+
+  return combined_callback
+
+
+def _download_request(
+    api_client: _api_client.BaseApiClient,
+    file: Union[str, types.File, types.Video, types.GeneratedVideo],
+    config: Optional[types.DownloadFileConfigOrDict],
+) -> tuple[str, Optional[types.HttpOptions]]:
+  """Returns the request path and http options to download a file."""
+  if api_client.vertexai:
+    raise ValueError(
+        'This method is only supported in the Gemini Developer client.'
+    )
+  config_model = None
+  if config:
+    if isinstance(config, dict):
+      config_model = types.DownloadFileConfig(**config)
+    else:
+      config_model = config
+  if isinstance(file, types.File) and file.download_uri is None:
+    raise ValueError(
+        "Only generated files can be downloaded, uploaded files can't be "
+        'downloaded. You can tell which files are downloadable by checking '
+        'the `source` or `download_uri` property.'
+    )
+  name = t.t_file_name(file)
+  path = f'files/{name}:download?{urlencode({"alt": "media"})}'
+  return path, getv(config_model, ['http_options'])
+
+
 class Files(_api_module.BaseModule):
 
   def _list(
@@ -424,8 +515,14 @@ class Files(_api_module.BaseModule):
   def upload(
       self,
       *,
-      file: Union[str, os.PathLike[str], io.IOBase],
+      file: Union[str, os.PathLike[str], io.IOBase, Iterable[bytes]],
       config: Optional[types.UploadFileConfigOrDict] = None,
+      resume: bool = False,
+      progress_callback: Optional[
+          Callable[[int, Optional[int]], None]
+      ] = None,
+      deduplicate: bool = False,
+      verify_deduplicated: bool = False,
   ) -> types.File:
     """Calls the API to upload a file using a supported file service.
 
@@ -434,9 +531,37 @@ class Files(_api_module.BaseModule):
         IOBase object, it must be opened in blocking (the default) mode and
         binary mode. In other words, do not use non-blocking mode or text mode.
         The given stream must be seekable, that is, it must be able to call
-        `seek()` on 'path'.
+        `seek()` on 'path'. It can also be an iterator of bytes of unknown
+        length, for example a generator of transcoded media. Its chunks are
+        uploaded as they are produced, and its size is declared when the upload
+        is finalized. The `mime_type` must be set in the config for file
+        objects and iterators.
       config: Optional parameters to set `diplay_name`, `mime_type`, and `name`.
+      resume: Whether to record the upload session in a local journal, and to
+        continue a previously interrupted upload of the same file from the
+        journal. The journal is keyed by the path, size and modification time
+        of the file, and is stored in `~/.cache/google-genai/uploads` or the
+        directory set by the `GOOGLE_GENAI_UPLOAD_JOURNAL_DIR` environment
+        variable. Only supported for uploads from a file path.
+      progress_callback: Called with the number of uploaded bytes and the size
+        of the file, after each uploaded chunk. The size of iterators is None.
+      deduplicate: Whether to return the file that was already uploaded with the
+        same content and metadata, instead of uploading it again. Uploaded
+        files are recorded in a local registry, keyed by the SHA-256 hash of
+        their content, until they expire. The registry is stored in
+        `~/.cache/google-genai/files` or the directory set by the
+        `GOOGLE_GENAI_UPLOAD_REGISTRY_DIR` environment variable. Not supported
+        for uploads from iterators.
+      verify_deduplicated: Whether to get the file that was already uploaded
+        from the server, to make sure that it was not deleted, before returning
+        it.
     """
+    if resume and not isinstance(file, (str, os.PathLike)):
+      raise ValueError('Only uploads from a file path can be resumed.')
+    if deduplicate and not isinstance(file, (str, os.PathLike, io.IOBase)):
+      raise ValueError(
+          'Only uploads from a file path or file object can be deduplicated.'
+      )
     if self._api_client.vertexai:
       raise ValueError(
           'This method is only supported in the Gemini Developer client.'
@@ -464,6 +589,73 @@ class Files(_api_module.BaseModule):
     )
     file_obj.size_bytes = size_bytes
     file_obj.mime_type = mime_type
+    upload_progress: Optional[Callable[[int], None]] = None
+    if progress_callback is not None:
+      user_callback = progress_callback
+
+      def report_progress(offset: int) -> None:
+        user_callback(offset, size_bytes)
+
+      upload_progress = report_progress
+
+    metadata = file_obj.model_dump(mode='json', exclude_none=True)
+    registry: Optional[_upload_registry.UploadRegistry] = None
+    file_hash = ''
+    if deduplicate:
+      registry = _upload_registry.UploadRegistry(self._api_client.api_key or '')
+      file_hash = _upload_registry.content_hash(file)  # type: ignore[arg-type]
+      existing_file = registry.get(file_hash, metadata)
+      if existing_file is not None and verify_deduplicated:
+        try:
+          existing_file = self.get(
+              name=existing_file.name  # type: ignore[arg-type]
+          )
+        except errors.ClientError as e:
+          if e.code not in (403, 404):
+            raise
+          existing_file = None
+        if (
+            existing_file is None
+            or existing_file.state == types.FileState.FAILED
+        ):
+          registry.remove(file_hash, metadata)
+          existing_file = None
+        else:
+          registry.record(file_hash, metadata, existing_file)
+      if existing_file is not None:
+        return existing_file
+
+    journal: Optional[_upload_journal.UploadJournal] = None
+    if resume:
+      journal = _upload_journal.UploadJournal()
+      fs_path = os.fspath(file)  # type: ignore[arg-type]
+      entry = journal.get(fs_path, metadata)
+      if entry is not None:
+        try:
+          return_file = self._api_client.upload_file(
+              fs_path,
+              entry.upload_url,
+              size_bytes,
+              http_options=http_options,
+              resume=True,
+              progress_callback=_combine_progress_callbacks(
+                  journal.progress_callback(fs_path, entry), upload_progress
+              ),
+          )
+        except _api_client.ResumableUploadExpiredError:
+          logger.info(
+              'The upload session of %s expired, uploading it again.', fs_path
+          )
+        else:
+          journal.remove(fs_path)
+          uploaded_file = types.File._from_response(
+              response=return_file.json['file'],
+              kwargs=config_model.model_dump() if config else {},
+          )
+          if registry is not None:
+            registry.record(file_hash, metadata, uploaded_file)
+          return uploaded_file
+
     response = self._create(
         file=file_obj,
         config=types.CreateFileConfig(
@@ -482,20 +674,117 @@ class Files(_api_module.BaseModule):
       )
     upload_url = response.sdk_http_response.headers['x-goog-upload-url']
 
-    if isinstance(file, io.IOBase):
+    if not isinstance(file, (str, os.PathLike)):
       return_file = self._api_client.upload_file(
-          file, upload_url, file_obj.size_bytes, http_options=http_options
+          file,
+          upload_url,
+          file_obj.size_bytes,
+          http_options=http_options,
+          progress_callback=upload_progress,
       )
     else:
       fs_path = os.fspath(file)
+      journal_progress = None
+      if journal is not None:
+        entry = _upload_journal.UploadJournalEntry(
+            upload_url=upload_url, offset=0, metadata=metadata
+        )
+        journal.record(fs_path, entry)
+        journal_progress = journal.progress_callback(fs_path, entry)
       return_file = self._api_client.upload_file(
-          fs_path, upload_url, file_obj.size_bytes, http_options=http_options
+          fs_path,
+          upload_url,
+          file_obj.size_bytes,
+          http_options=http_options,
+          progress_callback=_combine_progress_callbacks(
+              journal_progress, upload_progress
+          ),
       )
+      if journal is not None:
+        journal.remove(fs_path)
 
-    return types.File._from_response(
+    uploaded_file = types.File._from_response(
         response=return_file.json['file'],
         kwargs=config_model.model_dump() if config else {},
     )
+    if registry is not None:
+      registry.record(file_hash, metadata, uploaded_file)
+    return uploaded_file
+
+  def upload_many(
+      self,
+      *,
+      files: Sequence[
+          Union[str, os.PathLike[str], io.IOBase, Iterable[bytes]]
+      ],
+      config: Optional[types.UploadFileConfigOrDict] = None,
+      configs: Optional[
+          Sequence[Optional[types.UploadFileConfigOrDict]]
+      ] = None,
+      max_concurrency: int = 8,
+      resume: bool = False,
+      progress_callback: Optional[
+          Callable[[int, int, Optional[int]], None]
+      ] = None,
+      deduplicate: bool = False,
+      verify_deduplicated: bool = False,
+  ) -> list[FileUploadResult]:
+    """Uploads many files concurrently.
+
+    The files are uploaded as by `upload`, by up to `max_concurrency` threads
+    that share the connections of the client. A failed upload does not stop
+    the other uploads, its error is reported in its result instead.
+
+    Args:
+      files: The paths to the files, `IOBase` objects or iterators of bytes to
+        be uploaded, see `upload`.
+      config: Optional parameters of all the files. The `name` can only be set
+        per file, with `configs`.
+      configs: Optional parameters of each file, in the order of `files`.
+      max_concurrency: The number of files that are uploaded at the same time.
+      resume: Whether to resume interrupted uploads, see `upload`.
+      progress_callback: Called with the index of a file, its number of
+        uploaded bytes and its size, after each uploaded chunk.
+      deduplicate: Whether to return the files that were already uploaded with
+        the same content, see `upload`.
+      verify_deduplicated: Whether to get the files that were already uploaded
+        from the server before returning them, see `upload`.
+
+    Returns:
+      The result of each file, in the order of `files`.
+
+    Usage:
+
+    .. code-block:: python
+
+      results = client.files.upload_many(files=['a.png', 'b.png'])
+      failed = [result.error for result in results if result.error]
+    """
+    if max_concurrency < 1:
+      raise ValueError('`max_concurrency` must be at least 1.')
+    file_configs = _upload_many_configs(len(files), config, configs)
+
+    def upload_one(index: int) -> FileUploadResult:
+      try:
+        return FileUploadResult(
+            file=self.upload(
+                file=files[index],
+                config=file_configs[index],
+                resume=resume,
+                deduplicate=deduplicate,
+                verify_deduplicated=verify_deduplicated,
+                progress_callback=(
+                    functools.partial(progress_callback, index)
+                    if progress_callback
+                    else None
+                ),
+            )
+        )
+      except Exception as e:  # pylint: disable=broad-except
+        return FileUploadResult(error=e)
+
+    with concurrent.futures.ThreadPoolExecutor(max_concurrency) as executor:
+      return list(executor.map(upload_one, range(len(files))))
 
   def list(
       self, *, config: Optional[types.ListFilesConfigOrDict] = None
@@ -588,6 +877,76 @@ class Files(_api_module.BaseModule):
 
     return data
 
+  def download_to(
+      self,
+      *,
+      file: Union[str, types.File, types.Video, types.GeneratedVideo],
+      destination: Union[str, os.PathLike[str], io.IOBase],
+      config: Optional[types.DownloadFileConfigOrDict] = None,
+      max_concurrency: int = 1,
+  ) -> None:
+    """Streams a file's data from storage to a local path or file object.
+
+    Unlike `download`, the data is written in chunks and never held in memory
+    in full, and `video_bytes` is not set on `Video` objects. A dropped
+    connection is resumed from the last received byte.
+
+    Args:
+      file (str): A file name, uri, or file object. Identifying which file to
+        download.
+      destination: The path to write the file to, or a writable file object
+        opened in binary mode.
+      config (DownloadFileConfigOrDict): Optional, configuration for the get
+        method.
+      max_concurrency (int): The number of ranges of a large file to download
+        in parallel. Only used if the destination is a path.
+
+    Usage:
+
+    .. code-block:: python
+
+      client.files.download_to(file=video, destination='video.mp4')
+    """
+    path, http_options = _download_request(self._api_client, file, config)
+    self._api_client.download_file_to(
+        path,
+        destination,
+        http_options=http_options,
+        max_concurrency=max_concurrency,
+    )
+
+  def iter_download(
+      self,
+      *,
+      file: Union[str, types.File, types.Video, types.GeneratedVideo],
+      config: Optional[types.DownloadFileConfigOrDict] = None,
+      chunk_size: int = _api_client.DOWNLOAD_CHUNK_SIZE,
+  ) -> Iterator[bytes]:
+    """Streams a file's data from storage in chunks.
+
+    A dropped connection is resumed from the last received byte.
+
+    Args:
+      file (str): A file name, uri, or file object. Identifying which file to
+        download.
+      config (DownloadFileConfigOrDict): Optional, configuration for the get
+        method.
+      chunk_size (int): The size of the chunks in bytes, the last chunk may be
+        smaller.
+
+    Usage:
+
+    .. code-block:: python
+
+      with open('video.mp4', 'wb') as f:
+        for chunk in client.files.iter_download(file=video):
+          f.write(chunk)
+    """
+    path, http_options = _download_request(self._api_client, file, config)
+    return self._api_client.iter_download(
+        path, http_options=http_options, chunk_size=chunk_size
+    )
+
 
 class AsyncFiles(_api_module.BaseModule):
 
@@ -866,8 +1225,20 @@ class AsyncFiles(_api_module.BaseModule):
   async def upload(
       self,
       *,
-      file: Union[str, os.PathLike[str], io.IOBase],
+      file: Union[
+          str,
+          os.PathLike[str],
+          io.IOBase,
+          Iterable[bytes],
+          AsyncIterable[bytes],
+      ],
       config: Optional[types.UploadFileConfigOrDict] = None,
+      resume: bool = False,
+      progress_callback: Optional[
+          Callable[[int, Optional[int]], None]
+      ] = None,
+      deduplicate: bool = False,
+      verify_deduplicated: bool = False,
   ) -> types.File:
     """Calls the API to upload a file asynchronously using a supported file service.
 
@@ -876,9 +1247,37 @@ class AsyncFiles(_api_module.BaseModule):
         IOBase object, it must be opened in blocking (the default) mode and
         binary mode. In other words, do not use non-blocking mode or text mode.
         The given stream must be seekable, that is, it must be able to call
-        `seek()` on 'path'.
+        `seek()` on 'path'. It can also be a sync or async iterator of bytes of
+        unknown length, for example a generator of transcoded media. Its chunks
+        are uploaded as they are produced, and its size is declared when the
+        upload is finalized. The `mime_type` must be set in the config for
+        file objects and iterators.
       config: Optional parameters to set `diplay_name`, `mime_type`, and `name`.
+      resume: Whether to record the upload session in a local journal, and to
+        continue a previously interrupted upload of the same file from the
+        journal. The journal is keyed by the path, size and modification time
+        of the file, and is stored in `~/.cache/google-genai/uploads` or the
+        directory set by the `GOOGLE_GENAI_UPLOAD_JOURNAL_DIR` environment
+        variable. Only supported for uploads from a file path.
+      progress_callback: Called with the number of uploaded bytes and the size
+        of the file, after each uploaded chunk. The size of iterators is None.
+      deduplicate: Whether to return the file that was already uploaded with the
+        same content and metadata, instead of uploading it again. Uploaded
+        files are recorded in a local registry, keyed by the SHA-256 hash of
+        their content, until they expire. The registry is stored in
+        `~/.cache/google-genai/files` or the directory set by the
+        `GOOGLE_GENAI_UPLOAD_REGISTRY_DIR` environment variable. Not supported
+        for uploads from iterators.
+      verify_deduplicated: Whether to get the file that was already uploaded
+        from the server, to make sure that it was not deleted, before returning
+        it.
     """
+    if resume and not isinstance(file, (str, os.PathLike)):
+      raise ValueError('Only uploads from a file path can be resumed.')
+    if deduplicate and not isinstance(file, (str, os.PathLike, io.IOBase)):
+      raise ValueError(
+          'Only uploads from a file path or file object can be deduplicated.'
+      )
     if self._api_client.vertexai:
       raise ValueError(
           'This method is only supported in the Gemini Developer client.'
@@ -906,6 +1305,75 @@ class AsyncFiles(_api_module.BaseModule):
     )
     file_obj.size_bytes = size_bytes
     file_obj.mime_type = mime_type
+    upload_progress: Optional[Callable[[int], None]] = None
+    if progress_callback is not None:
+      user_callback = progress_callback
+
+      def report_progress(offset: int) -> None:
+        user_callback(offset, size_bytes)
+
+      upload_progress = report_progress
+
+    metadata = file_obj.model_dump(mode='json', exclude_none=True)
+    registry: Optional[_upload_registry.UploadRegistry] = None
+    file_hash = ''
+    if deduplicate:
+      registry = _upload_registry.UploadRegistry(self._api_client.api_key or '')
+      file_hash = await asyncio.to_thread(
+          _upload_registry.content_hash, file  # type: ignore[arg-type]
+      )
+      existing_file = registry.get(file_hash, metadata)
+      if existing_file is not None and verify_deduplicated:
+        try:
+          existing_file = await self.get(
+              name=existing_file.name  # type: ignore[arg-type]
+          )
+        except errors.ClientError as e:
+          if e.code not in (403, 404):
+            raise
+          existing_file = None
+        if (
+            existing_file is None
+            or existing_file.state == types.FileState.FAILED
+        ):
+          registry.remove(file_hash, metadata)
+          existing_file = None
+        else:
+          registry.record(file_hash, metadata, existing_file)
+      if existing_file is not None:
+        return existing_file
+
+    journal: Optional[_upload_journal.UploadJournal] = None
+    if resume:
+      journal = _upload_journal.UploadJournal()
+      fs_path = os.fspath(file)  # type: ignore[arg-type]
+      entry = journal.get(fs_path, metadata)
+      if entry is not None:
+        try:
+          return_file = await self._api_client.async_upload_file(
+              fs_path,
+              entry.upload_url,
+              size_bytes,
+              http_options=http_options,
+              resume=True,
+              progress_callback=_combine_progress_callbacks(
+                  journal.progress_callback(fs_path, entry), upload_progress
+              ),
+          )
+        except _api_client.ResumableUploadExpiredError:
+          logger.info(
+              'The upload session of %s expired, uploading it again.', fs_path
+          )
+        else:
+          journal.remove(fs_path)
+          uploaded_file = types.File._from_response(
+              response=return_file.json['file'],
+              kwargs=config_model.model_dump() if config else {},
+          )
+          if registry is not None:
+            registry.record(file_hash, metadata, uploaded_file)
+          return uploaded_file
+
     response = await self._create(
         file=file_obj,
         config=types.CreateFileConfig(
@@ -929,20 +1397,126 @@ class AsyncFiles(_api_module.BaseModule):
     else:
       upload_url = response.sdk_http_response.headers['X-Goog-Upload-URL']
 
-    if isinstance(file, io.IOBase):
+    if not isinstance(file, (str, os.PathLike)):
       return_file = await self._api_client.async_upload_file(
-          file, upload_url, file_obj.size_bytes, http_options=http_options
+          file,
+          upload_url,
+          file_obj.size_bytes,
+          http_options=http_options,
+          progress_callback=upload_progress,
       )
     else:
       fs_path = os.fspath(file)
+      journal_progress = None
+      if journal is not None:
+        entry = _upload_journal.UploadJournalEntry(
+            upload_url=upload_url, offset=0, metadata=metadata
+        )
+        journal.record(fs_path, entry)
+        journal_progress = journal.progress_callback(fs_path, entry)
       return_file = await self._api_client.async_upload_file(
-          fs_path, upload_url, file_obj.size_bytes, http_options=http_options
+          fs_path,
+          upload_url,
+          file_obj.size_bytes,
+          http_options=http_options,
+          progress_callback=_combine_progress_callbacks(
+              journal_progress, upload_progress
+          ),
       )
+      if journal is not None:
+        journal.remove(fs_path)
 
-    return types.File._from_response(
+    uploaded_file = types.File._from_response(
         response=return_file.json['file'],
         kwargs=config_model.model_dump() if config else {},
     )
+    if registry is not None:
+      registry.record(file_hash, metadata, uploaded_file)
+    return uploaded_file
+
+  async def upload_many(
+      self,
+      *,
+      files: Sequence[
+          Union[
+              str,
+              os.PathLike[str],
+              io.IOBase,
+              Iterable[bytes],
+              AsyncIterable[bytes],
+          ]
+      ],
+      config: Optional[types.UploadFileConfigOrDict] = None,
+      configs: Optional[
+          Sequence[Optional[types.UploadFileConfigOrDict]]
+      ] = None,
+      max_concurrency: int = 8,
+      resume: bool = False,
+      progress_callback: Optional[
+          Callable[[int, int, Optional[int]], None]
+      ] = None,
+      deduplicate: bool = False,
+      verify_deduplicated: bool = False,
+  ) -> list[FileUploadResult]:
+    """Uploads many files concurrently and asynchronously.
+
+    The files are uploaded as by `upload`, up to `max_concurrency` at a time
+    over the connections of the client. A failed upload does not stop the
+    other uploads, its error is reported in its result instead.
+
+    Args:
+      files: The paths to the files, `IOBase` objects or iterators of bytes to
+        be uploaded, see `upload`.
+      config: Optional parameters of all the files. The `name` can only be set
+        per file, with `configs`.
+      configs: Optional parameters of each file, in the order of `files`.
+      max_concurrency: The number of files that are uploaded at the same time.
+      resume: Whether to resume interrupted uploads, see `upload`.
+      progress_callback: Called with the index of a file, its number of
+        uploaded bytes and its size, after each uploaded chunk.
+      deduplicate: Whether to return the files that were already uploaded with
+        the same content, see `upload`.
+      verify_deduplicated: Whether to get the files that were already uploaded
+        from the server before returning them, see `upload`.
+
+    Returns:
+      The result of each file, in the order of `files`.
+
+    Usage:
+
+    .. code-block:: python
+
+      results = await client.aio.files.upload_many(files=['a.png', 'b.png'])
+      failed = [result.error for result in results if result.error]
+    """
+    if max_concurrency < 1:
+      raise ValueError('`max_concurrency` must be at least 1.')
+    file_configs = _upload_many_configs(len(files), config, configs)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def upload_one(index: int) -> FileUploadResult:
+      async with semaphore:
+        try:
+          return FileUploadResult(
+              file=await self.upload(
+                  file=files[index],
+                  config=file_configs[index],
+                  resume=resume,
+                  deduplicate=deduplicate,
+                  verify_deduplicated=verify_deduplicated,
+                  progress_callback=(
+                      functools.partial(progress_callback, index)
+                      if progress_callback
+                      else None
+                  ),
+              )
+          )
+        except Exception as e:  # pylint: disable=broad-except
+          return FileUploadResult(error=e)
+
+    return list(
+        await asyncio.gather(*(upload_one(i) for i in range(len(files))))
+    )
 
   async def list(
       self, *, config: Optional[types.ListFilesConfigOrDict] = None
@@ -1019,3 +1593,71 @@ class AsyncFiles(_api_module.BaseModule):
     )
 
     return data
+
+  async def download_to(
+      self,
+      *,
+      file: Union[str, types.File, types.Video, types.GeneratedVideo],
+      destination: Union[str, os.PathLike[str], io.IOBase],
+      config: Optional[types.DownloadFileConfigOrDict] = None,
+      max_concurrency: int = 1,
+  ) -> None:
+    """Streams a file's data asynchronously to a local path or file object.
+
+    Unlike `download`, the data is written in chunks and never held in memory
+    in full. A dropped connection is resumed from the last received byte.
+
+    Args:
+      file (str): A file name, uri, or file object. Identifying which file to
+        download.
+      destination: The path to write the file to, or a writable file object
+        opened in binary mode.
+      config (DownloadFileConfigOrDict): Optional, configuration for the get
+        method.
+      max_concurrency (int): The number of ranges of a large file to download
+        in parallel. Only used if the destination is a path.
+
+    Usage:
+
+    .. code-block:: python
+
+      await client.aio.files.download_to(file=video, destination='video.mp4')
+    """
+    path, http_options = _download_request(self._api_client, file, config)
+    await self._api_client.async_download_file_to(
+        path,
+        destination,
+        http_options=http_options,
+        max_concurrency=max_concurrency,
+    )
+
+  def iter_download(
+      self,
+      *,
+      file: Union[str, types.File, types.Video, types.GeneratedVideo],
+      config: Optional[types.DownloadFileConfigOrDict] = None,
+      chunk_size: int = _api_client.DOWNLOAD_CHUNK_SIZE,
+  ) -> AsyncIterator[bytes]:
+    """Streams a file's data asynchronously from storage in chunks.
+
+    A dropped connection is resumed from the last received byte.
+
+    Args:
+      file (str): A file name, uri, or file object. Identifying which file to
+        download.
+      config (DownloadFileConfigOrDict): Optional, configuration for the get
+        method.
+      chunk_size (int): The size of the chunks in bytes, the last chunk may be
+        smaller.
+
+    Usage:
+
+    .. code-block:: python
+
+      async for chunk in client.aio.files.iter_download(file=video):
+        ...
+    """
+    path, http_options = _download_request(self._api_client, file, config)
+    return self._api_client.async_iter_download(
+        path, http_options=http_options, chunk_size=chunk_size
+    )
@@ -55,21 +55,17 @@ except ModuleNotFoundError:
 if typing.TYPE_CHECKING:
   from mcp import ClientSession as McpClientSession
   from mcp.types import Tool as McpTool
-  from ._adapters import McpToGenAiToolAdapter
   from ._mcp_utils import mcp_to_gemini_tool
 else:
   McpClientSession: typing.Type = Any
   McpTool: typing.Type = Any
-  McpToGenAiToolAdapter: typing.Type = Any
   try:
     from mcp import ClientSession as McpClientSession
     from mcp.types import Tool as McpTool
-    from ._adapters import McpToGenAiToolAdapter
     from ._mcp_utils import mcp_to_gemini_tool
   except ImportError:
     McpClientSession = None
     McpTool = None
-    McpToGenAiToolAdapter = None
     mcp_to_gemini_tool = None
 
 logger = logging.getLogger('google_genai.live')
@@ -1135,11 +1131,9 @@ async def _t_live_connect_config(
     parameter_model_copy.tools = []
     for tool in parameter_model.tools:
       if McpClientSession is not None and isinstance(tool, McpClientSession):
-        mcp_to_genai_tool_adapter = McpToGenAiToolAdapter(
-            tool, await tool.list_tools()
-        )
+        _, genai_tools = await _mcp_utils.list_mcp_session_tools(tool)
         # Extend the config with the MCP session tools converted to GenAI tools.
-        parameter_model_copy.tools.extend(mcp_to_genai_tool_adapter.tools)
+        parameter_model_copy.tools.extend(genai_tools)
       elif McpTool is not None and isinstance(tool, McpTool):
         parameter_model_copy.tools.append(mcp_to_gemini_tool(tool))
       else:
@@ -17,27 +17,146 @@
 
 from __future__ import annotations
 
+import array
+import collections
+import concurrent.futures
+import dataclasses
+import hashlib
+import io
+import itertools
 import logging
-from typing import Any, Iterable
+import math
+import re
+import threading
+import time
+import typing
+from typing import Any, BinaryIO, Iterable, Iterator, Literal, Sequence, cast
 from typing import Optional, Union
 
 from sentencepiece import sentencepiece_model_pb2
 
 from . import _common
 from . import _local_tokenizer_loader as loader
+from . import _media_token_estimator
 from . import _transformers as t
 from . import types
 
+if typing.TYPE_CHECKING:
+  import numpy
+else:
+  try:
+    import numpy
+  except ImportError:
+    numpy = None
+
 logger = logging.getLogger("google_genai.local_tokenizer")
 
+_DEFAULT_TOKEN_COUNT_CACHE_SIZE = 10000
+_DEFAULT_CHUNK_BATCH_SIZE = 256
+# The seconds after which a tokenizer model that failed to load is tried again.
+_TOKENIZER_LOAD_RETRY_SECONDS = 300.0
+# Text without any boundary is cut into segments of at most this many
+# characters, so the chunker never buffers an unbounded amount of text.
+_MAX_SEGMENT_CHARS = 16384
+
+# Whitespace after the end of a sentence, or containing an empty line. Text is
+# split at the start of the match, so whitespace begins the next segment.
+_SEGMENT_BOUNDARY = re.compile(
+    r"(?:(?<=[.!?])|(?<=[.!?][\"')\]\u201d\u2019]))\s+|\s*\n[ \t]*\n\s*"
+)
+
 __all__ = [
     "_parse_hex_byte",
     "_token_str_to_bytes",
     "LocalTokenizer",
+    "CompactTokensInfo",
+    "TextChunk",
+    "LocalTokenCounter",
+    "LocalTokenCounterStats",
     "_TextsAccumulator",
 ]
 
 
+@dataclasses.dataclass
+class CompactTokensInfo:
+  """[Experimental] The tokens of one text, stored as compact arrays.
+
+  Attributes:
+    token_ids: The token ids.
+    role: The role of the content the text belongs to.
+    tokens: The bytes of all tokens, concatenated. Only set if requested.
+    token_offsets: The offset of each token in `tokens`, followed by the
+      length of `tokens`. Only set if requested.
+  """
+
+  token_ids: array.array  # type: ignore[type-arg]
+  role: Optional[str] = None
+  tokens: Optional[bytes] = None
+  token_offsets: Optional[array.array] = None  # type: ignore[type-arg]
+
+  def token(self, index: int) -> bytes:
+    """Returns the bytes of the token at the index."""
+    if self.tokens is None or self.token_offsets is None:
+      raise ValueError("Tokens were not requested.")
+    return self.tokens[
+        self.token_offsets[index] : self.token_offsets[index + 1]
+    ]
+
+
+@dataclasses.dataclass
+class TextChunk:
+  """[Experimental] A chunk of a document produced by `chunk_text`.
+
+  Attributes:
+    text: The text of the chunk, including any overlap with the previous
+      chunk.
+    token_count: The number of tokens in the chunk.
+  """
+
+  text: str
+  token_count: int
+
+
+@dataclasses.dataclass
+class _Segment:
+  text: str
+  token_count: int
+  ends_paragraph: bool
+
+
+def _iter_segment_texts(
+    text: Union[str, Iterable[str]],
+) -> Iterator[tuple[str, bool]]:
+  """Splits streamed text at sentence and paragraph boundaries.
+
+  Yields:
+    The text of each segment and whether it ends a paragraph.
+  """
+  pieces: Iterable[str] = [text] if isinstance(text, str) else text
+  buffer = ""
+  for piece in itertools.chain(pieces, [None]):
+    final = piece is None
+    if not final:
+      buffer += cast(str, piece)
+    start = 0
+    for match in _SEGMENT_BOUNDARY.finditer(buffer):
+      # A boundary at the end of the buffer may continue in the next piece.
+      if match.end() == len(buffer) and not final:
+        break
+      if match.start() > start:
+        yield buffer[start : match.start()], match.group().count("\n") >= 2
+        start = match.start()
+    buffer = buffer[start:]
+    while len(buffer) > _MAX_SEGMENT_CHARS:
+      cut = buffer.rfind(" ", 1, _MAX_SEGMENT_CHARS)
+      if cut <= 0:
+        cut = _MAX_SEGMENT_CHARS
+      yield buffer[:cut], False
+      buffer = buffer[cut:]
+  if buffer:
+    yield buffer, True
+
+
 class _TextsAccumulator:
   """Accumulates countable texts from `Content` and `Tool` objects.
 
@@ -58,12 +177,18 @@ class _TextsAccumulator:
   signifies the presence of unsupported fields, and a warning is logged.
   """
 
-  def __init__(self) -> None:
+  def __init__(self, estimate_media: bool = False) -> None:
     self._texts: list[str] = []
+    self._estimate_media = estimate_media
+    self._media_tokens = 0
 
   def get_texts(self) -> Iterable[str]:
     return self._texts
 
+  def get_media_tokens(self) -> int:
+    """Returns the estimated number of tokens of the media parts."""
+    return self._media_tokens
+
   def add_contents(self, contents: Iterable[types.Content]) -> None:
     for content in contents:
       self.add_content(content)
@@ -75,9 +200,13 @@ class _TextsAccumulator:
         assert counted_content.parts is not None
         counted_part = types.Part()
         if part.file_data is not None or part.inline_data is not None:
-          raise ValueError(
-              "LocalTokenizers do not support non-text content types."
-          )
+          if not self._estimate_media:
+            raise ValueError(
+                "LocalTokenizers do not support non-text content types."
+            )
+          self.add_media(part)
+          counted_part.file_data = part.file_data
+          counted_part.inline_data = part.inline_data
         if part.video_metadata is not None:
           counted_part.video_metadata = part.video_metadata
         if part.function_call is not None:
@@ -99,6 +228,36 @@ class _TextsAccumulator:
           f" fields {counted_content}. Got {content}."
       )
 
+  def add_media(self, part: types.Part) -> None:
+    """Estimates the tokens of the media of a part from its metadata.
+
+    Text media is tokenized. Other media is estimated from its size, duration
+    or page count; `file_data` must refer to a local file.
+
+    Args:
+        part: The part with `inline_data` or `file_data`.
+    """
+    mime_type = ""
+    if part.inline_data is not None:
+      mime_type = part.inline_data.mime_type or ""
+      data = part.inline_data.data or b""
+      if mime_type.startswith("text/"):
+        self._texts.append(data.decode("utf-8", errors="replace"))
+        return
+      f: BinaryIO = io.BytesIO(data)
+    else:
+      assert part.file_data is not None
+      mime_type = part.file_data.mime_type or ""
+      f = _media_token_estimator.open_local_file(part.file_data.file_uri or "")
+      if mime_type.startswith("text/"):
+        with f:
+          self._texts.append(f.read().decode("utf-8", errors="replace"))
+        return
+    with f:
+      self._media_tokens += _media_token_estimator.estimate_tokens(
+          f, mime_type, part.video_metadata
+      )
+
   def add_function_call(self, function_call: types.FunctionCall) -> None:
     """Processes a function call and adds relevant text to the accumulator.
 
@@ -246,6 +405,115 @@ class _TextsAccumulator:
       return value
 
 
+class _PieceTable:
+  """The bytes of each piece of a tokenizer model, indexed by token id."""
+
+  def __init__(self, model_proto: Any):
+    # model_proto is a sentencepiece_model_pb2.ModelProto, which has no type
+    # stubs.
+    self.piece_bytes = [
+        _token_str_to_bytes(piece.piece, piece.type)
+        for piece in model_proto.pieces
+    ]
+    self._piece_lengths = [len(b) for b in self.piece_bytes]
+    if numpy is not None:
+      self._np_lengths = numpy.array(self._piece_lengths, dtype=numpy.int64)
+      self._np_starts = numpy.cumsum(self._np_lengths) - self._np_lengths
+      self._np_buffer = numpy.frombuffer(
+          b"".join(self.piece_bytes), dtype=numpy.uint8
+      )
+
+  def join(
+      self, ids: Sequence[int]
+  ) -> tuple[bytes, array.array]:  # type: ignore[type-arg]
+    """Returns the concatenated bytes of the tokens and their offsets."""
+    offsets = array.array("q")
+    if numpy is None:
+      offsets.extend(
+          itertools.accumulate(
+              itertools.chain((0,), map(self._piece_lengths.__getitem__, ids))
+          )
+      )
+      return b"".join(map(self.piece_bytes.__getitem__, ids)), offsets
+
+    # Gathers the bytes of all tokens at once: each output byte is read from
+    # the start of its piece plus its position within the token.
+    np_ids = numpy.asarray(ids, dtype=numpy.int64)
+    lengths = self._np_lengths[np_ids]
+    np_offsets = numpy.zeros(len(np_ids) + 1, dtype=numpy.int64)
+    numpy.cumsum(lengths, out=np_offsets[1:])
+    token_of_byte = numpy.repeat(numpy.arange(len(np_ids)), lengths)
+    positions = (
+        numpy.arange(np_offsets[-1])
+        - np_offsets[token_of_byte]
+        + self._np_starts[np_ids][token_of_byte]
+    )
+    offsets.frombytes(np_offsets.tobytes())
+    return self._np_buffer[positions].tobytes(), offsets
+
+
+def _item_texts(
+    contents: Union[types.ContentListUnion, types.ContentListUnionDict],
+) -> list[str]:
+  """Returns the countable texts of one `count_tokens_batch` item."""
+  # Plain text items skip building `Content` objects.
+  if isinstance(contents, str):
+    return [contents]
+  if isinstance(contents, list) and all(
+      isinstance(item, str) for item in contents
+  ):
+    return list(contents)
+  text_accumulator = _TextsAccumulator()
+  text_accumulator.add_contents(t.t_contents(contents))
+  return list(text_accumulator.get_texts())
+
+
+def _texts_and_roles(
+    contents: Union[types.ContentListUnion, types.ContentListUnionDict],
+) -> tuple[list[str], list[Optional[str]]]:
+  """Returns the texts to compute tokens for, and the role of each text."""
+  processed_contents = t.t_contents(contents)
+  text_accumulator = _TextsAccumulator()
+  for content in processed_contents:
+    text_accumulator.add_content(content)
+
+  roles = []
+  for content in processed_contents:
+    if content.parts:
+      for _ in content.parts:
+        roles.append(content.role)
+  return list(text_accumulator.get_texts()), roles
+
+
+def _paragraph_cut(
+    window: collections.deque[_Segment], max_tokens: int, overlap_count: int
+) -> Optional[int]:
+  """Returns the number of segments up to the last paragraph break.
+
+  Returns None if there is no paragraph break after the first half of
+  `max_tokens` and after the first `overlap_count` segments.
+  """
+  cut = None
+  tokens = 0
+  for i, segment in enumerate(window):
+    tokens += segment.token_count
+    if (
+        segment.ends_paragraph
+        and i >= overlap_count
+        and tokens * 2 >= max_tokens
+    ):
+      cut = i + 1
+  return cut
+
+
+def _count_text_tokens_in_process(
+    tokenizer_name: str, cache_dir: Optional[str], texts: list[str]
+) -> list[int]:
+  """Counts the tokens of each text in a worker process."""
+  tokenizer = loader.get_sentencepiece(tokenizer_name, cache_dir)
+  return [len(tokens) for tokens in tokenizer.encode(texts)]
+
+
 def _token_str_to_bytes(
     token: str, type: sentencepiece_model_pb2.ModelProto.SentencePiece.Type
 ) -> bytes:
@@ -277,24 +545,59 @@ def _parse_hex_byte(token: str) -> int:
   return val
 
 
+def _text_digest(text: str) -> bytes:
+  """Returns the digest that the token count of a text is cached by."""
+  return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
 class LocalTokenizer:
   """[Experimental] Text Only Local Tokenizer.
 
   This class provides a local tokenizer for text only token counting.
 
   LIMITATIONS:
-  - Only supports text based tokenization and no multimodal tokenization.
+  - Only supports text based tokenization. The tokens of images, audio, video
+  and PDF documents can only be estimated, with
+  `count_tokens(..., estimate_media=True)`.
   - Forward compatibility depends on the open-source tokenizer models for future
   Gemini versions.
   - For token counting of tools and response schemas, the `LocalTokenizer` only
   supports `types.Tool` and `types.Schema` objects. Python functions or Pydantic
   models cannot be passed directly.
+
+  The tokenizer model is downloaded once and cached in `cache_dir`, which
+  defaults to the `GOOGLE_GENAI_TOKENIZER_CACHE_DIR` environment variable or a
+  directory in the system temporary directory. Point it at a persistent
+  directory, or at one pre-seeded when building an image, to avoid downloads.
+  Models are loaded once per process.
+
+  `count_tokens` remembers the token counts of the last
+  `token_count_cache_size` distinct texts, so repeated system instructions,
+  tool declarations and chat turns are not encoded again. The counts are keyed
+  by a digest of each text, so the texts themselves are not kept in memory.
+  Set it to 0 to disable the cache.
   """
 
-  def __init__(self, model_name: str):
+  def __init__(
+      self,
+      model_name: str,
+      *,
+      cache_dir: Optional[str] = None,
+      token_count_cache_size: int = _DEFAULT_TOKEN_COUNT_CACHE_SIZE,
+  ):
     self._tokenizer_name = loader.get_tokenizer_name(model_name)
-    self._model_proto = loader.load_model_proto(self._tokenizer_name)
-    self._tokenizer = loader.get_sentencepiece(self._tokenizer_name)
+    self._cache_dir = cache_dir
+    self._token_count_cache_size = token_count_cache_size
+    # Token counts keyed by the digests of the texts.
+    self._token_counts: collections.OrderedDict[bytes, int] = (
+        collections.OrderedDict()
+    )
+    self._token_counts_lock = threading.Lock()
+    self._piece_table: Optional[_PieceTable] = None
+    self._model_proto = loader.load_model_proto(
+        self._tokenizer_name, cache_dir
+    )
+    self._tokenizer = loader.get_sentencepiece(self._tokenizer_name, cache_dir)
 
   @_common.experimental_warning(
       "The SDK's local tokenizer implementation is experimental and may change"
@@ -305,12 +608,17 @@ class LocalTokenizer:
       contents: Union[types.ContentListUnion, types.ContentListUnionDict],
       *,
       config: Optional[types.CountTokensConfigOrDict] = None,
+      estimate_media: bool = False,
   ) -> types.CountTokensResult:
     """Counts the number of tokens in a given text.
 
     Args:
       contents: The contents to tokenize.
       config: The configuration for counting tokens.
+      estimate_media: Whether to estimate the tokens of images, audio, video
+        and PDF documents from their metadata, with the documented token rates
+        of each modality, instead of raising an error. `file_data` parts must
+        refer to local files. The estimates may differ from the API count.
 
     Returns:
       A `CountTokensResult` containing the total number of tokens.
@@ -326,7 +634,7 @@ class LocalTokenizer:
       # total_tokens=5
     """
     processed_contents = t.t_contents(contents)
-    text_accumulator = _TextsAccumulator()
+    text_accumulator = _TextsAccumulator(estimate_media=estimate_media)
     config = types.CountTokensConfig.model_validate(config or {})
     text_accumulator.add_contents(processed_contents)
     if config.tools:
@@ -335,11 +643,312 @@ class LocalTokenizer:
       text_accumulator.add_schema(config.generation_config.response_schema)
     if config.system_instruction:
       text_accumulator.add_contents(t.t_contents([config.system_instruction]))
-    tokens_list = self._tokenizer.encode(list(text_accumulator.get_texts()))
     return types.CountTokensResult(
-        total_tokens=sum(len(tokens) for tokens in tokens_list)
+        total_tokens=sum(self._count_texts(list(text_accumulator.get_texts())))
+        + text_accumulator.get_media_tokens()
     )
 
+  @_common.experimental_warning(
+      "The SDK's local tokenizer implementation is experimental and may change"
+      " in the future. It only supports text based tokenization."
+  )
+  def count_tokens_incremental(
+      self,
+      previous_result: types.CountTokensResult,
+      new_contents: Union[types.ContentListUnion, types.ContentListUnionDict],
+  ) -> types.CountTokensResult:
+    """Adds the tokens of new contents to a previous token count.
+
+    Use it to keep the token count of a growing chat history up to date
+    without counting the earlier turns, tools or system instruction again.
+
+    Args:
+      previous_result: The token count of the contents so far.
+      new_contents: The contents added since `previous_result` was counted.
+
+    Returns:
+      A `CountTokensResult` containing the total number of tokens.
+
+    Usage:
+
+    .. code-block:: python
+
+      from google import genai
+      from google.genai import types
+      tokenizer = genai.LocalTokenizer(model_name='gemini-2.0-flash-001')
+      result = tokenizer.count_tokens("What is your name?")
+      result = tokenizer.count_tokens_incremental(
+          result, types.Content(role='model', parts=[types.Part(text='Bard')])
+      )
+    """
+    text_accumulator = _TextsAccumulator()
+    text_accumulator.add_contents(t.t_contents(new_contents))
+    return types.CountTokensResult(
+        total_tokens=(previous_result.total_tokens or 0)
+        + sum(self._count_texts(list(text_accumulator.get_texts())))
+    )
+
+  def _count_texts(self, texts: list[str]) -> list[int]:
+    """Returns the token count of each text, encoding only unseen texts."""
+    if not self._token_count_cache_size:
+      return [len(tokens) for tokens in self._tokenizer.encode(texts)]
+
+    keys = [_text_digest(text) for text in texts]
+    counts: list[Optional[int]] = []
+    misses = []
+    miss_keys = []
+    with self._token_counts_lock:
+      for text, key in zip(texts, keys):
+        count = self._token_counts.get(key)
+        if count is None:
+          misses.append(text)
+          miss_keys.append(key)
+        else:
+          self._token_counts.move_to_end(key)
+        counts.append(count)
+    if not misses:
+      return cast(list[int], counts)
+
+    miss_counts = [len(tokens) for tokens in self._tokenizer.encode(misses)]
+    with self._token_counts_lock:
+      for key, count in zip(miss_keys, miss_counts):
+        self._token_counts[key] = count
+        self._token_counts.move_to_end(key)
+      while len(self._token_counts) > self._token_count_cache_size:
+        self._token_counts.popitem(last=False)
+    miss_counts_iter = iter(miss_counts)
+    return [
+        next(miss_counts_iter) if count is None else count for count in counts
+    ]
+
+  @_common.experimental_warning(
+      "The SDK's local tokenizer implementation is experimental and may change"
+      " in the future. It only supports text based tokenization."
+  )
+  def count_tokens_batch(
+      self,
+      contents_list: Sequence[
+          Union[types.ContentListUnion, types.ContentListUnionDict]
+      ],
+      *,
+      config: Optional[types.CountTokensConfigOrDict] = None,
+      num_threads: Optional[int] = None,
+      num_processes: Optional[int] = None,
+  ) -> list[int]:
+    """Counts the number of tokens of each item in a batch.
+
+    Each item is counted as if passed to `count_tokens` with the same
+    `config`, but the texts of all items are tokenized together, which avoids
+    the per-call overhead when counting many inputs.
+
+    Args:
+      contents_list: The contents to tokenize, one item per count.
+      config: The configuration for counting tokens, applied to every item.
+      num_threads: The number of threads sentencepiece encodes with. Defaults
+        to all available cores.
+      num_processes: If set, texts are split across a pool of this many
+        processes, for very large batches.
+
+    Returns:
+      The total number of tokens of each item, in input order.
+
+    Usage:
+
+    .. code-block:: python
+
+      from google import genai
+      tokenizer = genai.LocalTokenizer(model_name='gemini-2.0-flash-001')
+      totals = tokenizer.count_tokens_batch(["What is your name?", "Hello"])
+      print(totals)
+      # [5, 1]
+    """
+    config = types.CountTokensConfig.model_validate(config or {})
+    config_text_accumulator = _TextsAccumulator()
+    if config.tools:
+      config_text_accumulator.add_tools(config.tools)
+    if config.generation_config and config.generation_config.response_schema:
+      config_text_accumulator.add_schema(
+          config.generation_config.response_schema
+      )
+    if config.system_instruction:
+      config_text_accumulator.add_contents(
+          t.t_contents([config.system_instruction])
+      )
+    config_texts = list(config_text_accumulator.get_texts())
+
+    texts = list(config_texts)
+    item_ends = []
+    for contents in contents_list:
+      texts.extend(_item_texts(contents))
+      item_ends.append(len(texts))
+
+    if not texts:
+      return [0] * len(item_ends)
+    if num_processes and num_processes > 1:
+      text_counts = self._count_text_tokens_in_processes(texts, num_processes)
+    else:
+      text_counts = [
+          len(tokens)
+          for tokens in self._tokenizer.encode(texts, num_threads=num_threads)
+      ]
+
+    config_total = sum(text_counts[: len(config_texts)])
+    totals = []
+    start = len(config_texts)
+    for end in item_ends:
+      totals.append(config_total + sum(text_counts[start:end]))
+      start = end
+    return totals
+
+  @_common.experimental_warning(
+      "The SDK's local tokenizer implementation is experimental and may change"
+      " in the future. It only supports text based tokenization."
+  )
+  def chunk_text(
+      self,
+      text: Union[str, Iterable[str]],
+      *,
+      max_tokens: int,
+      overlap_tokens: int = 0,
+      boundary: Literal["paragraph", "sentence"] = "paragraph",
+      batch_size: int = _DEFAULT_CHUNK_BATCH_SIZE,
+  ) -> Iterator[TextChunk]:
+    """Splits a document into chunks of at most `max_tokens` tokens.
+
+    The document is split into sentences, which are tokenized in batches of
+    `batch_size` as the document is read, and packed into chunks. Only the
+    sentences of the current chunk are kept in memory, so `text` can be an
+    iterator over a large file.
+
+    Chunks end at sentence boundaries, except for sentences longer than
+    `max_tokens`, which are split between tokens. The token count of a chunk
+    is the sum of the token counts of its sentences, each tokenized on its
+    own.
+
+    Args:
+      text: The document, or an iterable of consecutive pieces of it such as a
+        file opened in text mode.
+      max_tokens: The maximum number of tokens in a chunk.
+      overlap_tokens: The maximum number of tokens at the end of a chunk that
+        are repeated at the start of the next one. Overlap is made of whole
+        sentences.
+      boundary: With "paragraph", a chunk ends at the last paragraph break in
+        it, if that keeps the chunk at least half full. With "sentence",
+        chunks are filled up to the last sentence that fits.
+      batch_size: The number of sentences to tokenize at once.
+
+    Yields:
+      The chunks, in document order.
+
+    Usage:
+
+    .. code-block:: python
+
+      from google import genai
+      tokenizer = genai.LocalTokenizer(model_name='gemini-2.0-flash-001')
+      with open('document.txt') as f:
+        for chunk in tokenizer.chunk_text(f, max_tokens=512, overlap_tokens=64):
+          print(chunk.token_count, chunk.text[:20])
+    """
+    if max_tokens <= 0:
+      raise ValueError("max_tokens must be positive.")
+    if not 0 <= overlap_tokens < max_tokens:
+      raise ValueError("overlap_tokens must be in [0, max_tokens).")
+    if boundary not in ("paragraph", "sentence"):
+      raise ValueError(
+          f'boundary must be "paragraph" or "sentence", got {boundary!r}.'
+      )
+
+    window: collections.deque[_Segment] = collections.deque()
+    window_tokens = 0
+    # The number of segments at the start of the window repeated from the
+    # previous chunk.
+    overlap_count = 0
+
+    for segment in self._iter_segments(text, max_tokens, batch_size):
+      while window and window_tokens + segment.token_count > max_tokens:
+        if overlap_count == len(window):
+          # Drops repeated segments rather than emit a chunk without new text.
+          window_tokens -= window.popleft().token_count
+          overlap_count -= 1
+          continue
+        cut = len(window)
+        if boundary == "paragraph":
+          cut = _paragraph_cut(window, max_tokens, overlap_count) or cut
+        emitted = [window.popleft() for _ in range(cut)]
+        emitted_tokens = sum(s.token_count for s in emitted)
+        window_tokens -= emitted_tokens
+        yield TextChunk(
+            text="".join(s.text for s in emitted), token_count=emitted_tokens
+        )
+        overlap: list[_Segment] = []
+        overlap_tokens_used = 0
+        for previous in reversed(emitted):
+          if overlap_tokens_used + previous.token_count > overlap_tokens:
+            break
+          overlap.append(previous)
+          overlap_tokens_used += previous.token_count
+        window.extendleft(overlap)
+        window_tokens += overlap_tokens_used
+        overlap_count = len(overlap)
+      window.append(segment)
+      window_tokens += segment.token_count
+
+    if len(window) > overlap_count:
+      yield TextChunk(
+          text="".join(s.text for s in window), token_count=window_tokens
+      )
+
+  def _iter_segments(
+      self, text: Union[str, Iterable[str]], max_tokens: int, batch_size: int
+  ) -> Iterator[_Segment]:
+    """Yields the segments of the text with their token counts."""
+    segment_texts = _iter_segment_texts(text)
+    while True:
+      batch = list(itertools.islice(segment_texts, batch_size))
+      if not batch:
+        return
+      ids_list = self._tokenizer.encode([text for text, _ in batch])
+      for (segment_text, ends_paragraph), ids in zip(batch, ids_list):
+        if len(ids) <= max_tokens:
+          yield _Segment(segment_text, len(ids), ends_paragraph)
+          continue
+        # Splits a segment longer than a chunk between tokens, at the byte
+        # offsets of the tokens in the text.
+        text_bytes = segment_text.encode("utf-8")
+        pieces = self._tokenizer.encode(segment_text, out_type="proto").pieces
+        for start in range(0, len(pieces), max_tokens):
+          end = min(start + max_tokens, len(pieces))
+          begin_offset = pieces[start].begin if start else 0
+          end_offset = pieces[end].begin if end < len(pieces) else None
+          yield _Segment(
+              text_bytes[begin_offset:end_offset].decode(
+                  "utf-8", errors="replace"
+              ),
+              end - start,
+              ends_paragraph and end == len(pieces),
+          )
+
+  def _count_text_tokens_in_processes(
+      self, texts: list[str], num_processes: int
+  ) -> list[int]:
+    """Counts the tokens of each text across a pool of processes."""
+    chunk_size = math.ceil(len(texts) / (num_processes * 4))
+    chunks = [
+        texts[start : start + chunk_size]
+        for start in range(0, len(texts), chunk_size)
+    ]
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=num_processes
+    ) as executor:
+      chunk_counts = executor.map(
+          _count_text_tokens_in_process,
+          [self._tokenizer_name] * len(chunks),
+          [self._cache_dir] * len(chunks),
+          chunks,
+      )
+      return [count for counts in chunk_counts for count in counts]
+
   @_common.experimental_warning(
       "The SDK's local tokenizer implementation is experimental and may change"
       " in the future. It only supports text based tokenization."
@@ -366,32 +975,374 @@ class LocalTokenizer:
       print(result)
       # tokens_info=[TokensInfo(token_ids=[279, 329, 1313, 2508, 13], tokens=[b' What', b' is', b' your', b' name', b'?'], role='user')]
     """
-    processed_contents = t.t_contents(contents)
-    text_accumulator = _TextsAccumulator()
-    for content in processed_contents:
-      text_accumulator.add_content(content)
-    tokens_protos = self._tokenizer.EncodeAsImmutableProto(
-        text_accumulator.get_texts()
+    texts, roles = _texts_and_roles(contents)
+    return self._compute_tokens_result(self._tokenizer.encode(texts), roles)
+
+  @_common.experimental_warning(
+      "The SDK's local tokenizer implementation is experimental and may change"
+      " in the future. It only supports text based tokenization."
+  )
+  def compute_tokens_batch(
+      self,
+      contents_list: Sequence[
+          Union[types.ContentListUnion, types.ContentListUnionDict]
+      ],
+      *,
+      num_threads: Optional[int] = None,
+  ) -> list[types.ComputeTokensResult]:
+    """Computes the token ids and string pieces of each item in a batch.
+
+    The texts of all items are tokenized with one multi-threaded
+    sentencepiece call.
+
+    Args:
+      contents_list: The contents to tokenize, one item per result.
+      num_threads: The number of threads sentencepiece encodes with. Defaults
+        to all available cores.
+
+    Returns:
+      A `ComputeTokensResult` for each item, in input order.
+    """
+    items = [_texts_and_roles(contents) for contents in contents_list]
+    ids_list = self._encode_items([texts for texts, _ in items], num_threads)
+    return [
+        self._compute_tokens_result(item_ids, roles)
+        for item_ids, (_, roles) in zip(ids_list, items)
+    ]
+
+  @_common.experimental_warning(
+      "The SDK's local tokenizer implementation is experimental and may change"
+      " in the future. It only supports text based tokenization."
+  )
+  def compute_tokens_compact(
+      self,
+      contents: Union[types.ContentListUnion, types.ContentListUnionDict],
+      *,
+      include_tokens: bool = False,
+  ) -> list[CompactTokensInfo]:
+    """Computes the token ids, and optionally pieces, as compact arrays.
+
+    Unlike `compute_tokens`, no Python object is created per token, which
+    makes it suitable for very long documents.
+
+    Args:
+      contents: The contents to tokenize.
+      include_tokens: Whether to also return the token bytes, concatenated,
+        with the offset of each token.
+
+    Returns:
+      A `CompactTokensInfo` for each text in the contents.
+
+    Usage:
+
+    .. code-block:: python
+
+      from google import genai
+      tokenizer = genai.LocalTokenizer(model_name='gemini-2.0-flash-001')
+      info, = tokenizer.compute_tokens_compact(
+          "What is your name?", include_tokens=True
+      )
+      print(info.token_ids, info.token(0))
+      # array('i', [3689, 603, 861, 1503, 235336]) b'What'
+    """
+    return self._compute_tokens_compact_batch(
+        [contents], include_tokens=include_tokens, num_threads=None
+    )[0]
+
+  @_common.experimental_warning(
+      "The SDK's local tokenizer implementation is experimental and may change"
+      " in the future. It only supports text based tokenization."
+  )
+  def compute_tokens_compact_batch(
+      self,
+      contents_list: Sequence[
+          Union[types.ContentListUnion, types.ContentListUnionDict]
+      ],
+      *,
+      include_tokens: bool = False,
+      num_threads: Optional[int] = None,
+  ) -> list[list[CompactTokensInfo]]:
+    """Batch variant of `compute_tokens_compact`.
+
+    Args:
+      contents_list: The contents to tokenize, one item per result.
+      include_tokens: Whether to also return the token bytes, concatenated,
+        with the offset of each token.
+      num_threads: The number of threads sentencepiece encodes with. Defaults
+        to all available cores.
+
+    Returns:
+      The `CompactTokensInfo` of each text, for each item in input order.
+    """
+    return self._compute_tokens_compact_batch(
+        contents_list, include_tokens=include_tokens, num_threads=num_threads
     )
 
-    roles = []
-    for content in processed_contents:
-      if content.parts:
-        for _ in content.parts:
-          roles.append(content.role)
+  def _compute_tokens_compact_batch(
+      self,
+      contents_list: Sequence[
+          Union[types.ContentListUnion, types.ContentListUnionDict]
+      ],
+      *,
+      include_tokens: bool,
+      num_threads: Optional[int],
+  ) -> list[list[CompactTokensInfo]]:
+    items = [_texts_and_roles(contents) for contents in contents_list]
+    ids_list = self._encode_items([texts for texts, _ in items], num_threads)
+    piece_table = self._get_piece_table() if include_tokens else None
+    results = []
+    for item_ids, (_, roles) in zip(ids_list, items):
+      infos = []
+      for ids, role in zip(item_ids, roles):
+        info = CompactTokensInfo(token_ids=array.array("i", ids), role=role)
+        if piece_table is not None:
+          info.tokens, info.token_offsets = piece_table.join(ids)
+        infos.append(info)
+      results.append(infos)
+    return results
+
+  def _encode_items(
+      self, texts_list: list[list[str]], num_threads: Optional[int]
+  ) -> list[list[list[int]]]:
+    """Encodes the texts of all items with one call, grouped by item."""
+    flat_texts = [text for texts in texts_list for text in texts]
+    if not flat_texts:
+      return [[] for _ in texts_list]
+    flat_ids = self._tokenizer.encode(flat_texts, num_threads=num_threads)
+    ids_list = []
+    start = 0
+    for texts in texts_list:
+      ids_list.append(flat_ids[start : start + len(texts)])
+      start += len(texts)
+    return ids_list
 
+  def _get_piece_table(self) -> _PieceTable:
+    """Returns the piece table of the model, building it on first use."""
+    if self._piece_table is None:
+      self._piece_table = _PieceTable(self._model_proto)
+    return self._piece_table
+
+  def _compute_tokens_result(
+      self, ids_list: Sequence[Sequence[int]], roles: list[Optional[str]]
+  ) -> types.ComputeTokensResult:
+    piece_bytes = self._get_piece_table().piece_bytes
     token_infos = []
-    for tokens_proto, role in zip(tokens_protos, roles):
+    for ids, role in zip(ids_list, roles):
       token_infos.append(
           types.TokensInfo(
-              token_ids=[piece.id for piece in tokens_proto.pieces],
-              tokens=[
-                  _token_str_to_bytes(
-                      piece.piece, self._model_proto.pieces[piece.id].type
-                  )
-                  for piece in tokens_proto.pieces
-              ],
+              token_ids=list(ids),
+              tokens=list(map(piece_bytes.__getitem__, ids)),
               role=role,
           )
       )
     return types.ComputeTokensResult(tokens_info=token_infos)
+
+
+_LOCALLY_COUNTABLE_PART_FIELDS = frozenset(
+    {"text", "function_call", "function_response"}
+)
+_LOCALLY_COUNTABLE_FUNCTION_DECLARATION_FIELDS = frozenset(
+    {"name", "description", "parameters", "response"}
+)
+
+
+def _is_locally_countable_contents(contents: list[types.Content]) -> bool:
+  for content in contents:
+    for part in content.parts or []:
+      if set(part.model_dump(exclude_none=True)) - (
+          _LOCALLY_COUNTABLE_PART_FIELDS
+      ):
+        return False
+  return True
+
+
+def _is_locally_countable_config(config: types.CountTokensConfig) -> bool:
+  if config.system_instruction is not None and not (
+      _is_locally_countable_contents(t.t_contents([config.system_instruction]))
+  ):
+    return False
+  for tool in config.tools or []:
+    if set(tool.model_dump(exclude_none=True)) - {"function_declarations"}:
+      return False
+    for function_declaration in tool.function_declarations or []:
+      if set(function_declaration.model_dump(exclude_none=True)) - (
+          _LOCALLY_COUNTABLE_FUNCTION_DECLARATION_FIELDS
+      ):
+        return False
+  if config.generation_config is not None and set(
+      config.generation_config.model_dump(exclude_none=True)
+  ) - {"response_schema"}:
+    return False
+  return True
+
+
+@dataclasses.dataclass
+class LocalTokenCounterStats:
+  """[Experimental] Statistics of a `LocalTokenCounter`.
+
+  Attributes:
+    local_counts: The number of requests counted locally.
+    remote_counts: The number of requests sent to the API because they could
+      not be counted locally.
+    verifications: The number of local counts checked against the API.
+    mismatches: The number of checked counts that differed from the API.
+  """
+
+  local_counts: int = 0
+  remote_counts: int = 0
+  verifications: int = 0
+  mismatches: int = 0
+
+
+class LocalTokenCounter:
+  """[Experimental] Answers `count_tokens` requests locally when possible.
+
+  Pass it to the client to count the tokens of text, function call and
+  function declaration contents with a `LocalTokenizer` instead of calling
+  the API. Requests with other contents, such as images, tools other than
+  function declarations, or models without a local tokenizer, are sent to the
+  API.
+
+  Every `verify_every` local counts, the request is also sent to the API and
+  the API count is returned. If the local count differs from it by more than
+  `tolerance` (a fraction of the API count), a warning is logged and the
+  model's requests are sent to the API from then on.
+
+  If the tokenizer model of a model cannot be downloaded or loaded, its
+  requests are sent to the API, and loading it is tried again a few minutes
+  later.
+
+  Usage:
+
+  .. code-block:: python
+
+    from google import genai
+    from google.genai import local_tokenizer
+
+    client = genai.Client(
+        api_key='my-api-key',
+        local_token_counter=local_tokenizer.LocalTokenCounter(
+            verify_every=1000
+        ),
+    )
+    response = client.models.count_tokens(
+        model='gemini-2.0-flash', contents='What is your name?'
+    )
+  """
+
+  def __init__(
+      self,
+      *,
+      verify_every: Optional[int] = None,
+      tolerance: float = 0.0,
+      cache_dir: Optional[str] = None,
+  ):
+    if verify_every is not None and verify_every <= 0:
+      raise ValueError("verify_every must be positive.")
+    self._verify_every = verify_every
+    self._tolerance = tolerance
+    self._cache_dir = cache_dir
+    self._tokenizers: dict[str, LocalTokenizer] = {}
+    self._mismatched_models: set[str] = set()
+    # The times at which loading each tokenizer model last failed.
+    self._failed_loads: dict[str, float] = {}
+    self._stats = LocalTokenCounterStats()
+    self._lock = threading.Lock()
+
+  def stats(self) -> LocalTokenCounterStats:
+    """Returns a copy of the statistics of the counter."""
+    with self._lock:
+      return dataclasses.replace(self._stats)
+
+  def _get_tokenizer(self, model: str) -> Optional[LocalTokenizer]:
+    model_name = model.split("/")[-1]
+    if model_name in self._mismatched_models:
+      return None
+    try:
+      tokenizer_name = loader.get_tokenizer_name(model_name)
+    except ValueError:
+      return None
+    with self._lock:
+      tokenizer = self._tokenizers.get(tokenizer_name)
+    if tokenizer is None:
+      with self._lock:
+        failed_at = self._failed_loads.get(tokenizer_name)
+      if (
+          failed_at is not None
+          and time.monotonic() - failed_at < _TOKENIZER_LOAD_RETRY_SECONDS
+      ):
+        return None
+      try:
+        tokenizer = LocalTokenizer(model_name, cache_dir=self._cache_dir)
+      except Exception as e:  # pylint: disable=broad-except
+        logger.warning(
+            "Failed to load the %s tokenizer model, sending count_tokens"
+            " requests of %s to the API: %s",
+            tokenizer_name,
+            model_name,
+            e,
+        )
+        with self._lock:
+          self._failed_loads[tokenizer_name] = time.monotonic()
+        return None
+      with self._lock:
+        tokenizer = self._tokenizers.setdefault(tokenizer_name, tokenizer)
+    return tokenizer
+
+  def try_count_tokens(
+      self,
+      *,
+      model: str,
+      contents: Union[types.ContentListUnion, types.ContentListUnionDict],
+      config: Optional[types.CountTokensConfigOrDict] = None,
+  ) -> tuple[Optional[types.CountTokensResponse], bool]:
+    """Counts the tokens of a request locally, if possible.
+
+    Returns:
+      The local count, or None if the request must be sent to the API, and
+      whether the count must be verified against the API.
+    """
+    tokenizer = self._get_tokenizer(model)
+    processed_contents = t.t_contents(contents)
+    count_config = types.CountTokensConfig.model_validate(config or {})
+    if (
+        tokenizer is None
+        or not _is_locally_countable_contents(processed_contents)
+        or not _is_locally_countable_config(count_config)
+    ):
+      with self._lock:
+        self._stats.remote_counts += 1
+      return None, False
+
+    result = tokenizer.count_tokens(processed_contents, config=count_config)
+    with self._lock:
+      self._stats.local_counts += 1
+      verify = bool(
+          self._verify_every
+          and self._stats.local_counts % self._verify_every == 0
+      )
+    return (
+        types.CountTokensResponse(total_tokens=result.total_tokens),
+        verify,
+    )
+
+  def record_verification(
+      self, *, model: str, local_tokens: int, remote_tokens: int
+  ) -> None:
+    """Compares a local count with the API count of the same request."""
+    mismatch = abs(local_tokens - remote_tokens) > self._tolerance * max(
+        remote_tokens, 1
+    )
+    with self._lock:
+      self._stats.verifications += 1
+      if mismatch:
+        self._stats.mismatches += 1
+        self._mismatched_models.add(model.split("/")[-1])
+    if mismatch:
+      logger.warning(
+          "Local token count %d of model %s differs from the API count %d."
+          " Sending its count_tokens requests to the API from now on.",
+          local_tokens,
+          model,
+          remote_tokens,
+      )
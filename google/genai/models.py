@@ -17,15 +17,19 @@ from __future__ import annotations
 
 # Code generated by the Google Gen AI SDK generator DO NOT EDIT.
 
+import asyncio
+import copy
 import json
 import logging
-from typing import Any, AsyncIterator, Awaitable, Iterator, Optional, Union
+from typing import Any, AsyncIterator, Awaitable, Iterable, Iterator, Optional, Union
 from urllib.parse import urlencode
 
+from . import _api_client
 from . import _api_module
 from . import _base_transformers as base_t
 from . import _common
 from . import _extra_utils
+from . import _fan_out
 from . import _mcp_utils
 from . import _transformers as t
 from . import errors
@@ -38,6 +42,14 @@ from .pagers import AsyncPager, Pager
 
 logger = logging.getLogger('google_genai.models')
 
+# The errors of the embedding request of a semantic cache lookup, after which
+# the response is generated without the cache.
+_SEMANTIC_CACHE_LOOKUP_ERRORS: tuple[type[Exception], ...] = (
+    errors.APIError,
+    asyncio.TimeoutError,
+    *_api_client._CONNECTION_ERRORS,
+)
+
 
 def _PersonGeneration_to_mldev_enum_validate(enum_value: Any) -> None:
   if enum_value in set(['ALLOW_ALL']):
@@ -3768,6 +3780,20 @@ def _Video_to_vertex(
 
 class Models(_api_module.BaseModule):
 
+  def __init__(self, api_client_: BaseApiClient):
+    super().__init__(api_client_)
+    # The function response caches of a chat, keyed by their configuration.
+    # Other requests cache the function responses of their AFC loop only.
+    self._function_response_caches: Optional[
+        dict[str, _extra_utils.FunctionResponseCache]
+    ] = None
+
+  def _for_chat(self) -> Models:
+    """Returns models that share function response caches across a chat."""
+    models = copy.copy(self)
+    models._function_response_caches = {}
+    return models
+
   def _generate_content(
       self,
       *,
@@ -3927,35 +3953,14 @@ class Models(_api_module.BaseModule):
       self._api_client._verify_response(return_value)
       yield return_value
 
-  def embed_content(
+  def _embed_content(
       self,
       *,
       model: str,
       contents: Union[types.ContentListUnion, types.ContentListUnionDict],
       config: Optional[types.EmbedContentConfigOrDict] = None,
   ) -> types.EmbedContentResponse:
-    """Calculates embeddings for the given contents. Only text is supported.
-
-    Args:
-      model (str): The model to use.
-      contents (list[Content]): The contents to embed.
-      config (EmbedContentConfig): Optional configuration for embeddings.
-
-    Usage:
-
-    .. code-block:: python
-
-      embeddings = client.models.embed_content(
-          model= 'text-embedding-004',
-          contents=[
-              'What is your name?',
-              'What is your favorite color?',
-          ],
-          config={
-              'output_dimensionality': 64
-          },
-      )
-    """
+    """Private method for embedding contents."""
 
     parameter_model = types._EmbedContentParameters(
         model=model,
@@ -4666,33 +4671,14 @@ class Models(_api_module.BaseModule):
     self._api_client._verify_response(return_value)
     return return_value
 
-  def count_tokens(
+  def _count_tokens(
       self,
       *,
       model: str,
       contents: Union[types.ContentListUnion, types.ContentListUnionDict],
       config: Optional[types.CountTokensConfigOrDict] = None,
   ) -> types.CountTokensResponse:
-    """Counts the number of tokens in the given content.
-
-    Multimodal input is supported for Gemini models.
-
-    Args:
-      model (str): The model to use for counting tokens.
-      contents (list[types.Content]): The content to count tokens for.
-      config (CountTokensConfig): The configuration for counting tokens.
-
-    Usage:
-
-    .. code-block:: python
-
-      response = client.models.count_tokens(
-          model='gemini-2.0-flash',
-          contents='What is your name?',
-      )
-      print(response)
-      # total_tokens=5 cached_content_token_count=None
-    """
+    """Private method for counting tokens."""
 
     parameter_model = types._CountTokensParameters(
         model=model,
@@ -4980,7 +4966,40 @@ class Models(_api_module.BaseModule):
       # The image shows a flat lay arrangement of freshly baked blueberry
       # scones.
     """
+    semantic_cache = self._api_client._semantic_cache
+    semantic_lookup = None
+    if semantic_cache is not None:
+      semantic_lookup = semantic_cache.lookup_request(model, contents, config)
+    if semantic_lookup is not None:
+      try:
+        embedding = self.embed_content(
+            model=semantic_cache.embedding_model,  # type: ignore[union-attr]
+            contents=semantic_lookup.prompt,
+            config=semantic_cache.embedding_config,  # type: ignore[union-attr]
+        )
+      except _SEMANTIC_CACHE_LOOKUP_ERRORS as e:
+        logger.warning(f'Skipping the semantic cache: {e}')
+        semantic_lookup = None
+      else:
+        cached_response = semantic_lookup.search(embedding)
+        if cached_response is not None:
+          return cached_response
 
+    response = self._generate_content_with_afc(
+        model=model, contents=contents, config=config
+    )
+    if semantic_lookup is not None:
+      semantic_lookup.add(response)
+    return response
+
+  def _generate_content_with_afc(
+      self,
+      *,
+      model: str,
+      contents: types.ContentListUnionDict,
+      config: Optional[types.GenerateContentConfigOrDict] = None,
+  ) -> types.GenerateContentResponse:
+    """Generates content, running automatic function calling if enabled."""
     parsed_config = _extra_utils.parse_config_for_mcp_usage(config)
     if (
         parsed_config
@@ -4990,24 +5009,30 @@ class Models(_api_module.BaseModule):
       raise errors.UnsupportedFunctionError(
           'MCP sessions are not supported in synchronous methods.'
       )
+    use_response_cache = _extra_utils.should_use_response_cache(parsed_config)
     if _extra_utils.should_disable_afc(parsed_config):
-      return self._generate_content(
-          model=model, contents=contents, config=parsed_config
-      )
+      with _api_client.use_response_cache(use_response_cache):
+        return self._generate_content(
+            model=model, contents=contents, config=parsed_config
+        )
     remaining_remote_calls_afc = _extra_utils.get_max_remote_calls_afc(
         parsed_config
     )
     logger.info(
         f'AFC is enabled with max remote calls: {remaining_remote_calls_afc}.'
     )
-    automatic_function_calling_history: list[types.Content] = []
+    conversation = _extra_utils.AfcConversationBuilder(contents)
+    function_response_cache = _extra_utils.get_function_response_cache(
+        parsed_config, self._function_response_caches
+    )
     response = types.GenerateContentResponse()
     i = 0
     while remaining_remote_calls_afc > 0:
       i += 1
-      response = self._generate_content(
-          model=model, contents=contents, config=parsed_config
-      )
+      with _api_client.use_response_cache(use_response_cache):
+        response = self._generate_content(
+            model=model, contents=conversation.contents, config=parsed_config
+        )
 
       function_map = _extra_utils.get_function_map(parsed_config)
       if not function_map:
@@ -5021,7 +5046,7 @@ class Models(_api_module.BaseModule):
       ):
         break
       func_response_parts = _extra_utils.get_function_response_parts(
-          response, function_map
+          response, function_map, function_response_cache
       )
       if not func_response_parts:
         break
@@ -5035,21 +5060,14 @@ class Models(_api_module.BaseModule):
           role='user',
           parts=func_response_parts,
       )
-      contents = t.t_contents(contents)  # type: ignore[assignment]
-      if not automatic_function_calling_history:
-        automatic_function_calling_history.extend(contents)  # type: ignore[arg-type]
-      if isinstance(contents, list):
-        contents.append(func_call_content)  # type: ignore[arg-type]
-        contents.append(func_response_content)  # type: ignore[arg-type]
-      automatic_function_calling_history.append(func_call_content)
-      automatic_function_calling_history.append(func_response_content)
+      conversation.append_function_call_turn(
+          func_call_content, func_response_content
+      )
     if (
         _extra_utils.should_append_afc_history(parsed_config)
         and response is not None
     ):
-      response.automatic_function_calling_history = (
-          automatic_function_calling_history
-      )
+      response.automatic_function_calling_history = conversation.history
     return response
 
   def generate_content_stream(
@@ -5126,9 +5144,13 @@ class Models(_api_module.BaseModule):
       raise errors.UnsupportedFunctionError(
           'MCP sessions are not supported in synchronous methods.'
       )
+    use_response_cache = _extra_utils.should_use_response_cache(parsed_config)
     if _extra_utils.should_disable_afc(parsed_config):
-      yield from self._generate_content_stream(
-          model=model, contents=contents, config=parsed_config
+      yield from _api_client.iter_with_response_cache(
+          self._generate_content_stream(
+              model=model, contents=contents, config=parsed_config
+          ),
+          use_response_cache,
       )
       return
 
@@ -5138,14 +5160,20 @@ class Models(_api_module.BaseModule):
     logger.info(
         f'AFC is enabled with max remote calls: {remaining_remote_calls_afc}.'
     )
-    automatic_function_calling_history: list[types.Content] = []
+    conversation = _extra_utils.AfcConversationBuilder(contents)
+    function_response_cache = _extra_utils.get_function_response_cache(
+        parsed_config, self._function_response_caches
+    )
     chunk = None
     func_response_parts = None
     i = 0
     while remaining_remote_calls_afc > 0:
       i += 1
-      response = self._generate_content_stream(
-          model=model, contents=contents, config=parsed_config
+      response = _api_client.iter_with_response_cache(
+          self._generate_content_stream(
+              model=model, contents=conversation.contents, config=parsed_config
+          ),
+          use_response_cache,
       )
 
       function_map = _extra_utils.get_function_map(parsed_config)
@@ -5156,7 +5184,6 @@ class Models(_api_module.BaseModule):
         # Yield chunks only if there's no function response parts.
         for chunk in response:
           if not function_map:
-            _extra_utils.append_chunk_contents(contents, chunk)
             yield chunk
           else:
             if (
@@ -5166,20 +5193,16 @@ class Models(_api_module.BaseModule):
             ):
               break
             func_response_parts = _extra_utils.get_function_response_parts(
-                chunk, function_map
+                chunk, function_map, function_response_cache
             )
             if not func_response_parts:
-              _extra_utils.append_chunk_contents(contents, chunk)
               yield chunk
 
       else:
         #  Second request and beyond, yield chunks.
         for chunk in response:
           if _extra_utils.should_append_afc_history(parsed_config):
-            chunk.automatic_function_calling_history = (
-                automatic_function_calling_history
-            )
-          _extra_utils.append_chunk_contents(contents, chunk)
+            chunk.automatic_function_calling_history = conversation.history
           yield chunk
         if (
             chunk is None
@@ -5189,7 +5212,7 @@ class Models(_api_module.BaseModule):
         ):
           break
         func_response_parts = _extra_utils.get_function_response_parts(
-            chunk, function_map
+            chunk, function_map, function_response_cache
         )
 
       if not function_map:
@@ -5208,15 +5231,242 @@ class Models(_api_module.BaseModule):
             role='user',
             parts=func_response_parts,
         )
-        contents = t.t_contents(contents)  # type: ignore[assignment]
-        if not automatic_function_calling_history:
-          automatic_function_calling_history.extend(contents)  # type: ignore[arg-type]
-        if isinstance(contents, list) and func_call_content is not None:
-          contents.append(func_call_content)  # type: ignore[arg-type]
-          contents.append(func_response_content)  # type: ignore[arg-type]
-        if func_call_content is not None:
-          automatic_function_calling_history.append(func_call_content)
-        automatic_function_calling_history.append(func_response_content)
+        conversation.append_function_call_turn(
+            func_call_content, func_response_content
+        )
+
+  def map_generate_content(
+      self,
+      requests: Iterable[_common.StringDict],
+      *,
+      max_workers: Optional[int] = None,
+      ordered: bool = False,
+  ) -> Iterator[_fan_out.FanOutResult[types.GenerateContentResponse]]:
+    """Makes many generate content requests on a thread pool and yields their results.
+
+    Each request is a dict of keyword arguments for `generate_content`
+    (`model`, `contents` and optionally `config`). Requests are consumed
+    lazily, so large inputs are not materialized. At most `max_workers`
+    requests (default 10) run at a time. They share the HTTP connection pool
+    and the retry options of the client.
+
+    Results are yielded as requests complete, or in input order when `ordered`
+    is true. An error raised by a request is captured in the `error` field of
+    its result instead of being raised. Requests that have not started are
+    cancelled when the iterator is closed or interrupted.
+
+    Usage:
+
+    .. code-block:: python
+
+      requests = (
+          {'model': 'gemini-2.0-flash', 'contents': f'Summarize: {doc}'}
+          for doc in documents
+      )
+      for result in client.models.map_generate_content(
+          requests, max_workers=16
+      ):
+        if result.error:
+          print(result.index, result.error)
+        else:
+          print(result.index, result.response.text)
+    """
+    return _fan_out.fan_out(
+        self.generate_content,
+        requests,
+        _fan_out.validate_max_concurrency(max_workers, 'max_workers'),
+        ordered,
+    )
+
+  def embed_content(
+      self,
+      *,
+      model: str,
+      contents: Union[types.ContentListUnion, types.ContentListUnionDict],
+      config: Optional[types.EmbedContentConfigOrDict] = None,
+  ) -> types.EmbedContentResponse:
+    """Calculates embeddings for the given contents. Only text is supported.
+
+    Args:
+      model (str): The model to use.
+      contents (list[Content]): The contents to embed.
+      config (EmbedContentConfig): Optional configuration for embeddings.
+
+    Usage:
+
+    .. code-block:: python
+
+      embeddings = client.models.embed_content(
+          model= 'text-embedding-004',
+          contents=[
+              'What is your name?',
+              'What is your favorite color?',
+          ],
+          config={
+              'output_dimensionality': 64
+          },
+      )
+
+    If `config.auto_batching` is set, a list of contents of any length is
+    split into sub-requests that are sent on a thread pool, and the embeddings
+    are returned in input order in one response:
+
+    .. code-block:: python
+
+      embeddings = client.models.embed_content(
+          model='text-embedding-004',
+          contents=texts,
+          config={'auto_batching': {'max_concurrency': 8}},
+      )
+
+    If `config.embedding_cache` is set, contents found in the cache are not
+    sent to the API, and the embeddings of the other contents are added to the
+    cache.
+    """
+    embedding_cache = _extra_utils.get_embedding_cache(config)
+    if embedding_cache is None:
+      return self._embed_content_auto_batched(
+          model=model, contents=contents, config=config
+      )
+    lookup = _extra_utils.EmbeddingCacheLookup(
+        self._api_client.vertexai, model, contents, config, embedding_cache  # type: ignore[arg-type]
+    )
+    lookup.load()
+    miss_response = None
+    if lookup.miss_contents:
+      miss_response = self._embed_content_auto_batched(
+          model=model, contents=lookup.miss_contents, config=config
+      )
+    return lookup.merge(miss_response)
+
+  def _embed_content_auto_batched(
+      self,
+      *,
+      model: str,
+      contents: Union[types.ContentListUnion, types.ContentListUnionDict],
+      config: Optional[types.EmbedContentConfigOrDict] = None,
+  ) -> types.EmbedContentResponse:
+    batching_config = _extra_utils.get_embed_content_batching_config(config)
+    if batching_config is None or not isinstance(contents, list):
+      return self._embed_content_compact(
+          model=model, contents=contents, config=config
+      )
+    plan = _extra_utils.EmbedContentBatchPlan(
+        bool(self._api_client.vertexai), contents, batching_config
+    )
+    requests = plan.requests(model, config)  # type: ignore[arg-type]
+    if len(requests) <= 1:
+      return plan.merge(
+          [self._embed_content_compact(**request) for request in requests]
+      )
+
+    responses: list[types.EmbedContentResponse] = [None] * len(requests)  # type: ignore[list-item]
+    results = _fan_out.fan_out(
+        self._embed_content_compact,
+        requests,
+        _fan_out.validate_max_concurrency(
+            plan.max_concurrency, 'auto_batching.max_concurrency'
+        ),
+        ordered=False,
+    )
+    try:
+      for result in results:
+        if result.error is not None:
+          raise result.error
+        responses[result.index] = result.response  # type: ignore[assignment]
+    finally:
+      # Cancels the sub-requests that have not started if one failed.
+      results.close()  # type: ignore[attr-defined]
+    return plan.merge(responses)
+
+  def _embed_content_compact(
+      self,
+      *,
+      model: str,
+      contents: Union[types.ContentListUnion, types.ContentListUnionDict],
+      config: Optional[types.EmbedContentConfigOrDict] = None,
+  ) -> types.EmbedContentResponse:
+    return _extra_utils.compact_embed_content_response(
+        config,
+        self._embed_content(model=model, contents=contents, config=config),
+    )
+
+  def map_embed_content(
+      self,
+      requests: Iterable[_common.StringDict],
+      *,
+      max_workers: Optional[int] = None,
+      ordered: bool = False,
+  ) -> Iterator[_fan_out.FanOutResult[types.EmbedContentResponse]]:
+    """Makes many embed content requests on a thread pool and yields their results.
+
+    Each request is a dict of keyword arguments for `embed_content`. See
+    `map_generate_content` for how requests are run and results are yielded.
+
+    Usage:
+
+    .. code-block:: python
+
+      requests = (
+          {'model': 'text-embedding-004', 'contents': chunk} for chunk in chunks
+      )
+      for result in client.models.map_embed_content(requests, ordered=True):
+        print(result.response.embeddings)
+    """
+    return _fan_out.fan_out(
+        self.embed_content,
+        requests,
+        _fan_out.validate_max_concurrency(max_workers, 'max_workers'),
+        ordered,
+    )
+
+  def count_tokens(
+      self,
+      *,
+      model: str,
+      contents: Union[types.ContentListUnion, types.ContentListUnionDict],
+      config: Optional[types.CountTokensConfigOrDict] = None,
+  ) -> types.CountTokensResponse:
+    """Counts the number of tokens in the given content.
+
+    Multimodal input is supported for Gemini models.
+
+    If the client has a `local_token_counter`, text only requests for models
+    with a local tokenizer are counted locally, without an API call.
+
+    Args:
+      model (str): The model to use for counting tokens.
+      contents (list[types.Content]): The content to count tokens for.
+      config (CountTokensConfig): The configuration for counting tokens.
+
+    Usage:
+
+    .. code-block:: python
+
+      response = client.models.count_tokens(
+          model='gemini-2.0-flash',
+          contents='What is your name?',
+      )
+      print(response)
+      # total_tokens=5 cached_content_token_count=None
+    """
+    counter = self._api_client._local_token_counter
+    if counter is None:
+      return self._count_tokens(model=model, contents=contents, config=config)
+    local_response, verify = counter.try_count_tokens(
+        model=model, contents=contents, config=config
+    )
+    if local_response is None:
+      return self._count_tokens(model=model, contents=contents, config=config)
+    if not verify:
+      return local_response
+    response = self._count_tokens(model=model, contents=contents, config=config)
+    counter.record_verification(
+        model=model,
+        local_tokens=local_response.total_tokens or 0,
+        remote_tokens=response.total_tokens or 0,
+    )
+    return response
 
   def generate_images(
       self,
@@ -5547,6 +5797,20 @@ class Models(_api_module.BaseModule):
 
 class AsyncModels(_api_module.BaseModule):
 
+  def __init__(self, api_client_: BaseApiClient):
+    super().__init__(api_client_)
+    # The function response caches of a chat, keyed by their configuration.
+    # Other requests cache the function responses of their AFC loop only.
+    self._function_response_caches: Optional[
+        dict[str, _extra_utils.FunctionResponseCache]
+    ] = None
+
+  def _for_chat(self) -> AsyncModels:
+    """Returns models that share function response caches across a chat."""
+    models = copy.copy(self)
+    models._function_response_caches = {}
+    return models
+
   async def _generate_content(
       self,
       *,
@@ -5711,35 +5975,14 @@ class AsyncModels(_api_module.BaseModule):
 
     return async_generator()  # type: ignore[no-untyped-call, no-any-return]
 
-  async def embed_content(
+  async def _embed_content(
       self,
       *,
       model: str,
       contents: Union[types.ContentListUnion, types.ContentListUnionDict],
       config: Optional[types.EmbedContentConfigOrDict] = None,
   ) -> types.EmbedContentResponse:
-    """Calculates embeddings for the given contents. Only text is supported.
-
-    Args:
-      model (str): The model to use.
-      contents (list[Content]): The contents to embed.
-      config (EmbedContentConfig): Optional configuration for embeddings.
-
-    Usage:
-
-    .. code-block:: python
-
-      embeddings = await client.aio.models.embed_content(
-          model= 'text-embedding-004',
-          contents=[
-              'What is your name?',
-              'What is your favorite color?',
-          ],
-          config={
-              'output_dimensionality': 64
-          },
-      )
-    """
+    """Private method for embedding contents."""
 
     parameter_model = types._EmbedContentParameters(
         model=model,
@@ -6457,33 +6700,14 @@ class AsyncModels(_api_module.BaseModule):
     self._api_client._verify_response(return_value)
     return return_value
 
-  async def count_tokens(
+  async def _count_tokens(
       self,
       *,
       model: str,
       contents: Union[types.ContentListUnion, types.ContentListUnionDict],
       config: Optional[types.CountTokensConfigOrDict] = None,
   ) -> types.CountTokensResponse:
-    """Counts the number of tokens in the given content.
-
-    Multimodal input is supported for Gemini models.
-
-    Args:
-      model (str): The model to use for counting tokens.
-      contents (list[types.Content]): The content to count tokens for.
-      config (CountTokensConfig): The configuration for counting tokens.
-
-    Usage:
-
-    .. code-block:: python
-
-      response = await client.aio.models.count_tokens(
-          model='gemini-2.0-flash',
-          contents='What is your name?',
-      )
-      print(response)
-      # total_tokens=5 cached_content_token_count=None
-    """
+    """Private method for counting tokens."""
 
     parameter_model = types._CountTokensParameters(
         model=model,
@@ -6744,26 +6968,66 @@ class AsyncModels(_api_module.BaseModule):
       print(response.text)
       # J'aime les bagels.
     """
+    semantic_cache = self._api_client._semantic_cache
+    semantic_lookup = None
+    if semantic_cache is not None:
+      semantic_lookup = semantic_cache.lookup_request(model, contents, config)
+    if semantic_lookup is not None:
+      try:
+        embedding = await self.embed_content(
+            model=semantic_cache.embedding_model,  # type: ignore[union-attr]
+            contents=semantic_lookup.prompt,
+            config=semantic_cache.embedding_config,  # type: ignore[union-attr]
+        )
+      except _SEMANTIC_CACHE_LOOKUP_ERRORS as e:
+        logger.warning(f'Skipping the semantic cache: {e}')
+        semantic_lookup = None
+      else:
+        cached_response = semantic_lookup.search(embedding)
+        if cached_response is not None:
+          return cached_response
+
+    response = await self._generate_content_with_afc(
+        model=model, contents=contents, config=config
+    )
+    if semantic_lookup is not None:
+      semantic_lookup.add(response)
+    return response
+
+  async def _generate_content_with_afc(
+      self,
+      *,
+      model: str,
+      contents: Union[types.ContentListUnion, types.ContentListUnionDict],
+      config: Optional[types.GenerateContentConfigOrDict] = None,
+  ) -> types.GenerateContentResponse:
+    """Generates content, running automatic function calling if enabled."""
     # Retrieve and cache any MCP sessions if provided.
     parsed_config, mcp_to_genai_tool_adapters = (
         await _extra_utils.parse_config_for_mcp_sessions(config)
     )
+    use_response_cache = _extra_utils.should_use_response_cache(parsed_config)
     if _extra_utils.should_disable_afc(parsed_config):
-      return await self._generate_content(
-          model=model, contents=contents, config=parsed_config
-      )
+      with _api_client.use_response_cache(use_response_cache):
+        return await self._generate_content(
+            model=model, contents=contents, config=parsed_config
+        )
     remaining_remote_calls_afc = _extra_utils.get_max_remote_calls_afc(
         parsed_config
     )
     logger.info(
         f'AFC is enabled with max remote calls: {remaining_remote_calls_afc}.'
     )
-    automatic_function_calling_history: list[types.Content] = []
+    conversation = _extra_utils.AfcConversationBuilder(contents)
+    function_response_cache = _extra_utils.get_function_response_cache(
+        parsed_config, self._function_response_caches
+    )
     response = types.GenerateContentResponse()
     while remaining_remote_calls_afc > 0:
-      response = await self._generate_content(
-          model=model, contents=contents, config=parsed_config
-      )
+      with _api_client.use_response_cache(use_response_cache):
+        response = await self._generate_content(
+            model=model, contents=conversation.contents, config=parsed_config
+        )
       remaining_remote_calls_afc -= 1
       if remaining_remote_calls_afc == 0:
         logger.info('Reached max remote calls for automatic function calling.')
@@ -6783,7 +7047,7 @@ class AsyncModels(_api_module.BaseModule):
         break
       func_response_parts = (
           await _extra_utils.get_function_response_parts_async(
-              response, function_map
+              response, function_map, function_response_cache
           )
       )
       if not func_response_parts:
@@ -6793,22 +7057,15 @@ class AsyncModels(_api_module.BaseModule):
           role='user',
           parts=func_response_parts,
       )
-      contents = t.t_contents(contents)  # type: ignore[assignment]
-      if not automatic_function_calling_history:
-        automatic_function_calling_history.extend(contents)  # type: ignore[arg-type]
-      if isinstance(contents, list):
-        contents.append(func_call_content)  # type: ignore[arg-type]
-        contents.append(func_response_content)  # type: ignore[arg-type]
-      automatic_function_calling_history.append(func_call_content)
-      automatic_function_calling_history.append(func_response_content)
+      conversation.append_function_call_turn(
+          func_call_content, func_response_content
+      )
 
     if (
         _extra_utils.should_append_afc_history(parsed_config)
         and response is not None
     ):
-      response.automatic_function_calling_history = (
-          automatic_function_calling_history
-      )
+      response.automatic_function_calling_history = conversation.history
     return response
 
   async def generate_content_stream(
@@ -6880,10 +7137,12 @@ class AsyncModels(_api_module.BaseModule):
     parsed_config, mcp_to_genai_tool_adapters = (
         await _extra_utils.parse_config_for_mcp_sessions(config)
     )
+    use_response_cache = _extra_utils.should_use_response_cache(parsed_config)
     if _extra_utils.should_disable_afc(parsed_config):
-      response = await self._generate_content_stream(
-          model=model, contents=contents, config=parsed_config
-      )
+      with _api_client.use_response_cache(use_response_cache):
+        response = await self._generate_content_stream(
+            model=model, contents=contents, config=parsed_config
+        )
 
       async def base_async_generator(model, contents, config):  # type: ignore[no-untyped-def]
         async for chunk in response:  # type: ignore[attr-defined]
@@ -6896,15 +7155,21 @@ class AsyncModels(_api_module.BaseModule):
       logger.info(
           f'AFC is enabled with max remote calls: {remaining_remote_calls_afc}.'
       )
-      automatic_function_calling_history: list[types.Content] = []
+      eager_execution = _extra_utils.should_eagerly_execute_afc(config)
+      conversation = _extra_utils.AfcConversationBuilder(contents)
+      function_response_cache = _extra_utils.get_function_response_cache(
+          config, self._function_response_caches
+      )
       func_response_parts = None
       chunk = None
       i = 0
       while remaining_remote_calls_afc > 0:
         i += 1
-        response = await self._generate_content_stream(
-            model=model, contents=contents, config=config
-        )
+        func_call_content = None
+        with _api_client.use_response_cache(use_response_cache):
+          response = await self._generate_content_stream(
+              model=model, contents=conversation.contents, config=config
+          )
         # TODO: b/453739108 - make AFC logic more robust like the other 3 methods.
         if i > 1:
           logger.info(f'AFC remote call {i} is done.')
@@ -6918,13 +7183,41 @@ class AsyncModels(_api_module.BaseModule):
             config, mcp_to_genai_tool_adapters, is_caller_method_async=True
         )
 
-        if i == 1:
+        if eager_execution and function_map:
+          # Start each function call as soon as its chunk arrives and keep
+          # consuming the stream. Yield chunks without function calls.
+          func_call_tasks: list[asyncio.Task[types.Part]] = []
+          func_call_parts: list[types.Part] = []
+          try:
+            async for chunk in response:  # type: ignore[attr-defined]
+              new_tasks = _extra_utils.start_function_response_tasks(
+                  chunk, function_map, function_response_cache
+              )
+              if new_tasks:
+                func_call_tasks.extend(new_tasks)
+                func_call_parts.extend(chunk.candidates[0].content.parts)
+                continue
+              if (
+                  conversation.history
+                  and _extra_utils.should_append_afc_history(config)
+              ):
+                chunk.automatic_function_calling_history = conversation.history
+              yield chunk
+            func_response_parts = list(await asyncio.gather(*func_call_tasks))
+          finally:
+            for task in func_call_tasks:
+              task.cancel()
+          if func_call_parts:
+            func_call_content = types.Content(
+                role='model', parts=func_call_parts
+            )
+
+        elif i == 1:
           # First request gets a function call.
           # Then get function response parts.
           # Yield chunks only if there's no function response parts.
           async for chunk in response:  # type: ignore[attr-defined]
             if not function_map:
-              _extra_utils.append_chunk_contents(contents, chunk)
               yield chunk
             else:
               if (
@@ -6935,11 +7228,10 @@ class AsyncModels(_api_module.BaseModule):
                 break
               func_response_parts = (
                   await _extra_utils.get_function_response_parts_async(
-                      chunk, function_map
+                      chunk, function_map, function_response_cache
                   )
               )
               if not func_response_parts:
-                _extra_utils.append_chunk_contents(contents, chunk)
                 yield chunk
 
         else:
@@ -6947,10 +7239,7 @@ class AsyncModels(_api_module.BaseModule):
           async for chunk in response:  # type: ignore[attr-defined]
 
             if _extra_utils.should_append_afc_history(config):
-              chunk.automatic_function_calling_history = (
-                  automatic_function_calling_history
-              )
-            _extra_utils.append_chunk_contents(contents, chunk)
+              chunk.automatic_function_calling_history = conversation.history
             yield chunk
           if (
               chunk is None
@@ -6961,7 +7250,7 @@ class AsyncModels(_api_module.BaseModule):
             break
           func_response_parts = (
               await _extra_utils.get_function_response_parts_async(
-                  chunk, function_map
+                  chunk, function_map, function_response_cache
               )
           )
         if not function_map:
@@ -6973,23 +7262,293 @@ class AsyncModels(_api_module.BaseModule):
         if chunk is None:
           continue
         # Append function response parts to contents for the next request.
-        func_call_content = chunk.candidates[0].content
+        if func_call_content is None:
+          func_call_content = chunk.candidates[0].content
         func_response_content = types.Content(
             role='user',
             parts=func_response_parts,
         )
-        contents = t.t_contents(contents)
-        if not automatic_function_calling_history:
-          automatic_function_calling_history.extend(contents)
-        if isinstance(contents, list) and func_call_content is not None:
-          contents.append(func_call_content)
-          contents.append(func_response_content)
-        if func_call_content is not None:
-          automatic_function_calling_history.append(func_call_content)
-        automatic_function_calling_history.append(func_response_content)
+        conversation.append_function_call_turn(
+            func_call_content, func_response_content
+        )
 
     return async_generator(model, contents, parsed_config)  # type: ignore[no-untyped-call, no-any-return]
 
+  async def generate_content_many(
+      self,
+      requests: _fan_out.FanOutRequests,
+      *,
+      max_concurrency: Optional[int] = None,
+      ordered: bool = False,
+  ) -> AsyncIterator[_fan_out.FanOutResult[types.GenerateContentResponse]]:
+    """Makes many generate content requests concurrently and yields their results.
+
+    Each request is a dict of keyword arguments for `generate_content`
+    (`model`, `contents` and optionally `config`). Requests can be an iterable
+    or an async iterable; they are consumed lazily, so large inputs are not
+    materialized. At most `max_concurrency` requests (default 10) run at a
+    time, and each one uses the retry options of the client.
+
+    Results are yielded as requests complete, or in input order when `ordered`
+    is true. An error raised by a request is captured in the `error` field of
+    its result instead of being raised.
+
+    Usage:
+
+    .. code-block:: python
+
+      requests = (
+          {'model': 'gemini-2.0-flash', 'contents': f'Summarize: {doc}'}
+          for doc in documents
+      )
+      async for result in await client.aio.models.generate_content_many(
+          requests, max_concurrency=32
+      ):
+        if result.error:
+          print(result.index, result.error)
+        else:
+          print(result.index, result.response.text)
+    """
+    return _fan_out.fan_out_async(
+        self.generate_content,
+        requests,
+        _fan_out.validate_max_concurrency(max_concurrency),
+        ordered,
+    )
+
+  async def embed_content(
+      self,
+      *,
+      model: str,
+      contents: Union[types.ContentListUnion, types.ContentListUnionDict],
+      config: Optional[types.EmbedContentConfigOrDict] = None,
+  ) -> types.EmbedContentResponse:
+    """Calculates embeddings for the given contents. Only text is supported.
+
+    Args:
+      model (str): The model to use.
+      contents (list[Content]): The contents to embed.
+      config (EmbedContentConfig): Optional configuration for embeddings.
+
+    Usage:
+
+    .. code-block:: python
+
+      embeddings = await client.aio.models.embed_content(
+          model= 'text-embedding-004',
+          contents=[
+              'What is your name?',
+              'What is your favorite color?',
+          ],
+          config={
+              'output_dimensionality': 64
+          },
+      )
+
+    If `config.auto_batching` is set, a list of contents of any length is
+    split into sub-requests that are sent concurrently, and the embeddings are
+    returned in input order in one response:
+
+    .. code-block:: python
+
+      embeddings = await client.aio.models.embed_content(
+          model='text-embedding-004',
+          contents=texts,
+          config={'auto_batching': {'max_concurrency': 8}},
+      )
+
+    If `config.embedding_cache` is set, contents found in the cache are not
+    sent to the API, and the embeddings of the other contents are added to the
+    cache. The cache is read and written in a worker thread.
+    """
+    embedding_cache = _extra_utils.get_embedding_cache(config)
+    if embedding_cache is None:
+      return await self._embed_content_auto_batched(
+          model=model, contents=contents, config=config
+      )
+    lookup = _extra_utils.EmbeddingCacheLookup(
+        self._api_client.vertexai, model, contents, config, embedding_cache  # type: ignore[arg-type]
+    )
+    await asyncio.to_thread(lookup.load)
+    miss_response = None
+    if lookup.miss_contents:
+      miss_response = await self._embed_content_auto_batched(
+          model=model, contents=lookup.miss_contents, config=config
+      )
+    return await asyncio.to_thread(lookup.merge, miss_response)
+
+  async def _embed_content_auto_batched(
+      self,
+      *,
+      model: str,
+      contents: Union[types.ContentListUnion, types.ContentListUnionDict],
+      config: Optional[types.EmbedContentConfigOrDict] = None,
+  ) -> types.EmbedContentResponse:
+    batching_config = _extra_utils.get_embed_content_batching_config(config)
+    if batching_config is None or not isinstance(contents, list):
+      return await self._embed_content_compact(
+          model=model, contents=contents, config=config
+      )
+    plan = _extra_utils.EmbedContentBatchPlan(
+        bool(self._api_client.vertexai), contents, batching_config
+    )
+    requests = plan.requests(model, config)  # type: ignore[arg-type]
+    if len(requests) <= 1:
+      return plan.merge(
+          [
+              await self._embed_content_compact(**request)
+              for request in requests
+          ]
+      )
+
+    responses: list[types.EmbedContentResponse] = [None] * len(requests)  # type: ignore[list-item]
+    results = _fan_out.fan_out_async(
+        self._embed_content_compact,
+        requests,
+        _fan_out.validate_max_concurrency(
+            plan.max_concurrency, 'auto_batching.max_concurrency'
+        ),
+        ordered=False,
+    )
+    try:
+      async for result in results:
+        if result.error is not None:
+          raise result.error
+        responses[result.index] = result.response  # type: ignore[assignment]
+    finally:
+      # Cancels the sub-requests in flight if one failed.
+      await results.aclose()  # type: ignore[attr-defined]
+    return plan.merge(responses)
+
+  async def _embed_content_compact(
+      self,
+      *,
+      model: str,
+      contents: Union[types.ContentListUnion, types.ContentListUnionDict],
+      config: Optional[types.EmbedContentConfigOrDict] = None,
+  ) -> types.EmbedContentResponse:
+    return _extra_utils.compact_embed_content_response(
+        config,
+        await self._embed_content(
+            model=model, contents=contents, config=config
+        ),
+    )
+
+  async def embed_content_many(
+      self,
+      requests: _fan_out.FanOutRequests,
+      *,
+      max_concurrency: Optional[int] = None,
+      ordered: bool = False,
+  ) -> AsyncIterator[_fan_out.FanOutResult[types.EmbedContentResponse]]:
+    """Makes many embed content requests concurrently and yields their results.
+
+    Each request is a dict of keyword arguments for `embed_content`. See
+    `generate_content_many` for how requests are run and results are yielded.
+
+    Usage:
+
+    .. code-block:: python
+
+      requests = (
+          {'model': 'text-embedding-004', 'contents': chunk} for chunk in chunks
+      )
+      async for result in await client.aio.models.embed_content_many(
+          requests, ordered=True
+      ):
+        print(result.response.embeddings)
+    """
+    return _fan_out.fan_out_async(
+        self.embed_content,
+        requests,
+        _fan_out.validate_max_concurrency(max_concurrency),
+        ordered,
+    )
+
+  async def count_tokens(
+      self,
+      *,
+      model: str,
+      contents: Union[types.ContentListUnion, types.ContentListUnionDict],
+      config: Optional[types.CountTokensConfigOrDict] = None,
+  ) -> types.CountTokensResponse:
+    """Counts the number of tokens in the given content.
+
+    Multimodal input is supported for Gemini models.
+
+    If the client has a `local_token_counter`, text only requests for models
+    with a local tokenizer are counted locally, without an API call.
+
+    Args:
+      model (str): The model to use for counting tokens.
+      contents (list[types.Content]): The content to count tokens for.
+      config (CountTokensConfig): The configuration for counting tokens.
+
+    Usage:
+
+    .. code-block:: python
+
+      response = await client.aio.models.count_tokens(
+          model='gemini-2.0-flash',
+          contents='What is your name?',
+      )
+      print(response)
+      # total_tokens=5 cached_content_token_count=None
+    """
+    counter = self._api_client._local_token_counter
+    if counter is None:
+      return await self._count_tokens(
+          model=model, contents=contents, config=config
+      )
+    # The first count of a model may download its tokenizer.
+    local_response, verify = await asyncio.to_thread(
+        counter.try_count_tokens, model=model, contents=contents, config=config
+    )
+    if local_response is None:
+      return await self._count_tokens(
+          model=model, contents=contents, config=config
+      )
+    if not verify:
+      return local_response
+    response = await self._count_tokens(
+        model=model, contents=contents, config=config
+    )
+    counter.record_verification(
+        model=model,
+        local_tokens=local_response.total_tokens or 0,
+        remote_tokens=response.total_tokens or 0,
+    )
+    return response
+
+  async def count_tokens_many(
+      self,
+      requests: _fan_out.FanOutRequests,
+      *,
+      max_concurrency: Optional[int] = None,
+      ordered: bool = False,
+  ) -> AsyncIterator[_fan_out.FanOutResult[types.CountTokensResponse]]:
+    """Makes many count tokens requests concurrently and yields their results.
+
+    Each request is a dict of keyword arguments for `count_tokens`. See
+    `generate_content_many` for how requests are run and results are yielded.
+
+    Usage:
+
+    .. code-block:: python
+
+      requests = (
+          {'model': 'gemini-2.0-flash', 'contents': doc} for doc in documents
+      )
+      async for result in await client.aio.models.count_tokens_many(requests):
+        print(result.index, result.response.total_tokens)
+    """
+    return _fan_out.fan_out_async(
+        self.count_tokens,
+        requests,
+        _fan_out.validate_max_concurrency(max_concurrency),
+        ordered,
+    )
+
   async def edit_image(
       self,
       *,
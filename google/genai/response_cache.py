@@ -0,0 +1,205 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""[Experimental] Response caches for deterministic generate_content calls."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import collections
+import dataclasses
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Optional, Union
+
+__all__ = [
+    'CachedResponse',
+    'ResponseCache',
+    'InMemoryResponseCache',
+    'DiskResponseCache',
+]
+
+_DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+@dataclasses.dataclass
+class CachedResponse:
+  """A cached API response.
+
+  A unary response has one body. A streamed response has one body per chunk,
+  in the order they were received.
+  """
+
+  headers: dict[str, str]
+  bodies: list[str]
+
+  def size(self) -> int:
+    """Returns the approximate size of the response in bytes."""
+    return sum(len(body) for body in self.bodies) + sum(
+        len(key) + len(value) for key, value in self.headers.items()
+    )
+
+
+class ResponseCache(ABC):
+  """The interface of a generate_content response cache.
+
+  Keys are SHA-256 hashes of the account of the client, the request URL and the
+  serialized request body, computed by the SDK. Implementations must be safe to use from several
+  threads.
+  """
+
+  @abstractmethod
+  def get(self, key: str) -> Optional[CachedResponse]:
+    """Returns the cached response of the key, if any."""
+
+  @abstractmethod
+  def put(self, key: str, response: CachedResponse) -> None:
+    """Caches the response of the key."""
+
+
+def request_key(
+    method: str,
+    url: str,
+    body: Union[dict[str, object], bytes],
+    account: str = '',
+) -> str:
+  """Returns the cache key of a request.
+
+  The account, derived from the credentials of the client, keeps the responses
+  of one account from being served to another one sharing the cache.
+  """
+  if isinstance(body, bytes):
+    canonical_body = body.decode('utf-8', errors='backslashreplace')
+  else:
+    canonical_body = json.dumps(body, sort_keys=True, separators=(',', ':'))
+  return hashlib.sha256(
+      json.dumps([account, method.upper(), url, canonical_body]).encode('utf-8')
+  ).hexdigest()
+
+
+class InMemoryResponseCache(ResponseCache):
+  """A least recently used response cache with a byte budget.
+
+  Responses are evicted, least recently used first, once the cached responses
+  exceed `max_bytes`, and are not served after `ttl_seconds`.
+  """
+
+  def __init__(
+      self,
+      *,
+      max_bytes: int = _DEFAULT_MAX_BYTES,
+      ttl_seconds: Optional[float] = None,
+  ):
+    self._max_bytes = max_bytes
+    self._ttl_seconds = ttl_seconds
+    self._entries: collections.OrderedDict[
+        str, tuple[float, int, CachedResponse]
+    ] = collections.OrderedDict()
+    self._total_bytes = 0
+    self._lock = threading.Lock()
+
+  def get(self, key: str) -> Optional[CachedResponse]:
+    """Returns the cached response of the key, if any."""
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is None:
+        return None
+      created_at, size, response = entry
+      if (
+          self._ttl_seconds is not None
+          and time.monotonic() - created_at > self._ttl_seconds
+      ):
+        del self._entries[key]
+        self._total_bytes -= size
+        return None
+      self._entries.move_to_end(key)
+      return response
+
+  def put(self, key: str, response: CachedResponse) -> None:
+    """Caches the response of the key, evicting responses if needed."""
+    size = response.size()
+    if size > self._max_bytes:
+      return
+    with self._lock:
+      previous = self._entries.pop(key, None)
+      if previous is not None:
+        self._total_bytes -= previous[1]
+      self._entries[key] = (time.monotonic(), size, response)
+      self._total_bytes += size
+      while self._total_bytes > self._max_bytes:
+        _, (_, evicted_size, _) = self._entries.popitem(last=False)
+        self._total_bytes -= evicted_size
+
+  def __len__(self) -> int:
+    return len(self._entries)
+
+
+class DiskResponseCache(ResponseCache):
+  """A response cache that stores one JSON file per response in a directory.
+
+  Responses older than `ttl_seconds` are not served and are deleted when
+  read. Files are written atomically, so several processes can share the
+  directory.
+  """
+
+  def __init__(
+      self,
+      directory: Union[str, os.PathLike[str]],
+      *,
+      ttl_seconds: Optional[float] = None,
+  ):
+    self._directory = os.path.expanduser(os.fspath(directory))
+    self._ttl_seconds = ttl_seconds
+    os.makedirs(self._directory, exist_ok=True)
+
+  def _path(self, key: str) -> str:
+    return os.path.join(self._directory, key[:2], f'{key}.json')
+
+  def get(self, key: str) -> Optional[CachedResponse]:
+    """Returns the cached response of the key, if any."""
+    path = self._path(key)
+    try:
+      if (
+          self._ttl_seconds is not None
+          and time.time() - os.path.getmtime(path) > self._ttl_seconds
+      ):
+        os.remove(path)
+        return None
+      with open(path, 'r', encoding='utf-8') as f:
+        entry = json.load(f)
+      return CachedResponse(headers=entry['headers'], bodies=entry['bodies'])
+    except (OSError, ValueError, KeyError, TypeError):
+      # A missing, expired by another process or corrupted entry is a miss.
+      return None
+
+  def put(self, key: str, response: CachedResponse) -> None:
+    """Caches the response of the key."""
+    path = self._path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+      with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(dataclasses.asdict(response), f)
+      os.replace(temp_path, path)
+    except BaseException:
+      try:
+        os.remove(temp_path)
+      except OSError:
+        pass
+      raise
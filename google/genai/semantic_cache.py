@@ -0,0 +1,386 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""[Experimental] A semantic response cache for generate_content."""
+
+from __future__ import annotations
+
+import collections
+import dataclasses
+import hashlib
+import itertools
+import json
+import math
+import threading
+import time
+import typing
+from typing import Any, Optional, Sequence
+
+from . import _transformers as t
+from . import types
+
+if typing.TYPE_CHECKING:
+  import numpy
+else:
+  try:
+    import numpy
+  except ImportError:
+    numpy = None
+
+__all__ = [
+    'SemanticCache',
+    'SemanticCacheStats',
+]
+
+_DEFAULT_EMBEDDING_MODEL = 'text-embedding-004'
+_DEFAULT_SIMILARITY_THRESHOLD = 0.95
+_DEFAULT_MAX_ENTRIES = 10_000
+_DEFAULT_IVF_MIN_ENTRIES = 100_000
+_DEFAULT_IVF_PROBES = 8
+_KMEANS_ITERATIONS = 8
+_KMEANS_MAX_SAMPLES = 50_000
+
+# Config fields that do not change the response.
+_CONFIG_FIELDS_EXCLUDED_FROM_NAMESPACE = {
+    'http_options',
+    'bypass_response_cache',
+}
+
+
+@dataclasses.dataclass
+class SemanticCacheStats:
+  """Counters of a semantic cache."""
+
+  hits: int = 0
+  """Number of requests served from the cache."""
+
+  misses: int = 0
+  """Number of eligible requests that were not found in the cache."""
+
+  evictions: int = 0
+  """Number of entries evicted because of `max_entries` or `ttl_seconds`."""
+
+  entries: int = 0
+  """Number of entries in the cache."""
+
+
+def _normalize(values: Sequence[float]) -> list[float]:
+  norm = math.sqrt(sum(value * value for value in values))
+  if not norm:
+    return list(values)
+  return [value / norm for value in values]
+
+
+class _VectorIndex:
+  """An in-process index of unit vectors searched by cosine similarity.
+
+  The search is brute force, vectorized with NumPy when it is installed. With
+  NumPy, once the index holds `ivf_min_entries` vectors, they are partitioned
+  with k-means (an inverted file index) and a search only scans the vectors of
+  the `ivf_probes` partitions closest to the query.
+  """
+
+  def __init__(self, ivf_min_entries: int, ivf_probes: int):
+    self._ivf_min_entries = ivf_min_entries
+    self._ivf_probes = ivf_probes
+    self._slots: dict[int, int] = {}  # Entry ID to row.
+    self._entry_ids: list[Optional[int]] = []  # Row to entry ID.
+    self._free_rows: list[int] = []
+    self._vectors: Any = None
+    self._centroids: Any = None
+    self._partitions: Any = None
+    self._ivf_size = 0
+
+  def __len__(self) -> int:
+    return len(self._slots)
+
+  def add(self, entry_id: int, vector: list[float]) -> None:
+    if self._free_rows:
+      row = self._free_rows.pop()
+      self._entry_ids[row] = entry_id
+    else:
+      row = len(self._entry_ids)
+      self._entry_ids.append(entry_id)
+    self._slots[entry_id] = row
+    if numpy is None:
+      if self._vectors is None:
+        self._vectors = []
+      if row == len(self._vectors):
+        self._vectors.append(vector)
+      else:
+        self._vectors[row] = vector
+      return
+
+    vector_array = numpy.asarray(vector, dtype=numpy.float32)
+    if self._vectors is None:
+      self._vectors = numpy.zeros((16, len(vector)), dtype=numpy.float32)
+    elif row >= len(self._vectors):
+      self._vectors = numpy.concatenate(
+          [self._vectors, numpy.zeros_like(self._vectors)]
+      )
+      if self._partitions is not None:
+        self._partitions = numpy.concatenate(
+            [self._partitions, numpy.full_like(self._partitions, -1)]
+        )
+    self._vectors[row] = vector_array
+    if len(self) >= self._ivf_min_entries and len(self) >= 2 * self._ivf_size:
+      self._build_ivf()
+    elif self._partitions is not None:
+      self._partitions[row] = int(numpy.argmax(self._centroids @ vector_array))
+
+  def remove(self, entry_id: int) -> None:
+    row = self._slots.pop(entry_id)
+    self._entry_ids[row] = None
+    self._free_rows.append(row)
+    if self._partitions is not None:
+      self._partitions[row] = -1
+
+  def _build_ivf(self) -> None:
+    rows = numpy.fromiter(self._slots.values(), dtype=numpy.int64)
+    vectors = self._vectors[rows]
+    partition_count = max(1, int(math.sqrt(len(rows))))
+    rng = numpy.random.default_rng(0)
+    samples = vectors[
+        rng.choice(
+            len(vectors),
+            size=min(len(vectors), _KMEANS_MAX_SAMPLES),
+            replace=False,
+        )
+    ]
+    centroids = samples[
+        rng.choice(len(samples), size=partition_count, replace=False)
+    ]
+    for _ in range(_KMEANS_ITERATIONS):
+      assignments = numpy.argmax(samples @ centroids.T, axis=1)
+      for partition in range(partition_count):
+        members = samples[assignments == partition]
+        if len(members):
+          centroid = members.mean(axis=0)
+          centroids[partition] = centroid / (
+              numpy.linalg.norm(centroid) or 1.0
+          )
+    self._centroids = centroids
+    self._partitions = numpy.full(len(self._vectors), -1, dtype=numpy.int64)
+    self._partitions[rows] = numpy.argmax(vectors @ centroids.T, axis=1)
+    self._ivf_size = len(rows)
+
+  def search(self, vector: list[float]) -> Optional[tuple[int, float]]:
+    """Returns the most similar entry ID and its similarity."""
+    if not self._slots:
+      return None
+    if numpy is None:
+      best_id, best_similarity = None, -math.inf
+      for entry_id, row in self._slots.items():
+        similarity = sum(a * b for a, b in zip(self._vectors[row], vector))
+        if similarity > best_similarity:
+          best_id, best_similarity = entry_id, similarity
+      return best_id, best_similarity  # type: ignore[return-value]
+
+    query = numpy.asarray(vector, dtype=numpy.float32)
+    if self._partitions is not None:
+      probes = numpy.argsort(self._centroids @ query)[-self._ivf_probes :]
+      rows = numpy.flatnonzero(numpy.isin(self._partitions, probes))
+    else:
+      rows = numpy.fromiter(self._slots.values(), dtype=numpy.int64)
+    if not len(rows):
+      return None
+    similarities = self._vectors[rows] @ query
+    best = int(numpy.argmax(similarities))
+    return self._entry_ids[rows[best]], float(similarities[best])  # type: ignore[return-value]
+
+
+@dataclasses.dataclass
+class _Entry:
+  namespace: str
+  response: types.GenerateContentResponse
+  created_at: float
+
+
+class SemanticCacheLookup:
+  """A generate_content request that is eligible for the semantic cache."""
+
+  def __init__(self, cache: SemanticCache, namespace: str, prompt: str):
+    self._cache = cache
+    self.namespace = namespace
+    self.prompt = prompt
+    self._vector: Optional[list[float]] = None
+
+  def search(
+      self, embedding: types.EmbedContentResponse
+  ) -> Optional[types.GenerateContentResponse]:
+    """Returns a copy of the cached response of a similar prompt, if any."""
+    matrix = embedding.embedding_matrix
+    if matrix is None or len(matrix) != 1:
+      return None
+    self._vector = _normalize(matrix[0].tolist())
+    return self._cache._search(self.namespace, self._vector)
+
+  def add(self, response: types.GenerateContentResponse) -> None:
+    """Caches the response of the request."""
+    if self._vector is not None and response.candidates:
+      self._cache._add(self.namespace, self._vector, response)
+
+
+class SemanticCache:
+  """A cache of generate_content responses keyed by the meaning of the prompt.
+
+  The text of the last content of a request is embedded with
+  `embed_content`. If a previous request had the same model, config and
+  earlier contents, and a prompt whose embedding has a cosine similarity of
+  at least `similarity_threshold`, its response is returned instead of
+  generating a new one. Requests whose last content is not text only, and
+  streaming requests, are not cached.
+
+  Usage:
+
+  .. code-block:: python
+
+    from google.genai import semantic_cache
+
+    cache = semantic_cache.SemanticCache(similarity_threshold=0.97)
+    client = genai.Client(semantic_cache=cache)
+    response = client.models.generate_content(
+        model='gemini-2.0-flash', contents='How do I reset my password?'
+    )
+    print(cache.stats())
+  """
+
+  def __init__(
+      self,
+      *,
+      embedding_model: str = _DEFAULT_EMBEDDING_MODEL,
+      similarity_threshold: float = _DEFAULT_SIMILARITY_THRESHOLD,
+      max_entries: int = _DEFAULT_MAX_ENTRIES,
+      ttl_seconds: Optional[float] = None,
+      ivf_min_entries: int = _DEFAULT_IVF_MIN_ENTRIES,
+      ivf_probes: int = _DEFAULT_IVF_PROBES,
+  ):
+    self.embedding_model = embedding_model
+    self.embedding_config = types.EmbedContentConfig(
+        task_type='SEMANTIC_SIMILARITY'
+    )
+    self._similarity_threshold = similarity_threshold
+    self._max_entries = max_entries
+    self._ttl_seconds = ttl_seconds
+    self._ivf_min_entries = ivf_min_entries
+    self._ivf_probes = ivf_probes
+    self._indexes: dict[str, _VectorIndex] = {}
+    # Entries in least recently used order.
+    self._entries: collections.OrderedDict[int, _Entry] = (
+        collections.OrderedDict()
+    )
+    self._entry_ids = itertools.count()
+    self._stats = SemanticCacheStats()
+    self._lock = threading.Lock()
+
+  def stats(self) -> SemanticCacheStats:
+    """Returns a snapshot of the counters of the cache."""
+    with self._lock:
+      return dataclasses.replace(self._stats, entries=len(self._entries))
+
+  def lookup_request(
+      self,
+      model: str,
+      contents: types.ContentListUnionDict,
+      config: Optional[types.GenerateContentConfigOrDict],
+  ) -> Optional[SemanticCacheLookup]:
+    """Returns the lookup of a request, or None if it is not eligible."""
+    if isinstance(config, dict):
+      config = types.GenerateContentConfig.model_validate(config)
+    if config is not None and config.bypass_response_cache:
+      return None
+    try:
+      normalized_contents = t.t_contents(contents)
+      if not normalized_contents or not normalized_contents[-1].parts:
+        return None
+      last_parts = normalized_contents[-1].parts
+      if any(
+          part.model_dump(exclude_none=True).keys() != {'text'}
+          for part in last_parts
+      ):
+        return None
+      namespace_source = json.dumps(
+          [
+              model,
+              [
+                  content.model_dump(mode='json', exclude_none=True)
+                  for content in normalized_contents[:-1]
+              ],
+              normalized_contents[-1].role,
+              config.model_dump(
+                  mode='json',
+                  exclude_none=True,
+                  exclude=_CONFIG_FIELDS_EXCLUDED_FROM_NAMESPACE,
+              )
+              if config is not None
+              else None,
+          ],
+          sort_keys=True,
+      )
+    except (TypeError, ValueError):
+      # For example, Python functions in tools cannot be serialized.
+      return None
+    namespace = hashlib.sha256(namespace_source.encode('utf-8')).hexdigest()
+    prompt = ''.join(part.text for part in last_parts)  # type: ignore[misc]
+    return SemanticCacheLookup(self, namespace, prompt)
+
+  def _evict(self, entry_id: int) -> None:
+    entry = self._entries.pop(entry_id)
+    index = self._indexes[entry.namespace]
+    index.remove(entry_id)
+    if not len(index):
+      del self._indexes[entry.namespace]
+    self._stats.evictions += 1
+
+  def _search(
+      self, namespace: str, vector: list[float]
+  ) -> Optional[types.GenerateContentResponse]:
+    with self._lock:
+      index = self._indexes.get(namespace)
+      result = index.search(vector) if index is not None else None
+      if result is not None and result[1] >= self._similarity_threshold:
+        entry_id = result[0]
+        entry = self._entries[entry_id]
+        if (
+            self._ttl_seconds is None
+            or time.monotonic() - entry.created_at <= self._ttl_seconds
+        ):
+          self._entries.move_to_end(entry_id)
+          self._stats.hits += 1
+          return entry.response.model_copy(deep=True)
+        self._evict(entry_id)
+      self._stats.misses += 1
+      return None
+
+  def _add(
+      self,
+      namespace: str,
+      vector: list[float],
+      response: types.GenerateContentResponse,
+  ) -> None:
+    with self._lock:
+      entry_id = next(self._entry_ids)
+      self._entries[entry_id] = _Entry(
+          namespace=namespace,
+          response=response.model_copy(deep=True),
+          created_at=time.monotonic(),
+      )
+      index = self._indexes.get(namespace)
+      if index is None:
+        index = _VectorIndex(self._ivf_min_entries, self._ivf_probes)
+        self._indexes[namespace] = index
+      index.add(entry_id, vector)
+      while len(self._entries) > self._max_entries:
+        self._evict(next(iter(self._entries)))
@@ -0,0 +1,92 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests for _extra_utils.AfcConversationBuilder."""
+
+from __future__ import annotations
+
+from unittest import mock
+
+from ... import _transformers as t
+from ... import types
+from ..._extra_utils import AfcConversationBuilder
+
+
+_FUNCTION_CALL_CONTENT = types.Content(
+    role='model',
+    parts=[
+        types.Part.from_function_call(
+            name='get_weather', args={'location': 'Boston'}
+        )
+    ],
+)
+
+_FUNCTION_RESPONSE_CONTENT = types.Content(
+    role='user',
+    parts=[
+        types.Part.from_function_response(
+            name='get_weather', response={'result': 'sunny'}
+        )
+    ],
+)
+
+
+def test_contents_before_function_call_turn():
+  conversation = AfcConversationBuilder('What is the weather in Boston?')
+
+  assert conversation.contents == 'What is the weather in Boston?'
+  assert conversation.history == []
+
+
+def test_append_function_call_turn():
+  conversation = AfcConversationBuilder('What is the weather in Boston?')
+
+  conversation.append_function_call_turn(
+      _FUNCTION_CALL_CONTENT, _FUNCTION_RESPONSE_CONTENT
+  )
+
+  assert conversation.history == [
+      types.UserContent(parts='What is the weather in Boston?'),
+      _FUNCTION_CALL_CONTENT,
+      _FUNCTION_RESPONSE_CONTENT,
+  ]
+  assert conversation.contents is conversation.history
+
+
+def test_user_contents_are_normalized_once():
+  user_contents = [types.UserContent(parts='What is the weather in Boston?')]
+  conversation = AfcConversationBuilder(user_contents)
+
+  with mock.patch.object(
+      t, 't_contents', wraps=t.t_contents
+  ) as mock_t_contents:
+    for _ in range(3):
+      conversation.append_function_call_turn(
+          _FUNCTION_CALL_CONTENT, _FUNCTION_RESPONSE_CONTENT
+      )
+
+  assert mock_t_contents.call_count == 1
+  assert len(conversation.history) == 7
+  # The user contents are not mutated.
+  assert len(user_contents) == 1
+
+
+def test_append_function_call_turn_without_function_call_content():
+  conversation = AfcConversationBuilder('What is the weather in Boston?')
+
+  conversation.append_function_call_turn(None, _FUNCTION_RESPONSE_CONTENT)
+
+  assert conversation.history[-1] == _FUNCTION_RESPONSE_CONTENT
+  assert len(conversation.history) == 2
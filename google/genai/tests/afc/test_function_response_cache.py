@@ -0,0 +1,266 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests for _extra_utils.FunctionResponseCache."""
+
+from __future__ import annotations
+
+import copy
+from unittest import mock
+
+import pytest
+
+from ... import _extra_utils
+from ... import Client
+from ... import types
+from ..._extra_utils import FunctionResponseCache
+from ..._extra_utils import get_function_response_cache
+from ..._extra_utils import get_function_response_parts
+from ..._extra_utils import get_function_response_parts_async
+
+
+def _function_call_response(**args) -> types.GenerateContentResponse:
+  return types.GenerateContentResponse(
+      candidates=[
+          types.Candidate(
+              content=types.Content(
+                  role='model',
+                  parts=[
+                      types.Part.from_function_call(
+                          name='search', args=dict(args)
+                      )
+                  ],
+              )
+          )
+      ]
+  )
+
+
+def test_cache_reuses_identical_function_calls():
+  calls = []
+
+  def search():
+    calls.append(1)
+    return len(calls)
+
+  cache = FunctionResponseCache()
+  function_map = {'search': search}
+
+  first = get_function_response_parts(
+      _function_call_response(), function_map, cache
+  )
+  second = get_function_response_parts(
+      _function_call_response(), function_map, cache
+  )
+
+  assert len(calls) == 1
+  assert first == second
+  assert second[0].function_response.response == {'result': 1}
+
+
+def test_cache_key_is_canonical():
+  cache = FunctionResponseCache()
+  cache.put('search', {'query': 'cats', 'limit': 2}, {'result': 'hit'})
+
+  assert cache.get('search', {'limit': 2, 'query': 'cats'}) == {
+      'result': 'hit'
+  }
+  assert cache.get('search', {'limit': 3, 'query': 'cats'}) is None
+  assert cache.get('lookup', {'limit': 2, 'query': 'cats'}) is None
+
+
+def test_cache_only_caches_listed_functions():
+  cache = FunctionResponseCache(function_names=['search'])
+  cache.put('search', {}, {'result': 1})
+  cache.put('book_flight', {}, {'result': 2})
+
+  assert cache.get('search', {}) == {'result': 1}
+  assert cache.get('book_flight', {}) is None
+
+
+def test_cache_evicts_least_recently_used():
+  cache = FunctionResponseCache(max_entries=2)
+  cache.put('search', {'query': 'a'}, {'result': 'a'})
+  cache.put('search', {'query': 'b'}, {'result': 'b'})
+  assert cache.get('search', {'query': 'a'}) == {'result': 'a'}
+
+  cache.put('search', {'query': 'c'}, {'result': 'c'})
+
+  assert cache.get('search', {'query': 'a'}) == {'result': 'a'}
+  assert cache.get('search', {'query': 'b'}) is None
+  assert cache.get('search', {'query': 'c'}) == {'result': 'c'}
+
+
+def test_cache_entries_expire():
+  cache = FunctionResponseCache(ttl_seconds=10)
+  with mock.patch.object(_extra_utils.time, 'monotonic', return_value=100):
+    cache.put('search', {}, {'result': 1})
+  with mock.patch.object(_extra_utils.time, 'monotonic', return_value=105):
+    assert cache.get('search', {}) == {'result': 1}
+  with mock.patch.object(_extra_utils.time, 'monotonic', return_value=111):
+    assert cache.get('search', {}) is None
+
+
+def test_cache_does_not_cache_errors():
+  calls = []
+
+  def search():
+    calls.append(1)
+    raise ValueError('backend unavailable')
+
+  cache = FunctionResponseCache()
+  function_map = {'search': search}
+
+  get_function_response_parts(_function_call_response(), function_map, cache)
+  parts = get_function_response_parts(
+      _function_call_response(), function_map, cache
+  )
+
+  assert len(calls) == 2
+  assert 'error' in parts[0].function_response.response
+
+
+@pytest.mark.asyncio
+async def test_cache_reuses_identical_function_calls_async():
+  calls = []
+
+  async def search():
+    calls.append(1)
+    return len(calls)
+
+  cache = FunctionResponseCache()
+  function_map = {'search': search}
+
+  await get_function_response_parts_async(
+      _function_call_response(), function_map, cache
+  )
+  parts = await get_function_response_parts_async(
+      _function_call_response(), function_map, cache
+  )
+
+  assert len(calls) == 1
+  assert parts[0].function_response.response == {'result': 1}
+
+
+def test_get_function_response_cache_without_cache_config():
+  assert get_function_response_cache(None, {}) is None
+  assert get_function_response_cache(types.GenerateContentConfig(), {}) is None
+
+
+def _cache_config() -> types.GenerateContentConfig:
+  return types.GenerateContentConfig(
+      automatic_function_calling=types.AutomaticFunctionCallingConfig(
+          function_response_cache=types.FunctionResponseCacheConfig(
+              ttl_seconds=60
+          )
+      )
+  )
+
+
+def test_get_function_response_cache_is_shared_by_cache_config():
+  config = _cache_config()
+  caches = {}
+
+  cache = get_function_response_cache(config, caches)
+
+  assert isinstance(cache, FunctionResponseCache)
+  assert get_function_response_cache(config, caches) is cache
+  assert get_function_response_cache(config.model_copy(), caches) is cache
+  assert get_function_response_cache(config.model_dump(), caches) is cache
+  assert get_function_response_cache(_cache_config(), {}) is not cache
+
+
+def test_used_config_can_be_deep_copied():
+  config = _cache_config()
+  get_function_response_cache(config, {}).put('search', {}, {'result': 1})
+
+  copied = copy.deepcopy(config)
+
+  assert copied == config
+  assert config.model_copy(deep=True) == config
+
+
+def test_cache_entries_expire_by_default():
+  cache = FunctionResponseCache()
+  with mock.patch.object(_extra_utils.time, 'monotonic', return_value=100):
+    cache.put('search', {}, {'result': 1})
+  with mock.patch.object(_extra_utils.time, 'monotonic', return_value=500):
+    assert cache.get('search', {}) is None
+
+
+def test_cacheable_tools_enable_the_cache():
+  @types.cacheable_tool
+  def search() -> int:
+    return 1
+
+  def book_flight() -> int:
+    return 2
+
+  config = types.GenerateContentConfig(tools=[search, book_flight])
+  cache = get_function_response_cache(config)
+  cache.put('search', {}, {'result': 1})
+  cache.put('book_flight', {}, {'result': 2})
+
+  assert get_function_response_cache(
+      types.GenerateContentConfig(tools=[book_flight])
+  ) is None
+  assert cache.get('search', {}) == {'result': 1}
+  assert cache.get('book_flight', {}) is None
+
+
+def _search_responses(turns: int) -> list[types.GenerateContentResponse]:
+  return [
+      _function_call_response(),
+      types.GenerateContentResponse(
+          candidates=[
+              types.Candidate(
+                  content=types.Content(
+                      role='model', parts=[types.Part(text='done')]
+                  )
+              )
+          ]
+      ),
+  ] * turns
+
+
+def test_cache_is_scoped_to_a_request_or_a_chat():
+  calls = []
+
+  @types.cacheable_tool
+  def search() -> int:
+    """Searches."""
+    calls.append(1)
+    return len(calls)
+
+  client = Client(api_key='test-api-key')
+  config = {'tools': [search]}
+
+  with mock.patch.object(
+      type(client.models), '_generate_content', side_effect=_search_responses(6)
+  ):
+    for _ in range(2):
+      client.models.generate_content(
+          model='gemini-2.0-flash', contents='search', config=config
+      )
+    assert len(calls) == 2
+
+    chat = client.chats.create(model='gemini-2.0-flash', config=config)
+    chat.send_message('search')
+    chat.send_message('search again')
+    assert len(calls) == 3
+
+    other_chat = client.chats.create(model='gemini-2.0-flash', config=config)
+    other_chat.send_message('search')
+    assert len(calls) == 4
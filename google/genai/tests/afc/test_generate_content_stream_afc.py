@@ -14,6 +14,8 @@
 #
 from __future__ import annotations
 
+import asyncio
+import threading
 from unittest import mock
 import pytest
 from ... import _api_client
@@ -530,3 +532,133 @@ async def test_generate_content_stream_with_thought_summaries_async(
     assert chunk.automatic_function_calling_history[i].model_dump(
         exclude_none=True
     ) == TEST_AFC_HISTORY[i].model_dump(exclude_none=True)
+
+
+@pytest.mark.asyncio
+async def test_generate_content_stream_eager_execution_async():
+  """Test that function calls start before the response stream is consumed.
+
+  Expected to answer weather based on function response.
+  """
+  tool_started = asyncio.Event()
+  stream_consumed_before_tool_started = []
+
+  async def get_current_weather_slow():
+    tool_started.set()
+    return 'sunny'
+
+  async def async_generator_1():
+    yield types.GenerateContentResponse(
+        candidates=[
+            types.Candidate(
+                content=types.Content(
+                    parts=[
+                        types.Part(
+                            function_call=types.FunctionCall(
+                                name='get_current_weather_slow', args={}
+                            )
+                        )
+                    ],
+                    role='model',
+                )
+            )
+        ]
+    )
+    await asyncio.sleep(0)
+    stream_consumed_before_tool_started.append(not tool_started.is_set())
+    yield types.GenerateContentResponse(
+        candidates=[types.Candidate(finish_reason='STOP')]
+    )
+
+  async def async_generator_2():
+    yield types.GenerateContentResponse(
+        candidates=[types.Candidate(content=TEST_AFC_TEXT_CONTENT)]
+    )
+
+  with mock.patch.object(
+      models.AsyncModels, '_generate_content_stream'
+  ) as mock_stream:
+    mock_stream.side_effect = [async_generator_1(), async_generator_2()]
+    models_instance = models.AsyncModels(api_client_=mock_api_client)
+    stream = await models_instance.generate_content_stream(
+        model='test_model',
+        contents='what is the weather in San Francisco?',
+        config=types.GenerateContentConfig(
+            tools=[get_current_weather_slow],
+            automatic_function_calling=types.AutomaticFunctionCallingConfig(
+                eager_execution=True
+            ),
+        ),
+    )
+    chunks = [chunk async for chunk in stream]
+
+  assert stream_consumed_before_tool_started == [False]
+  assert mock_stream.call_count == 2
+  assert chunks[-1].text == TEST_AFC_TEXT_PART.text
+  history = chunks[-1].automatic_function_calling_history
+  assert len(history) == 3
+  assert history[1].parts[0].function_call.name == 'get_current_weather_slow'
+  assert history[2].parts[0].function_response.response == {
+      'result': 'sunny'
+  }
+
+
+@pytest.mark.asyncio
+async def test_generate_content_stream_eager_execution_sync_function_async():
+  """Test that eager execution runs synchronous functions off the event loop."""
+  event_loop_threads = []
+
+  def get_current_weather_sync():
+    event_loop_threads.append(threading.get_ident())
+    return 'windy'
+
+  async def async_generator_1():
+    event_loop_threads.append(threading.get_ident())
+    yield types.GenerateContentResponse(
+        candidates=[
+            types.Candidate(
+                content=types.Content(
+                    parts=[
+                        types.Part(
+                            function_call=types.FunctionCall(
+                                name='get_current_weather_sync', args={}
+                            )
+                        )
+                    ],
+                    role='model',
+                )
+            )
+        ]
+    )
+
+  async def async_generator_2():
+    yield types.GenerateContentResponse(
+        candidates=[types.Candidate(content=TEST_AFC_TEXT_CONTENT)]
+    )
+
+  with mock.patch.object(
+      models.AsyncModels, '_generate_content_stream'
+  ) as mock_stream, mock.patch.object(
+      _extra_utils, 'get_function_response_parts_async'
+  ) as mock_get_function_response_parts_async:
+    mock_stream.side_effect = [async_generator_1(), async_generator_2()]
+    models_instance = models.AsyncModels(api_client_=mock_api_client)
+    stream = await models_instance.generate_content_stream(
+        model='test_model',
+        contents='what is the weather in San Francisco?',
+        config={
+            'tools': [get_current_weather_sync],
+            'automatic_function_calling': {'eager_execution': True},
+        },
+    )
+    chunks = [chunk async for chunk in stream]
+
+  assert mock_get_function_response_parts_async.call_count == 0
+  assert event_loop_threads[0] != event_loop_threads[1]
+  assert len(chunks) == 1
+  assert chunks[0].text == TEST_AFC_TEXT_PART.text
+  assert chunks[
+      0
+  ].automatic_function_calling_history[2].parts[
+      0
+  ].function_response.response == {'result': 'windy'}
@@ -1291,6 +1291,34 @@ async def test_async_access_token_locking(monkeypatch):
   mock_refresh.assert_called_once()
 
 
+def test_access_token_skips_lock_for_valid_token():
+  """Tests that _access_token only takes the lock to load or refresh."""
+  mock_creds = mock.Mock(spec=credentials.Credentials)
+  mock_creds.token = "initial-token"
+  mock_creds.expired = False
+
+  def refresh_side_effect(request):
+    mock_creds.token = "refreshed-token"
+    mock_creds.expired = False
+
+  mock_creds.refresh = mock.Mock(side_effect=refresh_side_effect)
+
+  client = Client(
+      vertexai=True, project="fake_project_id", location="fake-location"
+  )
+  client._api_client._credentials = mock_creds
+  mock_lock = mock.MagicMock()
+  client._api_client._sync_auth_lock = mock_lock
+
+  assert client._api_client._access_token() == "initial-token"
+  mock_lock.__enter__.assert_not_called()
+
+  mock_creds.expired = True
+  assert client._api_client._access_token() == "refreshed-token"
+  mock_lock.__enter__.assert_called_once()
+  mock_creds.refresh.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_get_async_auth_lock_concurrent_access():
   """Tests that concurrent access to _get_async_auth_lock is thread-safe."""
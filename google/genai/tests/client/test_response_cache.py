@@ -0,0 +1,236 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests for the client response cache."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from unittest import mock
+
+import pytest
+
+from ... import _api_client
+from ... import Client
+from ... import response_cache
+from ... import types
+
+
+def _body(text: str) -> str:
+  return json.dumps(
+      {'candidates': [{'content': {'role': 'model', 'parts': [{'text': text}]}}]}
+  )
+
+
+def _http_response(*texts: str) -> _api_client.HttpResponse:
+  return _api_client.HttpResponse(
+      headers={'x-test': '1'}, response_stream=[_body(text) for text in texts]
+  )
+
+
+@pytest.fixture
+def client():
+  return Client(
+      api_key='test-api-key',
+      response_cache=response_cache.InMemoryResponseCache(),
+  )
+
+
+def test_identical_requests_are_served_from_cache(client):
+  with mock.patch.object(
+      client._api_client, '_request', return_value=_http_response('hello')
+  ) as request:
+    first = client.models.generate_content(
+        model='gemini-2.0-flash', contents='Hi'
+    )
+    # The same request in another input form hashes equal.
+    second = client.models.generate_content(
+        model='gemini-2.0-flash',
+        contents=[types.Content(role='user', parts=[types.Part(text='Hi')])],
+    )
+
+  assert request.call_count == 1
+  assert first.text == second.text == 'hello'
+  assert second.sdk_http_response.headers == {'x-test': '1'}
+
+
+def test_different_requests_are_not_shared(client):
+  with mock.patch.object(
+      client._api_client, '_request', return_value=_http_response('hello')
+  ) as request:
+    client.models.generate_content(model='gemini-2.0-flash', contents='Hi')
+    client.models.generate_content(
+        model='gemini-2.0-flash',
+        contents='Hi',
+        config={'temperature': 0},
+    )
+    client.models.generate_content(model='gemini-2.5-flash', contents='Hi')
+
+  assert request.call_count == 3
+
+
+def test_responses_are_not_shared_across_api_keys(tmp_path):
+  cache = response_cache.DiskResponseCache(tmp_path)
+  clients = [
+      Client(api_key=api_key, response_cache=cache)
+      for api_key in ('test-api-key', 'other-api-key')
+  ]
+
+  for other_client in clients:
+    with mock.patch.object(
+        other_client._api_client,
+        '_request',
+        return_value=_http_response('hello'),
+    ) as request:
+      other_client.models.generate_content(
+          model='gemini-2.0-flash', contents='Hi'
+      )
+    assert request.call_count == 1
+
+
+def test_bypass_response_cache(client):
+  with mock.patch.object(
+      client._api_client, '_request', return_value=_http_response('hello')
+  ) as request:
+    for _ in range(2):
+      client.models.generate_content(
+          model='gemini-2.0-flash',
+          contents='Hi',
+          config={'bypass_response_cache': True},
+      )
+
+  assert request.call_count == 2
+
+
+def test_streaming_replays_cached_chunks(client):
+  with mock.patch.object(
+      client._api_client,
+      '_request',
+      side_effect=lambda *args, **kwargs: _http_response('a', 'b', 'c'),
+  ) as request:
+    first = [
+        chunk.text
+        for chunk in client.models.generate_content_stream(
+            model='gemini-2.0-flash', contents='Hi'
+        )
+    ]
+    second = [
+        chunk.text
+        for chunk in client.models.generate_content_stream(
+            model='gemini-2.0-flash', contents='Hi'
+        )
+    ]
+
+  assert request.call_count == 1
+  assert first == second == ['a', 'b', 'c']
+
+
+def test_cache_is_only_enabled_for_generate_content_requests(client):
+  with mock.patch.object(
+      client._api_client,
+      '_request',
+      side_effect=lambda *args, **kwargs: _http_response('a', 'b'),
+  ):
+    for _ in client.models.generate_content_stream(
+        model='gemini-2.0-flash', contents='Hi'
+    ):
+      # Requests sent while the stream is consumed do not use the cache.
+      assert not _api_client._response_cache_enabled.get()
+    assert not _api_client._response_cache_enabled.get()
+
+
+def test_partially_consumed_stream_is_not_cached(client):
+  with mock.patch.object(
+      client._api_client,
+      '_request',
+      side_effect=lambda *args, **kwargs: _http_response('a', 'b'),
+  ) as request:
+    for _ in range(2):
+      stream = client.models.generate_content_stream(
+          model='gemini-2.0-flash', contents='Hi'
+      )
+      next(stream)
+      stream.close()
+
+  assert request.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_async_requests_are_served_from_cache(client):
+  with mock.patch.object(
+      client._api_client,
+      '_async_request',
+      side_effect=lambda *args, **kwargs: _http_response('hello'),
+  ) as request:
+    for _ in range(2):
+      response = await client.aio.models.generate_content(
+          model='gemini-2.0-flash', contents='Hi'
+      )
+    chunks = []
+    for _ in range(2):
+      chunks.append([
+          chunk.text
+          async for chunk in await client.aio.models.generate_content_stream(
+              model='gemini-2.0-flash', contents='Hi'
+          )
+      ])
+
+  assert request.call_count == 2
+  assert response.text == 'hello'
+  assert chunks == [['hello'], ['hello']]
+
+
+def test_in_memory_cache_evicts_by_byte_budget():
+  cache = response_cache.InMemoryResponseCache(max_bytes=10)
+  cache.put('a', response_cache.CachedResponse(headers={}, bodies=['12345']))
+  cache.put('b', response_cache.CachedResponse(headers={}, bodies=['12345']))
+  assert cache.get('a') is not None
+  cache.put('c', response_cache.CachedResponse(headers={}, bodies=['12345']))
+  cache.put('d', response_cache.CachedResponse(headers={}, bodies=['1' * 11]))
+
+  assert len(cache) == 2
+  assert cache.get('a') is not None
+  assert cache.get('b') is None
+  assert cache.get('c') is not None
+  assert cache.get('d') is None
+
+
+def test_in_memory_cache_ttl():
+  cache = response_cache.InMemoryResponseCache(ttl_seconds=10)
+  cache.put('a', response_cache.CachedResponse(headers={}, bodies=['x']))
+  with mock.patch.object(time, 'monotonic', return_value=time.monotonic() + 11):
+    assert cache.get('a') is None
+
+
+def test_disk_cache_persists_and_expires(tmp_path):
+  cached = response_cache.CachedResponse(headers={'h': 'v'}, bodies=['1', '2'])
+  response_cache.DiskResponseCache(tmp_path).put('ab12', cached)
+
+  assert response_cache.DiskResponseCache(tmp_path).get('ab12') == cached
+  path = tmp_path / 'ab' / 'ab12.json'
+  os.utime(path, (time.time() - 100, time.time() - 100))
+  assert response_cache.DiskResponseCache(tmp_path, ttl_seconds=50).get(
+      'ab12'
+  ) is None
+  assert not path.exists()
+
+
+def test_disk_cache_ignores_corrupted_entries(tmp_path):
+  (tmp_path / 'ab').mkdir()
+  (tmp_path / 'ab' / 'ab12.json').write_text('{not json')
+
+  assert response_cache.DiskResponseCache(tmp_path).get('ab12') is None
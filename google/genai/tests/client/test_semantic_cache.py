@@ -0,0 +1,254 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests for the client semantic cache."""
+
+from __future__ import annotations
+
+import json
+import time
+from unittest import mock
+
+import httpx
+import pytest
+
+from ... import _api_client
+from ... import Client
+from ... import semantic_cache
+from ... import types
+
+_VECTORS = {
+    'How do I reset my password?': [1.0, 0.0, 0.0],
+    'how can I reset my password': [0.99, 0.1, 0.0],
+    'What are your opening hours?': [0.0, 1.0, 0.0],
+}
+
+
+class _FakeApi:
+
+  def __init__(self):
+    self.generate_calls = 0
+    self.embed_calls = 0
+    # The error that the embedding requests fail with, if any.
+    self.embed_error = None
+
+  def request(self, http_request, http_options=None, stream=False):
+    if 'batchEmbedContents' in http_request.url:
+      self.embed_calls += 1
+      if self.embed_error is not None:
+        raise self.embed_error
+      body = {
+          'embeddings': [
+              {'values': _VECTORS[r['content']['parts'][0]['text']]}
+              for r in http_request.data['requests']
+          ]
+      }
+    else:
+      self.generate_calls += 1
+      body = {
+          'candidates': [{
+              'content': {
+                  'role': 'model',
+                  'parts': [{'text': f'answer {self.generate_calls}'}],
+              }
+          }]
+      }
+    return _api_client.HttpResponse(
+        headers={}, response_stream=[json.dumps(body)]
+    )
+
+  async def async_request(self, http_request, http_options=None, stream=False):
+    return self.request(http_request, http_options, stream)
+
+
+@pytest.fixture
+def fake_api():
+  return _FakeApi()
+
+
+def _client(fake_api, cache):
+  client = Client(api_key='test-api-key', semantic_cache=cache)
+  client._api_client._request = fake_api.request
+  client._api_client._async_request = fake_api.async_request
+  return client
+
+
+def test_similar_prompt_is_served_from_cache(fake_api):
+  cache = semantic_cache.SemanticCache(similarity_threshold=0.95)
+  client = _client(fake_api, cache)
+
+  first = client.models.generate_content(
+      model='gemini-2.0-flash', contents='How do I reset my password?'
+  )
+  second = client.models.generate_content(
+      model='gemini-2.0-flash', contents='how can I reset my password'
+  )
+  third = client.models.generate_content(
+      model='gemini-2.0-flash', contents='What are your opening hours?'
+  )
+
+  assert fake_api.generate_calls == 2
+  assert first.text == second.text == 'answer 1'
+  assert third.text == 'answer 2'
+  assert cache.stats() == semantic_cache.SemanticCacheStats(
+      hits=1, misses=2, evictions=0, entries=2
+  )
+
+
+def test_cache_is_scoped_by_model_and_config(fake_api):
+  client = _client(fake_api, semantic_cache.SemanticCache())
+  prompt = 'How do I reset my password?'
+
+  client.models.generate_content(model='gemini-2.0-flash', contents=prompt)
+  client.models.generate_content(model='gemini-2.5-flash', contents=prompt)
+  client.models.generate_content(
+      model='gemini-2.0-flash',
+      contents=prompt,
+      config={'system_instruction': 'Be brief.'},
+  )
+  client.models.generate_content(model='gemini-2.0-flash', contents=prompt)
+
+  assert fake_api.generate_calls == 3
+
+
+def test_bypass_response_cache_skips_semantic_cache(fake_api):
+  cache = semantic_cache.SemanticCache()
+  client = _client(fake_api, cache)
+
+  for _ in range(2):
+    client.models.generate_content(
+        model='gemini-2.0-flash',
+        contents='How do I reset my password?',
+        config={'bypass_response_cache': True},
+    )
+
+  assert fake_api.generate_calls == 2
+  assert fake_api.embed_calls == 0
+  assert cache.stats().entries == 0
+
+
+def test_embedding_transport_error_skips_semantic_cache(fake_api):
+  fake_api.embed_error = httpx.ConnectError('connection refused')
+  client = _client(fake_api, semantic_cache.SemanticCache())
+
+  response = client.models.generate_content(
+      model='gemini-2.0-flash', contents='How do I reset my password?'
+  )
+
+  assert response.text == 'answer 1'
+  assert fake_api.embed_calls >= 1
+
+
+@pytest.mark.asyncio
+async def test_async_embedding_timeout_skips_semantic_cache(fake_api):
+  fake_api.embed_error = httpx.ReadTimeout('timed out')
+  client = _client(fake_api, semantic_cache.SemanticCache())
+
+  response = await client.aio.models.generate_content(
+      model='gemini-2.0-flash', contents='How do I reset my password?'
+  )
+
+  assert response.text == 'answer 1'
+
+
+def test_non_text_prompts_are_not_cached(fake_api):
+  client = _client(fake_api, semantic_cache.SemanticCache())
+
+  for _ in range(2):
+    client.models.generate_content(
+        model='gemini-2.0-flash',
+        contents=types.Part.from_uri(
+            file_uri='gs://bucket/image.jpg', mime_type='image/jpeg'
+        ),
+    )
+
+  assert fake_api.generate_calls == 2
+  assert fake_api.embed_calls == 0
+
+
+def test_max_entries_evicts_least_recently_used(fake_api):
+  cache = semantic_cache.SemanticCache(max_entries=1)
+  client = _client(fake_api, cache)
+
+  client.models.generate_content(
+      model='gemini-2.0-flash', contents='How do I reset my password?'
+  )
+  client.models.generate_content(
+      model='gemini-2.0-flash', contents='What are your opening hours?'
+  )
+  client.models.generate_content(
+      model='gemini-2.0-flash', contents='How do I reset my password?'
+  )
+
+  assert fake_api.generate_calls == 3
+  assert cache.stats().evictions == 2
+  assert cache.stats().entries == 1
+
+
+def test_ttl_expires_entries(fake_api):
+  cache = semantic_cache.SemanticCache(ttl_seconds=10)
+  client = _client(fake_api, cache)
+  prompt = 'How do I reset my password?'
+
+  client.models.generate_content(model='gemini-2.0-flash', contents=prompt)
+  with mock.patch.object(time, 'monotonic', return_value=time.monotonic() + 11):
+    client.models.generate_content(model='gemini-2.0-flash', contents=prompt)
+
+  assert fake_api.generate_calls == 2
+
+
+def test_cached_responses_are_copies(fake_api):
+  client = _client(fake_api, semantic_cache.SemanticCache())
+  prompt = 'How do I reset my password?'
+
+  first = client.models.generate_content(
+      model='gemini-2.0-flash', contents=prompt
+  )
+  first.candidates[0].content.parts[0].text = 'changed'
+  second = client.models.generate_content(
+      model='gemini-2.0-flash', contents=prompt
+  )
+
+  assert second.text == 'answer 1'
+
+
+@pytest.mark.asyncio
+async def test_async_similar_prompt_is_served_from_cache(fake_api):
+  client = _client(fake_api, semantic_cache.SemanticCache())
+
+  first = await client.aio.models.generate_content(
+      model='gemini-2.0-flash', contents='How do I reset my password?'
+  )
+  second = await client.aio.models.generate_content(
+      model='gemini-2.0-flash', contents='how can I reset my password'
+  )
+
+  assert fake_api.generate_calls == 1
+  assert first.text == second.text
+
+
+def test_ivf_index_finds_nearest_vector():
+  numpy = pytest.importorskip('numpy')
+  rng = numpy.random.default_rng(1)
+  vectors = rng.normal(size=(400, 16))
+  vectors /= numpy.linalg.norm(vectors, axis=1, keepdims=True)
+  index = semantic_cache._VectorIndex(ivf_min_entries=100, ivf_probes=20)
+  for entry_id, vector in enumerate(vectors):
+    index.add(entry_id, vector.tolist())
+
+  assert index._partitions is not None
+  entry_id, similarity = index.search(vectors[123].tolist())
+  assert entry_id == 123
+  assert similarity == pytest.approx(1.0, abs=1e-5)
@@ -0,0 +1,305 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests for chunked resumable uploads."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import threading
+from unittest import mock
+
+import httpx
+import pytest
+
+from ... import _api_client
+from ... import Client
+
+_UPLOAD_URL = 'https://upload.example.com/upload'
+
+
+class _FakeUploadServer:
+  """A resumable upload endpoint that can drop the connection mid chunk."""
+
+  def __init__(self, fail_chunks: int = 0, partial_bytes: int = 0):
+    self.data = bytearray()
+    self.commands: list[tuple[str, int, int]] = []
+    self.final = False
+    # The number of chunks that fail after their first partial_bytes arrived.
+    self.fail_chunks = fail_chunks
+    self.partial_bytes = partial_bytes
+
+  def handle(self, request: httpx.Request, content: bytes) -> httpx.Response:
+    command = request.headers['X-Goog-Upload-Command']
+    if command == 'query':
+      self.commands.append((command, len(self.data), 0))
+      return self._response()
+    offset = int(request.headers['X-Goog-Upload-Offset'])
+    self.commands.append((command, offset, len(content)))
+    assert offset == len(self.data)
+    assert int(request.headers['Content-Length']) == len(content)
+    if self.fail_chunks:
+      self.fail_chunks -= 1
+      self.data += content[: self.partial_bytes]
+      raise httpx.ReadError('connection dropped')
+    self.data += content
+    if 'finalize' in command:
+      self.final = True
+    return self._response()
+
+  def _response(self) -> httpx.Response:
+    headers = {
+        'x-goog-upload-status': 'final' if self.final else 'active',
+        'x-goog-upload-size-received': str(len(self.data)),
+    }
+    body = {'file': {'name': 'files/abc'}} if self.final else {}
+    return httpx.Response(200, headers=headers, text=json.dumps(body))
+
+  def sync_handler(self, request: httpx.Request) -> httpx.Response:
+    return self.handle(request, request.read())
+
+  async def async_handler(self, request: httpx.Request) -> httpx.Response:
+    return self.handle(request, await request.aread())
+
+
+def _client(server: _FakeUploadServer, **kwargs) -> Client:
+  client = Client(api_key='test-api-key', **kwargs)
+  client._api_client._httpx_client = httpx.Client(
+      transport=httpx.MockTransport(server.sync_handler)
+  )
+  client._api_client._async_httpx_client = httpx.AsyncClient(
+      transport=httpx.MockTransport(server.async_handler)
+  )
+  return client
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay():
+  with mock.patch.object(_api_client.time, 'sleep'), mock.patch.object(
+      _api_client.asyncio, 'sleep', mock.AsyncMock()
+  ):
+    yield
+
+
+@pytest.fixture
+def content():
+  return bytes(range(256)) * (30 * 1024 * 1024 // 256 + 7)
+
+
+def test_upload_path_in_growing_chunks(tmp_path, content):
+  path = tmp_path / 'data.bin'
+  path.write_bytes(content)
+  server = _FakeUploadServer()
+  client = _client(server)
+
+  response = client._api_client.upload_file(
+      str(path), _UPLOAD_URL, len(content)
+  )
+
+  assert response.json == {'file': {'name': 'files/abc'}}
+  assert server.data == content
+  # Local chunks upload fast, so the second chunk is twice as large.
+  assert [size for _, _, size in server.commands] == [
+      _api_client.CHUNK_SIZE,
+      2 * _api_client.CHUNK_SIZE,
+      len(content) - 3 * _api_client.CHUNK_SIZE,
+  ]
+  assert server.commands[-1][0] == 'upload, finalize'
+
+
+def test_max_chunk_size_limits_growth(content):
+  server = _FakeUploadServer()
+  client = _client(server, upload_max_chunk_size=5 * 1024 * 1024 + 1)
+
+  client._api_client.upload_file(io.BytesIO(content), _UPLOAD_URL, len(content))
+
+  assert server.data == content
+  assert {size for _, _, size in server.commands[:-1]} == {5 * 1024 * 1024}
+
+
+def test_failed_chunk_resumes_from_received_offset(tmp_path, content):
+  path = tmp_path / 'data.bin'
+  path.write_bytes(content)
+  server = _FakeUploadServer(fail_chunks=1, partial_bytes=1000)
+  client = _client(server)
+
+  client._api_client.upload_file(str(path), _UPLOAD_URL, len(content))
+
+  assert server.data == content
+  assert server.commands[:3] == [
+      ('upload', 0, _api_client.CHUNK_SIZE),
+      ('query', 1000, 0),
+      ('upload', 1000, _api_client.CHUNK_SIZE),
+  ]
+
+
+def test_file_object_is_seeked_to_resume_offset(content):
+  server = _FakeUploadServer(fail_chunks=1, partial_bytes=1000)
+  client = _client(server)
+  file = io.BytesIO(b'header' + content)
+  file.seek(len(b'header'))
+
+  client._api_client.upload_file(file, _UPLOAD_URL, len(content))
+
+  assert server.data == content
+
+
+def test_upload_fails_after_max_retries(content):
+  server = _FakeUploadServer(fail_chunks=_api_client.MAX_RETRY_COUNT)
+  client = _client(server)
+
+  with pytest.raises(httpx.ReadError):
+    client._api_client.upload_file(
+        io.BytesIO(content), _UPLOAD_URL, len(content)
+    )
+
+
+def test_empty_file(tmp_path):
+  path = tmp_path / 'empty.bin'
+  path.write_bytes(b'')
+  server = _FakeUploadServer()
+  client = _client(server)
+
+  client._api_client.upload_file(str(path), _UPLOAD_URL, 0)
+
+  assert server.commands == [('upload, finalize', 0, 0)]
+
+
+def test_async_failed_chunk_resumes_from_received_offset(tmp_path, content):
+  path = tmp_path / 'data.bin'
+  path.write_bytes(content)
+  server = _FakeUploadServer(fail_chunks=1, partial_bytes=1000)
+  client = _client(server)
+
+  with mock.patch.object(
+      _api_client.BaseApiClient, '_use_aiohttp', return_value=False
+  ):
+    response = asyncio.run(
+        client._api_client.async_upload_file(
+            str(path), _UPLOAD_URL, len(content)
+        )
+    )
+
+  assert response.json == {'file': {'name': 'files/abc'}}
+  assert server.data == content
+  assert ('query', 1000, 0) in server.commands
+
+
+def test_chunk_sizer_adapts_to_throughput():
+  sizer = _api_client._UploadChunkSizer(4 * _api_client.CHUNK_SIZE)
+
+  sizer.record(sizer.chunk_size, 0.1)
+  sizer.record(sizer.chunk_size, 0.1)
+  sizer.record(sizer.chunk_size, 0.1)
+  assert sizer.chunk_size == 4 * _api_client.CHUNK_SIZE
+  sizer.record(sizer.chunk_size, 60)
+  assert sizer.chunk_size == 2 * _api_client.CHUNK_SIZE
+  # A short last chunk does not change the chunk size.
+  sizer.record(1, 60)
+  assert sizer.chunk_size == 2 * _api_client.CHUNK_SIZE
+
+
+class _RecordingFile(io.BytesIO):
+  """Records the threads, offsets and sizes of its reads."""
+
+  def __init__(self, content: bytes):
+    super().__init__(content)
+    self.threads: set[int] = set()
+    self.second_chunk_read = threading.Event()
+    self.bytes_read = 0
+
+  def read(self, size=-1):
+    self.threads.add(threading.get_ident())
+    if self.tell() > 0:
+      self.second_chunk_read.set()
+    data = super().read(size)
+    self.bytes_read += len(data)
+    return data
+
+
+def test_async_upload_reads_ahead_off_the_event_loop(content):
+  file = _RecordingFile(content)
+  server = _FakeUploadServer()
+  client = _client(server)
+
+  async def handler(request: httpx.Request) -> httpx.Response:
+    body = await request.aread()
+    if int(request.headers['X-Goog-Upload-Offset']) == 0:
+      # The next chunk is read while the first one is uploaded.
+      assert await asyncio.to_thread(file.second_chunk_read.wait, 5)
+    return server.handle(request, body)
+
+  client._api_client._async_httpx_client = httpx.AsyncClient(
+      transport=httpx.MockTransport(handler)
+  )
+
+  async def upload():
+    await client._api_client.async_upload_file(
+        file, _UPLOAD_URL, len(content)
+    )
+    return threading.get_ident()
+
+  with mock.patch.object(
+      _api_client.BaseApiClient, '_use_aiohttp', return_value=False
+  ):
+    loop_thread = asyncio.run(upload())
+
+  assert server.data == content
+  assert file.threads and loop_thread not in file.threads
+
+
+def test_async_read_ahead_is_discarded_on_resume(tmp_path, content):
+  path = tmp_path / 'data.bin'
+  path.write_bytes(content)
+  server = _FakeUploadServer(fail_chunks=2, partial_bytes=1000)
+  client = _client(server)
+
+  with mock.patch.object(
+      _api_client.BaseApiClient, '_use_aiohttp', return_value=False
+  ):
+    asyncio.run(
+        client._api_client.async_upload_file(
+            str(path), _UPLOAD_URL, len(content)
+        )
+    )
+
+  assert server.data == content
+
+
+def test_async_read_ahead_is_kept_while_chunks_grow(content):
+  file = _RecordingFile(content)
+  server = _FakeUploadServer()
+  client = _client(server)
+
+  with mock.patch.object(
+      _api_client.BaseApiClient, '_use_aiohttp', return_value=False
+  ):
+    asyncio.run(
+        client._api_client.async_upload_file(
+            file, _UPLOAD_URL, len(content)
+        )
+    )
+
+  assert server.data == content
+  assert [size for _, _, size in server.commands] == [
+      _api_client.CHUNK_SIZE,
+      2 * _api_client.CHUNK_SIZE,
+      len(content) - 3 * _api_client.CHUNK_SIZE,
+  ]
+  # Each byte is read once, although each chunk was read ahead with the size
+  # of the previous one.
+  assert file.bytes_read == len(content)
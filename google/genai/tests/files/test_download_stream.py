@@ -0,0 +1,242 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests for streaming file downloads."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import os
+import re
+from unittest import mock
+
+import httpx
+import pytest
+
+from ... import _api_client
+from ... import Client
+from ... import errors
+from ... import types
+
+_DATA = os.urandom(10_000)
+_VIDEO_URI = (
+    'https://generativelanguage.googleapis.com/v1beta/files/abc:download'
+    '?alt=media'
+)
+
+
+class _DroppingStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+  """A response body whose connection drops after some bytes."""
+
+  def __init__(self, data: bytes, drop_after: int | None):
+    self._data = data
+    self._drop_after = drop_after
+
+  def _chunks(self):
+    size = len(self._data) if self._drop_after is None else self._drop_after
+    for i in range(0, size, 1000):
+      yield self._data[i : min(i + 1000, size)]
+    if self._drop_after is not None:
+      raise httpx.ReadError('connection dropped')
+
+  def __iter__(self):
+    yield from self._chunks()
+
+  async def __aiter__(self):
+    for chunk in self._chunks():
+      yield chunk
+
+
+class _FakeStorage:
+  """Serves _DATA with range support, dropping some connections."""
+
+  def __init__(self, supports_ranges: bool = True):
+    self.supports_ranges = supports_ranges
+    self.ranges: list[str | None] = []
+    # The number of bytes after which the next responses drop the connection,
+    # or None to send the whole response.
+    self.drops: list[int | None] = []
+    self.status_code = 200
+
+  def handler(self, request: httpx.Request) -> httpx.Response:
+    assert request.url.path.endswith('files/abc:download')
+    range_header = request.headers.get('range')
+    self.ranges.append(range_header)
+    if self.status_code != 200:
+      return httpx.Response(self.status_code, json={'error': {}})
+    data = _DATA
+    status_code = 200
+    headers = {}
+    if range_header and self.supports_ranges:
+      start, end = re.fullmatch(r'bytes=(\d+)-(\d*)', range_header).groups()
+      end = int(end) + 1 if end else len(_DATA)
+      data = _DATA[int(start) : end]
+      status_code = 206
+      headers['content-range'] = f'bytes {start}-{end - 1}/{len(_DATA)}'
+    drop_after = self.drops.pop(0) if self.drops else None
+    return httpx.Response(
+        status_code,
+        headers=headers,
+        stream=_DroppingStream(data, drop_after),
+    )
+
+
+class _StreamingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+  """Unlike httpx.MockTransport, does not read the responses eagerly."""
+
+  def __init__(self, handler):
+    self._handler = handler
+
+  def handle_request(self, request: httpx.Request) -> httpx.Response:
+    return self._handler(request)
+
+  async def handle_async_request(
+      self, request: httpx.Request
+  ) -> httpx.Response:
+    return self._handler(request)
+
+
+@pytest.fixture
+def storage():
+  return _FakeStorage()
+
+
+@pytest.fixture
+def client(storage):
+  client = Client(api_key='test-api-key')
+  client._api_client._httpx_client = httpx.Client(
+      transport=_StreamingTransport(storage.handler)
+  )
+  client._api_client._async_httpx_client = httpx.AsyncClient(
+      transport=_StreamingTransport(storage.handler)
+  )
+  with mock.patch.object(_api_client.time, 'sleep'), mock.patch.object(
+      _api_client.asyncio, 'sleep', mock.AsyncMock()
+  ), mock.patch.object(
+      _api_client.BaseApiClient, '_use_aiohttp', return_value=False
+  ), mock.patch.object(
+      _api_client, 'DOWNLOAD_RANGE_SIZE', 1500
+  ):
+    yield client
+
+
+def test_iter_download_streams_chunks(client):
+  chunks = list(client.files.iter_download(file='files/abc', chunk_size=512))
+
+  assert b''.join(chunks) == _DATA
+  assert max(len(chunk) for chunk in chunks) == 512
+
+
+def test_dropped_connection_resumes_with_range(client, storage):
+  storage.drops = [3000, 2000]
+
+  data = b''.join(
+      client.files.iter_download(file='files/abc', chunk_size=1000)
+  )
+
+  assert data == _DATA
+  assert storage.ranges == [None, 'bytes=3000-', 'bytes=5000-']
+
+
+def test_resume_without_range_support_skips_received_bytes(client, storage):
+  storage.supports_ranges = False
+  storage.drops = [3000]
+
+  data = b''.join(
+      client.files.iter_download(file='files/abc', chunk_size=1000)
+  )
+
+  assert data == _DATA
+
+
+def test_download_fails_after_max_retries(client, storage):
+  storage.drops = [0] * _api_client.MAX_RETRY_COUNT
+
+  with pytest.raises(httpx.ReadError):
+    b''.join(client.files.iter_download(file='files/abc'))
+
+
+def test_download_error_is_not_retried(client, storage):
+  storage.status_code = 404
+
+  with pytest.raises(errors.ClientError):
+    b''.join(client.files.iter_download(file='files/abc'))
+  assert len(storage.ranges) == 1
+
+
+def test_download_to_file_object(client):
+  destination = io.BytesIO()
+  video = types.Video(uri=_VIDEO_URI)
+
+  client.files.download_to(file=video, destination=destination)
+
+  assert destination.getvalue() == _DATA
+  assert video.video_bytes is None
+
+
+def test_download_to_path_in_parallel_ranges(client, storage, tmp_path):
+  # The size request is not dropped.
+  storage.drops = [None, 0, 700]
+  destination = tmp_path / 'video.mp4'
+
+  client.files.download_to(
+      file='files/abc', destination=destination, max_concurrency=4
+  )
+
+  assert destination.read_bytes() == _DATA
+  assert storage.ranges[0] == 'bytes=0-0'
+  # One request per range, and the retries of the two dropped ranges.
+  assert len(storage.ranges) == 1 + 7 + 2
+
+
+def test_failed_download_to_path_removes_partial_file(
+    client, storage, tmp_path
+):
+  storage.drops = [5000] + [0] * _api_client.MAX_RETRY_COUNT
+  destination = tmp_path / 'video.mp4'
+
+  with pytest.raises(httpx.ReadError):
+    client.files.download_to(file='files/abc', destination=destination)
+
+  assert not destination.exists()
+
+
+def test_async_iter_download_resumes_with_range(client, storage):
+  storage.drops = [3000]
+
+  async def download():
+    return [
+        chunk
+        async for chunk in client.aio.files.iter_download(
+            file='files/abc', chunk_size=1000
+        )
+    ]
+
+  assert b''.join(asyncio.run(download())) == _DATA
+  assert storage.ranges == [None, 'bytes=3000-']
+
+
+def test_async_download_to_path_in_parallel_ranges(client, storage, tmp_path):
+  storage.drops = [None, 0, 700]
+  destination = tmp_path / 'video.mp4'
+
+  asyncio.run(
+      client.aio.files.download_to(
+          file='files/abc', destination=destination, max_concurrency=4
+      )
+  )
+
+  assert destination.read_bytes() == _DATA
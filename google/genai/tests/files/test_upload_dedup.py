@@ -0,0 +1,246 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests for deduplicating uploads with the upload registry."""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import io
+import json
+
+import httpx
+import pytest
+
+from ... import _upload_registry
+from ... import Client
+from ... import types
+
+
+class _FakeFileService:
+  """Uploads files that expire after `lifetime`, and gets them."""
+
+  def __init__(self):
+    self.files: dict[str, dict] = {}
+    self.uploads = 0
+    self.gets = 0
+    self.lifetime = datetime.timedelta(hours=48)
+
+  def handle(self, request: httpx.Request, content: bytes) -> httpx.Response:
+    if request.method == 'GET':
+      self.gets += 1
+      name = request.url.path.split('/v1beta/')[-1]
+      if name not in self.files:
+        return httpx.Response(
+            404, json={'error': {'code': 404, 'message': 'not found'}}
+        )
+      return httpx.Response(200, json=self.files[name])
+    command = request.headers['X-Goog-Upload-Command']
+    if command == 'start':
+      return httpx.Response(
+          200,
+          headers={'x-goog-upload-url': 'https://upload.example.com/1'},
+          text='{}',
+      )
+    self.uploads += 1
+    expiration_time = datetime.datetime.now(datetime.timezone.utc) + (
+        self.lifetime
+    )
+    file = {
+        'name': f'files/{self.uploads}',
+        'expirationTime': expiration_time.isoformat(),
+        'state': 'ACTIVE',
+    }
+    self.files[file['name']] = file
+    return httpx.Response(
+        200,
+        headers={'x-goog-upload-status': 'final'},
+        text=json.dumps({'file': file}),
+    )
+
+  def sync_handler(self, request: httpx.Request) -> httpx.Response:
+    return self.handle(request, request.read())
+
+  async def async_handler(self, request: httpx.Request) -> httpx.Response:
+    return self.handle(request, await request.aread())
+
+
+@pytest.fixture
+def service():
+  return _FakeFileService()
+
+
+@pytest.fixture
+def client(service, tmp_path, monkeypatch):
+  monkeypatch.setenv(
+      _upload_registry._REGISTRY_DIR_ENV_VAR, str(tmp_path / 'registry')
+  )
+  client = Client(api_key='test-api-key')
+  client._api_client._httpx_client = httpx.Client(
+      transport=httpx.MockTransport(service.sync_handler)
+  )
+  client._api_client._async_httpx_client = httpx.AsyncClient(
+      transport=httpx.MockTransport(service.async_handler)
+  )
+  client._api_client._use_aiohttp = lambda: False
+  return client
+
+
+@pytest.fixture
+def path(tmp_path):
+  path = tmp_path / 'image.png'
+  path.write_bytes(b'image data')
+  return path
+
+
+def test_same_content_is_uploaded_once(client, service, path, tmp_path):
+  copy = tmp_path / 'copy.png'
+  copy.write_bytes(path.read_bytes())
+
+  first = client.files.upload(file=path, deduplicate=True)
+  second = client.files.upload(file=copy, deduplicate=True)
+
+  assert service.uploads == 1
+  assert second.name == first.name == 'files/1'
+  assert second.expiration_time == first.expiration_time
+
+
+def test_other_content_or_metadata_is_uploaded(client, service, path):
+  client.files.upload(file=path, deduplicate=True)
+  client.files.upload(
+      file=path, config={'display_name': 'other'}, deduplicate=True
+  )
+  path.write_bytes(b'other data')
+  client.files.upload(file=path, deduplicate=True)
+
+  assert service.uploads == 3
+
+
+def test_uploads_are_only_recorded_when_deduplicating(client, service, path):
+  client.files.upload(file=path)
+  client.files.upload(file=path, deduplicate=True)
+
+  assert service.uploads == 2
+
+
+def test_expiring_file_is_uploaded_again(client, service, path):
+  service.lifetime = datetime.timedelta(minutes=10)
+  client.files.upload(file=path, deduplicate=True)
+
+  file = client.files.upload(file=path, deduplicate=True)
+
+  assert service.uploads == 2
+  assert file.name == 'files/2'
+
+
+def test_deleted_file_is_uploaded_again_when_verified(client, service, path):
+  client.files.upload(file=path, deduplicate=True)
+  assert client.files.upload(
+      file=path, deduplicate=True, verify_deduplicated=True
+  ).name == 'files/1'
+  del service.files['files/1']
+
+  file = client.files.upload(
+      file=path, deduplicate=True, verify_deduplicated=True
+  )
+
+  assert file.name == 'files/2'
+  assert service.gets == 2
+
+
+def test_upload_many_verifies_deduplicated_files(client, service, path):
+  client.files.upload(file=path, deduplicate=True)
+  del service.files['files/1']
+
+  results = client.files.upload_many(
+      files=[path], deduplicate=True, verify_deduplicated=True
+  )
+  del service.files['files/2']
+  async_results = asyncio.run(
+      client.aio.files.upload_many(
+          files=[path], deduplicate=True, verify_deduplicated=True
+      )
+  )
+
+  assert results[0].file.name == 'files/2'
+  assert async_results[0].file.name == 'files/3'
+  assert service.gets == 2
+
+
+def test_file_object_is_hashed_from_its_position(client, service):
+  file = io.BytesIO(b'header' + b'image data')
+  file.seek(len(b'header'))
+  config = {'mime_type': 'image/png'}
+
+  client.files.upload(file=file, config=config, deduplicate=True)
+  file.seek(len(b'header'))
+  client.files.upload(
+      file=io.BytesIO(b'image data'), config=config, deduplicate=True
+  )
+
+  assert service.uploads == 1
+
+
+def test_iterators_cannot_be_deduplicated(client):
+  with pytest.raises(ValueError, match='deduplicated'):
+    client.files.upload(
+        file=iter([b'data']),
+        config={'mime_type': 'image/png'},
+        deduplicate=True,
+    )
+
+
+def test_registry_writes_use_their_own_temporary_files(tmp_path, monkeypatch):
+  registry = _upload_registry.UploadRegistry('account', str(tmp_path))
+  file = types.File(name='files/1')
+  replaced = []
+  os_replace = _upload_registry.os.replace
+
+  def replace(src, dst):
+    replaced.append(src)
+    os_replace(src, dst)
+
+  monkeypatch.setattr(_upload_registry.os, 'replace', replace)
+  registry.record('hash', {}, file)
+  registry.record('hash', {}, file)
+
+  assert len(set(replaced)) == 2
+  assert registry.get('hash', {}) == file
+
+
+def test_registry_is_per_account(client, service, path):
+  client.files.upload(file=path, deduplicate=True)
+  client._api_client.api_key = 'other-api-key'
+
+  client.files.upload(file=path, deduplicate=True)
+
+  assert service.uploads == 2
+
+
+def test_async_same_content_is_uploaded_once(client, service, path):
+  async def upload():
+    first = await client.aio.files.upload(file=path, deduplicate=True)
+    second = await client.aio.files.upload(
+        file=path, deduplicate=True, verify_deduplicated=True
+    )
+    return first, second
+
+  first, second = asyncio.run(upload())
+
+  assert service.uploads == 1
+  assert service.gets == 1
+  assert second.name == first.name
+  assert second.state == types.FileState.ACTIVE
@@ -0,0 +1,195 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests for uploading iterators of bytes of unknown length."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest import mock
+
+import httpx
+import pytest
+
+from ... import _api_client
+from ... import Client
+
+_UPLOAD_URL = 'https://upload.example.com/session/1'
+_CONTENT = bytes(range(256)) * (30 * 1024 * 1024 // 256) + b'tail'
+
+
+class _FakeFileService:
+  """Creates an upload session and receives its chunks."""
+
+  def __init__(self):
+    self.start_headers: dict[str, str] = {}
+    self.commands: list[tuple[str, int]] = []
+    self.data = bytearray()
+    # The number of chunks that fail after their first 1000 bytes arrived.
+    self.fail_chunks = 0
+
+  def handle(self, request: httpx.Request, content: bytes) -> httpx.Response:
+    command = request.headers['X-Goog-Upload-Command']
+    if command == 'start':
+      self.start_headers = dict(request.headers)
+      return httpx.Response(
+          200, headers={'x-goog-upload-url': _UPLOAD_URL}, text='{}'
+      )
+    final = 'finalize' in command
+    if command != 'query':
+      self.commands.append((command, len(content)))
+      if self.fail_chunks:
+        self.fail_chunks -= 1
+        self.data += content[:1000]
+        raise httpx.ReadError('connection dropped')
+      self.data += content
+    headers = {
+        'x-goog-upload-status': 'final' if final else 'active',
+        'x-goog-upload-size-received': str(len(self.data)),
+    }
+    body = {'file': {'name': 'files/abc'}} if final else {}
+    return httpx.Response(200, headers=headers, text=json.dumps(body))
+
+  def sync_handler(self, request: httpx.Request) -> httpx.Response:
+    return self.handle(request, request.read())
+
+  async def async_handler(self, request: httpx.Request) -> httpx.Response:
+    return self.handle(request, await request.aread())
+
+
+@pytest.fixture
+def service():
+  return _FakeFileService()
+
+
+@pytest.fixture
+def client(service):
+  client = Client(api_key='test-api-key')
+  client._api_client._httpx_client = httpx.Client(
+      transport=httpx.MockTransport(service.sync_handler)
+  )
+  client._api_client._async_httpx_client = httpx.AsyncClient(
+      transport=httpx.MockTransport(service.async_handler)
+  )
+  with mock.patch.object(_api_client.time, 'sleep'), mock.patch.object(
+      _api_client.asyncio, 'sleep', mock.AsyncMock()
+  ), mock.patch.object(
+      _api_client.BaseApiClient, '_use_aiohttp', return_value=False
+  ):
+    yield client
+
+
+def _pieces(size: int = 300_000):
+  for i in range(0, len(_CONTENT), size):
+    yield _CONTENT[i : i + size]
+
+
+async def _async_pieces(size: int = 300_000):
+  for piece in _pieces(size):
+    yield piece
+
+
+def test_upload_generator_without_content_length(client, service):
+  progress = []
+
+  file = client.files.upload(
+      file=_pieces(),
+      config={'mime_type': 'video/mp4'},
+      progress_callback=lambda *args: progress.append(args),
+  )
+
+  assert file.name == 'files/abc'
+  assert service.data == _CONTENT
+  assert 'x-goog-upload-header-content-length' not in service.start_headers
+  assert service.start_headers['x-goog-upload-header-content-type'] == (
+      'video/mp4'
+  )
+  assert [size for _, size in service.commands] == [
+      _api_client.CHUNK_SIZE,
+      2 * _api_client.CHUNK_SIZE,
+      len(_CONTENT) - 3 * _api_client.CHUNK_SIZE,
+  ]
+  assert [command for command, _ in service.commands] == [
+      'upload',
+      'upload',
+      'upload, finalize',
+  ]
+  assert progress[-1] == (len(_CONTENT), None)
+
+
+def test_iterator_ending_on_chunk_boundary(client, service):
+  content = _CONTENT[: _api_client.CHUNK_SIZE]
+
+  client.files.upload(
+      file=iter([content[:1000], content[1000:]]),
+      config={'mime_type': 'video/mp4'},
+  )
+
+  assert service.data == content
+  assert service.commands == [('upload, finalize', _api_client.CHUNK_SIZE)]
+
+
+def test_empty_iterator(client, service):
+  client.files.upload(file=iter([]), config={'mime_type': 'video/mp4'})
+
+  assert service.commands == [('upload, finalize', 0)]
+
+
+def test_failed_chunk_of_iterator_is_resent(client, service):
+  service.fail_chunks = 1
+
+  client.files.upload(file=_pieces(), config={'mime_type': 'video/mp4'})
+
+  assert service.data == _CONTENT
+  assert service.commands[:2] == [('upload', _api_client.CHUNK_SIZE)] * 2
+
+
+def test_iterator_requires_mime_type(client):
+  with pytest.raises(ValueError, match='mime_type'):
+    client.files.upload(file=_pieces())
+
+
+def test_bytes_are_not_uploaded_as_iterator(client):
+  with pytest.raises(ValueError, match='io.BytesIO'):
+    client.files.upload(file=b'data', config={'mime_type': 'text/plain'})
+
+
+def test_async_upload_async_generator(client, service):
+  file = asyncio.run(
+      client.aio.files.upload(
+          file=_async_pieces(1024 * 1024),
+          config={'mime_type': 'video/mp4'},
+      )
+  )
+
+  assert file.name == 'files/abc'
+  assert service.data == _CONTENT
+  assert service.commands[-1] == (
+      'upload, finalize',
+      len(_CONTENT) - 3 * _api_client.CHUNK_SIZE,
+  )
+
+
+def test_async_upload_resends_failed_chunk_of_sync_generator(client, service):
+  service.fail_chunks = 1
+
+  asyncio.run(
+      client.aio.files.upload(
+          file=_pieces(), config={'mime_type': 'video/mp4'}
+      )
+  )
+
+  assert service.data == _CONTENT
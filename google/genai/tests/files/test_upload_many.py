@@ -0,0 +1,174 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests for uploading many files concurrently."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import threading
+
+import httpx
+import pytest
+
+from ... import Client
+
+
+class _FakeFileService:
+  """Creates an upload session per file and receives the uploads."""
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self.sessions: dict[str, dict] = {}
+    self.active = 0
+    self.max_active = 0
+
+  def handle(self, request: httpx.Request, content: bytes) -> httpx.Response:
+    command = request.headers['X-Goog-Upload-Command']
+    with self._lock:
+      if command == 'start':
+        metadata = json.loads(content)['file']
+        if metadata.get('display_name') == 'rejected':
+          return httpx.Response(400, json={'error': {'message': 'rejected'}})
+        url = f'https://upload.example.com/{len(self.sessions)}'
+        self.sessions[url] = {'metadata': metadata, 'data': b''}
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        return httpx.Response(
+            200, headers={'x-goog-upload-url': url}, text='{}'
+        )
+      session = self.sessions[str(request.url)]
+      session['data'] += content
+      final = 'finalize' in command
+      if final:
+        self.active -= 1
+    body = {}
+    if final:
+      body = {'file': {'name': f'files/{request.url.path.strip("/")}'}}
+    return httpx.Response(
+        200,
+        headers={'x-goog-upload-status': 'final' if final else 'active'},
+        text=json.dumps(body),
+    )
+
+  def sync_handler(self, request: httpx.Request) -> httpx.Response:
+    return self.handle(request, request.read())
+
+  async def async_handler(self, request: httpx.Request) -> httpx.Response:
+    return self.handle(request, await request.aread())
+
+
+@pytest.fixture
+def service():
+  return _FakeFileService()
+
+
+@pytest.fixture
+def client(service):
+  client = Client(api_key='test-api-key')
+  client._api_client._httpx_client = httpx.Client(
+      transport=httpx.MockTransport(service.sync_handler)
+  )
+  client._api_client._async_httpx_client = httpx.AsyncClient(
+      transport=httpx.MockTransport(service.async_handler)
+  )
+  client._api_client._use_aiohttp = lambda: False
+  return client
+
+
+@pytest.fixture
+def paths(tmp_path):
+  paths = []
+  for i in range(6):
+    path = tmp_path / f'{i}.txt'
+    path.write_bytes(b'x' * (i + 1))
+    paths.append(path)
+  return paths
+
+
+def test_results_are_in_input_order(client, service, paths):
+  progress = []
+
+  results = client.files.upload_many(
+      files=paths,
+      max_concurrency=3,
+      progress_callback=lambda *args: progress.append(args),
+  )
+
+  assert all(result.error is None for result in results)
+  uploaded = [
+      service.sessions[f'https://upload.example.com/{result.file.name[6:]}']
+      for result in results
+  ]
+  assert [session['data'] for session in uploaded] == [
+      path.read_bytes() for path in paths
+  ]
+  assert sorted(progress) == [(i, i + 1, i + 1) for i in range(6)]
+  assert service.max_active <= 3
+
+
+def test_failures_are_reported_per_file(client, service, paths):
+  results = client.files.upload_many(
+      files=[paths[0], 'missing.txt', paths[1]],
+      configs=[None, None, {'display_name': 'rejected'}],
+  )
+
+  assert results[0].file is not None and results[0].error is None
+  assert isinstance(results[1].error, FileNotFoundError)
+  assert results[2].file is None
+  assert 'rejected' in str(results[2].error)
+
+
+def test_config_applies_to_all_files(client, service):
+  results = client.files.upload_many(
+      files=[io.BytesIO(b'a'), io.BytesIO(b'b')],
+      config={'mime_type': 'text/plain'},
+  )
+
+  assert all(result.file for result in results)
+  assert [s['metadata']['mime_type'] for s in service.sessions.values()] == [
+      'text/plain',
+      'text/plain',
+  ]
+
+
+def test_config_and_configs_are_exclusive(client, paths):
+  with pytest.raises(ValueError, match='Only one'):
+    client.files.upload_many(files=paths, config={}, configs=[None] * 6)
+  with pytest.raises(ValueError, match='one config per file'):
+    client.files.upload_many(files=paths, configs=[None])
+
+
+def test_max_concurrency_must_be_positive(client, paths):
+  with pytest.raises(ValueError, match='max_concurrency'):
+    client.files.upload_many(files=paths, max_concurrency=0)
+  with pytest.raises(ValueError, match='max_concurrency'):
+    asyncio.run(client.aio.files.upload_many(files=paths, max_concurrency=0))
+
+
+def test_async_results_are_in_input_order(client, service, paths):
+  results = asyncio.run(
+      client.aio.files.upload_many(files=paths, max_concurrency=2)
+  )
+
+  assert [
+      service.sessions[
+          f'https://upload.example.com/{result.file.name[6:]}'
+      ]['data']
+      for result in results
+  ] == [path.read_bytes() for path in paths]
+  assert service.max_active <= 2
@@ -0,0 +1,217 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests for resuming interrupted uploads from the upload journal."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+from unittest import mock
+
+import httpx
+import pytest
+
+from ... import _api_client
+from ... import _upload_journal
+from ... import Client
+
+_UPLOAD_URL = 'https://upload.example.com/session/1'
+
+
+class _FakeFileService:
+  """Creates upload sessions and receives uploads, dropping some chunks."""
+
+  def __init__(self):
+    self.data = bytearray()
+    self.final = False
+    self.start_requests = 0
+    # Chunks at these offsets fail with a dropped connection.
+    self.failing_offsets: set[int] = set()
+    # Whether the upload session expired.
+    self.expired = False
+
+  def handle(self, request: httpx.Request, content: bytes) -> httpx.Response:
+    command = request.headers['X-Goog-Upload-Command']
+    if command == 'start':
+      self.start_requests += 1
+      self.data = bytearray()
+      self.final = False
+      self.expired = False
+      return httpx.Response(
+          200, headers={'x-goog-upload-url': _UPLOAD_URL}, text='{}'
+      )
+    if self.expired:
+      return httpx.Response(404, text='{}')
+    if command != 'query':
+      offset = int(request.headers['X-Goog-Upload-Offset'])
+      assert offset == len(self.data)
+      if offset in self.failing_offsets:
+        raise httpx.ReadError('connection dropped')
+      self.data += content
+      self.final = 'finalize' in command
+    headers = {
+        'x-goog-upload-status': 'final' if self.final else 'active',
+        'x-goog-upload-size-received': str(len(self.data)),
+    }
+    body = {'file': {'name': 'files/abc'}} if self.final else {}
+    return httpx.Response(200, headers=headers, text=json.dumps(body))
+
+  def sync_handler(self, request: httpx.Request) -> httpx.Response:
+    return self.handle(request, request.read())
+
+  async def async_handler(self, request: httpx.Request) -> httpx.Response:
+    return self.handle(request, await request.aread())
+
+
+@pytest.fixture
+def service():
+  return _FakeFileService()
+
+
+@pytest.fixture
+def client(service, tmp_path, monkeypatch):
+  monkeypatch.setenv(
+      _upload_journal._JOURNAL_DIR_ENV_VAR, str(tmp_path / 'journal')
+  )
+  client = Client(api_key='test-api-key')
+  client._api_client._httpx_client = httpx.Client(
+      transport=httpx.MockTransport(service.sync_handler)
+  )
+  client._api_client._async_httpx_client = httpx.AsyncClient(
+      transport=httpx.MockTransport(service.async_handler)
+  )
+  with mock.patch.object(_api_client.time, 'sleep'), mock.patch.object(
+      _api_client.asyncio, 'sleep', mock.AsyncMock()
+  ), mock.patch.object(
+      _api_client.BaseApiClient, '_use_aiohttp', return_value=False
+  ):
+    yield client
+
+
+@pytest.fixture
+def path(tmp_path):
+  path = tmp_path / 'data.bin'
+  path.write_bytes(bytes(range(256)) * (20 * 1024 * 1024 // 256))
+  return path
+
+
+def test_resume_continues_interrupted_upload(client, service, path):
+  service.failing_offsets = {_api_client.CHUNK_SIZE}
+  with pytest.raises(httpx.ReadError):
+    client.files.upload(file=path, resume=True)
+  assert len(service.data) == _api_client.CHUNK_SIZE
+
+  service.failing_offsets = set()
+  file = client.files.upload(file=path, resume=True)
+
+  assert file.name == 'files/abc'
+  assert service.start_requests == 1
+  assert service.data == path.read_bytes()
+  assert not list((path.parent / 'journal').iterdir())
+
+
+def test_journal_records_acknowledged_offset(client, service, path):
+  service.failing_offsets = {_api_client.CHUNK_SIZE}
+  with pytest.raises(httpx.ReadError):
+    client.files.upload(
+        file=path, config={'display_name': 'data'}, resume=True
+    )
+
+  entry = _upload_journal.UploadJournal().get(
+      str(path),
+      {
+          'display_name': 'data',
+          'mime_type': 'application/octet-stream',
+          'size_bytes': path.stat().st_size,
+      },
+  )
+  assert entry == _upload_journal.UploadJournalEntry(
+      upload_url=_UPLOAD_URL,
+      offset=_api_client.CHUNK_SIZE,
+      metadata=entry.metadata,
+  )
+
+
+def test_journal_writes_use_their_own_temporary_files(tmp_path, monkeypatch):
+  journal = _upload_journal.UploadJournal(str(tmp_path / 'journal'))
+  path = tmp_path / 'data.bin'
+  path.write_bytes(b'data')
+  entry = _upload_journal.UploadJournalEntry(
+      upload_url=_UPLOAD_URL, offset=0, metadata={}
+  )
+  replaced = []
+  os_replace = _upload_journal.os.replace
+
+  def replace(src, dst):
+    replaced.append(src)
+    os_replace(src, dst)
+
+  monkeypatch.setattr(_upload_journal.os, 'replace', replace)
+  journal.record(str(path), entry)
+  journal.record(str(path), entry)
+
+  assert len(set(replaced)) == 2
+  assert journal.get(str(path), {}) == entry
+
+
+def test_expired_session_uploads_again(client, service, path):
+  service.failing_offsets = {0}
+  with pytest.raises(httpx.ReadError):
+    client.files.upload(file=path, resume=True)
+
+  service.failing_offsets = set()
+  service.expired = True
+  file = client.files.upload(file=path, resume=True)
+
+  assert file.name == 'files/abc'
+  assert service.start_requests == 2
+  assert service.data == path.read_bytes()
+
+
+def test_modified_file_is_not_resumed(client, service, path):
+  service.failing_offsets = {_api_client.CHUNK_SIZE}
+  with pytest.raises(httpx.ReadError):
+    client.files.upload(file=path, resume=True)
+
+  service.failing_offsets = set()
+  path.write_bytes(b'new content')
+  client.files.upload(file=path, resume=True)
+
+  assert service.start_requests == 2
+  assert service.data == b'new content'
+
+
+def test_resume_requires_a_path(client):
+  with pytest.raises(ValueError, match='file path'):
+    client.files.upload(
+        file=io.BytesIO(b'data'),
+        config={'mime_type': 'text/plain'},
+        resume=True,
+    )
+
+
+def test_async_resume_continues_interrupted_upload(client, service, path):
+  service.failing_offsets = {_api_client.CHUNK_SIZE}
+  with pytest.raises(httpx.ReadError):
+    asyncio.run(client.aio.files.upload(file=path, resume=True))
+
+  service.failing_offsets = set()
+  file = asyncio.run(client.aio.files.upload(file=path, resume=True))
+
+  assert file.name == 'files/abc'
+  assert service.start_requests == 1
+  assert service.data == path.read_bytes()
@@ -0,0 +1,229 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests for counting tokens locally through the client."""
+
+from __future__ import annotations
+
+import json
+from unittest import mock
+
+import pytest
+
+from ... import _api_client
+from ... import Client
+from ... import local_tokenizer
+from ... import types
+
+
+@pytest.fixture(autouse=True)
+def fake_sentencepiece():
+  tokenizer = mock.MagicMock()
+  # One token per character.
+  tokenizer.encode.side_effect = lambda texts: [[0] * len(t) for t in texts]
+  with mock.patch('genai._local_tokenizer_loader.load_model_proto'), mock.patch(
+      'genai._local_tokenizer_loader.get_sentencepiece',
+      return_value=tokenizer,
+  ):
+    yield tokenizer
+
+
+def _client(counter, total_tokens=100):
+  client = Client(api_key='test-api-key', local_token_counter=counter)
+  client._api_client._request = mock.MagicMock(
+      return_value=_api_client.HttpResponse(
+          headers={},
+          response_stream=[json.dumps({'totalTokens': total_tokens})],
+      )
+  )
+  client._api_client._async_request = mock.AsyncMock(
+      side_effect=lambda *args, **kwargs: client._api_client._request()
+  )
+  return client
+
+
+def test_text_is_counted_locally():
+  counter = local_tokenizer.LocalTokenCounter()
+  client = _client(counter)
+
+  response = client.models.count_tokens(
+      model='gemini-2.0-flash',
+      contents='Hello',
+      config={'system_instruction': 'Be brief.'},
+  )
+
+  assert response.total_tokens == 14
+  client._api_client._request.assert_not_called()
+  assert counter.stats() == local_tokenizer.LocalTokenCounterStats(
+      local_counts=1
+  )
+
+
+def test_models_prefix_and_function_declarations_are_counted_locally():
+  client = _client(local_tokenizer.LocalTokenCounter())
+
+  response = client.models.count_tokens(
+      model='models/gemini-2.0-flash',
+      contents='Hi',
+      config=types.CountTokensConfig(
+          tools=[
+              types.Tool(
+                  function_declarations=[
+                      types.FunctionDeclaration(name='f', description='ab')
+                  ]
+              )
+          ]
+      ),
+  )
+
+  assert response.total_tokens == 5
+  client._api_client._request.assert_not_called()
+
+
+def test_tokenizer_load_failure_falls_back_to_api():
+  counter = local_tokenizer.LocalTokenCounter()
+  client = _client(counter)
+
+  with mock.patch(
+      'genai._local_tokenizer_loader.load_model_proto',
+      side_effect=OSError('network is unreachable'),
+  ) as load_model_proto:
+    responses = [
+        client.models.count_tokens(model='gemini-2.0-flash', contents='Hello')
+        for _ in range(2)
+    ]
+
+  assert [response.total_tokens for response in responses] == [100, 100]
+  # Loading is not tried again right away.
+  load_model_proto.assert_called_once()
+  assert counter.stats() == local_tokenizer.LocalTokenCounterStats(
+      remote_counts=2
+  )
+
+  with mock.patch.object(
+      local_tokenizer, '_TOKENIZER_LOAD_RETRY_SECONDS', 0
+  ):
+    response = client.models.count_tokens(
+        model='gemini-2.0-flash', contents='Hello'
+    )
+
+  assert response.total_tokens == 5
+
+
+@pytest.mark.parametrize(
+    'model, contents, config',
+    [
+        (
+            'gemini-2.0-flash',
+            types.Part.from_bytes(data=b'123', mime_type='image/png'),
+            None,
+        ),
+        ('unknown-model', 'Hello', None),
+        (
+            'gemini-2.0-flash',
+            types.Part(
+                executable_code=types.ExecutableCode(
+                    language='PYTHON', code='print(1)'
+                )
+            ),
+            None,
+        ),
+    ],
+)
+def test_unsupported_requests_are_sent_to_the_api(model, contents, config):
+  counter = local_tokenizer.LocalTokenCounter()
+  client = _client(counter)
+
+  response = client.models.count_tokens(
+      model=model, contents=contents, config=config
+  )
+
+  assert response.total_tokens == 100
+  client._api_client._request.assert_called_once()
+  assert counter.stats().remote_counts == 1
+
+
+def test_only_function_declaration_tools_are_counted_locally():
+  assert local_tokenizer._is_locally_countable_config(
+      types.CountTokensConfig(
+          tools=[types.Tool(function_declarations=[{'name': 'f'}])]
+      )
+  )
+  assert not local_tokenizer._is_locally_countable_config(
+      types.CountTokensConfig(tools=[types.Tool(google_search={})])
+  )
+  assert not local_tokenizer._is_locally_countable_config(
+      types.CountTokensConfig(
+          system_instruction=types.Part.from_uri(
+              file_uri='gs://bucket/a.pdf', mime_type='application/pdf'
+          )
+      )
+  )
+
+
+def test_periodic_verification():
+  counter = local_tokenizer.LocalTokenCounter(verify_every=2)
+  client = _client(counter, total_tokens=5)
+
+  totals = [
+      client.models.count_tokens(
+          model='gemini-2.0-flash', contents='Hello'
+      ).total_tokens
+      for _ in range(4)
+  ]
+
+  assert totals == [5, 5, 5, 5]
+  assert client._api_client._request.call_count == 2
+  assert counter.stats() == local_tokenizer.LocalTokenCounterStats(
+      local_counts=4, verifications=2
+  )
+
+
+def test_mismatch_sends_model_to_the_api(caplog):
+  counter = local_tokenizer.LocalTokenCounter(verify_every=1, tolerance=0.1)
+  client = _client(counter, total_tokens=7)
+
+  client.models.count_tokens(model='gemini-2.0-flash', contents='Hello')
+  response = client.models.count_tokens(
+      model='gemini-2.0-flash', contents='Hello'
+  )
+
+  assert response.total_tokens == 7
+  assert counter.stats() == local_tokenizer.LocalTokenCounterStats(
+      local_counts=1, remote_counts=1, verifications=1, mismatches=1
+  )
+  assert 'differs from the API count' in caplog.text
+
+
+def test_without_counter_counts_remotely():
+  client = _client(None)
+
+  response = client.models.count_tokens(
+      model='gemini-2.0-flash', contents='Hello'
+  )
+
+  assert response.total_tokens == 100
+
+
+@pytest.mark.asyncio
+async def test_async_text_is_counted_locally():
+  client = _client(local_tokenizer.LocalTokenCounter())
+
+  response = await client.aio.models.count_tokens(
+      model='gemini-2.0-flash', contents='Hello'
+  )
+
+  assert response.total_tokens == 5
+  client._api_client._async_request.assert_not_called()
@@ -15,7 +15,10 @@
 
 from __future__ import annotations
 
+import array
+import concurrent.futures
 import unittest
+from unittest import mock
 from unittest.mock import MagicMock, patch
 
 from sentencepiece import sentencepiece_model_pb2
@@ -179,13 +182,14 @@ class TestLocalTokenizer(unittest.TestCase):
     )
 
   def test_count_tokens_with_response_schema(self):
+    # One token list per encoded text.
     self.mock_tokenizer.encode.return_value = [
         [1],
         [1, 2],
         [1, 2, 3],
         [1, 2, 3, 4],
         [1, 2, 3, 4, 5],
-    ]
+    ] + [[]] * 5
     schema = types.Schema(
         type=types.Type.OBJECT,
         format='schema_format',
@@ -249,35 +253,41 @@ class TestLocalTokenizer(unittest.TestCase):
           'Content contains unsupported types for token counting', cm.output[0]
       )
 
+  def _set_model_pieces(self, *pieces):
+    self.tokenizer._model_proto = sentencepiece_model_pb2.ModelProto(
+        pieces=[
+            sentencepiece_model_pb2.ModelProto.SentencePiece(
+                piece=piece, type=piece_type
+            )
+            for piece, piece_type in pieces
+        ]
+    )
+
   def test_compute_tokens_simple_string(self):
-    mock_spt = MagicMock()
-    mock_spt.pieces = [
-        MagicMock(id=1, piece='He'),
-        MagicMock(id=2, piece='llo'),
-        MagicMock(id=3, piece=' world'),
-    ]
-    self.mock_tokenizer.EncodeAsImmutableProto.return_value = [mock_spt]
+    normal = sentencepiece_model_pb2.ModelProto.SentencePiece.Type.NORMAL
+    self._set_model_pieces(
+        ('<unk>', sentencepiece_model_pb2.ModelProto.SentencePiece.Type.UNKNOWN),
+        ('He', normal),
+        ('llo', normal),
+        ('▁world', normal),
+    )
+    self.mock_tokenizer.encode.return_value = [[1, 2, 3]]
     result = self.tokenizer.compute_tokens('Hello world')
     self.assertEqual(len(result.tokens_info), 1)
     self.assertEqual(result.tokens_info[0].token_ids, [1, 2, 3])
     self.assertEqual(result.tokens_info[0].tokens, [b'He', b'llo', b' world'])
     self.assertEqual(result.tokens_info[0].role, 'user')
-    self.mock_tokenizer.EncodeAsImmutableProto.assert_called_once_with(
-        ['Hello world']
-    )
+    self.mock_tokenizer.encode.assert_called_once_with(['Hello world'])
 
   def test_compute_tokens_with_chat_history(self):
-    mock_spt1 = MagicMock()
-    mock_spt1.pieces = [MagicMock(id=1, piece='Hello')]
-    mock_spt2 = MagicMock()
-    mock_spt2.pieces = [
-        MagicMock(id=2, piece='Hi'),
-        MagicMock(id=3, piece=' there!'),
-    ]
-    self.mock_tokenizer.EncodeAsImmutableProto.return_value = [
-        mock_spt1,
-        mock_spt2,
-    ]
+    normal = sentencepiece_model_pb2.ModelProto.SentencePiece.Type.NORMAL
+    self._set_model_pieces(
+        ('<unk>', sentencepiece_model_pb2.ModelProto.SentencePiece.Type.UNKNOWN),
+        ('Hello', normal),
+        ('Hi', normal),
+        ('▁there!', normal),
+    )
+    self.mock_tokenizer.encode.return_value = [[1], [2, 3]]
     history = [
         types.Content(role='user', parts=[types.Part(text='Hello')]),
         types.Content(role='model', parts=[types.Part(text='Hi there!')]),
@@ -290,36 +300,240 @@ class TestLocalTokenizer(unittest.TestCase):
     self.assertEqual(result.tokens_info[1].token_ids, [2, 3])
     self.assertEqual(result.tokens_info[1].tokens, [b'Hi', b' there!'])
     self.assertEqual(result.tokens_info[1].role, 'model')
-    self.mock_tokenizer.EncodeAsImmutableProto.assert_called_once_with(
-        ['Hello', 'Hi there!']
-    )
+    self.mock_tokenizer.encode.assert_called_once_with(['Hello', 'Hi there!'])
 
   def test_compute_tokens_with_byte_tokens(self):
-    mock_spt = MagicMock()
-    mock_spt.pieces = [
-        MagicMock(id=1, piece='<0x48>'),
-        MagicMock(id=2, piece='ello'),
-    ]
-    self.mock_tokenizer.EncodeAsImmutableProto.return_value = [mock_spt]
-    self.tokenizer._model_proto = sentencepiece_model_pb2.ModelProto(
-        pieces=[
-            sentencepiece_model_pb2.ModelProto.SentencePiece(),
-            sentencepiece_model_pb2.ModelProto.SentencePiece(
-                type=sentencepiece_model_pb2.ModelProto.SentencePiece.Type.BYTE
-            ),
-            sentencepiece_model_pb2.ModelProto.SentencePiece(
-                type=sentencepiece_model_pb2.ModelProto.SentencePiece.Type.NORMAL
-            ),
-        ]
+    self.mock_tokenizer.encode.return_value = [[1, 2]]
+    self._set_model_pieces(
+        ('<unk>', sentencepiece_model_pb2.ModelProto.SentencePiece.Type.UNKNOWN),
+        ('<0x48>', sentencepiece_model_pb2.ModelProto.SentencePiece.Type.BYTE),
+        ('ello', sentencepiece_model_pb2.ModelProto.SentencePiece.Type.NORMAL),
     )
     result = self.tokenizer.compute_tokens('Hello')
     self.assertEqual(len(result.tokens_info), 1)
     self.assertEqual(result.tokens_info[0].token_ids, [1, 2])
     self.assertEqual(result.tokens_info[0].tokens, [b'H', b'ello'])
-    self.mock_tokenizer.EncodeAsImmutableProto.assert_called_once_with(
-        ['Hello']
+    self.mock_tokenizer.encode.assert_called_once_with(['Hello'])
+
+  def test_compute_tokens_batch(self):
+    normal = sentencepiece_model_pb2.ModelProto.SentencePiece.Type.NORMAL
+    self._set_model_pieces(('a', normal), ('b', normal), ('c', normal))
+    self.mock_tokenizer.encode.return_value = [[0], [1, 2], [2]]
+    results = self.tokenizer.compute_tokens_batch(['a', ['b', 'c']])
+    self.assertEqual(
+        [[info.tokens for info in r.tokens_info] for r in results],
+        [[[b'a']], [[b'b', b'c'], [b'c']]],
+    )
+    self.mock_tokenizer.encode.assert_called_once_with(
+        ['a', 'b', 'c'], num_threads=None
     )
 
+  def test_compute_tokens_compact(self):
+    self._set_model_pieces(
+        ('<0x48>', sentencepiece_model_pb2.ModelProto.SentencePiece.Type.BYTE),
+        ('ello', sentencepiece_model_pb2.ModelProto.SentencePiece.Type.NORMAL),
+        ('▁w', sentencepiece_model_pb2.ModelProto.SentencePiece.Type.NORMAL),
+    )
+    self.mock_tokenizer.encode.return_value = [[0, 1, 2]]
+    info, = self.tokenizer.compute_tokens_compact(
+        'Hello w', include_tokens=True
+    )
+    self.assertEqual(info.token_ids, array.array('i', [0, 1, 2]))
+    self.assertEqual(info.tokens, b'Hello w')
+    self.assertEqual(info.token_offsets, array.array('q', [0, 1, 5, 7]))
+    self.assertEqual(info.token(2), b' w')
+    self.assertEqual(info.role, 'user')
+
+  def test_compute_tokens_compact_without_tokens(self):
+    self.mock_tokenizer.encode.return_value = [[5, 6]]
+    info, = self.tokenizer.compute_tokens_compact('Hello')
+    self.assertEqual(info.token_ids, array.array('i', [5, 6]))
+    self.assertIsNone(info.tokens)
+    with self.assertRaisesRegex(ValueError, 'Tokens were not requested'):
+      info.token(0)
+
+  def test_count_tokens_only_encodes_unseen_texts(self):
+    self.mock_tokenizer.encode.side_effect = lambda texts: [
+        [0] * len(text) for text in texts
+    ]
+    config = types.CountTokensConfig(system_instruction='Be brief.')
+    first = self.tokenizer.count_tokens('Hello', config=config)
+    second = self.tokenizer.count_tokens('Hi', config=config)
+
+    self.assertEqual(first.total_tokens, 14)
+    self.assertEqual(second.total_tokens, 11)
+    self.assertEqual(
+        self.mock_tokenizer.encode.call_args_list,
+        [mock.call(['Hello', 'Be brief.']), mock.call(['Hi'])],
+    )
+
+  def test_token_count_cache_evicts_least_recently_used(self):
+    tokenizer = local_tokenizer.LocalTokenizer(
+        model_name='gemini-1.0-pro', token_count_cache_size=1
+    )
+    self.mock_tokenizer.encode.side_effect = lambda texts: [
+        [0] * len(text) for text in texts
+    ]
+    tokenizer.count_tokens('a')
+    tokenizer.count_tokens('b')
+    tokenizer.count_tokens('a')
+
+    self.assertEqual(self.mock_tokenizer.encode.call_count, 3)
+
+  def test_token_count_cache_does_not_keep_texts(self):
+    self.mock_tokenizer.encode.side_effect = lambda texts: [
+        [0] * len(text) for text in texts
+    ]
+    document = 'long document ' * 1000
+    self.tokenizer.count_tokens(document)
+
+    self.assertEqual(len(self.tokenizer._token_counts), 1)
+    key, = self.tokenizer._token_counts
+    self.assertIsInstance(key, bytes)
+    self.assertLess(len(key), 100)
+
+  def test_count_tokens_incremental(self):
+    self.mock_tokenizer.encode.side_effect = lambda texts: [
+        [0] * len(text) for text in texts
+    ]
+    history = [types.Content(role='user', parts=[types.Part(text='Hello')])]
+    result = self.tokenizer.count_tokens(history)
+    result = self.tokenizer.count_tokens_incremental(
+        result,
+        [
+            types.Content(role='model', parts=[types.Part(text='Hi there')]),
+            types.Content(role='user', parts=[types.Part(text='Bye')]),
+        ],
+    )
+
+    self.assertEqual(result.total_tokens, 16)
+    self.mock_tokenizer.encode.assert_called_with(['Hi there', 'Bye'])
+
+  def test_count_tokens_batch(self):
+    self.mock_tokenizer.encode.return_value = [[1, 2], [3], [4, 5, 6]]
+    result = self.tokenizer.count_tokens_batch([
+        'Hello world',
+        types.Content(role='user', parts=[types.Part(text='a')]),
+        ['b'],
+    ])
+    self.assertEqual(result, [2, 1, 3])
+    self.mock_tokenizer.encode.assert_called_once_with(
+        ['Hello world', 'a', 'b'], num_threads=None
+    )
+
+  def test_count_tokens_batch_with_config(self):
+    self.mock_tokenizer.encode.return_value = [[1], [2, 3], [4]]
+    result = self.tokenizer.count_tokens_batch(
+        ['Hello', 'world'],
+        config=types.CountTokensConfig(system_instruction='Be brief.'),
+        num_threads=4,
+    )
+    # The system instruction is counted once per item.
+    self.assertEqual(result, [3, 2])
+    self.mock_tokenizer.encode.assert_called_once_with(
+        ['Be brief.', 'Hello', 'world'], num_threads=4
+    )
+
+  def test_count_tokens_batch_empty(self):
+    self.assertEqual(self.tokenizer.count_tokens_batch([]), [])
+    self.assertEqual(self.tokenizer.count_tokens_batch([[]]), [0])
+    self.mock_tokenizer.encode.assert_not_called()
+
+  def test_count_tokens_batch_with_processes(self):
+    self.mock_tokenizer.encode.side_effect = lambda texts: [
+        [0] * len(text) for text in texts
+    ]
+    with patch(
+        'concurrent.futures.ProcessPoolExecutor',
+        concurrent.futures.ThreadPoolExecutor,
+    ):
+      result = self.tokenizer.count_tokens_batch(
+          ['a', 'bb', 'ccc', 'dddd', 'eeeee'], num_processes=2
+      )
+    self.assertEqual(result, [1, 2, 3, 4, 5])
+
+
+class TestChunkText(unittest.TestCase):
+
+  def setUp(self):
+    patch('genai._local_tokenizer_loader.load_model_proto').start()
+    self.mock_tokenizer = MagicMock()
+    patch(
+        'genai._local_tokenizer_loader.get_sentencepiece',
+        return_value=self.mock_tokenizer,
+    ).start()
+
+    # One token per character.
+    def encode(texts, out_type=None):
+      if out_type == 'proto':
+        return MagicMock(
+            pieces=[MagicMock(begin=i) for i in range(len(texts.encode()))]
+        )
+      return [[0] * len(text) for text in texts]
+
+    self.mock_tokenizer.encode.side_effect = encode
+    self.tokenizer = local_tokenizer.LocalTokenizer(model_name='gemini-1.0-pro')
+
+  def tearDown(self):
+    patch.stopall()
+
+  def _chunk(self, text, **kwargs):
+    return [
+        (chunk.text, chunk.token_count)
+        for chunk in self.tokenizer.chunk_text(text, **kwargs)
+    ]
+
+  def test_chunks_end_at_sentences(self):
+    self.assertEqual(
+        self._chunk('Aaaa. Bbbb. Cccc.', max_tokens=12),
+        [('Aaaa. Bbbb.', 11), (' Cccc.', 6)],
+    )
+
+  def test_chunks_streamed_text(self):
+    text = 'One. Two? Three! Four.\n\nFive.'
+    chunks = self._chunk(
+        (text[i : i + 3] for i in range(0, len(text), 3)), max_tokens=10
+    )
+    self.assertEqual(
+        chunks,
+        [('One. Two?', 9), (' Three!', 7), (' Four.', 6), ('\n\nFive.', 7)],
+    )
+
+  def test_overlap(self):
+    self.assertEqual(
+        self._chunk('Aa. Bb. Cc. Dd.', max_tokens=8, overlap_tokens=4),
+        [('Aa. Bb.', 7), (' Bb. Cc.', 8), (' Cc. Dd.', 8)],
+    )
+
+  def test_prefers_paragraph_boundaries(self):
+    text = 'Aaaa. Bbbb.\n\nCcc. Ddd. Eee.'
+    self.assertEqual(
+        self._chunk(text, max_tokens=20),
+        [('Aaaa. Bbbb.', 11), ('\n\nCcc. Ddd. Eee.', 16)],
+    )
+    self.assertEqual(
+        self._chunk(text, max_tokens=20, boundary='sentence'),
+        [('Aaaa. Bbbb.\n\nCcc.', 17), (' Ddd. Eee.', 10)],
+    )
+
+  def test_splits_long_sentences_between_tokens(self):
+    self.assertEqual(
+        self._chunk('Abcdefghij. Kl.', max_tokens=4),
+        [('Abcd', 4), ('efgh', 4), ('ij.', 3), (' Kl.', 4)],
+    )
+
+  def test_tokenizes_in_batches(self):
+    self._chunk('A. B. C. D. E.', max_tokens=4, batch_size=2)
+    self.assertEqual(self.mock_tokenizer.encode.call_count, 3)
+
+  def test_invalid_arguments(self):
+    with self.assertRaisesRegex(ValueError, 'max_tokens'):
+      self._chunk('A.', max_tokens=0)
+    with self.assertRaisesRegex(ValueError, 'overlap_tokens'):
+      self._chunk('A.', max_tokens=4, overlap_tokens=4)
+    with self.assertRaisesRegex(ValueError, 'boundary'):
+      self._chunk('A.', max_tokens=4, boundary='word')
+
 
 class TestParseHexByte(unittest.TestCase):
 
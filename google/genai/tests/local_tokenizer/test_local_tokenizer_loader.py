@@ -15,6 +15,9 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
+import tempfile
 import unittest
 from unittest.mock import MagicMock, mock_open, patch
 
@@ -238,3 +241,119 @@ class TestLoaderFunctions(unittest.TestCase):
 
     # Should only be loaded once due to lru_cache
     mock_get.assert_called_once()
+
+
+class TestLoaderCacheDir(unittest.TestCase):
+
+  def setUp(self):
+    loader.load_model_proto.cache_clear()
+    loader.get_sentencepiece.cache_clear()
+    temp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(temp_dir.cleanup)
+    self.cache_dir = temp_dir.name
+    fake_config = loader._TokenizerConfig(
+        model_url="https://example.com/tokenizer.model",
+        model_hash=hashlib.sha256(FAKE_MODEL_CONTENT).hexdigest(),
+    )
+    patch.dict(loader._TOKENIZERS, {"gemma2": fake_config}).start()
+    self.mock_get = patch("genai._local_tokenizer_loader.requests.get").start()
+    self.mock_get.return_value.content = FAKE_MODEL_CONTENT
+    self.model_path = os.path.join(
+        self.cache_dir,
+        hashlib.sha1(fake_config.model_url.encode()).hexdigest(),
+    )
+
+  def tearDown(self):
+    patch.stopall()
+    self._clear_process_caches()
+
+  def _clear_process_caches(self):
+    loader.load_model_proto.cache_clear()
+    loader.get_sentencepiece.cache_clear()
+
+  def test_model_is_loaded_once_per_process(self):
+    with patch.object(
+        loader, "_is_valid_model", wraps=loader._is_valid_model
+    ) as is_valid_model:
+      loader.load_model_proto("gemma2", self.cache_dir)
+      loader.get_sentencepiece("gemma2", self.cache_dir)
+
+    self.mock_get.assert_called_once()
+    is_valid_model.assert_called_once()
+    self.assertTrue(os.path.exists(self.model_path))
+    self.assertTrue(os.path.exists(self.model_path + ".sha256"))
+
+  def test_cache_hit_skips_hashing_and_rewriting(self):
+    loader.load_model_proto("gemma2", self.cache_dir)
+    self._clear_process_caches()
+
+    with patch.object(loader, "_is_valid_model") as is_valid_model:
+      with patch.object(loader, "_maybe_save_to_cache") as save:
+        proto = loader.load_model_proto("gemma2", self.cache_dir)
+
+    self.assertEqual(len(proto.pieces), 4)
+    self.mock_get.assert_called_once()
+    is_valid_model.assert_not_called()
+    save.assert_not_called()
+
+  def test_changed_cache_file_is_verified_again(self):
+    loader.load_model_proto("gemma2", self.cache_dir)
+    self._clear_process_caches()
+    with open(self.model_path, "wb") as f:
+      f.write(b"corrupted")
+
+    proto = loader.load_model_proto("gemma2", self.cache_dir)
+
+    self.assertEqual(len(proto.pieces), 4)
+    self.assertEqual(self.mock_get.call_count, 2)
+    with open(self.model_path, "rb") as f:
+      self.assertEqual(f.read(), FAKE_MODEL_CONTENT)
+
+  def test_pre_seeded_cache_without_marker(self):
+    with open(self.model_path, "wb") as f:
+      f.write(FAKE_MODEL_CONTENT)
+
+    loader.load_model_proto("gemma2", self.cache_dir)
+
+    self.mock_get.assert_not_called()
+    self.assertTrue(os.path.exists(self.model_path + ".sha256"))
+
+  def _load_twice_from_default_cache_dir(self, mode):
+    model_dir = os.path.join(self.cache_dir, "vertexai_tokenizer_model")
+    os.makedirs(model_dir)
+    os.chmod(model_dir, mode)
+    with patch("tempfile.gettempdir", return_value=self.cache_dir):
+      loader.load_model_proto("gemma2")
+      self._clear_process_caches()
+      with patch.object(
+          loader, "_is_valid_model", wraps=loader._is_valid_model
+      ) as is_valid_model:
+        loader.load_model_proto("gemma2")
+    model_path = os.path.join(model_dir, os.path.basename(self.model_path))
+    return model_path, is_valid_model
+
+  @unittest.skipUnless(hasattr(os, "getuid"), "Requires POSIX ownership.")
+  def test_hash_marker_is_trusted_in_private_default_cache_dir(self):
+    model_path, is_valid_model = self._load_twice_from_default_cache_dir(
+        0o755
+    )
+
+    is_valid_model.assert_not_called()
+    self.assertTrue(os.path.exists(model_path + ".sha256"))
+
+  def test_hash_marker_is_not_trusted_in_shared_default_cache_dir(self):
+    model_path, is_valid_model = self._load_twice_from_default_cache_dir(
+        0o777
+    )
+
+    is_valid_model.assert_called_once()
+    self.assertTrue(os.path.exists(model_path))
+    self.assertFalse(os.path.exists(model_path + ".sha256"))
+
+  def test_cache_dir_from_environment(self):
+    with patch.dict(
+        os.environ, {"GOOGLE_GENAI_TOKENIZER_CACHE_DIR": self.cache_dir}
+    ):
+      loader.load_model_proto("gemma2")
+
+    self.assertTrue(os.path.exists(self.model_path))
@@ -0,0 +1,231 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests for the offline media token estimator."""
+
+from __future__ import annotations
+
+import io
+import os
+import struct
+import wave
+from unittest import mock
+
+import pytest
+
+from ... import _media_token_estimator as estimator
+from ... import local_tokenizer
+from ... import types
+
+_DATA_DIR = os.path.join(os.path.dirname(__file__), '../data')
+
+
+def _data_path(name):
+  return os.path.join(_DATA_DIR, name)
+
+
+def _estimate(name, mime_type, video_metadata=None):
+  with open(_data_path(name), 'rb') as f:
+    return estimator.estimate_tokens(f, mime_type, video_metadata)
+
+
+@pytest.mark.parametrize(
+    'name, size',
+    [
+        ('google.png', (272, 92)),
+        ('bridge1.png', (768, 1408)),
+        ('dog.jpg', (1408, 768)),
+        # Progressive JPEG.
+        ('google.jpg', (1400, 788)),
+    ],
+)
+def test_image_size(name, size):
+  with open(_data_path(name), 'rb') as f:
+    assert estimator.image_size(f) == size
+
+
+def test_gif_and_webp_size():
+  gif = b'GIF89a' + struct.pack('<HH', 640, 480)
+  webp = (
+      b'RIFF\x00\x00\x00\x00WEBPVP8X\x0a\x00\x00\x00\x00\x00\x00\x00'
+      + (1023).to_bytes(3, 'little')
+      + (767).to_bytes(3, 'little')
+  )
+  assert estimator.image_size(io.BytesIO(gif)) == (640, 480)
+  assert estimator.image_size(io.BytesIO(webp)) == (1024, 768)
+
+
+def test_image_tokens():
+  # Small images are one tile, larger ones are split into 768x768 tiles.
+  assert _estimate('google.png', 'image/png') == 258
+  assert _estimate('dog.jpg', 'image/jpeg') == 2 * 258
+  assert _estimate('google_homepage.png', 'image/png') == 5 * 3 * 258
+
+
+def test_video_tokens():
+  with open(_data_path('animal.mp4'), 'rb') as f:
+    duration = estimator.media_duration(f, 'video/mp4')
+  assert duration == pytest.approx(2.75, abs=0.01)
+  # 258 tokens per frame at 1 fps and 32 tokens per second of audio.
+  assert _estimate('animal.mp4', 'video/mp4') == 3 * 258 + 89
+  assert (
+      _estimate(
+          'animal.mp4',
+          'video/mp4',
+          types.VideoMetadata(fps=2, start_offset='1s', end_offset='2s'),
+      )
+      == 2 * 258 + 32
+  )
+
+
+def test_audio_tokens():
+  with open(_data_path('pixel.m4a'), 'rb') as f:
+    duration = estimator.media_duration(f, 'audio/mp4')
+  assert duration == pytest.approx(15.9, abs=0.1)
+  assert _estimate('pixel.m4a', 'audio/mp4') == 510
+
+
+def test_wav_flac_and_mp3_duration():
+  wav = io.BytesIO()
+  with wave.open(wav, 'wb') as w:
+    w.setnchannels(1)
+    w.setsampwidth(2)
+    w.setframerate(8000)
+    w.writeframes(b'\x00\x00' * 8000 * 3)
+  # 4 seconds at 44.1 kHz.
+  stream_info = ((44100 << 44) | (44100 * 4)).to_bytes(8, 'big')
+  flac = (
+      b'fLaC\x80\x00\x00\x22' + b'\x00' * 10 + stream_info + b'\x00' * 16
+  )
+  # 1 second of MPEG-1 layer III at 128 kbps, after an empty ID3 tag.
+  mp3 = (
+      b'ID3\x04\x00\x00\x00\x00\x00\x00'
+      + b'\xff\xfb\x90\x00'
+      + b'\x00' * 15996
+  )
+
+  assert estimator.media_duration(wav, 'audio/wav') == 3
+  assert estimator.media_duration(io.BytesIO(flac), 'audio/flac') == 4
+  assert estimator.media_duration(io.BytesIO(mp3), 'audio/mpeg') == 1
+
+
+def test_zero_sample_rate_or_timescale():
+  flac = b'fLaC\x80\x00\x00\x22' + b'\x00' * 34
+  # A movie header with a timescale of 0 and a duration of 10.
+  mvhd = struct.pack('>I4s4x8xII', 28, b'mvhd', 0, 10)
+  mp4 = struct.pack('>I4s8x', 16, b'ftyp') + mvhd
+
+  with pytest.raises(ValueError, match='duration'):
+    estimator.media_duration(io.BytesIO(flac), 'audio/flac')
+  with pytest.raises(ValueError, match='duration'):
+    estimator.media_duration(io.BytesIO(mp4), 'video/mp4')
+
+
+def test_mp4_box_ending_in_its_header():
+  ftyp = struct.pack('>I4s8x', 16, b'ftyp')
+
+  boxes = (
+      # A 64-bit box size of 0.
+      struct.pack('>I4sQ', 1, b'free', 0) + b'\x00' * 16,
+      # A 32-bit box size of 4.
+      struct.pack('>I4s', 4, b'free') + b'\x00' * 16,
+  )
+
+  for box in boxes:
+    with pytest.raises(ValueError, match='corrupted media'):
+      estimator.media_duration(io.BytesIO(ftyp + box), 'video/mp4')
+
+
+class _CountingFile(io.BytesIO):
+  """Counts the bytes that are read."""
+
+  def __init__(self, content: bytes):
+    super().__init__(content)
+    self.bytes_read = 0
+
+  def read(self, size=-1):
+    data = super().read(size)
+    self.bytes_read += len(data)
+    return data
+
+
+def test_pdf_page_count_reads_only_the_page_tree_root():
+  with open(_data_path('story.pdf'), 'rb') as f:
+    f = _CountingFile(f.read())
+
+  assert estimator.pdf_page_count(f) == 1
+  assert f.bytes_read < len(f.getvalue()) // 4
+
+
+def test_pdf_without_xref_table_is_scanned():
+  pdf = (
+      b'%PDF-1.5\n1 0 obj\n<< /Type /Pages /Kids [] /Count 3 >>\nendobj\n'
+      b'startxref\n9\n%%EOF\n'
+  )
+
+  assert estimator.pdf_page_count(io.BytesIO(pdf)) == 3
+
+
+def test_pdf_tokens():
+  with open(_data_path('story.pdf'), 'rb') as f:
+    assert estimator.pdf_page_count(f) == 1
+  assert _estimate('story.pdf', 'application/pdf') == 258
+
+
+def test_unsupported_media():
+  with pytest.raises(ValueError, match='Cannot estimate'):
+    estimator.estimate_tokens(io.BytesIO(b'x'), 'application/zip')
+  with pytest.raises(ValueError, match='remote file'):
+    estimator.open_local_file('gs://bucket/video.mp4')
+
+
+class TestCountTokensEstimateMedia:
+
+  @pytest.fixture(autouse=True)
+  def tokenizer(self):
+    sentencepiece = mock.MagicMock()
+    # One token per character.
+    sentencepiece.encode.side_effect = lambda texts: [
+        [0] * len(text) for text in texts
+    ]
+    with mock.patch(
+        'genai._local_tokenizer_loader.load_model_proto'
+    ), mock.patch(
+        'genai._local_tokenizer_loader.get_sentencepiece',
+        return_value=sentencepiece,
+    ):
+      self.tokenizer = local_tokenizer.LocalTokenizer('gemini-2.0-flash')
+      yield
+
+  def test_media_requires_opt_in(self):
+    with open(_data_path('google.png'), 'rb') as f:
+      part = types.Part.from_bytes(data=f.read(), mime_type='image/png')
+    with pytest.raises(ValueError, match='non-text'):
+      self.tokenizer.count_tokens([part])
+
+  def test_inline_and_local_file_media(self):
+    with open(_data_path('google.png'), 'rb') as f:
+      image = types.Part.from_bytes(data=f.read(), mime_type='image/png')
+    pdf = types.Part.from_uri(
+        file_uri='file://' + os.path.abspath(_data_path('story.pdf')),
+        mime_type='application/pdf',
+    )
+    text = types.Part.from_bytes(data=b'abc', mime_type='text/plain')
+
+    result = self.tokenizer.count_tokens(
+        ['Hello', image, pdf, text], estimate_media=True
+    )
+
+    assert result.total_tokens == 5 + 258 + 258 + 3
@@ -0,0 +1,128 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests for _mcp_utils.list_mcp_session_tools."""
+
+from __future__ import annotations
+
+from unittest import mock
+
+import pytest
+from ... import _mcp_utils
+from ... import invalidate_mcp_tools_cache
+from ... import types
+
+try:
+  from mcp import types as mcp_types
+  from mcp import ClientSession as McpClientSession
+except ImportError as e:
+  import sys
+
+  if sys.version_info < (3, 10):
+    raise ImportError(
+        'MCP Tool requires Python 3.10 or above. Please upgrade your Python'
+        ' version.'
+    ) from e
+  else:
+    raise e
+
+
+class MockMcpClientSession(McpClientSession):
+
+  def __init__(self):
+    self._read_stream = None
+    self._write_stream = None
+    self.list_tools_count = 0
+
+    async def message_handler(message):
+      pass
+
+    self._message_handler = message_handler
+
+  async def list_tools(self):
+    self.list_tools_count += 1
+    return mcp_types.ListToolsResult(
+        tools=[
+            mcp_types.Tool(
+                name=f'get_weather_{self.list_tools_count}',
+                description='Get the weather in a city.',
+                inputSchema={
+                    'type': 'object',
+                    'properties': {'location': {'type': 'string'}},
+                },
+            ),
+        ]
+    )
+
+
+@pytest.mark.asyncio
+async def test_list_mcp_session_tools_is_cached():
+  session = MockMcpClientSession()
+
+  list_tools_result, tools = await _mcp_utils.list_mcp_session_tools(session)
+  _, cached_tools = await _mcp_utils.list_mcp_session_tools(session)
+
+  assert session.list_tools_count == 1
+  assert list_tools_result.tools[0].name == 'get_weather_1'
+  assert tools == cached_tools
+  assert tools[0].function_declarations[0].name == 'get_weather_1'
+  assert (
+      tools[0].function_declarations[0].parameters.properties['location'].type
+      == types.Type.STRING
+  )
+
+
+@pytest.mark.asyncio
+async def test_list_mcp_session_tools_is_cached_per_session():
+  session_1 = MockMcpClientSession()
+  session_2 = MockMcpClientSession()
+
+  await _mcp_utils.list_mcp_session_tools(session_1)
+  await _mcp_utils.list_mcp_session_tools(session_2)
+
+  assert session_1.list_tools_count == 1
+  assert session_2.list_tools_count == 1
+
+
+@pytest.mark.asyncio
+async def test_list_mcp_session_tools_expires():
+  session = MockMcpClientSession()
+
+  with mock.patch.object(_mcp_utils.time, 'monotonic', return_value=100):
+    await _mcp_utils.list_mcp_session_tools(session)
+  with mock.patch.object(
+      _mcp_utils.time,
+      'monotonic',
+      return_value=101 + _mcp_utils._MCP_TOOLS_CACHE_TTL_SECONDS,
+  ):
+    _, tools = await _mcp_utils.list_mcp_session_tools(session)
+
+  assert session.list_tools_count == 2
+  assert tools[0].function_declarations[0].name == 'get_weather_2'
+
+
+@pytest.mark.asyncio
+async def test_list_mcp_session_tools_invalidated():
+  session = MockMcpClientSession()
+  message_handler = session._message_handler
+  await _mcp_utils.list_mcp_session_tools(session)
+
+  invalidate_mcp_tools_cache(session)
+  _, tools = await _mcp_utils.list_mcp_session_tools(session)
+
+  assert session.list_tools_count == 2
+  assert tools[0].function_declarations[0].name == 'get_weather_2'
+  # The session is used as is.
+  assert session._message_handler is message_handler
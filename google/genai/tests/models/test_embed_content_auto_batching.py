@@ -0,0 +1,256 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests for the auto batching mode of embed_content."""
+
+from __future__ import annotations
+
+import threading
+from unittest import mock
+
+import pytest
+
+from ... import _api_client
+from ... import errors
+from ... import models
+from ... import types
+
+
+def _text(content) -> str:
+  if isinstance(content, str):
+    return content
+  return types.Content.model_validate(content).parts[0].text
+
+
+def _embed(calls, lock=None):
+  def embed_content(*, model, contents, config=None):
+    assert not isinstance(config, types.EmbedContentConfig) or (
+        config.auto_batching is None
+    )
+    if lock:
+      with lock:
+        calls.append(list(contents))
+    else:
+      calls.append(list(contents))
+    return types.EmbedContentResponse(
+        embeddings=[
+            types.ContentEmbedding(values=[float(len(_text(c)))])
+            for c in contents
+        ],
+        metadata=types.EmbedContentMetadata(
+            billable_character_count=sum(len(_text(c)) for c in contents)
+        ),
+    )
+
+  return embed_content
+
+
+def _models(vertexai=False):
+  api_client = mock.MagicMock(spec=_api_client.BaseApiClient)
+  api_client.vertexai = vertexai
+  return models.Models(api_client_=api_client)
+
+
+def _async_models():
+  api_client = mock.MagicMock(spec=_api_client.BaseApiClient)
+  api_client.vertexai = False
+  return models.AsyncModels(api_client_=api_client)
+
+
+def test_without_auto_batching_sends_one_request():
+  sync_models = _models()
+  calls = []
+  contents = ['a'] * 5
+  with mock.patch.object(
+      sync_models, '_embed_content', side_effect=_embed(calls)
+  ) as embed_content:
+    sync_models.embed_content(
+        model='m', contents=contents, config={'task_type': 'x'}
+    )
+
+  embed_content.assert_called_once_with(
+      model='m', contents=contents, config={'task_type': 'x'}
+  )
+
+
+def test_auto_batching_splits_by_item_count_and_merges_in_order():
+  sync_models = _models()
+  calls = []
+  contents = ['x' * i for i in range(1, 8)]
+  with mock.patch.object(
+      sync_models, '_embed_content', side_effect=_embed(calls, threading.Lock())
+  ):
+    response = sync_models.embed_content(
+        model='m',
+        contents=contents,
+        config=types.EmbedContentConfig(
+            task_type='RETRIEVAL_DOCUMENT',
+            auto_batching=types.EmbedContentBatchingConfig(
+                max_items_per_request=3
+            ),
+        ),
+    )
+
+  assert sorted(len(call) for call in calls) == [1, 3, 3]
+  assert [e.values[0] for e in response.embeddings] == [
+      float(i) for i in range(1, 8)
+  ]
+  assert response.metadata.billable_character_count == sum(range(1, 8))
+
+
+def test_auto_batching_splits_by_estimated_tokens():
+  sync_models = _models()
+  calls = []
+  # 40 characters is estimated as 10 tokens.
+  contents = ['a' * 40, 'b' * 40, 'c' * 40, 'd' * 200]
+  with mock.patch.object(
+      sync_models, '_embed_content', side_effect=_embed(calls, threading.Lock())
+  ):
+    response = sync_models.embed_content(
+        model='m',
+        contents=contents,
+        config={'auto_batching': {'max_tokens_per_request': 20}},
+    )
+
+  assert sorted(calls) == [['a' * 40, 'b' * 40], ['c' * 40], ['d' * 200]]
+  assert [e.values[0] for e in response.embeddings] == [40.0, 40.0, 40.0, 200.0]
+
+
+def test_auto_batching_embeds_duplicates_once():
+  sync_models = _models()
+  calls = []
+  contents = [
+      'a',
+      'b',
+      'a',
+      types.Content(parts=[types.Part(text='cc')]),
+      {'parts': [{'text': 'cc'}]},
+  ]
+  with mock.patch.object(
+      sync_models, '_embed_content', side_effect=_embed(calls)
+  ):
+    response = sync_models.embed_content(
+        model='m', contents=contents, config={'auto_batching': {}}
+    )
+
+  assert len(calls) == 1
+  assert len(calls[0]) == 3
+  assert [e.values[0] for e in response.embeddings] == [
+      1.0,
+      1.0,
+      1.0,
+      2.0,
+      2.0,
+  ]
+
+
+def test_auto_batching_vertex_maps_text_parts():
+  sync_models = _models(vertexai=True)
+
+  def embed_content(*, model, contents, config=None):
+    texts = []
+    for content in contents:
+      if isinstance(content, str):
+        texts.append(content)
+      else:
+        texts.extend(part.text for part in content.parts)
+    return types.EmbedContentResponse(
+        embeddings=[types.ContentEmbedding(values=[len(t)]) for t in texts]
+    )
+
+  contents = [
+      types.Content(parts=[types.Part(text='a'), types.Part(text='bb')]),
+      'ccc',
+  ]
+  with mock.patch.object(
+      sync_models, '_embed_content', side_effect=embed_content
+  ):
+    response = sync_models.embed_content(
+        model='m',
+        contents=contents,
+        config={'auto_batching': {'max_items_per_request': 1}},
+    )
+
+  assert [e.values[0] for e in response.embeddings] == [1.0, 2.0, 3.0]
+  assert response.metadata is None
+
+
+def test_auto_batching_raises_sub_request_error():
+  sync_models = _models()
+
+  def embed_content(*, model, contents, config=None):
+    if 'bad' in contents:
+      raise errors.APIError(400, {'error': {'message': 'bad request'}})
+    return _embed([])(model=model, contents=contents, config=config)
+
+  with mock.patch.object(
+      sync_models, '_embed_content', side_effect=embed_content
+  ):
+    with pytest.raises(errors.APIError):
+      sync_models.embed_content(
+          model='m',
+          contents=['ok', 'bad', 'fine'],
+          config={'auto_batching': {'max_items_per_request': 1}},
+      )
+
+
+def test_auto_batching_rejects_invalid_max_concurrency():
+  sync_models = _models()
+  with mock.patch.object(
+      sync_models, '_embed_content', side_effect=_embed([])
+  ):
+    with pytest.raises(ValueError, match='auto_batching.max_concurrency'):
+      sync_models.embed_content(
+          model='m',
+          contents=['a', 'b'],
+          config={
+              'auto_batching': {
+                  'max_items_per_request': 1,
+                  'max_concurrency': 0,
+              }
+          },
+      )
+
+
+@pytest.mark.asyncio
+async def test_async_auto_batching_merges_in_order():
+  async_models = _async_models()
+  calls = []
+  sync_embed = _embed(calls)
+
+  async def embed_content(**kwargs):
+    return sync_embed(**kwargs)
+
+  contents = ['x' * i for i in range(1, 6)] + ['x']
+  with mock.patch.object(
+      async_models, '_embed_content', side_effect=embed_content
+  ):
+    response = await async_models.embed_content(
+        model='m',
+        contents=contents,
+        config={
+            'auto_batching': {'max_items_per_request': 2, 'max_concurrency': 2}
+        },
+    )
+
+  assert sorted(len(call) for call in calls) == [1, 2, 2]
+  assert [e.values[0] for e in response.embeddings] == [
+      1.0,
+      2.0,
+      3.0,
+      4.0,
+      5.0,
+      1.0,
+  ]
@@ -0,0 +1,174 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests for the embed_content embedding cache."""
+
+from __future__ import annotations
+
+import json
+from unittest import mock
+
+import pytest
+
+from ... import _api_client
+from ... import embedding_cache
+from ... import models
+from ... import types
+
+
+def _request(method, path, request_dict, http_options=None):
+  return types.HttpResponse(
+      headers={},
+      body=json.dumps({
+          'embeddings': [
+              {'values': [float(len(r['content']['parts'][0]['text'])), 1.0]}
+              for r in request_dict['requests']
+          ]
+      }),
+  )
+
+
+def _api_client_mock():
+  api_client = mock.MagicMock(spec=_api_client.BaseApiClient)
+  api_client.vertexai = False
+  api_client.request.side_effect = _request
+  return api_client
+
+
+def _sent_texts(api_client):
+  return [
+      [r['content']['parts'][0]['text'] for r in call.args[2]['requests']]
+      for call in api_client.request.call_args_list
+  ]
+
+
+@pytest.fixture
+def cache(tmp_path):
+  with embedding_cache.SqliteEmbeddingCache(
+      tmp_path / 'cache' / 'embeddings.sqlite'
+  ) as cache:
+    yield cache
+
+
+def test_embedding_cache_sends_only_misses(cache):
+  api_client = _api_client_mock()
+  sync_models = models.Models(api_client_=api_client)
+  config = {'embedding_cache': cache, 'task_type': 'RETRIEVAL_DOCUMENT'}
+
+  first = sync_models.embed_content(
+      model='m', contents=['a', 'bb'], config=config
+  )
+  second = sync_models.embed_content(
+      model='m', contents=['ccc', 'a', 'bb', 'ccc'], config=config
+  )
+
+  assert _sent_texts(api_client) == [['a', 'bb'], ['ccc']]
+  assert [e.values for e in first.embeddings] == [[1.0, 1.0], [2.0, 1.0]]
+  assert [e.values for e in second.embeddings] == [
+      [3.0, 1.0],
+      [1.0, 1.0],
+      [2.0, 1.0],
+      [3.0, 1.0],
+  ]
+
+
+def test_embedding_cache_hit_makes_no_request(cache):
+  api_client = _api_client_mock()
+  sync_models = models.Models(api_client_=api_client)
+  sync_models.embed_content(
+      model='m', contents=['a'], config={'embedding_cache': cache}
+  )
+
+  response = sync_models.embed_content(
+      model='m',
+      contents=['a'],
+      config={'embedding_cache': cache, 'compact_embeddings': True},
+  )
+
+  assert api_client.request.call_count == 1
+  assert list(response.embedding_matrix[0]) == [1.0, 1.0]
+  assert response.embeddings[0].values is None
+
+
+def test_embedding_cache_key_includes_model_and_config(cache):
+  api_client = _api_client_mock()
+  sync_models = models.Models(api_client_=api_client)
+
+  for model, task_type in [('m', 'A'), ('m', 'B'), ('n', 'A'), ('m', 'A')]:
+    sync_models.embed_content(
+        model=model,
+        contents=['a'],
+        config={'embedding_cache': cache, 'task_type': task_type},
+    )
+
+  assert api_client.request.call_count == 3
+
+
+def test_embedding_cache_persists(tmp_path):
+  path = tmp_path / 'embeddings.sqlite'
+  with embedding_cache.SqliteEmbeddingCache(path) as cache:
+    models.Models(api_client_=_api_client_mock()).embed_content(
+        model='m', contents=['a'], config={'embedding_cache': cache}
+    )
+
+  api_client = _api_client_mock()
+  with embedding_cache.SqliteEmbeddingCache(path) as cache:
+    response = models.Models(api_client_=api_client).embed_content(
+        model='m', contents=['a'], config={'embedding_cache': cache}
+    )
+
+  api_client.request.assert_not_called()
+  assert response.embeddings[0].values == [1.0, 1.0]
+
+
+def test_sqlite_cache_evicts_least_recently_used_entries():
+  with embedding_cache.SqliteEmbeddingCache(':memory:', max_entries=2) as cache:
+    matrix = types.EmbeddingMatrix.from_rows([[1.0, 2.0]])
+    cache.put_many({'a': matrix})
+    cache.put_many({'b': matrix})
+    assert set(cache.get_many(['a'])) == {'a'}
+    cache.put_many({'c': matrix})
+
+    assert len(cache) == 2
+    assert set(cache.get_many(['a', 'b', 'c'])) == {'a', 'c'}
+
+
+def test_sqlite_cache_evicts_by_size():
+  # Each entry is 2 float32 values, 8 bytes.
+  with embedding_cache.SqliteEmbeddingCache(':memory:', max_bytes=20) as cache:
+    for key in ['a', 'b', 'c']:
+      cache.put_many({key: types.EmbeddingMatrix.from_rows([[1.0, 2.0]])})
+
+    assert set(cache.get_many(['a', 'b', 'c'])) == {'b', 'c'}
+
+
+@pytest.mark.asyncio
+async def test_async_embedding_cache_sends_only_misses(cache):
+  api_client = _api_client_mock()
+  api_client.async_request = mock.AsyncMock(side_effect=_request)
+  async_models = models.AsyncModels(api_client_=api_client)
+  config = {'embedding_cache': cache}
+
+  await async_models.embed_content(model='m', contents=['a'], config=config)
+  response = await async_models.embed_content(
+      model='m', contents=['a', 'bb'], config=config
+  )
+
+  sent = [
+      [r['content']['parts'][0]['text'] for r in call.args[2]['requests']]
+      for call in api_client.async_request.call_args_list
+  ]
+  assert sent == [['a'], ['bb']]
+  assert [e.values for e in response.embeddings] == [[1.0, 1.0], [2.0, 1.0]]
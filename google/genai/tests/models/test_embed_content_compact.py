@@ -0,0 +1,197 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests for compact array-backed embedding results."""
+
+from __future__ import annotations
+
+import array
+import json
+from unittest import mock
+
+import pytest
+
+from ... import _api_client
+from ... import _embedding_matrix
+from ... import models
+from ... import types
+
+
+def _models(response_body: dict, vertexai: bool = False) -> models.Models:
+  api_client = mock.MagicMock(spec=_api_client.BaseApiClient)
+  api_client.vertexai = vertexai
+  api_client.request.return_value = types.HttpResponse(
+      headers={}, body=json.dumps(response_body)
+  )
+  return models.Models(api_client_=api_client)
+
+
+def test_compact_embeddings_mldev():
+  sync_models = _models(
+      {'embeddings': [{'values': [0.5, -1.0, 2.0]}, {'values': [1, 2, 3]}]}
+  )
+
+  response = sync_models.embed_content(
+      model='m', contents=['a', 'b'], config={'compact_embeddings': True}
+  )
+
+  assert [embedding.values for embedding in response.embeddings] == [
+      None,
+      None,
+  ]
+  matrix = response.embedding_matrix
+  assert matrix.shape == (2, 3)
+  assert matrix.data.typecode == 'f'
+  assert list(matrix[0]) == [0.5, -1.0, 2.0]
+  assert list(matrix[-1]) == [1.0, 2.0, 3.0]
+
+
+def test_compact_embeddings_vertex():
+  sync_models = _models(
+      {
+          'predictions': [
+              {
+                  'embeddings': {
+                      'values': [1.0, 2.0],
+                      'statistics': {'token_count': 3},
+                  }
+              },
+          ],
+          'metadata': {'billableCharacterCount': 1},
+      },
+      vertexai=True,
+  )
+
+  response = sync_models.embed_content(
+      model='m', contents=['a'], config={'compact_embeddings': True}
+  )
+
+  assert response.embeddings[0].values is None
+  assert response.embeddings[0].statistics.token_count == 3
+  assert list(response.embedding_matrix[0]) == [1.0, 2.0]
+
+
+
+@pytest.mark.asyncio
+async def test_compact_embeddings_async():
+  api_client = mock.MagicMock(spec=_api_client.BaseApiClient)
+  api_client.vertexai = False
+  api_client.async_request = mock.AsyncMock(
+      return_value=types.HttpResponse(
+          headers={}, body=json.dumps({'embeddings': [{'values': [1, 2]}]})
+      )
+  )
+  async_models = models.AsyncModels(api_client_=api_client)
+
+  response = await async_models.embed_content(
+      model='m', contents=['a'], config={'compact_embeddings': True}
+  )
+
+  assert response.embeddings[0].values is None
+  assert list(response.embedding_matrix[0]) == [1.0, 2.0]
+
+def test_embedding_matrix_from_values_without_compact_embeddings():
+  sync_models = _models({'embeddings': [{'values': [1.0, 2.0]}]})
+
+  response = sync_models.embed_content(model='m', contents=['a'])
+
+  assert response.embeddings[0].values == [1.0, 2.0]
+  assert response.embedding_matrix.shape == (1, 2)
+
+
+def test_embedding_matrix_rows_are_views():
+  matrix = types.EmbeddingMatrix(array.array('f', [1, 2, 3, 4]), 2)
+
+  row = matrix[1]
+  matrix.data[2] = 5.0
+
+  assert list(row) == [5.0, 4.0]
+  with pytest.raises(IndexError):
+    matrix[2]
+
+
+def test_embedding_matrix_rejects_mismatched_dimensions():
+  with pytest.raises(ValueError):
+    types.EmbeddingMatrix.from_rows([[1.0, 2.0], [1.0]])
+  with pytest.raises(ValueError):
+    types.EmbeddingMatrix(array.array('f', [1, 2, 3]), 2)
+
+
+def test_quantize_int8():
+  matrix = types.EmbeddingMatrix.from_rows([[1.0, -0.5, 0.0], [0.0, 0.0, 0.0]])
+
+  values, scales = matrix.quantize_int8()
+
+  assert list(values) == [127, -64, 0, 0, 0, 0]
+  assert scales[0] == pytest.approx(1.0 / 127)
+  assert scales[1] == 1.0
+
+
+def test_quantize_binary():
+  matrix = types.EmbeddingMatrix.from_rows(
+      [[1.0, -1.0] * 4 + [1.0], [-1.0] * 8 + [-1.0]]
+  )
+
+  assert matrix.quantize_binary() == bytes([0b10101010, 0x80, 0, 0])
+
+
+def test_to_numpy_is_zero_copy():
+  numpy = pytest.importorskip('numpy')
+  matrix = types.EmbeddingMatrix.from_rows([[1.0, 2.0], [3.0, 4.0]])
+
+  array_view = matrix.to_numpy()
+  matrix.data[0] = 9.0
+
+  assert array_view.shape == (2, 2)
+  assert array_view.dtype == numpy.float32
+  assert array_view[0, 0] == 9.0
+
+
+def test_to_numpy_without_numpy():
+  matrix = types.EmbeddingMatrix.from_rows([[1.0]])
+  with mock.patch.object(_embedding_matrix, 'numpy', None):
+    with pytest.raises(ImportError, match='NumPy'):
+      matrix.to_numpy()
+
+
+def test_auto_batching_merges_compact_embeddings():
+  api_client = mock.MagicMock(spec=_api_client.BaseApiClient)
+  api_client.vertexai = False
+
+  def request(method, path, request_dict, http_options=None):
+    return types.HttpResponse(
+        headers={},
+        body=json.dumps({
+            'embeddings': [
+                {'values': [float(len(r['content']['parts'][0]['text']))]}
+                for r in request_dict['requests']
+            ]
+        }),
+    )
+
+  api_client.request.side_effect = request
+  sync_models = models.Models(api_client_=api_client)
+
+  response = sync_models.embed_content(
+      model='m',
+      contents=['aaa', 'b', 'aaa', 'cc'],
+      config={
+          'compact_embeddings': True,
+          'auto_batching': {'max_items_per_request': 1},
+      },
+  )
+
+  assert api_client.request.call_count == 3
+  assert [row[0] for row in response.embedding_matrix] == [3.0, 1.0, 3.0, 2.0]
@@ -0,0 +1,280 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests for the concurrent fan-out methods of AsyncModels."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+from unittest import mock
+
+import pytest
+
+from ... import _api_client
+from ... import errors
+from ... import models
+from ... import types
+
+
+def _response(text: str) -> types.GenerateContentResponse:
+  return types.GenerateContentResponse(
+      candidates=[
+          types.Candidate(
+              content=types.Content(
+                  role='model', parts=[types.Part(text=text)]
+              )
+          )
+      ]
+  )
+
+
+@pytest.fixture
+def async_models():
+  api_client = mock.MagicMock(spec=_api_client.BaseApiClient)
+  return models.AsyncModels(api_client_=api_client)
+
+
+@pytest.mark.asyncio
+async def test_generate_content_many_ordered(async_models):
+  async def generate_content(*, model, contents, config=None):
+    # Later requests finish first.
+    await asyncio.sleep(0.01 * (3 - int(contents)))
+    return _response(f'{model}:{contents}')
+
+  with mock.patch.object(
+      async_models, 'generate_content', side_effect=generate_content
+  ):
+    results = [
+        result
+        async for result in await async_models.generate_content_many(
+            [{'model': 'm', 'contents': str(i)} for i in range(3)],
+            ordered=True,
+        )
+    ]
+
+  assert [result.index for result in results] == [0, 1, 2]
+  assert [result.response.text for result in results] == ['m:0', 'm:1', 'm:2']
+  assert all(result.error is None for result in results)
+
+
+@pytest.mark.asyncio
+async def test_generate_content_many_unordered(async_models):
+  async def generate_content(*, model, contents, config=None):
+    await asyncio.sleep(0.01 * (3 - int(contents)))
+    return _response(contents)
+
+  with mock.patch.object(
+      async_models, 'generate_content', side_effect=generate_content
+  ):
+    results = [
+        result
+        async for result in await async_models.generate_content_many(
+            [{'model': 'm', 'contents': str(i)} for i in range(3)]
+        )
+    ]
+
+  assert [result.index for result in results] == [2, 1, 0]
+  assert [result.request['contents'] for result in results] == ['2', '1', '0']
+
+
+@pytest.mark.asyncio
+async def test_generate_content_many_captures_errors(async_models):
+  async def generate_content(*, model, contents, config=None):
+    if contents == 'bad':
+      raise errors.ClientError(400, {'error': {'message': 'bad request'}})
+    return _response(contents)
+
+  with mock.patch.object(
+      async_models, 'generate_content', side_effect=generate_content
+  ):
+    results = [
+        result
+        async for result in await async_models.generate_content_many(
+            [
+                {'model': 'm', 'contents': 'good'},
+                {'model': 'm', 'contents': 'bad'},
+            ],
+            ordered=True,
+        )
+    ]
+
+  assert results[0].response.text == 'good'
+  assert results[0].error is None
+  assert results[1].response is None
+  assert isinstance(results[1].error, errors.ClientError)
+
+
+@pytest.mark.asyncio
+async def test_generate_content_many_limits_concurrency(async_models):
+  running = 0
+  max_running = 0
+
+  async def generate_content(*, model, contents, config=None):
+    nonlocal running, max_running
+    running += 1
+    max_running = max(max_running, running)
+    await asyncio.sleep(0.001)
+    running -= 1
+    return _response(contents)
+
+  with mock.patch.object(
+      async_models, 'generate_content', side_effect=generate_content
+  ):
+    results = [
+        result
+        async for result in await async_models.generate_content_many(
+            ({'model': 'm', 'contents': str(i)} for i in range(50)),
+            max_concurrency=4,
+        )
+    ]
+
+  assert len(results) == 50
+  assert max_running == 4
+
+
+@pytest.mark.asyncio
+async def test_generate_content_many_consumes_requests_lazily(async_models):
+  consumed = 0
+
+  def requests():
+    nonlocal consumed
+    for i in itertools.count():
+      consumed += 1
+      yield {'model': 'm', 'contents': str(i)}
+
+  async def generate_content(*, model, contents, config=None):
+    return _response(contents)
+
+  with mock.patch.object(
+      async_models, 'generate_content', side_effect=generate_content
+  ):
+    stream = await async_models.generate_content_many(
+        requests(), max_concurrency=2, ordered=True
+    )
+    results = []
+    async for result in stream:
+      results.append(result)
+      if len(results) == 5:
+        break
+    await stream.aclose()
+
+  assert [result.response.text for result in results] == [
+      '0',
+      '1',
+      '2',
+      '3',
+      '4',
+  ]
+  assert consumed <= 5 + 2 * 2
+
+
+@pytest.mark.asyncio
+async def test_generate_content_many_async_iterable(async_models):
+  async def requests():
+    for i in range(3):
+      yield {'model': 'm', 'contents': str(i)}
+
+  async def generate_content(*, model, contents, config=None):
+    return _response(contents)
+
+  with mock.patch.object(
+      async_models, 'generate_content', side_effect=generate_content
+  ):
+    results = [
+        result
+        async for result in await async_models.generate_content_many(
+            requests(), ordered=True
+        )
+    ]
+
+  assert [result.response.text for result in results] == ['0', '1', '2']
+
+
+@pytest.mark.asyncio
+async def test_generate_content_many_cancels_pending_requests(async_models):
+  cancelled = []
+
+  async def generate_content(*, model, contents, config=None):
+    if contents == '0':
+      return _response(contents)
+    try:
+      await asyncio.sleep(10)
+    except asyncio.CancelledError:
+      cancelled.append(contents)
+      raise
+
+  with mock.patch.object(
+      async_models, 'generate_content', side_effect=generate_content
+  ):
+    stream = await async_models.generate_content_many(
+        [{'model': 'm', 'contents': str(i)} for i in range(3)]
+    )
+    result = await stream.__anext__()
+    await stream.aclose()
+    await asyncio.sleep(0)
+
+  assert result.response.text == '0'
+  assert sorted(cancelled) == ['1', '2']
+
+
+@pytest.mark.asyncio
+async def test_generate_content_many_invalid_max_concurrency(async_models):
+  with pytest.raises(ValueError):
+    await async_models.generate_content_many([], max_concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_embed_content_many(async_models):
+  async def embed_content(*, model, contents, config=None):
+    return types.EmbedContentResponse(
+        embeddings=[types.ContentEmbedding(values=[float(len(contents))])]
+    )
+
+  with mock.patch.object(
+      async_models, 'embed_content', side_effect=embed_content
+  ):
+    results = [
+        result
+        async for result in await async_models.embed_content_many(
+            [{'model': 'm', 'contents': 'a' * i} for i in range(1, 4)],
+            ordered=True,
+        )
+    ]
+
+  assert [result.response.embeddings[0].values for result in results] == [
+      [1.0],
+      [2.0],
+      [3.0],
+  ]
+
+
+@pytest.mark.asyncio
+async def test_count_tokens_many(async_models):
+  async def count_tokens(*, model, contents, config=None):
+    return types.CountTokensResponse(total_tokens=len(contents))
+
+  with mock.patch.object(
+      async_models, 'count_tokens', side_effect=count_tokens
+  ):
+    results = [
+        result
+        async for result in await async_models.count_tokens_many(
+            [{'model': 'm', 'contents': 'a' * i} for i in range(1, 4)],
+            ordered=True,
+        )
+    ]
+
+  assert [result.response.total_tokens for result in results] == [1, 2, 3]
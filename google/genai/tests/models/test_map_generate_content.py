@@ -0,0 +1,197 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Tests for the thread pool fan-out methods of Models."""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from ... import _api_client
+from ... import errors
+from ... import models
+from ... import types
+
+
+def _response(text: str) -> types.GenerateContentResponse:
+  return types.GenerateContentResponse(
+      candidates=[
+          types.Candidate(
+              content=types.Content(
+                  role='model', parts=[types.Part(text=text)]
+              )
+          )
+      ]
+  )
+
+
+@pytest.fixture
+def sync_models():
+  api_client = mock.MagicMock(spec=_api_client.BaseApiClient)
+  return models.Models(api_client_=api_client)
+
+
+def test_map_generate_content_ordered(sync_models):
+  def generate_content(*, model, contents, config=None):
+    # Later requests finish first.
+    time.sleep(0.01 * (3 - int(contents)))
+    return _response(f'{model}:{contents}')
+
+  with mock.patch.object(
+      sync_models, 'generate_content', side_effect=generate_content
+  ):
+    results = list(
+        sync_models.map_generate_content(
+            [{'model': 'm', 'contents': str(i)} for i in range(3)],
+            ordered=True,
+        )
+    )
+
+  assert [result.index for result in results] == [0, 1, 2]
+  assert [result.response.text for result in results] == ['m:0', 'm:1', 'm:2']
+
+
+def test_map_generate_content_unordered(sync_models):
+  def generate_content(*, model, contents, config=None):
+    time.sleep(0.05 * (3 - int(contents)))
+    return _response(contents)
+
+  with mock.patch.object(
+      sync_models, 'generate_content', side_effect=generate_content
+  ):
+    results = list(
+        sync_models.map_generate_content(
+            [{'model': 'm', 'contents': str(i)} for i in range(3)]
+        )
+    )
+
+  assert [result.index for result in results] == [2, 1, 0]
+
+
+def test_map_generate_content_captures_errors(sync_models):
+  def generate_content(*, model, contents, config=None):
+    if contents == 'bad':
+      raise errors.ClientError(400, {'error': {'message': 'bad request'}})
+    return _response(contents)
+
+  with mock.patch.object(
+      sync_models, 'generate_content', side_effect=generate_content
+  ):
+    results = list(
+        sync_models.map_generate_content(
+            [
+                {'model': 'm', 'contents': 'good'},
+                {'model': 'm', 'contents': 'bad'},
+            ],
+            ordered=True,
+        )
+    )
+
+  assert results[0].response.text == 'good'
+  assert isinstance(results[1].error, errors.ClientError)
+  assert results[1].response is None
+
+
+def test_map_generate_content_limits_workers(sync_models):
+  lock = threading.Lock()
+  running = 0
+  max_running = 0
+
+  def generate_content(*, model, contents, config=None):
+    nonlocal running, max_running
+    with lock:
+      running += 1
+      max_running = max(max_running, running)
+    time.sleep(0.005)
+    with lock:
+      running -= 1
+    return _response(contents)
+
+  with mock.patch.object(
+      sync_models, 'generate_content', side_effect=generate_content
+  ):
+    results = list(
+        sync_models.map_generate_content(
+            ({'model': 'm', 'contents': str(i)} for i in range(30)),
+            max_workers=3,
+        )
+    )
+
+  assert len(results) == 30
+  assert max_running <= 3
+
+
+def test_map_generate_content_consumes_requests_lazily(sync_models):
+  consumed = 0
+
+  def requests():
+    nonlocal consumed
+    for i in itertools.count():
+      consumed += 1
+      yield {'model': 'm', 'contents': str(i)}
+
+  def generate_content(*, model, contents, config=None):
+    return _response(contents)
+
+  with mock.patch.object(
+      sync_models, 'generate_content', side_effect=generate_content
+  ):
+    results = sync_models.map_generate_content(
+        requests(), max_workers=2, ordered=True
+    )
+    first_results = list(itertools.islice(results, 5))
+    results.close()
+
+  assert [result.response.text for result in first_results] == [
+      '0',
+      '1',
+      '2',
+      '3',
+      '4',
+  ]
+  assert consumed <= 5 + 2 * 2
+
+
+def test_map_generate_content_invalid_max_workers(sync_models):
+  with pytest.raises(ValueError, match='max_workers'):
+    sync_models.map_generate_content([], max_workers=0)
+
+
+def test_map_embed_content(sync_models):
+  def embed_content(*, model, contents, config=None):
+    return types.EmbedContentResponse(
+        embeddings=[types.ContentEmbedding(values=[float(len(contents))])]
+    )
+
+  with mock.patch.object(
+      sync_models, 'embed_content', side_effect=embed_content
+  ):
+    results = list(
+        sync_models.map_embed_content(
+            [{'model': 'm', 'contents': 'a' * i} for i in range(1, 4)],
+            ordered=True,
+        )
+    )
+
+  assert [result.response.embeddings[0].values for result in results] == [
+      [1.0],
+      [2.0],
+      [3.0],
+  ]
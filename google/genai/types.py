@@ -41,6 +41,8 @@ except ImportError:
 
 GenericAliasType = getattr(builtin_types, 'GenericAlias', None)
 from . import _common
+from ._embedding_matrix import EmbeddingMatrix
+from .embedding_cache import EmbeddingCache
 from ._operations_converters import (
     _GenerateVideosOperation_from_mldev,
     _GenerateVideosOperation_from_vertex,
@@ -3966,6 +3968,95 @@ class SpeechConfigDict(TypedDict, total=False):
 SpeechConfigOrDict = Union[SpeechConfig, SpeechConfigDict]
 
 
+class FunctionResponseCacheConfig(_common.BaseModel):
+  """The configuration for caching function responses in automatic function calling.
+
+  Identical function calls (same function name and arguments) reuse the cached
+  function response instead of invoking the function again. The cache lasts for
+  one automatic function calling loop, or for all the turns of a chat.
+  """
+
+  function_names: Optional[list[str]] = Field(
+      default=None,
+      description="""Names of the functions whose responses can be cached,
+      in addition to the functions marked with `cacheable_tool`.
+      If not set, the responses of all functions are cached.
+      """,
+  )
+  max_entries: Optional[int] = Field(
+      default=None,
+      description="""Maximum number of cached function responses. The least
+      recently used response is evicted first.
+      If not set, SDK will set max_entries to 128.
+      """,
+  )
+  ttl_seconds: Optional[float] = Field(
+      default=None,
+      description="""Time in seconds a cached function response can be reused.
+      If not set, SDK will set ttl_seconds to 300.
+      """,
+  )
+
+
+class FunctionResponseCacheConfigDict(TypedDict, total=False):
+  """The configuration for caching function responses in automatic function calling.
+
+  Identical function calls (same function name and arguments) reuse the cached
+  function response instead of invoking the function again. The cache lasts for
+  one automatic function calling loop, or for all the turns of a chat.
+  """
+
+  function_names: Optional[list[str]]
+  """Names of the functions whose responses can be cached,
+      in addition to the functions marked with `cacheable_tool`.
+      If not set, the responses of all functions are cached.
+      """
+
+  max_entries: Optional[int]
+  """Maximum number of cached function responses. The least
+      recently used response is evicted first.
+      If not set, SDK will set max_entries to 128.
+      """
+
+  ttl_seconds: Optional[float]
+  """Time in seconds a cached function response can be reused.
+      If not set, SDK will set ttl_seconds to 300.
+      """
+
+
+FunctionResponseCacheConfigOrDict = Union[
+    FunctionResponseCacheConfig, FunctionResponseCacheConfigDict
+]
+
+_CallableT = typing.TypeVar('_CallableT', bound=Callable[..., Any])
+
+
+def cacheable_tool(func: _CallableT) -> _CallableT:
+  """Marks a function tool whose responses can be reused.
+
+  Automatic function calling reuses the response of an identical earlier call
+  of the function (same arguments) in the same loop, or in the same chat,
+  instead of invoking the function again. The cache is configured by
+  `AutomaticFunctionCallingConfig.function_response_cache`.
+
+  Usage:
+
+  .. code-block:: python
+
+    @types.cacheable_tool
+    def search(query: str) -> list[str]:
+      ...
+  """
+  setattr(func, '_genai_cacheable_tool', True)
+  return func
+
+
+def _is_cacheable_tool(func: Callable[..., Any]) -> bool:
+  """Returns whether the function tool is marked with `cacheable_tool`."""
+  return bool(getattr(func, '_genai_cacheable_tool', False))
+
+
+
 class AutomaticFunctionCallingConfig(_common.BaseModel):
   """The configuration for automatic function calling."""
 
@@ -3993,6 +4084,23 @@ class AutomaticFunctionCallingConfig(_common.BaseModel):
       GenerateContentResponse.automatic_function_calling_history.
       """,
   )
+  eager_execution: Optional[bool] = Field(
+      default=None,
+      description="""If automatic function calling is enabled,
+      whether to start executing function calls as soon as they arrive in
+      the response stream instead of after the stream is consumed.
+      The next request is sent once all started function calls finish.
+      Only supported by the async generate_content_stream method.
+      If not set, SDK will set eager_execution to false.
+      """,
+  )
+  function_response_cache: Optional[FunctionResponseCacheConfig] = Field(
+      default=None,
+      description="""If automatic function calling is enabled,
+      the configuration for reusing the responses of identical function calls.
+      If not set, every function call invokes the function.
+      """,
+  )
 
 
 class AutomaticFunctionCallingConfigDict(TypedDict, total=False):
@@ -4019,6 +4127,21 @@ class AutomaticFunctionCallingConfigDict(TypedDict, total=False):
       GenerateContentResponse.automatic_function_calling_history.
       """
 
+  eager_execution: Optional[bool]
+  """If automatic function calling is enabled,
+      whether to start executing function calls as soon as they arrive in
+      the response stream instead of after the stream is consumed.
+      The next request is sent once all started function calls finish.
+      Only supported by the async generate_content_stream method.
+      If not set, SDK will set eager_execution to false.
+      """
+
+  function_response_cache: Optional[FunctionResponseCacheConfigDict]
+  """If automatic function calling is enabled,
+      the configuration for reusing the responses of identical function calls.
+      If not set, every function call invokes the function.
+      """
+
 
 AutomaticFunctionCallingConfigOrDict = Union[
     AutomaticFunctionCallingConfig, AutomaticFunctionCallingConfigDict
@@ -4325,6 +4448,12 @@ class GenerateContentConfig(_common.BaseModel):
       default=None,
       description=""" If true, the raw HTTP response will be returned in the 'sdk_http_response' field.""",
   )
+  bypass_response_cache: Optional[bool] = Field(
+      default=None,
+      description="""If true, the response cache and the semantic cache of the
+      client are neither read nor written for this request.
+      """,
+  )
   system_instruction: Optional[ContentUnion] = Field(
       default=None,
       description="""Instructions for the model to steer it toward better performance.
@@ -4556,6 +4685,11 @@ class GenerateContentConfigDict(TypedDict, total=False):
   should_return_http_response: Optional[bool]
   """ If true, the raw HTTP response will be returned in the 'sdk_http_response' field."""
 
+  bypass_response_cache: Optional[bool]
+  """If true, the response cache and the semantic cache of the
+      client are neither read nor written for this request.
+      """
+
   system_instruction: Optional[ContentUnionDict]
   """Instructions for the model to steer it toward better performance.
       For example, "Answer as concisely as possible" or "Don't use technical
@@ -6228,6 +6362,67 @@ GenerateContentResponseOrDict = Union[
 ]
 
 
+class EmbedContentBatchingConfig(_common.BaseModel):
+  """The configuration for automatically batching embed_content requests.
+
+  The contents are split into sub-requests that respect the item and token
+  limits below, the sub-requests are sent concurrently, and their embeddings
+  are merged back in input order. Exact duplicate contents are embedded once.
+  """
+
+  max_items_per_request: Optional[int] = Field(
+      default=None,
+      description="""Maximum number of contents sent in one sub-request.
+      If not set, SDK will set max_items_per_request to 100.
+      """,
+  )
+  max_tokens_per_request: Optional[int] = Field(
+      default=None,
+      description="""Maximum estimated number of tokens sent in one
+      sub-request. Tokens are estimated from the text length, and a content
+      that exceeds the limit on its own is sent in its own sub-request.
+      If not set, SDK will set max_tokens_per_request to 20000.
+      """,
+  )
+  max_concurrency: Optional[int] = Field(
+      default=None,
+      description="""Maximum number of sub-requests in flight at a time.
+      If not set, SDK will set max_concurrency to 10.
+      """,
+  )
+
+
+class EmbedContentBatchingConfigDict(TypedDict, total=False):
+  """The configuration for automatically batching embed_content requests.
+
+  The contents are split into sub-requests that respect the item and token
+  limits below, the sub-requests are sent concurrently, and their embeddings
+  are merged back in input order. Exact duplicate contents are embedded once.
+  """
+
+  max_items_per_request: Optional[int]
+  """Maximum number of contents sent in one sub-request.
+      If not set, SDK will set max_items_per_request to 100.
+      """
+
+  max_tokens_per_request: Optional[int]
+  """Maximum estimated number of tokens sent in one
+      sub-request. Tokens are estimated from the text length, and a content
+      that exceeds the limit on its own is sent in its own sub-request.
+      If not set, SDK will set max_tokens_per_request to 20000.
+      """
+
+  max_concurrency: Optional[int]
+  """Maximum number of sub-requests in flight at a time.
+      If not set, SDK will set max_concurrency to 10.
+      """
+
+
+EmbedContentBatchingConfigOrDict = Union[
+    EmbedContentBatchingConfig, EmbedContentBatchingConfigDict
+]
+
+
 class EmbedContentConfig(_common.BaseModel):
   """Optional parameters for the embed_content method."""
 
@@ -6265,6 +6460,27 @@ class EmbedContentConfig(_common.BaseModel):
       will lead to an INVALID_ARGUMENT error, similar to other text APIs.
       """,
   )
+  auto_batching: Optional[EmbedContentBatchingConfig] = Field(
+      default=None,
+      description="""If set, a list of contents is split into sub-requests
+      that are sent concurrently, and the embeddings are merged back in input
+      order.
+      """,
+  )
+  compact_embeddings: Optional[bool] = Field(
+      default=None,
+      description="""If true, the embedding values are decoded into one
+      contiguous float32 buffer, available as
+      `EmbedContentResponse.embedding_matrix`, instead of lists of floats in
+      `ContentEmbedding.values`.
+      """,
+  )
+  embedding_cache: Optional[EmbeddingCache] = Field(
+      default=None,
+      description="""A cache of embeddings, keyed by the model, this config and
+      each content. Cached contents are not sent to the API.
+      """,
+  )
 
 
 class EmbedContentConfigDict(TypedDict, total=False):
@@ -6299,6 +6515,24 @@ class EmbedContentConfigDict(TypedDict, total=False):
       will lead to an INVALID_ARGUMENT error, similar to other text APIs.
       """
 
+  auto_batching: Optional[EmbedContentBatchingConfigDict]
+  """If set, a list of contents is split into sub-requests
+      that are sent concurrently, and the embeddings are merged back in input
+      order.
+      """
+
+  compact_embeddings: Optional[bool]
+  """If true, the embedding values are decoded into one
+      contiguous float32 buffer, available as
+      `EmbedContentResponse.embedding_matrix`, instead of lists of floats in
+      `ContentEmbedding.values`.
+      """
+
+  embedding_cache: Optional[EmbeddingCache]
+  """A cache of embeddings, keyed by the model, this config and
+      each content. Cached contents are not sent to the API.
+      """
+
 
 EmbedContentConfigOrDict = Union[EmbedContentConfig, EmbedContentConfigDict]
 
@@ -6453,6 +6687,24 @@ class EmbedContentResponse(_common.BaseModel):
       """,
   )
 
+  _embedding_matrix: Optional[EmbeddingMatrix] = PrivateAttr(default=None)
+
+  @property
+  def embedding_matrix(self) -> Optional[EmbeddingMatrix]:
+    """Returns the embeddings as one contiguous float32 matrix.
+
+    With `EmbedContentConfig.compact_embeddings`, this is the matrix the values
+    were decoded into. Otherwise, the matrix is built from
+    `ContentEmbedding.values` on each access.
+    """
+    if self._embedding_matrix is not None:
+      return self._embedding_matrix
+    if not self.embeddings:
+      return None
+    return EmbeddingMatrix.from_rows(
+        embedding.values or [] for embedding in self.embeddings
+    )
+
 
 class EmbedContentResponseDict(TypedDict, total=False):
   """Response for the embed_content method."""